@@ -38,6 +38,11 @@ class Settings:
             "SYNC_MINUTE": "0",
             "SYNC_ENABLED": "true",
             "CACHE_MINUTES": "60",
+            "SYNC_FONTE": "xlsx",
+            "SYNC_CSV_WORKERS": "4",
+            "VALIDACAO_MAX_DIAS": "60",
+            "SNAPSHOT_MAX_VERSOES": "10",
+            "SNAPSHOT_MAX_MB": "200",
             "EVOLUTION_API_URL": "",
             "EVOLUTION_NUMERO": "",
             "EVOLUTION_API_KEY": "",
@@ -63,9 +68,11 @@ class Settings:
             "SYNC_NOTIF_ENABLED": "false",
             "EVOLUTION_NUMERO_SYNC": "120363423378738083@g.us",
             "NOTIFY_ON_SYNC": "false",
+            "NOTIFY_RETORNO_ALTERADO": "false",
             "NOTIFY_FERIAS_DIAS_ANTES": "1",
             "API_HOST": "0.0.0.0",
             "API_PORT": "8000",
+            "SCHEDULER_HEALTH_PORT": "8765",
             "SISTEMAS_ACESSO": ["AD PRIN", "VPN", "Gmail", "Admin", "Metrics", "TOTVS"],
             # Padrões que indicam que a pessoa NÃO POSSUI acesso (mapeados para "NP")
             "PADROES_SEM_ACESSO": "N/P,N\\A,NA,N/A,NP"
@@ -101,6 +108,7 @@ class Settings:
         if name == 'CACHE_DIR': return ROOT_DIR / "data" / "cache"
         if name == 'DATABASE_PATH': return (ROOT_DIR / "data" / "database.sqlite")
         if name == 'HASH_FILE': return (ROOT_DIR / "data" / "cache" / ".last_hash")
+        if name == 'SNAPSHOT_DIR': return ROOT_DIR / "data" / "snapshots"
 
         if name not in self._data:
             raise AttributeError(f"'Settings' object has no attribute '{name}'")
@@ -108,9 +116,13 @@ class Settings:
         value = self._data[name]
 
         # Conversão de tipo "Just-In-Time"
+        # KANBANIZE_ENABLED continua texto: as páginas do Kanbanize sempre o
+        # trataram como verdadeiro e só exigem as credenciais
         bool_keys = [
             "SYNC_ENABLED", "EVOLUTION_ENABLED", "ONETIMESECRET_ENABLED", 
-            "MENSAGEM_MANHA_ENABLED", "MENSAGEM_TARDE_ENABLED", "SYNC_NOTIF_ENABLED", "NOTIFY_ON_SYNC"
+            "MENSAGEM_MANHA_ENABLED", "MENSAGEM_TARDE_ENABLED", "SYNC_NOTIF_ENABLED", "NOTIFY_ON_SYNC",
+            "NOTIFY_RETORNO_ALTERADO", "KANBANIZE_SYNC_ENABLED",
+            "KANBANIZE_SYNC_09H30_ENABLED", "KANBANIZE_SYNC_18H00_ENABLED"
         ]
         if name in bool_keys:
             return str(value).lower() == 'true'
@@ -118,8 +130,9 @@ class Settings:
         int_keys = [
             "SYNC_HOUR", "SYNC_MINUTE", "CACHE_MINUTES", "MENSAGEM_MANHA_HOUR", 
             "MENSAGEM_MANHA_MINUTE", "MENSAGEM_TARDE_HOUR", "MENSAGEM_TARDE_MINUTE",
-            "SYNC_NOTIF_HOUR", "SYNC_NOTIF_MINUTE",
-            "NOTIFY_FERIAS_DIAS_ANTES", "API_PORT"
+            "SYNC_NOTIF_HOUR", "SYNC_NOTIF_MINUTE", "SNAPSHOT_MAX_VERSOES", "SNAPSHOT_MAX_MB",
+            "SYNC_CSV_WORKERS", "VALIDACAO_MAX_DIAS",
+            "NOTIFY_FERIAS_DIAS_ANTES", "API_PORT", "SCHEDULER_HEALTH_PORT"
         ]
         if name in int_keys:
             try:
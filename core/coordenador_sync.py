@@ -0,0 +1,160 @@
+"""
+Coordenador single-flight de sincronizações.
+
+Garante que apenas uma sincronização rode por vez, mesmo entre processos
+diferentes (scheduler, páginas do Streamlit, teste de planilha):
+- A execução em andamento é registrada em `sync_execucoes` (índice único parcial)
+- Quem chega depois para a mesma operação aguarda e recebe o mesmo resultado,
+  exceto quem força a execução enquanto roda uma não forçada: esse aguarda
+  e executa de novo (uma execução forçada, compartilhada pelos que forçaram)
+- Quem chega para outra operação aguarda o término e então executa a sua
+- Execuções sem heartbeat recente ou de processos mortos são recuperadas
+"""
+
+import json
+import os
+import socket
+import threading
+import time
+import uuid
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, Optional
+
+import sys
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.database import Database
+
+# Intervalo entre heartbeats da execução em andamento (segundos)
+HEARTBEAT_SEGUNDOS = 5
+
+# Sem heartbeat por este tempo, a execução é considerada travada (segundos)
+EXECUCAO_TRAVADA_SEGUNDOS = 60
+
+# Tempo máximo aguardando uma execução de outro chamador (segundos)
+ESPERA_MAXIMA_SEGUNDOS = 30 * 60
+
+# Intervalo entre consultas enquanto aguarda (segundos)
+INTERVALO_ESPERA_SEGUNDOS = 1.0
+
+
+def _processo_vivo(pid: int) -> bool:
+    """Verifica se um processo local ainda existe."""
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except (PermissionError, OSError):
+        return True
+    return True
+
+
+class CoordenadorSync:
+    """Coordena execuções de sincronização com um único voo por vez."""
+
+    def __init__(self, db: Database = None):
+        self.db = db or Database()
+        self.host = socket.gethostname()
+        self.pid = os.getpid()
+
+    # ==================== EXECUÇÃO ====================
+
+    def executar(self, operacao: str, funcao: Callable[[], Dict], forcar: bool = False) -> Dict:
+        """
+        Executa `funcao` garantindo uma única execução simultânea.
+
+        Args:
+            operacao: Nome da operação (ex: 'sincronizacao', 'teste_planilha')
+            funcao: Função sem argumentos que retorna o dicionário de resultado
+            forcar: O chamador forçou a execução: não reaproveita o resultado
+                    de uma execução não forçada em andamento
+
+        Returns:
+            Resultado da própria execução ou da execução em andamento compartilhada
+        """
+        limite = time.monotonic() + ESPERA_MAXIMA_SEGUNDOS
+
+        while True:
+            token = uuid.uuid4().hex
+            if self.db.tentar_iniciar_execucao_sync(token, operacao, self.pid, self.host, forcar):
+                return self._executar_com_heartbeat(token, funcao)
+
+            ativa = self.db.buscar_execucao_sync_ativa()
+            if not ativa:
+                continue
+
+            if self._esta_travada(ativa):
+                if self.db.abandonar_execucao_sync(ativa["token"]):
+                    print(f"   ⚠️ Execução travada recuperada ({ativa['operacao']}, PID {ativa['pid']})")
+                continue
+
+            print(f"   ⏳ {ativa['operacao']} já em andamento (PID {ativa['pid']}), aguardando...")
+            finalizada = self._aguardar(ativa["token"], limite)
+            if finalizada is None:
+                return {
+                    "status": "error",
+                    "message": "Tempo esgotado aguardando sincronização em andamento",
+                    "registros": 0
+                }
+
+            compativel = ativa["operacao"] == operacao and (ativa.get("forcada") or not forcar)
+            if compativel and finalizada["status"] == "concluido":
+                resultado = json.loads(finalizada["resultado"] or "{}")
+                resultado["compartilhado"] = True
+                return resultado
+
+    def _executar_com_heartbeat(self, token: str, funcao: Callable[[], Dict]) -> Dict:
+        """Executa a função mantendo o heartbeat e grava o resultado."""
+        parar = threading.Event()
+        batimento = threading.Thread(target=self._heartbeat, args=(token, parar), daemon=True)
+        batimento.start()
+
+        try:
+            resultado = funcao()
+        except Exception as e:
+            self.db.finalizar_execucao_sync(
+                token, "erro", json.dumps({"status": "error", "message": str(e), "registros": 0})
+            )
+            raise
+        finally:
+            parar.set()
+            batimento.join()
+
+        self.db.finalizar_execucao_sync(token, "concluido", json.dumps(resultado, default=str))
+        return resultado
+
+    def _heartbeat(self, token: str, parar: threading.Event):
+        """Atualiza o heartbeat até a execução terminar."""
+        while not parar.wait(HEARTBEAT_SEGUNDOS):
+            try:
+                self.db.atualizar_heartbeat_sync(token)
+            except Exception as e:
+                print(f"   ⚠️ Erro ao atualizar heartbeat da sincronização: {e}")
+
+    # ==================== ESPERA / RECUPERAÇÃO ====================
+
+    def _aguardar(self, token: str, limite: float) -> Optional[Dict]:
+        """Aguarda a execução terminar; retorna None se o tempo esgotar."""
+        while time.monotonic() < limite:
+            execucao = self.db.buscar_execucao_sync(token)
+            if not execucao or execucao["status"] != "executando":
+                return execucao or {"status": "abandonado", "resultado": None}
+            if self._esta_travada(execucao):
+                self.db.abandonar_execucao_sync(token)
+                return {"status": "abandonado", "resultado": None}
+            time.sleep(INTERVALO_ESPERA_SEGUNDOS)
+        return None
+
+    def _esta_travada(self, execucao: Dict) -> bool:
+        """Execução sem heartbeat recente ou cujo processo local morreu."""
+        if execucao.get("host") == self.host and execucao.get("pid"):
+            if not _processo_vivo(execucao["pid"]):
+                return True
+
+        try:
+            heartbeat = datetime.strptime(execucao["heartbeat_em"], '%Y-%m-%d %H:%M:%S')
+        except (TypeError, ValueError):
+            return True
+
+        return (datetime.now() - heartbeat).total_seconds() > EXECUCAO_TRAVADA_SEGUNDOS
@@ -5,10 +5,11 @@ Fornece interface unificada para todas as operações de banco.
 Pronto para migração futura para SQLAlchemy/FastAPI.
 """
 
+import json
 import sqlite3
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
 
 # Import opcional do pandas
 try:
@@ -21,6 +22,15 @@ import sys
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from config.settings import settings
+from core.models import EstatisticasPeriodo
+from utils.calendario import Calendario
+from utils.formatadores import normalizar_nome
+
+# Sinal emitido quando os feriados locais mudam (invalida os calendários em cache)
+SINAL_FERIADOS = "feriados"
+
+# Calendário de dias úteis por banco: (versão do sinal de feriados, calendário)
+_calendarios: Dict[str, Tuple[int, Calendario]] = {}
 
 
 class Database:
@@ -46,28 +56,115 @@ class Database:
             CREATE TABLE IF NOT EXISTS funcionarios (
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
                 nome TEXT NOT NULL,
-                unidade TEXT,
+                unidade_id INTEGER REFERENCES unidades(id),
                 motivo TEXT,
                 data_saida DATE,
                 data_retorno DATE,
-                gestor TEXT,
-                aba_origem TEXT,
+                gestor_id INTEGER REFERENCES gestores(id),
+                aba_id INTEGER REFERENCES abas(id),
                 mes INTEGER,
                 ano INTEGER,
                 created_at DATETIME DEFAULT CURRENT_TIMESTAMP
             )
         """)
         
-        # Tabela de acessos
+        # Dimensão de pessoas: identidade estável pelo nome normalizado
         cursor.execute("""
-            CREATE TABLE IF NOT EXISTS acessos (
+            CREATE TABLE IF NOT EXISTS pessoas (
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
-                funcionario_id INTEGER,
-                sistema TEXT,
-                status TEXT,
-                FOREIGN KEY (funcionario_id) REFERENCES funcionarios(id)
+                chave TEXT NOT NULL,
+                nome TEXT NOT NULL,
+                created_at DATETIME DEFAULT CURRENT_TIMESTAMP
+            )
+        """)
+        cursor.execute("CREATE UNIQUE INDEX IF NOT EXISTS idx_pessoas_chave ON pessoas(chave)")
+        
+        # Dimensões de unidade e gestor (ids estáveis entre sincronizações)
+        for tabela in ("unidades", "gestores"):
+            cursor.execute(f"""
+                CREATE TABLE IF NOT EXISTS {tabela} (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    nome TEXT NOT NULL UNIQUE
+                )
+            """)
+        
+        # Migração: vincula funcionarios à pessoa
+        try:
+            cursor.execute("ALTER TABLE funcionarios ADD COLUMN pessoa_id INTEGER REFERENCES pessoas(id)")
+        except sqlite3.OperationalError:
+            pass  # Coluna já existe, ignora
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_func_pessoa ON funcionarios(pessoa_id, data_saida)")
+        self._vincular_pessoas(cursor)
+        
+        # Acessos: uma linha por funcionário com o status de cada sistema
+        # empacotado em `codigos` (BITS_STATUS bits por sistema, na posição id - 1)
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS sistemas_acesso (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                nome TEXT NOT NULL UNIQUE
+            )
+        """)
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS status_acesso (
+                codigo INTEGER PRIMARY KEY,
+                nome TEXT NOT NULL UNIQUE
             )
         """)
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS acessos_matriz (
+                funcionario_id INTEGER PRIMARY KEY REFERENCES funcionarios(id),
+                codigos INTEGER NOT NULL
+            )
+        """)
+        cursor.executemany(
+            "INSERT OR IGNORE INTO status_acesso (codigo, nome) VALUES (?, ?)",
+            enumerate(self.STATUS_ACESSO, start=1)
+        )
+        for sistema in settings.SISTEMAS_ACESSO:
+            cursor.execute("INSERT OR IGNORE INTO sistemas_acesso (nome) VALUES (?)", (sistema,))
+        self._migrar_acessos(cursor)
+        
+        # Histórico de mudanças de status de acesso (códigos da matriz)
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS acessos_historico (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                funcionario_id INTEGER NOT NULL,
+                pessoa_id INTEGER REFERENCES pessoas(id),
+                nome TEXT,
+                data_saida DATE,
+                sistema_id INTEGER NOT NULL REFERENCES sistemas_acesso(id),
+                de INTEGER REFERENCES status_acesso(codigo),
+                para INTEGER REFERENCES status_acesso(codigo),
+                sync_id INTEGER REFERENCES sync_logs(id),
+                registrado_em DATETIME
+            )
+        """)
+        # Migração: o histórico guarda a identificação do registro, que pode ser removido
+        cursor.execute("PRAGMA table_info(acessos_historico)")
+        colunas_historico = {row[1] for row in cursor.fetchall()}
+        if "pessoa_id" not in colunas_historico:
+            cursor.execute("ALTER TABLE acessos_historico ADD COLUMN pessoa_id INTEGER REFERENCES pessoas(id)")
+            cursor.execute("ALTER TABLE acessos_historico ADD COLUMN nome TEXT")
+            cursor.execute("ALTER TABLE acessos_historico ADD COLUMN data_saida DATE")
+            cursor.execute("""
+                UPDATE acessos_historico SET
+                    pessoa_id = (SELECT f.pessoa_id FROM funcionarios f WHERE f.id = acessos_historico.funcionario_id),
+                    nome = (SELECT f.nome FROM funcionarios f WHERE f.id = acessos_historico.funcionario_id),
+                    data_saida = (SELECT f.data_saida FROM funcionarios f WHERE f.id = acessos_historico.funcionario_id)
+            """)
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_acessos_hist_func ON acessos_historico(funcionario_id, sistema_id)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_acessos_hist_pessoa ON acessos_historico(pessoa_id, sistema_id)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_acessos_hist_sync ON acessos_historico(sync_id)")
+        
+        # Visão no formato antigo (funcionario_id, sistema, status)
+        cursor.execute(f"""
+            CREATE VIEW IF NOT EXISTS acessos AS
+            SELECT m.funcionario_id, s.nome AS sistema, st.nome AS status
+            FROM acessos_matriz m
+            JOIN sistemas_acesso s
+            JOIN status_acesso st
+                ON st.codigo = (m.codigos >> ({self.BITS_STATUS} * (s.id - 1))) & {self.MASCARA_STATUS}
+        """)
         
         # Tabela de abas
         cursor.execute("""
@@ -80,6 +177,61 @@ class Database:
             )
         """)
         
+        # Migração: abas passa a ser a dimensão de aba de origem (nome único)
+        cursor.execute("DELETE FROM abas WHERE id NOT IN (SELECT MIN(id) FROM abas GROUP BY nome)")
+        cursor.execute("CREATE UNIQUE INDEX IF NOT EXISTS idx_abas_nome ON abas(nome)")
+        self._migrar_dimensoes(cursor)
+        
+        # Visão com os nomes das dimensões (formato das linhas de funcionarios)
+        cursor.execute("""
+            CREATE VIEW IF NOT EXISTS vw_funcionarios AS
+            SELECT f.id, f.nome, COALESCE(u.nome, '') AS unidade, f.motivo,
+                   f.data_saida, f.data_retorno, COALESCE(g.nome, '') AS gestor,
+                   COALESCE(a.nome, '') AS aba_origem, f.mes, f.ano, f.created_at,
+                   f.pessoa_id, f.unidade_id, f.gestor_id, f.aba_id
+            FROM funcionarios f
+            LEFT JOIN unidades u ON u.id = f.unidade_id
+            LEFT JOIN gestores g ON g.id = f.gestor_id
+            LEFT JOIN abas a ON a.id = f.aba_id
+        """)
+        
+        # Resumo por pessoa (mantido incrementalmente por salvar_funcionarios).
+        # Última/próxima saída dependem do dia da consulta: calculadas na leitura
+        # (bancos antigos mantêm essas colunas, sem uso)
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS resumo_funcionario (
+                pessoa_id INTEGER PRIMARY KEY REFERENCES pessoas(id),
+                periodos INTEGER NOT NULL,
+                total_dias INTEGER NOT NULL,
+                primeira_saida DATE,
+                atualizado_em DATETIME
+            )
+        """)
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_resumo_periodos ON resumo_funcionario(periodos DESC, pessoa_id)")
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS resumo_funcionario_ano (
+                pessoa_id INTEGER NOT NULL REFERENCES pessoas(id),
+                ano INTEGER NOT NULL,
+                periodos INTEGER NOT NULL,
+                total_dias INTEGER NOT NULL,
+                PRIMARY KEY (pessoa_id, ano)
+            )
+        """)
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_resumo_ano_periodos ON resumo_funcionario_ano(ano, periodos DESC)")
+        cursor.execute("SELECT EXISTS (SELECT 1 FROM resumo_funcionario), EXISTS (SELECT 1 FROM funcionarios)")
+        resumo_existe, ha_funcionarios = cursor.fetchone()
+        if ha_funcionarios and not resumo_existe:
+            self._atualizar_resumo(cursor)
+        
+        # Versão dos dados de funcionários/acessos (invalida caches em memória)
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS versao_dados (
+                id INTEGER PRIMARY KEY CHECK (id = 1),
+                versao INTEGER NOT NULL
+            )
+        """)
+        cursor.execute("INSERT OR IGNORE INTO versao_dados (id, versao) VALUES (1, 0)")
+        
         # Tabela de logs de sincronização
         cursor.execute("""
             CREATE TABLE IF NOT EXISTS sync_logs (
@@ -99,6 +251,175 @@ class Database:
         except sqlite3.OperationalError:
             pass  # Coluna já existe, ignora
         
+        # Tabela de métricas por etapa da sincronização
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS sync_etapas (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                sync_id INTEGER NOT NULL,
+                etapa TEXT NOT NULL,
+                ordem INTEGER,
+                duracao_ms REAL,
+                linhas_entrada INTEGER,
+                linhas_saida INTEGER,
+                memoria_aumento_kb INTEGER,
+                FOREIGN KEY (sync_id) REFERENCES sync_logs(id)
+            )
+        """)
+        # Bancos antigos guardavam o pico do processo (igual em todas as etapas, sem uso)
+        cursor.execute("PRAGMA table_info(sync_etapas)")
+        if "memoria_aumento_kb" not in {row[1] for row in cursor.fetchall()}:
+            cursor.execute("ALTER TABLE sync_etapas ADD COLUMN memoria_aumento_kb INTEGER")
+        
+        # Tabela de problemas de qualidade encontrados na sincronização
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS sync_issues (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                sync_id INTEGER NOT NULL,
+                tipo TEXT NOT NULL,
+                severidade TEXT NOT NULL,
+                nome TEXT,
+                aba TEXT,
+                linha INTEGER,
+                detalhe TEXT,
+                FOREIGN KEY (sync_id) REFERENCES sync_logs(id)
+            )
+        """)
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_sync_issues_sync ON sync_issues(sync_id)")
+        
+        # Outbox de eventos de mudança gerados por cada sincronização (CDC)
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS eventos_sync (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                sync_id INTEGER NOT NULL,
+                tipo TEXT NOT NULL,
+                nome TEXT NOT NULL,
+                data_saida DATE,
+                campo TEXT,
+                valor_anterior TEXT,
+                valor_novo TEXT,
+                criado_em DATETIME,
+                FOREIGN KEY (sync_id) REFERENCES sync_logs(id)
+            )
+        """)
+        
+        # Posição de leitura de cada consumidor do outbox
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS eventos_cursores (
+                consumidor TEXT PRIMARY KEY,
+                ultimo_id INTEGER NOT NULL,
+                atualizado_em DATETIME
+            )
+        """)
+        
+        # Tabela de execuções de sincronização (single-flight entre processos)
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS sync_execucoes (
+                token TEXT PRIMARY KEY,
+                operacao TEXT NOT NULL,
+                forcada INTEGER NOT NULL DEFAULT 0,
+                status TEXT NOT NULL,
+                pid INTEGER,
+                host TEXT,
+                iniciado_em DATETIME,
+                heartbeat_em DATETIME,
+                finalizado_em DATETIME,
+                resultado TEXT
+            )
+        """)
+        cursor.execute("PRAGMA table_info(sync_execucoes)")
+        if "forcada" not in {row[1] for row in cursor.fetchall()}:
+            cursor.execute("ALTER TABLE sync_execucoes ADD COLUMN forcada INTEGER NOT NULL DEFAULT 0")
+        # Garante no máximo uma execução em andamento
+        cursor.execute("""
+            CREATE UNIQUE INDEX IF NOT EXISTS idx_sync_execucoes_ativa
+            ON sync_execucoes(status) WHERE status = 'executando'
+        """)
+        
+        # Registro de jobs agendados (complementa/sobrescreve os padrões do .env)
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS jobs_agendados (
+                id TEXT PRIMARY KEY,
+                tipo TEXT NOT NULL,
+                nome TEXT,
+                cron TEXT NOT NULL,
+                parametros TEXT,
+                habilitado INTEGER NOT NULL DEFAULT 1,
+                timeout_segundos INTEGER,
+                processo INTEGER,
+                max_instancias INTEGER NOT NULL DEFAULT 1,
+                notificar TEXT,
+                atualizado_em DATETIME
+            )
+        """)
+        
+        # Heartbeat do scheduler (linha única, atualizada a cada poucos segundos)
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS scheduler_heartbeat (
+                id INTEGER PRIMARY KEY CHECK (id = 1),
+                status TEXT NOT NULL,
+                atualizado_em DATETIME NOT NULL,
+                iniciado_em DATETIME,
+                pid INTEGER,
+                host TEXT,
+                em_execucao INTEGER,
+                fila INTEGER,
+                proximos TEXT,
+                ultimo_job TEXT
+            )
+        """)
+        
+        # Feriados locais (os nacionais são calculados em utils.calendario)
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS feriados (
+                data DATE PRIMARY KEY,
+                nome TEXT NOT NULL,
+                recorrente INTEGER NOT NULL DEFAULT 0
+            )
+        """)
+        
+        # Ledger de execuções dos jobs agendados (uma linha por job e horário)
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS job_runs (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                job_id TEXT NOT NULL,
+                agendado_para DATETIME NOT NULL,
+                token TEXT NOT NULL,
+                status TEXT NOT NULL,
+                tentativas INTEGER NOT NULL DEFAULT 1,
+                pid INTEGER,
+                host TEXT,
+                iniciado_em DATETIME,
+                finalizado_em DATETIME,
+                duracao_segundos REAL,
+                erro TEXT,
+                UNIQUE (job_id, agendado_para)
+            )
+        """)
+        
+        # Métricas de cada disparo dos jobs (listener do APScheduler)
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS job_metricas (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                job_id TEXT NOT NULL,
+                resultado TEXT NOT NULL,
+                agendado_para DATETIME NOT NULL,
+                iniciado_em DATETIME,
+                atraso_segundos REAL,
+                duracao_segundos REAL,
+                erro TEXT
+            )
+        """)
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_job_metricas_agendado ON job_metricas(agendado_para)")
+        
+        # Sinais entre processos (ex: reload do scheduler): versão incrementada a cada emissão
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS sinais (
+                nome TEXT PRIMARY KEY,
+                versao INTEGER NOT NULL,
+                emitido_em DATETIME
+            )
+        """)
+        
         # Tabela de logs de atividades gerais
         cursor.execute("""
             CREATE TABLE IF NOT EXISTS activity_logs (
@@ -150,8 +471,10 @@ class Database:
         # Índices para performance
         cursor.execute("CREATE INDEX IF NOT EXISTS idx_func_data_saida ON funcionarios(data_saida)")
         cursor.execute("CREATE INDEX IF NOT EXISTS idx_func_data_retorno ON funcionarios(data_retorno)")
-        cursor.execute("CREATE INDEX IF NOT EXISTS idx_func_aba ON funcionarios(aba_origem)")
-        cursor.execute("CREATE INDEX IF NOT EXISTS idx_acessos_func ON acessos(funcionario_id)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_func_aba ON funcionarios(aba_id)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_func_unidade ON funcionarios(unidade_id)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_func_gestor ON funcionarios(gestor_id)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_sync_etapas_sync ON sync_etapas(sync_id)")
         cursor.execute("CREATE INDEX IF NOT EXISTS idx_kanbanize_card_id ON kanbanize_cards(card_id)")
         cursor.execute("CREATE INDEX IF NOT EXISTS idx_kanbanize_workflow ON kanbanize_cards(workflow_id)")
         cursor.execute("CREATE INDEX IF NOT EXISTS idx_kanbanize_column ON kanbanize_cards(column_id)")
@@ -170,129 +493,1474 @@ class Database:
         conn.commit()
         conn.close()
     
-    # ==================== OPERAÇÕES DE ESCRITA ====================
-    
-    def limpar_dados(self):
-        """Limpa todas as tabelas (exceto logs)."""
+    # ==================== PESSOAS ====================
+    
+    def _obter_pessoa_id(self, cursor: sqlite3.Cursor, nome: str, cache: Dict[str, int] = None) -> Optional[int]:
+        """
+        Retorna o id da pessoa para o nome, criando-a se necessário.
+        
+        Variações de acento, caixa e espaços resolvem para a mesma pessoa;
+        o nome exibido é o da primeira ocorrência.
+        """
+        chave = normalizar_nome(nome)
+        if not chave:
+            return None
+        if cache is not None and chave in cache:
+            return cache[chave]
+        
+        cursor.execute("INSERT OR IGNORE INTO pessoas (chave, nome) VALUES (?, ?)", (chave, " ".join(nome.split())))
+        cursor.execute("SELECT id FROM pessoas WHERE chave = ?", (chave,))
+        pessoa_id = cursor.fetchone()[0]
+        
+        if cache is not None:
+            cache[chave] = pessoa_id
+        return pessoa_id
+    
+    def _vincular_pessoas(self, cursor: sqlite3.Cursor):
+        """Preenche pessoa_id dos registros antigos que ainda não têm vínculo."""
+        cursor.execute("SELECT DISTINCT nome FROM funcionarios WHERE pessoa_id IS NULL AND nome IS NOT NULL")
+        cache: Dict[str, int] = {}
+        for (nome,) in cursor.fetchall():
+            pessoa_id = self._obter_pessoa_id(cursor, nome, cache)
+            if pessoa_id:
+                cursor.execute(
+                    "UPDATE funcionarios SET pessoa_id = ? WHERE nome = ? AND pessoa_id IS NULL",
+                    (pessoa_id, nome)
+                )
+    
+    def buscar_pessoas(self, busca: str = None) -> List[Dict]:
+        """
+        Lista as pessoas com registros de férias.
+        
+        Args:
+            busca: Trecho do nome (ignora acentos, caixa e espaços extras)
+            
+        Returns:
+            Lista com id, nome e total de períodos, ordenada por nome
+        """
+        conn = self._get_connection()
+        cursor = conn.cursor()
+        
+        query = """
+            SELECT p.id, p.nome, COUNT(*) as total
+            FROM pessoas p
+            JOIN funcionarios f ON f.pessoa_id = p.id
+        """
+        params = []
+        if busca:
+            query += " WHERE p.chave LIKE ?"
+            params.append(f"%{normalizar_nome(busca)}%")
+        query += " GROUP BY p.id ORDER BY p.chave"
+        
+        cursor.execute(query, params)
+        rows = cursor.fetchall()
+        conn.close()
+        
+        return [self._row_to_dict(row) for row in rows]
+    
+    def buscar_pessoa_por_nome(self, nome: str) -> Optional[Dict]:
+        """Busca a pessoa pelo nome normalizado."""
+        conn = self._get_connection()
+        cursor = conn.cursor()
+        
+        cursor.execute("SELECT id, nome, chave FROM pessoas WHERE chave = ?", (normalizar_nome(nome),))
+        row = cursor.fetchone()
+        conn.close()
+        
+        return self._row_to_dict(row) if row else None
+    
+    # ==================== DIMENSÕES ====================
+    
+    # Coluna texto antiga -> (coluna de id, tabela de dimensão)
+    DIMENSOES = {
+        "unidade": ("unidade_id", "unidades"),
+        "gestor": ("gestor_id", "gestores"),
+        "aba_origem": ("aba_id", "abas"),
+    }
+    
+    def _obter_dimensao_id(self, cursor: sqlite3.Cursor, tabela: str, nome: str,
+                           cache: Dict[str, int] = None) -> Optional[int]:
+        """Retorna o id do nome na tabela de dimensão, criando-o se necessário."""
+        nome = (nome or "").strip()
+        if not nome:
+            return None
+        if cache is not None and nome in cache:
+            return cache[nome]
+        
+        cursor.execute(f"INSERT OR IGNORE INTO {tabela} (nome) VALUES (?)", (nome,))
+        cursor.execute(f"SELECT id FROM {tabela} WHERE nome = ?", (nome,))
+        dimensao_id = cursor.fetchone()[0]
+        
+        if cache is not None:
+            cache[nome] = dimensao_id
+        return dimensao_id
+    
+    def _migrar_dimensoes(self, cursor: sqlite3.Cursor):
+        """Converte as colunas texto antigas de funcionarios em chaves das dimensões."""
+        cursor.execute("PRAGMA table_info(funcionarios)")
+        colunas = {row[1] for row in cursor.fetchall()}
+        if "unidade" not in colunas:
+            return
+        
+        for coluna, (coluna_id, tabela) in self.DIMENSOES.items():
+            if coluna_id not in colunas:
+                cursor.execute(f"ALTER TABLE funcionarios ADD COLUMN {coluna_id} INTEGER REFERENCES {tabela}(id)")
+            cursor.execute(f"SELECT DISTINCT {coluna} FROM funcionarios WHERE {coluna_id} IS NULL")
+            for (nome,) in cursor.fetchall():
+                dimensao_id = self._obter_dimensao_id(cursor, tabela, nome)
+                if dimensao_id:
+                    cursor.execute(
+                        f"UPDATE funcionarios SET {coluna_id} = ? WHERE {coluna} = ? AND {coluna_id} IS NULL",
+                        (dimensao_id, nome)
+                    )
+        
+        cursor.execute("DROP INDEX IF EXISTS idx_func_aba")
+        try:
+            for coluna in self.DIMENSOES:
+                cursor.execute(f"ALTER TABLE funcionarios DROP COLUMN {coluna}")
+        except sqlite3.OperationalError:
+            pass  # SQLite < 3.35: colunas antigas ficam sem uso
+    
+    def buscar_unidades(self) -> List[str]:
+        """Lista as unidades com registros de férias (para filtros)."""
+        return self._listar_dimensao("unidades", "unidade_id")
+    
+    def buscar_gestores(self) -> List[str]:
+        """Lista os gestores com registros de férias (para filtros)."""
+        return self._listar_dimensao("gestores", "gestor_id")
+    
+    def _listar_dimensao(self, tabela: str, coluna_id: str) -> List[str]:
+        conn = self._get_connection()
+        cursor = conn.cursor()
+        
+        cursor.execute(f"""
+            SELECT d.nome FROM {tabela} d
+            WHERE EXISTS (SELECT 1 FROM funcionarios f WHERE f.{coluna_id} = d.id)
+            ORDER BY d.nome
+        """)
+        nomes = [row["nome"] for row in cursor.fetchall()]
+        conn.close()
+        
+        return nomes
+    
+    # ==================== RESUMO POR PESSOA ====================
+    
+    def _atualizar_resumo(self, cursor: sqlite3.Cursor, pessoa_ids: List[int] = None):
+        """
+        Recalcula o resumo das pessoas informadas (todas se None) a partir
+        dos seus períodos em `funcionarios`.
+        """
+        if pessoa_ids is not None and not pessoa_ids:
+            return
+        
+        filtro = "1=1"
+        params: List[Any] = []
+        if pessoa_ids is not None:
+            filtro = "pessoa_id IN (SELECT value FROM json_each(?))"
+            params = [json.dumps(sorted(set(pessoa_ids)))]
+        
+        dias = """
+            CASE WHEN data_saida IS NOT NULL AND data_retorno IS NOT NULL
+                 THEN CAST(julianday(data_retorno) - julianday(data_saida) AS INTEGER) + 1
+                 ELSE 0 END
+        """
+        
+        cursor.execute(f"DELETE FROM resumo_funcionario WHERE {filtro}", params)
+        cursor.execute(f"DELETE FROM resumo_funcionario_ano WHERE {filtro}", params)
+        cursor.execute(f"""
+            INSERT INTO resumo_funcionario
+            (pessoa_id, periodos, total_dias, primeira_saida, atualizado_em)
+            SELECT pessoa_id, COUNT(*), SUM({dias}), MIN(data_saida), ?
+            FROM funcionarios
+            WHERE pessoa_id IS NOT NULL AND {filtro}
+            GROUP BY pessoa_id
+        """, [datetime.now().isoformat()] + params)
+        cursor.execute(f"""
+            INSERT INTO resumo_funcionario_ano (pessoa_id, ano, periodos, total_dias)
+            SELECT pessoa_id, ano, COUNT(*), SUM({dias})
+            FROM funcionarios
+            WHERE pessoa_id IS NOT NULL AND ano > 0 AND {filtro}
+            GROUP BY pessoa_id, ano
+        """, params)
+    
+    def buscar_resumo_pessoa(self, pessoa_id: int, hoje: date = None) -> Optional[Dict]:
+        """
+        Busca o resumo pré-calculado de uma pessoa. Última e próxima saída
+        são relativas a `hoje` (padrão: data atual) e lidas de `funcionarios`
+        pelo índice (pessoa_id, data_saida).
+        
+        Returns:
+            Dicionário com periodos, total_dias, primeira/ultima/proxima_saida
+            e `por_ano` ({ano: {"periodos", "total_dias"}}), ou None
+        """
+        conn = self._get_connection()
+        cursor = conn.cursor()
+        
+        cursor.execute("""
+            SELECT r.*, p.nome FROM resumo_funcionario r
+            JOIN pessoas p ON p.id = r.pessoa_id
+            WHERE r.pessoa_id = ?
+        """, (pessoa_id,))
+        row = cursor.fetchone()
+        if not row:
+            conn.close()
+            return None
+        
+        resumo = self._row_to_dict(row)
+        hoje = (hoje or date.today()).strftime('%Y-%m-%d')
+        cursor.execute("""
+            SELECT (SELECT MAX(data_saida) FROM funcionarios WHERE pessoa_id = ? AND data_saida <= ?),
+                   (SELECT MIN(data_saida) FROM funcionarios WHERE pessoa_id = ? AND data_saida > ?)
+        """, (pessoa_id, hoje, pessoa_id, hoje))
+        resumo["ultima_saida"], resumo["proxima_saida"] = cursor.fetchone()
+        cursor.execute(
+            "SELECT ano, periodos, total_dias FROM resumo_funcionario_ano WHERE pessoa_id = ? ORDER BY ano DESC",
+            (pessoa_id,)
+        )
+        resumo["por_ano"] = {
+            r["ano"]: {"periodos": r["periodos"], "total_dias": r["total_dias"]} for r in cursor.fetchall()
+        }
+        conn.close()
+        
+        return resumo
+    
+    # ==================== MATRIZ DE ACESSOS ====================
+    
+    # Status fixos (código = posição + 1; 0 indica sistema sem status)
+    STATUS_ACESSO = ("NB", "BLOQUEADO", "LIBERADO", "NP", "PENDENTE")
+    BITS_STATUS = 3
+    MASCARA_STATUS = (1 << BITS_STATUS) - 1
+    MAX_SISTEMAS = 63 // BITS_STATUS
+    
+    def _mapas_acesso(self, cursor: sqlite3.Cursor) -> Tuple[Dict[str, int], Dict[str, int]]:
+        """Retorna (sistema -> id, status -> código) para empacotar acessos."""
+        cursor.execute("SELECT id, nome FROM sistemas_acesso")
+        sistemas = {row[1]: row[0] for row in cursor.fetchall()}
+        cursor.execute("SELECT codigo, nome FROM status_acesso")
+        status = {row[1]: row[0] for row in cursor.fetchall()}
+        return sistemas, status
+    
+    def _obter_codigo(self, cursor: sqlite3.Cursor, tabela: str, coluna: str, nome: str,
+                      mapa: Dict[str, int], limite: int) -> int:
+        """Resolve sistema/status desconhecido criando o próximo código livre."""
+        if nome not in mapa:
+            codigo = max(mapa.values(), default=0) + 1
+            if codigo > limite:
+                raise ValueError(f"Limite de {limite} valores em {tabela} atingido ao incluir '{nome}'")
+            cursor.execute(f"INSERT INTO {tabela} ({coluna}, nome) VALUES (?, ?)", (codigo, nome))
+            mapa[nome] = codigo
+        return mapa[nome]
+    
+    def _empacotar_acessos(self, cursor: sqlite3.Cursor, acessos: Dict[str, str],
+                           mapas: Tuple[Dict[str, int], Dict[str, int]]) -> int:
+        """Converte {sistema: status} no inteiro da matriz."""
+        sistemas, status = mapas
+        codigos = 0
+        for sistema, valor in acessos.items():
+            sistema_id = self._obter_codigo(cursor, "sistemas_acesso", "id", sistema, sistemas, self.MAX_SISTEMAS)
+            codigo = self._obter_codigo(cursor, "status_acesso", "codigo", valor, status, self.MASCARA_STATUS)
+            codigos |= codigo << (self.BITS_STATUS * (sistema_id - 1))
+        return codigos
+    
+    def _desempacotar_acessos(self, codigos: Optional[int],
+                              mapas: Tuple[Dict[str, int], Dict[str, int]]) -> Dict[str, str]:
+        """Converte o inteiro da matriz em {sistema: status}."""
+        if not codigos:
+            return {}
+        sistemas, status = mapas
+        nomes_status = {codigo: nome for nome, codigo in status.items()}
+        acessos = {}
+        for sistema, sistema_id in sistemas.items():
+            codigo = (codigos >> (self.BITS_STATUS * (sistema_id - 1))) & self.MASCARA_STATUS
+            if codigo:
+                acessos[sistema] = nomes_status[codigo]
+        return acessos
+    
+    def _migrar_acessos(self, cursor: sqlite3.Cursor):
+        """Converte a tabela antiga `acessos` (uma linha por sistema) na matriz."""
+        cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'acessos'")
+        if not cursor.fetchone():
+            return
+        
+        cursor.execute("SELECT funcionario_id, sistema, status FROM acessos WHERE funcionario_id IS NOT NULL")
+        por_funcionario: Dict[int, Dict[str, str]] = {}
+        for funcionario_id, sistema, status in cursor.fetchall():
+            if sistema and status:
+                por_funcionario.setdefault(funcionario_id, {})[sistema] = status
+        
+        mapas = self._mapas_acesso(cursor)
+        for funcionario_id, acessos in por_funcionario.items():
+            cursor.execute(
+                "INSERT OR REPLACE INTO acessos_matriz (funcionario_id, codigos) VALUES (?, ?)",
+                (funcionario_id, self._empacotar_acessos(cursor, acessos, mapas))
+            )
+        cursor.execute("DROP TABLE acessos")
+    
+    def buscar_historico_acessos(self, funcionario_id: int = None, sistema: str = None,
+                                 limite: int = 500, pessoa_id: int = None) -> List[Dict]:
+        """
+        Busca as mudanças de status de acesso (mais recentes primeiro).
+        
+        Registros removidos ou remarcados (nova data de saída) continuam no
+        histórico: a remoção grava a saída de cada status e o registro novo
+        a entrada, ambos com o nome e a data de saída do próprio registro.
+        
+        Args:
+            funcionario_id: Filtra por registro de férias (opcional)
+            sistema: Filtra por sistema (opcional)
+            limite: Número máximo de mudanças
+            pessoa_id: Filtra por pessoa, em todos os seus registros (opcional)
+            
+        Returns:
+            Lista com nome, data_saida, data_retorno, sistema, de, para, sync_id e registrado_em
+            (data_retorno é None para registros já removidos)
+        """
+        conn = self._get_connection()
+        cursor = conn.cursor()
+        
+        where_clauses = []
+        params = []
+        if funcionario_id:
+            where_clauses.append("h.funcionario_id = ?")
+            params.append(funcionario_id)
+        if pessoa_id:
+            where_clauses.append("h.pessoa_id = ?")
+            params.append(pessoa_id)
+        if sistema:
+            where_clauses.append("s.nome = ?")
+            params.append(sistema)
+        where_sql = " AND ".join(where_clauses) if where_clauses else "1=1"
+        params.append(limite)
+        
+        cursor.execute(f"""
+            SELECT h.funcionario_id, h.pessoa_id, COALESCE(h.nome, f.nome) AS nome,
+                   COALESCE(h.data_saida, f.data_saida) AS data_saida, f.data_retorno, s.nome AS sistema,
+                   de.nome AS de, para.nome AS para, h.sync_id, h.registrado_em
+            FROM acessos_historico h
+            JOIN sistemas_acesso s ON s.id = h.sistema_id
+            LEFT JOIN status_acesso de ON de.codigo = h.de
+            LEFT JOIN status_acesso para ON para.codigo = h.para
+            LEFT JOIN funcionarios f ON f.id = h.funcionario_id
+            WHERE {where_sql}
+            ORDER BY h.id DESC
+            LIMIT ?
+        """, params)
+        
+        rows = cursor.fetchall()
+        conn.close()
+        
+        return [self._row_to_dict(row) for row in rows]
+    
+    # ==================== OPERAÇÕES DE ESCRITA ====================
+    
+    def _incrementar_versao_dados(self, cursor: sqlite3.Cursor):
+        """Marca que funcionarios/acessos mudaram (na mesma transação da escrita)."""
+        cursor.execute("UPDATE versao_dados SET versao = versao + 1 WHERE id = 1")
+    
+    def buscar_versao_dados(self) -> int:
+        """Retorna a versão atual dos dados de funcionários/acessos."""
+        conn = self._get_connection()
+        cursor = conn.cursor()
+        cursor.execute("SELECT versao FROM versao_dados WHERE id = 1")
+        row = cursor.fetchone()
+        conn.close()
+        return row["versao"] if row else 0
+    
+    def limpar_dados(self):
+        """Limpa todas as tabelas (exceto logs)."""
+        conn = self._get_connection()
+        cursor = conn.cursor()
+        cursor.execute("DELETE FROM acessos_matriz")
+        cursor.execute("DELETE FROM funcionarios")
+        cursor.execute("DELETE FROM abas")
+        cursor.execute("DELETE FROM resumo_funcionario")
+        cursor.execute("DELETE FROM resumo_funcionario_ano")
+        self._incrementar_versao_dados(cursor)
+        conn.commit()
+        conn.close()
+    
+    def salvar_funcionarios(self, funcionarios: Iterable[Dict], substituir: bool = False,
+                            sync_id: int = None) -> int:
+        """
+        Salva lista de funcionários no banco, atualizando se já existir.
+        Usa o nome do funcionário e a data de saída como chave única.
+        
+        Só grava o que mudou: registros idênticos não são reescritos e cada
+        status de acesso alterado gera uma linha em `acessos_historico`, na
+        mesma transação. Fora da carga inicial, registros novos e removidos
+        também entram no histórico (de/para vazio), para que uma remarcação
+        não interrompa o histórico da pessoa.
+        Com `sync_id`, as mudanças encontradas nessa mesma comparação viram
+        eventos no outbox `eventos_sync` (exceto na carga inicial).
+        Registros repetidos na lista (mesma pessoa e data de saída em duas
+        abas) são unificados antes da comparação: vale o último.
+        
+        Args:
+            funcionarios: Registros processados (lista ou iterador, consumido uma vez)
+            substituir: Se True, remove os registros que não estão na lista
+            sync_id: Sincronização (em sync_logs) que fez as mudanças
+            
+        Returns:
+            Número de registros processados
+        """
+        # eventos_sync importa Database: importado aqui para evitar o ciclo
+        from core.eventos_sync import evento_criacao, evento_remocao, eventos_alteracao
+        
+        conn = self._get_connection()
+        cursor = conn.cursor()
+        
+        registros_atualizados = 0
+        registros_inseridos = 0
+        registros_inalterados = 0
+        transicoes = 0
+        pessoas: Dict[str, int] = {}
+        caches: Dict[str, Dict[str, int]] = {tabela: {} for _, tabela in self.DIMENSOES.values()}
+        mapas = self._mapas_acesso(cursor)
+        ids_processados = set()
+        pessoas_alteradas = set()
+        
+        eventos = []
+        
+        cursor.execute("SELECT EXISTS (SELECT 1 FROM funcionarios)")
+        carga_inicial = not cursor.fetchone()[0]
+        gerar_eventos = sync_id is not None and not carga_inicial
+        
+        # Sem unificar, as duplicatas se sobrescreveriam a cada sync (mudança falsa)
+        unicos = {(f.get("nome", ""), f.get("data_saida")): f for f in funcionarios}
+        
+        for f in unicos.values():
+            nome = f.get("nome", "")
+            data_saida = f.get("data_saida")
+            pessoa_id = self._obter_pessoa_id(cursor, nome, pessoas)
+            unidade_id, gestor_id, aba_id = (
+                self._obter_dimensao_id(cursor, tabela, f.get(coluna), caches[tabela])
+                for coluna, (_, tabela) in self.DIMENSOES.items()
+            )
+            dados = (
+                unidade_id, f.get("motivo", ""), f.get("data_retorno"),
+                gestor_id, aba_id, f.get("mes", 0), f.get("ano", 0), pessoa_id
+            )
+            codigos = self._empacotar_acessos(cursor, f.get("acessos") or {}, mapas)
+            
+            # 1. Verifica se já existe um registro com o mesmo nome E data de saída
+            cursor.execute("""
+                SELECT f.id, f.unidade_id, f.motivo, f.data_retorno, f.gestor_id, f.aba_id,
+                       f.mes, f.ano, f.pessoa_id, m.codigos,
+                       COALESCE(u.nome, '') AS unidade, COALESCE(g.nome, '') AS gestor
+                FROM funcionarios f
+                LEFT JOIN acessos_matriz m ON m.funcionario_id = f.id
+                LEFT JOIN unidades u ON u.id = f.unidade_id
+                LEFT JOIN gestores g ON g.id = f.gestor_id
+                WHERE f.nome = ? AND f.data_saida = ?
+            """, (nome, data_saida))
+            existente = cursor.fetchone()
+            
+            if existente:
+                funcionario_id = existente[0]
+                alterado = False
+                
+                if tuple(existente)[1:9] != dados:
+                    pessoas_alteradas.update((existente["pessoa_id"], pessoa_id))
+                    # UPDATE - Atualiza o registro existente
+                    cursor.execute("""
+                        UPDATE funcionarios 
+                        SET unidade_id = ?, motivo = ?, data_retorno = ?, gestor_id = ?, 
+                            aba_id = ?, mes = ?, ano = ?, pessoa_id = ?
+                        WHERE id = ?
+                    """, dados + (funcionario_id,))
+                    alterado = True
+                
+                codigos_anteriores = existente["codigos"] or 0
+                if codigos != codigos_anteriores:
+                    cursor.execute(
+                        "INSERT OR REPLACE INTO acessos_matriz (funcionario_id, codigos) VALUES (?, ?)",
+                        (funcionario_id, codigos)
+                    )
+                    transicoes += self._registrar_transicoes(
+                        cursor, (funcionario_id, pessoa_id, nome, data_saida),
+                        codigos_anteriores, codigos, sync_id
+                    )
+                    alterado = True
+                
+                if alterado:
+                    registros_atualizados += 1
+                    if gerar_eventos:
+                        anterior = dict(existente, acessos=self._desempacotar_acessos(codigos_anteriores, mapas))
+                        eventos.extend(eventos_alteracao((nome, data_saida), anterior, f))
+                else:
+                    registros_inalterados += 1
+            else:
+                # INSERT - Insere um novo registro
+                cursor.execute("""
+                    INSERT INTO funcionarios 
+                    (unidade_id, motivo, data_retorno, gestor_id, aba_id, mes, ano, pessoa_id, nome, data_saida)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """, dados + (nome, data_saida))
+                funcionario_id = cursor.lastrowid
+                cursor.execute(
+                    "INSERT INTO acessos_matriz (funcionario_id, codigos) VALUES (?, ?)",
+                    (funcionario_id, codigos)
+                )
+                if not carga_inicial:
+                    transicoes += self._registrar_transicoes(
+                        cursor, (funcionario_id, pessoa_id, nome, data_saida), 0, codigos, sync_id
+                    )
+                if gerar_eventos:
+                    eventos.append(evento_criacao((nome, data_saida), f))
+                pessoas_alteradas.add(pessoa_id)
+                registros_inseridos += 1
+            
+            ids_processados.add(funcionario_id)
+        
+        removidos = 0
+        if substituir:
+            ids_json = json.dumps(sorted(ids_processados))
+            cursor.execute("""
+                SELECT f.id, f.pessoa_id, f.nome, f.data_saida, m.codigos, f.data_retorno
+                FROM funcionarios f
+                LEFT JOIN acessos_matriz m ON m.funcionario_id = f.id
+                WHERE f.id NOT IN (SELECT value FROM json_each(?))
+            """, (ids_json,))
+            for row in cursor.fetchall():
+                pessoas_alteradas.add(row["pessoa_id"])
+                transicoes += self._registrar_transicoes(
+                    cursor, tuple(row)[:4], row["codigos"] or 0, 0, sync_id
+                )
+                if gerar_eventos:
+                    eventos.append(evento_remocao((row["nome"], row["data_saida"]), row))
+            cursor.execute(
+                "DELETE FROM acessos_matriz WHERE funcionario_id NOT IN (SELECT value FROM json_each(?))",
+                (ids_json,)
+            )
+            cursor.execute("DELETE FROM funcionarios WHERE id NOT IN (SELECT value FROM json_each(?))", (ids_json,))
+            removidos = cursor.rowcount
+        
+        pessoas_alteradas.discard(None)
+        self._atualizar_resumo(cursor, list(pessoas_alteradas))
+        
+        if registros_inseridos or registros_atualizados or removidos:
+            self._incrementar_versao_dados(cursor)
+        self._inserir_eventos(cursor, sync_id, eventos)
+        
+        conn.commit()
+        conn.close()
+        
+        print(f"   -> Inseridos: {registros_inseridos}, Atualizados: {registros_atualizados}, "
+              f"Inalterados: {registros_inalterados}, Removidos: {removidos}, "
+              f"Mudanças de acesso: {transicoes}, Eventos: {len(eventos)}")
+        return registros_inseridos + registros_atualizados + registros_inalterados
+    
+    def _registrar_transicoes(self, cursor: sqlite3.Cursor, registro: Tuple[int, int, str, str],
+                              anteriores: int, novos: int, sync_id: int = None) -> int:
+        """
+        Grava no histórico cada sistema cujo status mudou entre os dois valores empacotados.
+        
+        Args:
+            registro: (funcionario_id, pessoa_id, nome, data_saida) do registro
+            anteriores: Códigos empacotados antes (0 para registro novo)
+            novos: Códigos empacotados depois (0 para registro removido)
+            sync_id: Sincronização que fez a mudança
+        """
+        transicoes = []
+        diferenca = anteriores ^ novos
+        sistema_id = 1
+        while diferenca >> (self.BITS_STATUS * (sistema_id - 1)):
+            deslocamento = self.BITS_STATUS * (sistema_id - 1)
+            if (diferenca >> deslocamento) & self.MASCARA_STATUS:
+                transicoes.append(registro + (
+                    sistema_id,
+                    (anteriores >> deslocamento) & self.MASCARA_STATUS or None,
+                    (novos >> deslocamento) & self.MASCARA_STATUS or None,
+                    sync_id, datetime.now().isoformat()
+                ))
+            sistema_id += 1
+        
+        cursor.executemany("""
+            INSERT INTO acessos_historico
+            (funcionario_id, pessoa_id, nome, data_saida, sistema_id, de, para, sync_id, registrado_em)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """, transicoes)
+        return len(transicoes)
+    
+    def salvar_abas(self, abas: List[Dict], substituir: bool = False):
+        """
+        Salva lista de abas no banco (a aba pode já existir como dimensão).
+        
+        Args:
+            abas: Abas processadas
+            substituir: Se True, remove as abas fora da lista que não têm registros
+        """
+        conn = self._get_connection()
+        cursor = conn.cursor()
+        
+        if substituir:
+            cursor.execute("""
+                DELETE FROM abas
+                WHERE nome NOT IN (SELECT value FROM json_each(?))
+                AND NOT EXISTS (SELECT 1 FROM funcionarios f WHERE f.aba_id = abas.id)
+            """, (json.dumps([a.get("nome", "") for a in abas]),))
+        
+        for a in abas:
+            cursor.execute("""
+                INSERT INTO abas (nome, mes, ano, total_funcionarios)
+                VALUES (?, ?, ?, ?)
+                ON CONFLICT(nome) DO UPDATE SET
+                    mes = excluded.mes, ano = excluded.ano,
+                    total_funcionarios = excluded.total_funcionarios
+            """, (
+                a.get("nome", ""),
+                a.get("mes", 0),
+                a.get("ano", 0),
+                a.get("total_funcionarios", 0)
+            ))
+        
+        conn.commit()
+        conn.close()
+    
+    def iniciar_sync(self, arquivo_hash: str = "") -> int:
+        """
+        Cria o log de uma sincronização em andamento (status RUNNING) antes
+        da gravação, para que as mudanças sejam gravadas já com o sync_id.
+        Concluído com `registrar_sync(..., sync_id=...)`.
+        """
+        conn = self._get_connection()
+        cursor = conn.cursor()
+        cursor.execute("""
+            INSERT INTO sync_logs (sync_at, total_registros, total_abas, status, mensagem, arquivo_hash)
+            VALUES (?, 0, 0, 'RUNNING', 'Sincronização em andamento', ?)
+        """, (datetime.now().strftime('%Y-%m-%d %H:%M:%S'), arquivo_hash))
+        sync_id = cursor.lastrowid
+        conn.commit()
+        conn.close()
+        return sync_id
+    
+    def registrar_sync(self, total_registros: int, total_abas: int, 
+                       status: str, mensagem: str, arquivo_hash: str = "",
+                       sync_id: int = None) -> int:
+        """
+        Registra log de sincronização e retorna o ID criado.
+        
+        Com `sync_id` (criado por `iniciar_sync`), conclui esse log em vez de criar outro.
+        """
+        conn = self._get_connection()
+        cursor = conn.cursor()
+        
+        # Define explicitamente o sync_at com o timestamp atual
+        sync_at = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        
+        if sync_id is None:
+            cursor.execute("""
+                INSERT INTO sync_logs (sync_at, total_registros, total_abas, status, mensagem, arquivo_hash)
+                VALUES (?, ?, ?, ?, ?, ?)
+            """, (sync_at, total_registros, total_abas, status, mensagem, arquivo_hash))
+            sync_id = cursor.lastrowid
+        else:
+            cursor.execute("""
+                UPDATE sync_logs
+                SET sync_at = ?, total_registros = ?, total_abas = ?, status = ?, mensagem = ?, arquivo_hash = ?
+                WHERE id = ?
+            """, (sync_at, total_registros, total_abas, status, mensagem, arquivo_hash, sync_id))
+        
+        conn.commit()
+        conn.close()
+        
+        # Também registra no log de atividades
+        self.registrar_log(
+            tipo="sync",
+            categoria="Sincronização",
+            status=status,
+            mensagem=mensagem,
+            detalhes=f"Registros: {total_registros}, Abas: {total_abas}",
+            origem="sync_manager"
+        )
+        
+        return sync_id
+    
+    def registrar_etapas_sync(self, sync_id: int, etapas: List[Dict]):
+        """
+        Registra as métricas de cada etapa de uma sincronização.
+        
+        Args:
+            sync_id: ID do registro em sync_logs
+            etapas: Lista de dicts com etapa, ordem, duracao_ms,
+                    linhas_entrada, linhas_saida e memoria_aumento_kb
+        """
+        if not etapas:
+            return
+        
+        conn = self._get_connection()
+        cursor = conn.cursor()
+        
+        cursor.executemany("""
+            INSERT INTO sync_etapas
+            (sync_id, etapa, ordem, duracao_ms, linhas_entrada, linhas_saida, memoria_aumento_kb)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+        """, [
+            (sync_id, e.get("etapa"), e.get("ordem"), e.get("duracao_ms"),
+             e.get("linhas_entrada"), e.get("linhas_saida"), e.get("memoria_aumento_kb"))
+            for e in etapas
+        ])
+        
+        conn.commit()
+        conn.close()
+    
+    def buscar_etapas_sync(self, limite_syncs: int = 20) -> List[Dict]:
+        """
+        Busca as métricas por etapa das últimas sincronizações.
+        
+        Args:
+            limite_syncs: Número de sincronizações mais recentes
+            
+        Returns:
+            Lista de etapas com sync_id e sync_at, da mais antiga para a mais recente
+        """
+        conn = self._get_connection()
+        cursor = conn.cursor()
+        
+        cursor.execute("""
+            SELECT e.sync_id, s.sync_at, e.etapa, e.ordem, e.duracao_ms,
+                   e.linhas_entrada, e.linhas_saida, e.memoria_aumento_kb
+            FROM sync_etapas e
+            JOIN (
+                SELECT id, sync_at FROM sync_logs
+                WHERE id IN (SELECT DISTINCT sync_id FROM sync_etapas)
+                ORDER BY id DESC
+                LIMIT ?
+            ) s ON s.id = e.sync_id
+            ORDER BY e.sync_id ASC, e.ordem ASC
+        """, (limite_syncs,))
+        
+        rows = cursor.fetchall()
+        conn.close()
+        
+        return [self._row_to_dict(row) for row in rows]
+    
+    def registrar_problemas_sync(self, sync_id: int, problemas: List[Dict]):
+        """
+        Registra os problemas de qualidade encontrados numa sincronização.
+        
+        Args:
+            sync_id: ID do registro em sync_logs
+            problemas: Lista de dicts com tipo, severidade, nome, aba, linha e detalhe
+        """
+        if not problemas:
+            return
+        
+        conn = self._get_connection()
+        cursor = conn.cursor()
+        
+        cursor.executemany("""
+            INSERT INTO sync_issues (sync_id, tipo, severidade, nome, aba, linha, detalhe)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+        """, [
+            (sync_id, p.get("tipo"), p.get("severidade"), p.get("nome"),
+             p.get("aba"), p.get("linha"), p.get("detalhe"))
+            for p in problemas
+        ])
+        
+        conn.commit()
+        conn.close()
+    
+    def buscar_problemas_sync(self, sync_id: int = None) -> List[Dict]:
+        """
+        Busca os problemas de qualidade de uma sincronização.
+        
+        Args:
+            sync_id: ID da sincronização. Se None, usa a mais recente.
+            
+        Returns:
+            Lista de problemas ordenados por severidade, aba e linha
+        """
+        conn = self._get_connection()
+        cursor = conn.cursor()
+        
+        if sync_id is None:
+            cursor.execute("SELECT MAX(id) FROM sync_logs")
+            sync_id = cursor.fetchone()[0]
+        
+        cursor.execute("""
+            SELECT sync_id, tipo, severidade, nome, aba, linha, detalhe
+            FROM sync_issues
+            WHERE sync_id = ?
+            ORDER BY severidade = 'erro' DESC, aba, linha
+        """, (sync_id,))
+        
+        rows = cursor.fetchall()
+        conn.close()
+        
+        return [self._row_to_dict(row) for row in rows]
+    
+    # ==================== EVENTOS DE SINCRONIZAÇÃO (CDC) ====================
+    
+    def buscar_estado_funcionarios(self) -> Dict[Tuple[str, str], Dict]:
+        """
+        Retorna o estado atual de cada registro para o cálculo de diferenças.
+        
+        Returns:
+            Dicionário (nome, data_saida) -> dados do registro com `acessos`
+        """
+        conn = self._get_connection()
+        cursor = conn.cursor()
+        
+        mapas = self._mapas_acesso(cursor)
+        cursor.execute("""
+            SELECT f.nome, f.data_saida, f.data_retorno, f.unidade, f.motivo,
+                   f.gestor, m.codigos
+            FROM vw_funcionarios f
+            LEFT JOIN acessos_matriz m ON m.funcionario_id = f.id
+        """)
+        
+        estado = {}
+        for row in cursor.fetchall():
+            estado[(row["nome"], row["data_saida"])] = {
+                "data_retorno": row["data_retorno"],
+                "unidade": row["unidade"],
+                "motivo": row["motivo"],
+                "gestor": row["gestor"],
+                "acessos": self._desempacotar_acessos(row["codigos"], mapas),
+            }
+        
+        conn.close()
+        return estado
+    
+    def registrar_eventos_sync(self, sync_id: int, eventos: List[Dict]):
+        """
+        Acrescenta os eventos de mudança de uma sincronização ao outbox.
+        
+        Args:
+            sync_id: ID do registro em sync_logs
+            eventos: Lista de dicts com tipo, nome, data_saida, campo,
+                     valor_anterior e valor_novo
+        """
+        if not eventos:
+            return
+        
+        conn = self._get_connection()
+        cursor = conn.cursor()
+        self._inserir_eventos(cursor, sync_id, eventos)
+        conn.commit()
+        conn.close()
+    
+    def _inserir_eventos(self, cursor: sqlite3.Cursor, sync_id: int, eventos: List[Dict]):
+        """Insere eventos no outbox (na transação do chamador)."""
+        criado_em = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        cursor.executemany("""
+            INSERT INTO eventos_sync
+            (sync_id, tipo, nome, data_saida, campo, valor_anterior, valor_novo, criado_em)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+        """, [
+            (sync_id, e.get("tipo"), e.get("nome"), e.get("data_saida"), e.get("campo"),
+             e.get("valor_anterior"), e.get("valor_novo"), criado_em)
+            for e in eventos
+        ])
+    
+    def contar_eventos_sync(self, sync_id: int) -> int:
+        """Retorna quantos eventos uma sincronização acrescentou ao outbox."""
+        conn = self._get_connection()
+        cursor = conn.cursor()
+        cursor.execute("SELECT COUNT(*) FROM eventos_sync WHERE sync_id = ?", (sync_id,))
+        total = cursor.fetchone()[0]
+        conn.close()
+        return total
+    
+    def buscar_eventos_sync(self, apos_id: int = 0, tipos: List[str] = None,
+                            limite: int = 500) -> List[Dict]:
+        """
+        Lê eventos do outbox a partir de uma posição (cursor).
+        
+        Args:
+            apos_id: Retorna apenas eventos com id maior que este
+            tipos: Filtra pelos tipos de evento (opcional)
+            limite: Máximo de eventos retornados
+            
+        Returns:
+            Lista de eventos em ordem crescente de id
+        """
+        conn = self._get_connection()
+        cursor = conn.cursor()
+        
+        query = "SELECT * FROM eventos_sync WHERE id > ?"
+        params: List[Any] = [apos_id]
+        if tipos:
+            query += f" AND tipo IN ({','.join('?' * len(tipos))})"
+            params.extend(tipos)
+        query += " ORDER BY id LIMIT ?"
+        params.append(limite)
+        
+        cursor.execute(query, params)
+        rows = cursor.fetchall()
+        conn.close()
+        
+        return [self._row_to_dict(row) for row in rows]
+    
+    def ler_cursor_eventos(self, consumidor: str) -> int:
+        """
+        Retorna a posição do consumidor no outbox.
+        Consumidores novos começam no fim (apenas eventos futuros).
+        """
+        conn = self._get_connection()
+        cursor = conn.cursor()
+        
+        cursor.execute("""
+            INSERT OR IGNORE INTO eventos_cursores (consumidor, ultimo_id, atualizado_em)
+            SELECT ?, COALESCE(MAX(id), 0), ? FROM eventos_sync
+        """, (consumidor, datetime.now().strftime('%Y-%m-%d %H:%M:%S')))
+        conn.commit()
+        
+        cursor.execute("SELECT ultimo_id FROM eventos_cursores WHERE consumidor = ?", (consumidor,))
+        ultimo_id = cursor.fetchone()[0]
+        conn.close()
+        
+        return ultimo_id
+    
+    def avancar_cursor_eventos(self, consumidor: str, ultimo_id: int):
+        """Grava a posição do consumidor (nunca retrocede)."""
+        conn = self._get_connection()
+        cursor = conn.cursor()
+        
+        cursor.execute("""
+            INSERT INTO eventos_cursores (consumidor, ultimo_id, atualizado_em)
+            VALUES (?, ?, ?)
+            ON CONFLICT(consumidor) DO UPDATE SET
+                ultimo_id = MAX(ultimo_id, excluded.ultimo_id),
+                atualizado_em = excluded.atualizado_em
+        """, (consumidor, ultimo_id, datetime.now().strftime('%Y-%m-%d %H:%M:%S')))
+        
+        conn.commit()
+        conn.close()
+    
+    # ==================== EXECUÇÕES DE SINCRONIZAÇÃO ====================
+    
+    def tentar_iniciar_execucao_sync(self, token: str, operacao: str, pid: int, host: str,
+                                     forcada: bool = False) -> bool:
+        """
+        Tenta registrar uma execução em andamento de forma atômica.
+        
+        Args:
+            forcada: Execução forçada (não pode ser substituída por uma comum em andamento)
+        
+        Returns:
+            True se a execução foi registrada, False se já existe outra em andamento
+        """
+        conn = self._get_connection()
+        cursor = conn.cursor()
+        
+        agora = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        try:
+            cursor.execute("""
+                INSERT INTO sync_execucoes
+                (token, operacao, forcada, status, pid, host, iniciado_em, heartbeat_em)
+                VALUES (?, ?, ?, 'executando', ?, ?, ?, ?)
+            """, (token, operacao, int(forcada), pid, host, agora, agora))
+            conn.commit()
+            return True
+        except sqlite3.IntegrityError:
+            return False
+        finally:
+            conn.close()
+    
+    def atualizar_heartbeat_sync(self, token: str):
+        """Atualiza o heartbeat de uma execução em andamento."""
+        conn = self._get_connection()
+        cursor = conn.cursor()
+        
+        cursor.execute("""
+            UPDATE sync_execucoes SET heartbeat_em = ?
+            WHERE token = ? AND status = 'executando'
+        """, (datetime.now().strftime('%Y-%m-%d %H:%M:%S'), token))
+        
+        conn.commit()
+        conn.close()
+    
+    def finalizar_execucao_sync(self, token: str, status: str, resultado: str):
+        """Marca uma execução como finalizada e guarda o resultado (JSON)."""
+        conn = self._get_connection()
+        cursor = conn.cursor()
+        
+        cursor.execute("""
+            UPDATE sync_execucoes
+            SET status = ?, resultado = ?, finalizado_em = ?
+            WHERE token = ?
+        """, (status, resultado, datetime.now().strftime('%Y-%m-%d %H:%M:%S'), token))
+        
+        conn.commit()
+        conn.close()
+    
+    def abandonar_execucao_sync(self, token: str) -> bool:
+        """
+        Marca uma execução travada como abandonada.
+        
+        Returns:
+            True se a execução ainda estava em andamento e foi liberada
+        """
+        conn = self._get_connection()
+        cursor = conn.cursor()
+        
+        cursor.execute("""
+            UPDATE sync_execucoes
+            SET status = 'abandonado', finalizado_em = ?
+            WHERE token = ? AND status = 'executando'
+        """, (datetime.now().strftime('%Y-%m-%d %H:%M:%S'), token))
+        liberada = cursor.rowcount > 0
+        
+        conn.commit()
+        conn.close()
+        
+        return liberada
+    
+    def buscar_execucao_sync_ativa(self) -> Optional[Dict]:
+        """Retorna a execução de sincronização em andamento, se houver."""
+        conn = self._get_connection()
+        cursor = conn.cursor()
+        
+        cursor.execute("SELECT * FROM sync_execucoes WHERE status = 'executando'")
+        row = cursor.fetchone()
+        conn.close()
+        
+        return self._row_to_dict(row) if row else None
+    
+    def buscar_execucao_sync(self, token: str) -> Optional[Dict]:
+        """Retorna uma execução de sincronização pelo token."""
+        conn = self._get_connection()
+        cursor = conn.cursor()
+        
+        cursor.execute("SELECT * FROM sync_execucoes WHERE token = ?", (token,))
+        row = cursor.fetchone()
+        conn.close()
+        
+        return self._row_to_dict(row) if row else None
+    
+    # ==================== SINAIS ====================
+    
+    def emitir_sinal(self, nome: str):
+        """Emite um sinal entre processos incrementando sua versão."""
+        conn = self._get_connection()
+        cursor = conn.cursor()
+        
+        cursor.execute("""
+            INSERT INTO sinais (nome, versao, emitido_em) VALUES (?, 1, ?)
+            ON CONFLICT(nome) DO UPDATE SET
+                versao = sinais.versao + 1,
+                emitido_em = excluded.emitido_em
+        """, (nome, datetime.now().strftime('%Y-%m-%d %H:%M:%S')))
+        
+        conn.commit()
+        conn.close()
+    
+    def buscar_versao_sinal(self, nome: str) -> int:
+        """Retorna a versão atual de um sinal (0 se nunca emitido)."""
+        conn = self._get_connection()
+        cursor = conn.cursor()
+        
+        cursor.execute("SELECT versao FROM sinais WHERE nome = ?", (nome,))
+        row = cursor.fetchone()
+        conn.close()
+        
+        return row[0] if row else 0
+    
+    # ==================== HEARTBEAT DO SCHEDULER ====================
+    
+    def registrar_heartbeat(self, heartbeat: Dict):
+        """
+        Grava o heartbeat do scheduler (substitui o anterior).
+        
+        Args:
+            heartbeat: status, atualizado_em, iniciado_em, pid, host, em_execucao,
+                       fila, proximos (lista) e ultimo_job (dict ou None)
+        """
+        conn = self._get_connection()
+        cursor = conn.cursor()
+        
+        cursor.execute("""
+            INSERT OR REPLACE INTO scheduler_heartbeat
+            (id, status, atualizado_em, iniciado_em, pid, host, em_execucao, fila, proximos, ultimo_job)
+            VALUES (1, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """, (
+            heartbeat["status"], heartbeat["atualizado_em"], heartbeat.get("iniciado_em"),
+            heartbeat.get("pid"), heartbeat.get("host"),
+            heartbeat.get("em_execucao", 0), heartbeat.get("fila", 0),
+            json.dumps(heartbeat.get("proximos") or [], ensure_ascii=False),
+            json.dumps(heartbeat.get("ultimo_job"), ensure_ascii=False),
+        ))
+        
+        conn.commit()
+        conn.close()
+    
+    def buscar_heartbeat(self) -> Optional[Dict]:
+        """Retorna o último heartbeat do scheduler, ou None se nunca rodou."""
+        conn = self._get_connection()
+        cursor = conn.cursor()
+        
+        cursor.execute("SELECT * FROM scheduler_heartbeat WHERE id = 1")
+        row = cursor.fetchone()
+        conn.close()
+        
+        if not row:
+            return None
+        heartbeat = self._row_to_dict(row)
+        heartbeat["proximos"] = json.loads(heartbeat["proximos"] or "[]")
+        heartbeat["ultimo_job"] = json.loads(heartbeat["ultimo_job"] or "null")
+        return heartbeat
+    
+    # ==================== REGISTRO DE JOBS ====================
+    
+    def buscar_jobs_agendados(self) -> List[Dict]:
+        """Retorna as linhas do registro de jobs agendados."""
+        conn = self._get_connection()
+        cursor = conn.cursor()
+        
+        cursor.execute("SELECT * FROM jobs_agendados ORDER BY id")
+        rows = cursor.fetchall()
+        conn.close()
+        
+        return [self._row_to_dict(row) for row in rows]
+    
+    def salvar_job_agendado(self, job: Dict):
+        """
+        Cria ou atualiza um job do registro.
+        
+        Args:
+            job: id, tipo, cron e opcionalmente nome, parametros (dict),
+                 habilitado, timeout_segundos, processo, max_instancias, notificar
+        """
+        conn = self._get_connection()
+        cursor = conn.cursor()
+        
+        processo = job.get("processo")
+        cursor.execute("""
+            INSERT INTO jobs_agendados
+            (id, tipo, nome, cron, parametros, habilitado, timeout_segundos,
+             processo, max_instancias, notificar, atualizado_em)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT(id) DO UPDATE SET
+                tipo = excluded.tipo,
+                nome = excluded.nome,
+                cron = excluded.cron,
+                parametros = excluded.parametros,
+                habilitado = excluded.habilitado,
+                timeout_segundos = excluded.timeout_segundos,
+                processo = excluded.processo,
+                max_instancias = excluded.max_instancias,
+                notificar = excluded.notificar,
+                atualizado_em = excluded.atualizado_em
+        """, (
+            job["id"], job["tipo"], job.get("nome"), job["cron"],
+            json.dumps(job.get("parametros") or {}, ensure_ascii=False),
+            1 if job.get("habilitado", True) else 0,
+            job.get("timeout_segundos"),
+            None if processo is None else int(bool(processo)),
+            job.get("max_instancias") or 1,
+            job.get("notificar"),
+            datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+        ))
+        
+        conn.commit()
+        conn.close()
+    
+    def remover_job_agendado(self, job_id: str) -> bool:
+        """Remove um job do registro."""
+        conn = self._get_connection()
+        cursor = conn.cursor()
+        
+        cursor.execute("DELETE FROM jobs_agendados WHERE id = ?", (job_id,))
+        removido = cursor.rowcount > 0
+        
+        conn.commit()
+        conn.close()
+        
+        return removido
+    
+    # ==================== CALENDÁRIO ====================
+    
+    def buscar_feriados(self) -> List[Dict]:
+        """Retorna os feriados locais cadastrados."""
+        conn = self._get_connection()
+        cursor = conn.cursor()
+        
+        cursor.execute("SELECT * FROM feriados ORDER BY data")
+        rows = cursor.fetchall()
+        conn.close()
+        
+        return [self._row_to_dict(row) for row in rows]
+    
+    def salvar_feriado(self, data: str, nome: str, recorrente: bool = False):
+        """
+        Cria ou atualiza um feriado local.
+        
+        Args:
+            data: Data no formato YYYY-MM-DD
+            nome: Descrição do feriado
+            recorrente: Se True, repete todo ano no mesmo dia e mês
+        """
+        conn = self._get_connection()
+        cursor = conn.cursor()
+        
+        cursor.execute("""
+            INSERT INTO feriados (data, nome, recorrente) VALUES (?, ?, ?)
+            ON CONFLICT(data) DO UPDATE SET
+                nome = excluded.nome,
+                recorrente = excluded.recorrente
+        """, (data, nome, 1 if recorrente else 0))
+        
+        conn.commit()
+        conn.close()
+        self.emitir_sinal(SINAL_FERIADOS)
+    
+    def remover_feriado(self, data: str) -> bool:
+        """Remove um feriado local."""
+        conn = self._get_connection()
+        cursor = conn.cursor()
+        
+        cursor.execute("DELETE FROM feriados WHERE data = ?", (data,))
+        removido = cursor.rowcount > 0
+        
+        conn.commit()
+        conn.close()
+        if removido:
+            self.emitir_sinal(SINAL_FERIADOS)
+        
+        return removido
+    
+    def calendario(self) -> Calendario:
+        """
+        Calendário de dias úteis (feriados nacionais + locais), pré-calculado
+        e mantido em cache até os feriados locais mudarem.
+        """
+        versao = self.buscar_versao_sinal(SINAL_FERIADOS)
+        em_cache = _calendarios.get(str(self.db_path))
+        if em_cache and em_cache[0] == versao:
+            return em_cache[1]
+        
+        locais, recorrentes = [], []
+        for feriado in self.buscar_feriados():
+            dia = datetime.strptime(feriado["data"], '%Y-%m-%d').date()
+            if feriado["recorrente"]:
+                recorrentes.append((dia.month, dia.day))
+            else:
+                locais.append(dia)
+        
+        calendario = Calendario(locais, recorrentes)
+        _calendarios[str(self.db_path)] = (versao, calendario)
+        return calendario
+    
+    # ==================== LEDGER DE JOBS ====================
+    
+    def reservar_job_run(self, job_id: str, agendado_para: str, token: str, pid: int, host: str,
+                         expirado_antes: str) -> bool:
+        """
+        Reserva de forma atômica a execução de um job em um horário agendado.
+        
+        A reserva só é concedida se o horário ainda não tem execução, se a
+        anterior terminou com erro, se a reexecução foi solicitada (dead-letter)
+        ou se uma execução em andamento
+        começou antes de `expirado_antes` (processo que morreu no meio).
+        
+        Returns:
+            True se este chamador deve executar o job
+        """
+        conn = self._get_connection()
+        cursor = conn.cursor()
+        
+        agora = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        cursor.execute("""
+            INSERT INTO job_runs (job_id, agendado_para, token, status, pid, host, iniciado_em)
+            VALUES (?, ?, ?, 'executando', ?, ?, ?)
+            ON CONFLICT(job_id, agendado_para) DO UPDATE SET
+                token = excluded.token,
+                status = 'executando',
+                tentativas = job_runs.tentativas + 1,
+                pid = excluded.pid,
+                host = excluded.host,
+                iniciado_em = excluded.iniciado_em,
+                finalizado_em = NULL,
+                duracao_segundos = NULL,
+                erro = NULL
+            WHERE job_runs.status IN ('erro', 'reexecutar')
+               OR (job_runs.status = 'executando' AND job_runs.iniciado_em < ?)
+        """, (job_id, agendado_para, token, pid, host, agora, expirado_antes))
+        reservado = cursor.rowcount > 0
+        
+        conn.commit()
+        conn.close()
+        
+        return reservado
+    
+    def finalizar_job_run(self, token: str, status: str, duracao_segundos: float, erro: str = None):
+        """Registra o término de uma execução reservada."""
+        conn = self._get_connection()
+        cursor = conn.cursor()
+        
+        cursor.execute("""
+            UPDATE job_runs
+            SET status = ?, duracao_segundos = ?, erro = ?, finalizado_em = ?
+            WHERE token = ?
+        """, (status, duracao_segundos, erro, datetime.now().strftime('%Y-%m-%d %H:%M:%S'), token))
+        
+        conn.commit()
+        conn.close()
+    
+    def buscar_job_run(self, job_id: str, agendado_para: str) -> Optional[Dict]:
+        """Retorna a execução de um job em um horário agendado, se houver."""
+        conn = self._get_connection()
+        cursor = conn.cursor()
+        
+        cursor.execute(
+            "SELECT * FROM job_runs WHERE job_id = ? AND agendado_para = ?",
+            (job_id, agendado_para)
+        )
+        row = cursor.fetchone()
+        conn.close()
+        
+        return self._row_to_dict(row) if row else None
+    
+    def atualizar_status_job_run(self, job_id: str, agendado_para: str, status: str, de: str) -> bool:
+        """
+        Troca o status de uma execução, apenas se ela ainda estiver em `de`.
+        
+        Returns:
+            True se a execução foi atualizada
+        """
         conn = self._get_connection()
         cursor = conn.cursor()
-        cursor.execute("DELETE FROM acessos")
-        cursor.execute("DELETE FROM funcionarios")
-        cursor.execute("DELETE FROM abas")
+        
+        cursor.execute("""
+            UPDATE job_runs SET status = ?
+            WHERE job_id = ? AND agendado_para = ? AND status = ?
+        """, (status, job_id, agendado_para, de))
+        atualizado = cursor.rowcount > 0
+        
         conn.commit()
         conn.close()
+        
+        return atualizado
     
-    def salvar_funcionarios(self, funcionarios: List[Dict]) -> int:
+    def solicitar_reexecucao_job_run(self, run_id: int) -> bool:
         """
-        Salva lista de funcionários no banco, atualizando se já existir.
-        Usa o nome do funcionário e a data de saída como chave única.
+        Marca uma execução do dead-letter (`esgotado`) para ser reexecutada
+        pelo scheduler.
+        
+        Returns:
+            True se a execução estava no dead-letter
         """
         conn = self._get_connection()
         cursor = conn.cursor()
         
-        registros_atualizados = 0
-        registros_inseridos = 0
-        
-        for f in funcionarios:
-            nome = f.get("nome", "")
-            data_saida = f.get("data_saida")
-            
-            # 1. Verifica se já existe um registro com o mesmo nome E data de saída
-            cursor.execute("""
-                SELECT id FROM funcionarios WHERE nome = ? AND data_saida = ?
-            """, (nome, data_saida))
-            existente = cursor.fetchone()
-            
-            if existente:
-                # UPDATE - Atualiza o registro existente
-                funcionario_id = existente[0]
-                cursor.execute("""
-                    UPDATE funcionarios 
-                    SET unidade = ?, motivo = ?, data_retorno = ?, gestor = ?, 
-                        aba_origem = ?, mes = ?, ano = ?
-                    WHERE id = ?
-                """, (
-                    f.get("unidade", ""), f.get("motivo", ""), f.get("data_retorno"),
-                    f.get("gestor", ""), f.get("aba_origem", ""), f.get("mes", 0),
-                    f.get("ano", 0), funcionario_id
-                ))
-                
-                # Deleta acessos antigos para reinserir
-                cursor.execute("DELETE FROM acessos WHERE funcionario_id = ?", (funcionario_id,))
-                registros_atualizados += 1
-            else:
-                # INSERT - Insere um novo registro
-                cursor.execute("""
-                    INSERT INTO funcionarios 
-                    (nome, unidade, motivo, data_saida, data_retorno, gestor, aba_origem, mes, ano)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """, (
-                    nome, f.get("unidade", ""), f.get("motivo", ""), data_saida,
-                    f.get("data_retorno"), f.get("gestor", ""), f.get("aba_origem", ""),
-                    f.get("mes", 0), f.get("ano", 0)
-                ))
-                funcionario_id = cursor.lastrowid
-                registros_inseridos += 1
-
-            # Insere/Reinsere os acessos
-            acessos = f.get("acessos", {})
-            for sistema, status in acessos.items():
-                cursor.execute("""
-                    INSERT INTO acessos (funcionario_id, sistema, status)
-                    VALUES (?, ?, ?)
-                """, (funcionario_id, sistema, status))
+        cursor.execute(
+            "UPDATE job_runs SET status = 'reexecutar' WHERE id = ? AND status = 'esgotado'",
+            (run_id,)
+        )
+        solicitada = cursor.rowcount > 0
         
         conn.commit()
         conn.close()
         
-        print(f"   -> Inseridos: {registros_inseridos}, Atualizados: {registros_atualizados}")
-        return registros_inseridos + registros_atualizados
+        return solicitada
     
-    def salvar_abas(self, abas: List[Dict]):
-        """Salva lista de abas no banco."""
+    def job_executado_no_dia(self, job_id: str, dia: str) -> bool:
+        """Verifica se o job tem execução bem-sucedida agendada para o dia (YYYY-MM-DD)."""
         conn = self._get_connection()
         cursor = conn.cursor()
         
-        for a in abas:
-            cursor.execute("""
-                INSERT INTO abas (nome, mes, ano, total_funcionarios)
-                VALUES (?, ?, ?, ?)
-            """, (
-                a.get("nome", ""),
-                a.get("mes", 0),
-                a.get("ano", 0),
-                a.get("total_funcionarios", 0)
-            ))
-        
-        conn.commit()
+        cursor.execute("""
+            SELECT 1 FROM job_runs
+            WHERE job_id = ? AND agendado_para >= ? AND agendado_para < date(?, '+1 day')
+              AND status = 'sucesso'
+            LIMIT 1
+        """, (job_id, dia, dia))
+        executado = cursor.fetchone() is not None
         conn.close()
+        
+        return executado
     
-    def registrar_sync(self, total_registros: int, total_abas: int, 
-                       status: str, mensagem: str, arquivo_hash: str = ""):
-        """Registra log de sincronização."""
+    def buscar_job_runs(self, limite: int = 100, job_id: str = None, status: str = None) -> List[Dict]:
+        """Retorna o histórico de execuções dos jobs, mais recentes primeiro."""
         conn = self._get_connection()
         cursor = conn.cursor()
         
-        # Define explicitamente o sync_at com o timestamp atual
-        sync_at = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        query = "SELECT * FROM job_runs WHERE 1=1"
+        params = []
+        if job_id:
+            query += " AND job_id = ?"
+            params.append(job_id)
+        if status:
+            query += " AND status = ?"
+            params.append(status)
+        query += " ORDER BY agendado_para DESC, id DESC LIMIT ?"
+        params.append(limite)
+        
+        cursor.execute(query, params)
+        rows = cursor.fetchall()
+        conn.close()
+        
+        return [self._row_to_dict(row) for row in rows]
+    
+    # ==================== MÉTRICAS DE JOBS ====================
+    
+    def registrar_metrica_job(self, metrica: Dict):
+        """Grava a métrica de um disparo de job."""
+        conn = self._get_connection()
+        cursor = conn.cursor()
         
         cursor.execute("""
-            INSERT INTO sync_logs (sync_at, total_registros, total_abas, status, mensagem, arquivo_hash)
-            VALUES (?, ?, ?, ?, ?, ?)
-        """, (sync_at, total_registros, total_abas, status, mensagem, arquivo_hash))
+            INSERT INTO job_metricas
+            (job_id, resultado, agendado_para, iniciado_em, atraso_segundos, duracao_segundos, erro)
+            VALUES (:job_id, :resultado, :agendado_para, :iniciado_em, :atraso_segundos, :duracao_segundos, :erro)
+        """, metrica)
         
         conn.commit()
         conn.close()
+    
+    def buscar_metricas_jobs(self, horas: int = 24 * 7) -> List[Dict]:
+        """
+        Agrega as métricas de cada job na janela das últimas `horas`.
         
-        # Também registra no log de atividades
-        self.registrar_log(
-            tipo="sync",
-            categoria="Sincronização",
-            status=status,
-            mensagem=mensagem,
-            detalhes=f"Registros: {total_registros}, Abas: {total_abas}",
-            origem="sync_manager"
-        )
+        Percentis de duração pelo método nearest-rank: o menor valor cuja
+        posição na ordem é >= p * total.
+        
+        Returns:
+            Lista por job com execuções, erros, misfires, atraso médio e p50/p95
+        """
+        conn = self._get_connection()
+        cursor = conn.cursor()
+        
+        cursor.execute("""
+            WITH janela AS (
+                SELECT * FROM job_metricas
+                WHERE agendado_para >= datetime('now', 'localtime', ?)
+            ),
+            duracoes AS (
+                SELECT job_id, duracao_segundos,
+                       ROW_NUMBER() OVER (PARTITION BY job_id ORDER BY duracao_segundos) AS posicao,
+                       COUNT(*) OVER (PARTITION BY job_id) AS total
+                FROM janela
+                WHERE duracao_segundos IS NOT NULL
+            ),
+            percentis AS (
+                SELECT job_id,
+                       MIN(CASE WHEN posicao >= 0.50 * total THEN duracao_segundos END) AS p50_segundos,
+                       MIN(CASE WHEN posicao >= 0.95 * total THEN duracao_segundos END) AS p95_segundos
+                FROM duracoes
+                GROUP BY job_id
+            )
+            SELECT j.job_id,
+                   COUNT(*) AS disparos,
+                   SUM(j.resultado = 'sucesso') AS sucessos,
+                   SUM(j.resultado = 'pulado') AS pulados,
+                   SUM(j.resultado = 'erro') AS erros,
+                   SUM(j.resultado IN ('perdido', 'ignorado')) AS misfires,
+                   AVG(j.atraso_segundos) AS atraso_medio_segundos,
+                   p.p50_segundos,
+                   p.p95_segundos,
+                   MAX(j.agendado_para) AS ultimo_disparo
+            FROM janela j
+            LEFT JOIN percentis p ON p.job_id = j.job_id
+            GROUP BY j.job_id
+            ORDER BY j.job_id
+        """, (f'-{horas} hours',))
+        rows = cursor.fetchall()
+        conn.close()
+        
+        return [self._row_to_dict(row) for row in rows]
     
     def registrar_log(self, tipo: str, categoria: str, status: str, 
                       mensagem: str, detalhes: str = "", origem: str = "sistema"):
@@ -389,6 +2057,10 @@ class Database:
             DELETE FROM activity_logs 
             WHERE created_at < datetime('now', ?)
         """, (f'-{dias} days',))
+        cursor.execute("""
+            DELETE FROM job_metricas
+            WHERE agendado_para < datetime('now', 'localtime', ?)
+        """, (f'-{dias} days',))
         
         conn.commit()
         conn.close()
@@ -407,12 +2079,17 @@ class Database:
         conn = self._get_connection()
         cursor = conn.cursor()
         
+        # Uma consulta para todos os ids (lista JSON em um único parâmetro)
+        mapas = self._mapas_acesso(cursor)
+        cursor.execute(
+            "SELECT funcionario_id, codigos FROM acessos_matriz "
+            "WHERE funcionario_id IN (SELECT value FROM json_each(?))",
+            (json.dumps([f["id"] for f in funcionarios]),)
+        )
+        codigos = {row["funcionario_id"]: row["codigos"] for row in cursor.fetchall()}
+        
         for f in funcionarios:
-            cursor.execute(
-                "SELECT sistema, status FROM acessos WHERE funcionario_id = ?",
-                (f["id"],)
-            )
-            f["acessos"] = {row["sistema"]: row["status"] for row in cursor.fetchall()}
+            f["acessos"] = self._desempacotar_acessos(codigos.get(f["id"]), mapas)
         
         conn.close()
         return funcionarios
@@ -423,11 +2100,11 @@ class Database:
         conn = self._get_connection()
         cursor = conn.cursor()
         
-        query = "SELECT * FROM funcionarios WHERE 1=1"
+        query = "SELECT * FROM vw_funcionarios WHERE 1=1"
         params = []
         
         if aba:
-            query += " AND aba_origem = ?"
+            query += " AND aba_id = (SELECT id FROM abas WHERE nome = ?)"
             params.append(aba)
         if mes:
             query += " AND mes = ?"
@@ -451,7 +2128,7 @@ class Database:
         
         hoje = datetime.now().strftime('%Y-%m-%d')
         cursor.execute(
-            "SELECT * FROM funcionarios WHERE date(data_saida) = ?",
+            "SELECT * FROM vw_funcionarios WHERE date(data_saida) = ?",
             (hoje,)
         )
         funcionarios = [self._row_to_dict(row) for row in cursor.fetchall()]
@@ -459,35 +2136,23 @@ class Database:
         
         return self._adicionar_acessos(funcionarios)
     
-    def buscar_retornos_proximo_dia_util(self) -> List[Dict]:
+    def buscar_retornos_proximo_dia_util(self, hoje: datetime = None) -> List[Dict]:
         """
-        Busca funcionários que retornam no próximo dia útil.
-        - Em dias de semana (seg-qui), busca quem volta no dia seguinte.
-        - Na sexta-feira, busca quem volta no sábado, domingo e segunda-feira.
+        Busca funcionários que retornam até o próximo dia útil: de amanhã
+        até o próximo dia útil do calendário, inclusive. Na sexta-feira (ou
+        véspera de feriado) inclui quem volta nos dias não úteis do meio.
         """
+        hoje = (hoje or datetime.now()).date()
+        proximo = self.calendario().proximo_dia_util(hoje)
+        
         conn = self._get_connection()
         cursor = conn.cursor()
 
-        hoje = datetime.now()
-        dia_semana = hoje.weekday()  # 0=segunda, 4=sexta
-
-        datas_busca = []
-        if dia_semana == 4:  # Sexta-feira
-            # Adiciona sábado, domingo e segunda
-            datas_busca.append((hoje + timedelta(days=1)).strftime('%Y-%m-%d'))
-            datas_busca.append((hoje + timedelta(days=2)).strftime('%Y-%m-%d'))
-            datas_busca.append((hoje + timedelta(days=3)).strftime('%Y-%m-%d'))
-        else:
-            # Para outros dias da semana, busca apenas o dia seguinte
-            amanha = (hoje + timedelta(days=1)).strftime('%Y-%m-%d')
-            datas_busca.append(amanha)
-
-        # Cria a string de placeholders para a consulta IN
-        placeholders = ','.join('?' for _ in datas_busca)
-
-        query = f"SELECT * FROM funcionarios WHERE date(data_retorno) IN ({placeholders}) ORDER BY data_retorno ASC"
-        
-        cursor.execute(query, datas_busca)
+        cursor.execute("""
+            SELECT * FROM vw_funcionarios
+            WHERE date(data_retorno) > ? AND date(data_retorno) <= ?
+            ORDER BY data_retorno ASC
+        """, (hoje.strftime('%Y-%m-%d'), proximo.strftime('%Y-%m-%d')))
         funcionarios = [self._row_to_dict(row) for row in cursor.fetchall()]
         conn.close()
 
@@ -500,7 +2165,7 @@ class Database:
         
         hoje = datetime.now().strftime('%Y-%m-%d')
         cursor.execute("""
-            SELECT * FROM funcionarios 
+            SELECT * FROM vw_funcionarios 
             WHERE date(data_saida) <= ? AND date(data_retorno) >= ?
             ORDER BY data_retorno ASC
         """, (hoje, hoje))
@@ -518,7 +2183,7 @@ class Database:
         data_limite = (datetime.now() + timedelta(days=dias)).strftime('%Y-%m-%d')
         
         cursor.execute("""
-            SELECT * FROM funcionarios 
+            SELECT * FROM vw_funcionarios 
             WHERE date(data_saida) > ? AND date(data_saida) <= ?
             ORDER BY data_saida ASC
         """, (hoje, data_limite))
@@ -544,31 +2209,21 @@ class Database:
         
         hoje = datetime.now().strftime('%Y-%m-%d')
         
-        # Busca IDs de funcionários com acessos BLOQUEADO
-        cursor.execute("""
-            SELECT DISTINCT funcionario_id 
-            FROM acessos 
-            WHERE status = 'BLOQUEADO'
-        """)
-        ids_bloqueados = [row["funcionario_id"] for row in cursor.fetchall()]
-        
-        if not ids_bloqueados:
-            conn.close()
-            return []
-        
-        # Monta query base
-        placeholders = ','.join('?' * len(ids_bloqueados))
-        query = f"""
-            SELECT * FROM funcionarios 
-            WHERE id IN ({placeholders})
-            AND date(data_retorno) < ?
+        # Uma única consulta: o EXISTS consulta a matriz pela chave do funcionário
+        query = """
+            SELECT * FROM vw_funcionarios f
+            WHERE f.data_retorno < ?
+            AND EXISTS (
+                SELECT 1 FROM acessos a
+                WHERE a.funcionario_id = f.id AND a.status = 'BLOQUEADO'
+            )
         """
-        params = ids_bloqueados + [hoje]
+        params = [hoje]
         
         # Adiciona filtro de período se especificado
         if mes_inicio and ano_inicio:
             data_inicio = f"{ano_inicio}-{mes_inicio:02d}-01"
-            query += " AND date(data_saida) >= ?"
+            query += " AND f.data_saida >= ?"
             params.append(data_inicio)
         
         if mes_fim and ano_fim:
@@ -580,7 +2235,7 @@ class Database:
                 prox_mes = mes_fim + 1
                 prox_ano = ano_fim
             data_fim = f"{prox_ano}-{prox_mes:02d}-01"
-            query += " AND date(data_saida) < ?"
+            query += " AND f.data_saida < ?"
             params.append(data_fim)
         
         query += " ORDER BY data_retorno DESC"
@@ -598,25 +2253,15 @@ class Database:
         
         hoje = datetime.now().strftime('%Y-%m-%d')
         
-        # Busca IDs de funcionários com acessos PENDENTE
+        # Em férias hoje e com algum sistema PENDENTE, em uma única consulta
         cursor.execute("""
-            SELECT DISTINCT funcionario_id 
-            FROM acessos 
-            WHERE status = 'PENDENTE'
-        """)
-        ids_pendentes = [row["funcionario_id"] for row in cursor.fetchall()]
-        
-        if not ids_pendentes:
-            conn.close()
-            return []
-        
-        # Busca funcionários em férias
-        placeholders = ','.join('?' * len(ids_pendentes))
-        cursor.execute(f"""
-            SELECT * FROM funcionarios 
-            WHERE id IN ({placeholders})
-            AND date(data_saida) <= ? AND date(data_retorno) >= ?
-        """, ids_pendentes + [hoje, hoje])
+            SELECT * FROM vw_funcionarios f
+            WHERE f.data_saida <= ? AND f.data_retorno >= ?
+            AND EXISTS (
+                SELECT 1 FROM acessos a
+                WHERE a.funcionario_id = f.id AND a.status = 'PENDENTE'
+            )
+        """, (hoje, hoje))
         
         funcionarios = [self._row_to_dict(row) for row in cursor.fetchall()]
         conn.close()
@@ -639,16 +2284,13 @@ class Database:
         conn = self._get_connection()
         cursor = conn.cursor()
         
-        resumo = {}
-        for sistema in settings.SISTEMAS_ACESSO:
-            cursor.execute("""
-                SELECT status, COUNT(*) as count 
-                FROM acessos 
-                WHERE sistema = ?
-                GROUP BY status
-            """, (sistema,))
-            
-            resumo[sistema] = {row["status"]: row["count"] for row in cursor.fetchall()}
+        # Uma única varredura da matriz para todos os sistemas
+        cursor.execute("SELECT sistema, status, COUNT(*) as count FROM acessos GROUP BY sistema, status")
+        
+        resumo = {sistema: {} for sistema in settings.SISTEMAS_ACESSO}
+        for row in cursor.fetchall():
+            if row["sistema"] in resumo:
+                resumo[row["sistema"]][row["status"]] = row["count"]
         
         conn.close()
         return resumo
@@ -875,64 +2517,122 @@ class Database:
 
     # ==================== RELATÓRIOS ====================
 
-    def buscar_historico_ferias_por_funcionario(self) -> Dict[str, Dict]:
+    # Períodos com campos derivados calculados no SQL: dias, datas formatadas
+    # e intervalo desde o retorno das férias anteriores da mesma pessoa (LAG)
+    SQL_PERIODOS = """
+        SELECT f.pessoa_id, f.data_saida, f.data_retorno,
+               COALESCE(strftime('%d/%m/%Y', f.data_saida), '') AS data_saida_fmt,
+               COALESCE(strftime('%d/%m/%Y', f.data_retorno), '') AS data_retorno_fmt,
+               CASE WHEN f.data_saida IS NOT NULL AND f.data_retorno IS NOT NULL
+                    THEN CAST(julianday(f.data_retorno) - julianday(f.data_saida) AS INTEGER) + 1
+                    ELSE 0 END AS dias,
+               CAST(julianday(f.data_saida) - julianday(
+                   LAG(f.data_retorno) OVER (PARTITION BY f.pessoa_id ORDER BY f.data_saida, f.id)
+               ) AS INTEGER) AS dias_desde_anterior,
+               f.motivo, f.unidade, f.gestor, f.aba_origem, f.mes, f.ano, f.id
+        FROM vw_funcionarios f
+    """
+
+    def historico(self, pessoa_id: int, offset: int = 0, limite: Optional[int] = 50) -> List[Dict]:
         """
-        Busca histórico completo de férias agrupado por funcionário.
+        Busca uma página do histórico de férias de uma pessoa (mais recente primeiro).
         
+        Args:
+            pessoa_id: ID em `pessoas`
+            offset: Quantos períodos pular
+            limite: Tamanho da página (None = todos)
+            
         Returns:
-            Dicionário com nome do funcionário como chave e dados como valor
+            Lista de períodos com dias, datas formatadas e dias_desde_anterior
         """
         conn = self._get_connection()
         cursor = conn.cursor()
         
-        cursor.execute("""
-            SELECT nome, unidade, motivo, data_saida, data_retorno, gestor, aba_origem, mes, ano
-            FROM funcionarios
-            WHERE nome IS NOT NULL AND nome != ''
-            ORDER BY nome, data_saida DESC
-        """)
+        cursor.execute(f"""
+            SELECT * FROM ({self.SQL_PERIODOS} WHERE f.pessoa_id = ?)
+            ORDER BY data_saida DESC, id DESC
+            LIMIT ? OFFSET ?
+        """, (pessoa_id, -1 if limite is None else limite, offset))
         
         rows = cursor.fetchall()
         conn.close()
         
-        historico = {}
-        for row in rows:
-            row_dict = dict(row)
-            nome = row_dict["nome"]
-            
-            if nome not in historico:
-                historico[nome] = {"ferias": []}
-            
-            # Calcula dias de férias
-            dias = 0
-            data_saida_fmt = ""
-            data_retorno_fmt = ""
-            
-            if row_dict["data_saida"] and row_dict["data_retorno"]:
-                try:
-                    saida = datetime.strptime(row_dict["data_saida"], '%Y-%m-%d')
-                    retorno = datetime.strptime(row_dict["data_retorno"], '%Y-%m-%d')
-                    dias = (retorno - saida).days + 1
-                    data_saida_fmt = saida.strftime('%d/%m/%Y')
-                    data_retorno_fmt = retorno.strftime('%d/%m/%Y')
-                except:
-                    pass
+        return [self._periodo(row) for row in rows]
+    
+    def buscar_historico_pessoa(self, pessoa_id: int) -> List[Dict]:
+        """Busca todos os períodos de férias de uma pessoa (mais recente primeiro)."""
+        return self.historico(pessoa_id, limite=None)
+    
+    def buscar_historico_pagina(self, apos_chave: str = None,
+                                pessoas_por_pagina: int = 100) -> Tuple[List[Dict], Optional[str]]:
+        """
+        Busca o histórico de um lote de pessoas, em ordem de nome (paginação por cursor).
+        
+        Args:
+            apos_chave: Cursor retornado pela página anterior (None = início)
+            pessoas_por_pagina: Quantas pessoas por página
             
-            historico[nome]["ferias"].append({
-                "data_saida": row_dict["data_saida"],
-                "data_retorno": row_dict["data_retorno"],
-                "data_saida_fmt": data_saida_fmt,
-                "data_retorno_fmt": data_retorno_fmt,
-                "dias": dias,
-                "motivo": row_dict["motivo"],
-                "unidade": row_dict["unidade"],
-                "gestor": row_dict["gestor"],
-                "aba_origem": row_dict["aba_origem"],
-                "mes": row_dict["mes"],
-                "ano": row_dict["ano"]
-            })
-        
-        return historico
+        Returns:
+            (lista de {"pessoa_id", "nome", "ferias"}, cursor da próxima página ou None)
+        """
+        conn = self._get_connection()
+        cursor = conn.cursor()
+        
+        cursor.execute(f"""
+            WITH lote AS (
+                SELECT id, chave, nome FROM pessoas
+                WHERE chave > ? AND EXISTS (SELECT 1 FROM funcionarios f WHERE f.pessoa_id = pessoas.id)
+                ORDER BY chave
+                LIMIT ?
+            )
+            SELECT lote.chave, lote.nome AS pessoa, h.*
+            FROM lote
+            JOIN ({self.SQL_PERIODOS} WHERE f.pessoa_id IN (SELECT id FROM lote)) h
+                ON h.pessoa_id = lote.id
+            ORDER BY lote.chave, h.data_saida DESC, h.id DESC
+        """, (apos_chave or "", pessoas_por_pagina))
+        
+        pessoas: List[Dict] = []
+        ultima_chave = None
+        for row in cursor.fetchall():
+            if row["chave"] != ultima_chave:
+                ultima_chave = row["chave"]
+                pessoas.append({"pessoa_id": row["pessoa_id"], "nome": row["pessoa"], "ferias": []})
+            pessoas[-1]["ferias"].append(self._periodo(row))
+        conn.close()
+        
+        proximo = ultima_chave if len(pessoas) == pessoas_por_pagina else None
+        return pessoas, proximo
+    
+    def iterar_historico(self, pessoas_por_pagina: int = 100) -> Iterator[Dict]:
+        """Percorre o histórico de todas as pessoas, uma página por vez."""
+        cursor = None
+        while True:
+            pessoas, cursor = self.buscar_historico_pagina(cursor, pessoas_por_pagina)
+            yield from pessoas
+            if cursor is None:
+                return
+    
+    def buscar_historico_ferias_por_funcionario(self) -> Dict[str, Dict]:
+        """
+        Busca histórico completo de férias agrupado por pessoa.
+        
+        Monta o dicionário da empresa inteira; para percorrer sem carregar
+        tudo, use `iterar_historico`.
+        
+        Returns:
+            Dicionário com nome da pessoa como chave e dados como valor
+        """
+        return {p["nome"]: {"ferias": p["ferias"]} for p in self.iterar_historico()}
+    
+    def _periodo(self, row: sqlite3.Row) -> Dict:
+        """Seleciona os campos de um período de férias vindos de SQL_PERIODOS."""
+        return {
+            campo: row[campo] for campo in (
+                "data_saida", "data_retorno", "data_saida_fmt", "data_retorno_fmt", "dias",
+                "dias_desde_anterior", "motivo", "unidade", "gestor", "aba_origem", "mes", "ano"
+            )
+        }
 
     def buscar_ferias_por_periodo(self, data_inicio: str, data_fim: str) -> List[Dict]:
         """
@@ -949,7 +2649,7 @@ class Database:
         cursor = conn.cursor()
         
         cursor.execute("""
-            SELECT * FROM funcionarios
+            SELECT * FROM vw_funcionarios
             WHERE (
                 (date(data_saida) >= ? AND date(data_saida) <= ?)
                 OR (date(data_retorno) >= ? AND date(data_retorno) <= ?)
@@ -978,7 +2678,7 @@ class Database:
         cursor = conn.cursor()
         
         cursor.execute("""
-            SELECT * FROM funcionarios
+            SELECT * FROM vw_funcionarios
             WHERE date(data_saida) >= ? AND date(data_saida) <= ?
             ORDER BY data_saida ASC
         """, (data_inicio, data_fim))
@@ -1003,7 +2703,7 @@ class Database:
         cursor = conn.cursor()
         
         cursor.execute("""
-            SELECT * FROM funcionarios
+            SELECT * FROM vw_funcionarios
             WHERE date(data_retorno) >= ? AND date(data_retorno) <= ?
             ORDER BY data_retorno ASC
         """, (data_inicio, data_fim))
@@ -1024,11 +2724,15 @@ class Database:
         cursor = conn.cursor()
         
         cursor.execute("""
-            SELECT unidade, COUNT(*) as total
-            FROM funcionarios
-            WHERE unidade IS NOT NULL AND unidade != ''
-            GROUP BY unidade
-            ORDER BY total DESC
+            SELECT u.nome AS unidade, f.total
+            FROM (
+                SELECT unidade_id, COUNT(*) as total
+                FROM funcionarios
+                WHERE unidade_id IS NOT NULL
+                GROUP BY unidade_id
+            ) f
+            JOIN unidades u ON u.id = f.unidade_id
+            ORDER BY f.total DESC
         """)
         
         rows = cursor.fetchall()
@@ -1050,8 +2754,8 @@ class Database:
         cursor = conn.cursor()
         
         cursor.execute("""
-            SELECT * FROM funcionarios
-            WHERE unidade = ?
+            SELECT * FROM vw_funcionarios
+            WHERE unidade_id = (SELECT id FROM unidades WHERE nome = ?)
             ORDER BY data_saida DESC
         """, (unidade,))
         
@@ -1075,11 +2779,11 @@ class Database:
         total_registros = cursor.fetchone()["total"]
         
         # Funcionários únicos
-        cursor.execute("SELECT COUNT(DISTINCT nome) as total FROM funcionarios WHERE nome IS NOT NULL AND nome != ''")
+        cursor.execute("SELECT COUNT(DISTINCT pessoa_id) as total FROM funcionarios")
         funcionarios_unicos = cursor.fetchone()["total"]
         
         # Total de unidades
-        cursor.execute("SELECT COUNT(DISTINCT unidade) as total FROM funcionarios WHERE unidade IS NOT NULL AND unidade != ''")
+        cursor.execute("SELECT COUNT(DISTINCT unidade_id) as total FROM funcionarios")
         total_unidades = cursor.fetchone()["total"]
         
         # Total de abas
@@ -1128,22 +2832,7 @@ class Database:
         Returns:
             Lista com nome e total de períodos
         """
-        conn = self._get_connection()
-        cursor = conn.cursor()
-        
-        cursor.execute("""
-            SELECT nome, COUNT(*) as total
-            FROM funcionarios
-            WHERE nome IS NOT NULL AND nome != ''
-            GROUP BY nome
-            ORDER BY total DESC
-            LIMIT ?
-        """, (limite,))
-        
-        rows = cursor.fetchall()
-        conn.close()
-        
-        return [dict(row) for row in rows]
+        return self._buscar_ranking_resumo(limite)
 
     def buscar_estatisticas_por_gestor(self, limite: int = 10) -> List[Dict]:
         """
@@ -1159,12 +2848,17 @@ class Database:
         cursor = conn.cursor()
         
         cursor.execute("""
-            SELECT gestor, COUNT(*) as total
-            FROM funcionarios
-            WHERE gestor IS NOT NULL AND gestor != ''
-            GROUP BY gestor
-            ORDER BY total DESC
-            LIMIT ?
+            SELECT g.nome AS gestor, f.total
+            FROM (
+                SELECT gestor_id, COUNT(*) as total
+                FROM funcionarios
+                WHERE gestor_id IS NOT NULL
+                GROUP BY gestor_id
+                ORDER BY total DESC
+                LIMIT ?
+            ) f
+            JOIN gestores g ON g.id = f.gestor_id
+            ORDER BY f.total DESC
         """, (limite,))
         
         rows = cursor.fetchall()
@@ -1188,7 +2882,7 @@ class Database:
         cursor = conn.cursor()
         
         # Monta a cláusula WHERE
-        where_clauses = ["gestor = ?"]
+        where_clauses = ["gestor_id = (SELECT id FROM gestores WHERE nome = ?)"]
         params = [gestor]
         
         if ano:
@@ -1202,7 +2896,7 @@ class Database:
         where_sql = " AND ".join(where_clauses)
         
         cursor.execute(f"""
-            SELECT * FROM funcionarios
+            SELECT * FROM vw_funcionarios
             WHERE {where_sql}
             ORDER BY data_saida DESC
         """, params)
@@ -1296,25 +2990,25 @@ class Database:
         
         # Funcionários únicos
         cursor.execute(f"""
-            SELECT COUNT(DISTINCT nome) as total 
+            SELECT COUNT(DISTINCT pessoa_id) as total 
             FROM funcionarios 
-            WHERE {where_sql} AND nome IS NOT NULL AND nome != ''
+            WHERE {where_sql}
         """, params)
         funcionarios_unicos = cursor.fetchone()["total"]
         
         # Total de unidades
         cursor.execute(f"""
-            SELECT COUNT(DISTINCT unidade) as total 
+            SELECT COUNT(DISTINCT unidade_id) as total 
             FROM funcionarios 
-            WHERE {where_sql} AND unidade IS NOT NULL AND unidade != ''
+            WHERE {where_sql}
         """, params)
         total_unidades = cursor.fetchone()["total"]
         
         # Total de gestores
         cursor.execute(f"""
-            SELECT COUNT(DISTINCT gestor) as total 
+            SELECT COUNT(DISTINCT gestor_id) as total 
             FROM funcionarios 
-            WHERE {where_sql} AND gestor IS NOT NULL AND gestor != ''
+            WHERE {where_sql}
         """, params)
         total_gestores = cursor.fetchone()["total"]
         
@@ -1339,29 +3033,33 @@ class Database:
         Returns:
             Lista com nome e total de períodos
         """
+        if not mes:
+            return self._buscar_ranking_resumo(limite, ano)
+        
         conn = self._get_connection()
         cursor = conn.cursor()
         
         # Monta a cláusula WHERE
-        where_clauses = ["nome IS NOT NULL", "nome != ''"]
+        where_clauses = []
         params = []
         
         if ano:
-            where_clauses.append("ano = ?")
+            where_clauses.append("f.ano = ?")
             params.append(ano)
         
         if mes:
-            where_clauses.append("mes = ?")
+            where_clauses.append("f.mes = ?")
             params.append(mes)
         
-        where_sql = " AND ".join(where_clauses)
+        where_sql = " AND ".join(where_clauses) if where_clauses else "1=1"
         params.append(limite)
         
         cursor.execute(f"""
-            SELECT nome, COUNT(*) as total
-            FROM funcionarios
+            SELECT p.nome, COUNT(*) as total
+            FROM funcionarios f
+            JOIN pessoas p ON p.id = f.pessoa_id
             WHERE {where_sql}
-            GROUP BY nome
+            GROUP BY f.pessoa_id
             ORDER BY total DESC
             LIMIT ?
         """, params)
@@ -1371,6 +3069,34 @@ class Database:
         
         return [dict(row) for row in rows]
 
+    def _buscar_ranking_resumo(self, limite: int, ano: int = None) -> List[Dict]:
+        """Ranking lido do resumo por pessoa (geral ou de um ano), pelo índice de períodos."""
+        conn = self._get_connection()
+        cursor = conn.cursor()
+        
+        if ano:
+            cursor.execute("""
+                SELECT p.nome, r.periodos as total
+                FROM resumo_funcionario_ano r
+                JOIN pessoas p ON p.id = r.pessoa_id
+                WHERE r.ano = ?
+                ORDER BY r.periodos DESC
+                LIMIT ?
+            """, (ano, limite))
+        else:
+            cursor.execute("""
+                SELECT p.nome, r.periodos as total
+                FROM resumo_funcionario r
+                JOIN pessoas p ON p.id = r.pessoa_id
+                ORDER BY r.periodos DESC
+                LIMIT ?
+            """, (limite,))
+        
+        rows = cursor.fetchall()
+        conn.close()
+        
+        return [dict(row) for row in rows]
+
     def buscar_estatisticas_por_gestor_filtrado(self, limite: int = 10, ano: int = None, mes: int = None) -> List[Dict]:
         """
         Busca estatísticas de férias por gestor, filtrado por ano/mês.
@@ -1387,7 +3113,7 @@ class Database:
         cursor = conn.cursor()
         
         # Monta a cláusula WHERE
-        where_clauses = ["gestor IS NOT NULL", "gestor != ''"]
+        where_clauses = ["gestor_id IS NOT NULL"]
         params = []
         
         if ano:
@@ -1402,12 +3128,17 @@ class Database:
         params.append(limite)
         
         cursor.execute(f"""
-            SELECT gestor, COUNT(*) as total
-            FROM funcionarios
-            WHERE {where_sql}
-            GROUP BY gestor
-            ORDER BY total DESC
-            LIMIT ?
+            SELECT g.nome AS gestor, f.total
+            FROM (
+                SELECT gestor_id, COUNT(*) as total
+                FROM funcionarios
+                WHERE {where_sql}
+                GROUP BY gestor_id
+                ORDER BY total DESC
+                LIMIT ?
+            ) f
+            JOIN gestores g ON g.id = f.gestor_id
+            ORDER BY f.total DESC
         """, params)
         
         rows = cursor.fetchall()
@@ -1431,7 +3162,7 @@ class Database:
         cursor = conn.cursor()
         
         # Monta a cláusula WHERE
-        where_clauses = ["unidade IS NOT NULL", "unidade != ''"]
+        where_clauses = ["unidade_id IS NOT NULL"]
         params = []
         
         if ano:
@@ -1446,12 +3177,17 @@ class Database:
         params.append(limite)
         
         cursor.execute(f"""
-            SELECT unidade, COUNT(*) as total
-            FROM funcionarios
-            WHERE {where_sql}
-            GROUP BY unidade
-            ORDER BY total DESC
-            LIMIT ?
+            SELECT u.nome AS unidade, f.total
+            FROM (
+                SELECT unidade_id, COUNT(*) as total
+                FROM funcionarios
+                WHERE {where_sql}
+                GROUP BY unidade_id
+                ORDER BY total DESC
+                LIMIT ?
+            ) f
+            JOIN unidades u ON u.id = f.unidade_id
+            ORDER BY f.total DESC
         """, params)
         
         rows = cursor.fetchall()
@@ -1459,6 +3195,86 @@ class Database:
         
         return [dict(row) for row in rows]
 
+    def buscar_estatisticas_periodo(self, ano: int = None, mes: int = None,
+                                    limite: int = 10) -> EstatisticasPeriodo:
+        """
+        Calcula todas as estatísticas da aba Estatísticas com uma única varredura.
+        
+        A consulta agrupa os registros do período pela combinação mais fina
+        (pessoa, gestor, unidade, mês); totais, contagens distintas, ranking,
+        gestores, unidades e distribuição mensal são obtidos desses grupos.
+        
+        Args:
+            ano: Ano para filtrar (opcional)
+            mes: Mês para filtrar (opcional)
+            limite: Número máximo de itens no ranking e nos tops
+            
+        Returns:
+            EstatisticasPeriodo
+        """
+        conn = self._get_connection()
+        cursor = conn.cursor()
+        
+        where_clauses = []
+        params = []
+        if ano:
+            where_clauses.append("ano = ?")
+            params.append(ano)
+        if mes:
+            where_clauses.append("mes = ?")
+            params.append(mes)
+        where_sql = " AND ".join(where_clauses) if where_clauses else "1=1"
+        
+        cursor.execute(f"""
+            SELECT g.pessoa_id, p.nome AS pessoa, g.gestor_id, ge.nome AS gestor,
+                   g.unidade_id, u.nome AS unidade, g.mes, g.total
+            FROM (
+                SELECT pessoa_id, gestor_id, unidade_id, mes, COUNT(*) AS total
+                FROM funcionarios
+                WHERE {where_sql}
+                GROUP BY pessoa_id, gestor_id, unidade_id, mes
+            ) g
+            LEFT JOIN pessoas p ON p.id = g.pessoa_id
+            LEFT JOIN gestores ge ON ge.id = g.gestor_id
+            LEFT JOIN unidades u ON u.id = g.unidade_id
+        """, params)
+        grupos = cursor.fetchall()
+        conn.close()
+        
+        por_pessoa: Dict[int, List] = {}
+        por_gestor: Dict[int, List] = {}
+        por_unidade: Dict[int, List] = {}
+        por_mes: Dict[int, int] = {}
+        total = 0
+        for grupo in grupos:
+            total += grupo["total"]
+            for chave, nome, acumulado in (
+                (grupo["pessoa_id"], grupo["pessoa"], por_pessoa),
+                (grupo["gestor_id"], grupo["gestor"], por_gestor),
+                (grupo["unidade_id"], grupo["unidade"], por_unidade),
+            ):
+                if chave is not None:
+                    acumulado.setdefault(chave, [nome, 0])[1] += grupo["total"]
+            if grupo["mes"]:
+                por_mes[grupo["mes"]] = por_mes.get(grupo["mes"], 0) + grupo["total"]
+        
+        def top(acumulado: Dict[int, List], campo: str) -> List[Dict]:
+            ordenados = sorted(acumulado.values(), key=lambda item: (-item[1], item[0] or ""))
+            return [{campo: nome, "total": quantidade} for nome, quantidade in ordenados[:limite]]
+        
+        return EstatisticasPeriodo(
+            ano=ano,
+            mes=mes,
+            total_registros=total,
+            funcionarios_unicos=len(por_pessoa),
+            total_unidades=len(por_unidade),
+            total_gestores=len(por_gestor),
+            ranking=top(por_pessoa, "nome"),
+            por_gestor=top(por_gestor, "gestor"),
+            por_unidade=top(por_unidade, "unidade"),
+            por_mes=[{"mes": m, "total": por_mes[m]} for m in sorted(por_mes)],
+        )
+
     # ==================== OPERAÇÕES KANBANIZE ====================
     
     def salvar_cards_kanbanize(self, cards: List[Dict], board_id: int = None) -> int:
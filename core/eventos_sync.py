@@ -0,0 +1,149 @@
+"""
+Eventos de mudança (CDC) gerados pela sincronização.
+
+A gravação (`Database.salvar_funcionarios`) compara cada registro recebido
+com a linha atual do banco e acrescenta eventos tipados ao outbox
+`eventos_sync`, na mesma transação da escrita. Consumidores
+leem apenas os eventos novos a partir do seu cursor em `eventos_cursores`,
+sem varrer as tabelas de funcionários.
+
+Tipos de evento:
+- ferias_criada: novo registro (nome + data de saída)
+- ferias_removida: registro que deixou de existir na planilha
+- retorno_alterado: data de retorno mudou
+- acesso_alterado: status de um sistema mudou (campo = sistema)
+- dados_alterados: unidade, motivo ou gestor mudou (campo = coluna)
+"""
+
+from pathlib import Path
+from typing import Callable, Dict, List, Tuple
+
+import sys
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.database import Database
+
+FERIAS_CRIADA = "ferias_criada"
+FERIAS_REMOVIDA = "ferias_removida"
+RETORNO_ALTERADO = "retorno_alterado"
+ACESSO_ALTERADO = "acesso_alterado"
+DADOS_ALTERADOS = "dados_alterados"
+
+CAMPOS_COMPARADOS = ("unidade", "motivo", "gestor")
+
+
+def _evento(tipo: str, chave: Tuple[str, str], campo: str = None,
+            anterior: str = None, novo: str = None) -> Dict:
+    return {
+        "tipo": tipo,
+        "nome": chave[0],
+        "data_saida": chave[1],
+        "campo": campo,
+        "valor_anterior": anterior,
+        "valor_novo": novo,
+    }
+
+
+def evento_criacao(chave: Tuple[str, str], registro: Dict) -> Dict:
+    """Evento de um registro novo."""
+    return _evento(FERIAS_CRIADA, chave, "data_retorno", None, registro.get("data_retorno"))
+
+
+def evento_remocao(chave: Tuple[str, str], anterior: Dict) -> Dict:
+    """Evento de um registro que deixou de existir na planilha."""
+    return _evento(FERIAS_REMOVIDA, chave, "data_retorno", anterior["data_retorno"], None)
+
+
+def eventos_alteracao(chave: Tuple[str, str], anterior: Dict, registro: Dict) -> List[Dict]:
+    """
+    Eventos de um registro existente (mesmo nome e data de saída).
+
+    Args:
+        chave: (nome, data_saida)
+        anterior: Estado gravado, com data_retorno, unidade, motivo, gestor e `acessos`
+        registro: Registro recebido
+    """
+    eventos = []
+    if anterior["data_retorno"] != registro.get("data_retorno"):
+        eventos.append(_evento(
+            RETORNO_ALTERADO, chave, "data_retorno",
+            anterior["data_retorno"], registro.get("data_retorno")
+        ))
+
+    for campo in CAMPOS_COMPARADOS:
+        de, para = anterior.get(campo) or "", registro.get(campo) or ""
+        if de != para:
+            eventos.append(_evento(DADOS_ALTERADOS, chave, campo, de, para))
+
+    acessos_anteriores = anterior.get("acessos", {})
+    for sistema, status in (registro.get("acessos") or {}).items():
+        de = acessos_anteriores.get(sistema)
+        if de != status:
+            eventos.append(_evento(ACESSO_ALTERADO, chave, sistema, de, status))
+
+    return eventos
+
+
+def calcular_eventos(estado_atual: Dict[Tuple[str, str], Dict], registros: List[Dict]) -> List[Dict]:
+    """
+    Compara os registros recebidos com o estado atual do banco, sem gravar
+    (a sincronização gera os mesmos eventos dentro de `salvar_funcionarios`).
+
+    Args:
+        estado_atual: Resultado de `Database.buscar_estado_funcionarios()`
+        registros: Registros que serão gravados (em caso de chave repetida,
+                   o último prevalece, como na gravação)
+
+    Returns:
+        Lista de eventos de mudança
+    """
+    novos = {(r.get("nome", ""), r.get("data_saida")): r for r in registros}
+    eventos = []
+
+    for chave, registro in novos.items():
+        anterior = estado_atual.get(chave)
+        if anterior is None:
+            eventos.append(evento_criacao(chave, registro))
+        else:
+            eventos.extend(eventos_alteracao(chave, anterior, registro))
+
+    for chave, anterior in estado_atual.items():
+        if chave not in novos:
+            eventos.append(evento_remocao(chave, anterior))
+
+    return eventos
+
+
+class ConsumidorEventos:
+    """Lê o outbox a partir do cursor de um consumidor e confirma o processamento."""
+
+    def __init__(self, nome: str, db: Database = None):
+        self.nome = nome
+        self.db = db or Database()
+
+    def processar(self, funcao: Callable[[List[Dict]], None], tipos: List[str] = None,
+                  lote: int = 500) -> int:
+        """
+        Entrega os eventos pendentes à função, em lotes, avançando o cursor
+        somente após cada lote ser processado sem erro.
+
+        Args:
+            funcao: Recebe a lista de eventos do lote
+            tipos: Tipos de evento de interesse (todos se None)
+            lote: Tamanho máximo de cada lote
+
+        Returns:
+            Número de eventos processados
+        """
+        cursor = self.db.ler_cursor_eventos(self.nome)
+        total = 0
+
+        while True:
+            eventos = self.db.buscar_eventos_sync(apos_id=cursor, tipos=tipos, limite=lote)
+            if not eventos:
+                return total
+
+            funcao(eventos)
+            cursor = eventos[-1]["id"]
+            self.db.avancar_cursor_eventos(self.nome, cursor)
+            total += len(eventos)
@@ -0,0 +1,161 @@
+"""
+Modelo de leitura em memória dos funcionários.
+
+Snapshot imutável de `funcionarios` + acessos, carregado uma vez por versão
+dos dados e compartilhado por todo o processo (todas as sessões do
+Streamlit). As datas ficam em arrays NumPy de ordinais e há índices
+ordenados por saída, retorno, gestor e unidade; as consultas usam busca
+binária (`searchsorted`) em vez de ir ao SQLite.
+
+Uso:
+    modelo = obter_modelo_leitura(database)
+    modelo.buscar_em_ferias()
+"""
+
+import sys
+import threading
+from datetime import date, datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.database import Database
+
+# Sentinelas para datas ausentes: nunca satisfazem "saída <= hoje" / "retorno >= hoje"
+SEM_SAIDA = np.iinfo(np.int32).max
+SEM_RETORNO = np.iinfo(np.int32).min
+
+_modelos: Dict[str, "ModeloLeitura"] = {}
+_lock = threading.Lock()
+
+
+def _ordinal(valor: Optional[str], padrao: int) -> int:
+    try:
+        return date.fromisoformat(valor[:10]).toordinal()
+    except (TypeError, ValueError):
+        return padrao
+
+
+def _internar(valor):
+    return sys.intern(valor) if isinstance(valor, str) else valor
+
+
+class ModeloLeitura:
+    """Snapshot imutável dos funcionários com índices ordenados."""
+
+    def __init__(self, funcionarios: List[Dict], versao: int):
+        self.versao = versao
+        self._registros: Tuple[Dict, ...] = tuple(
+            {chave: _internar(valor) for chave, valor in f.items()} for f in funcionarios
+        )
+
+        self._saida = np.array([_ordinal(f.get("data_saida"), SEM_SAIDA) for f in self._registros], dtype=np.int32)
+        self._retorno = np.array([_ordinal(f.get("data_retorno"), SEM_RETORNO) for f in self._registros], dtype=np.int32)
+        self._ano = np.array([f.get("ano") or 0 for f in self._registros], dtype=np.int32)
+        self._mes = np.array([f.get("mes") or 0 for f in self._registros], dtype=np.int32)
+
+        self._ordem_saida = np.argsort(self._saida, kind="stable")
+        self._saida_ordenada = self._saida[self._ordem_saida]
+        self._ordem_retorno = np.argsort(self._retorno, kind="stable")
+        self._retorno_ordenado = self._retorno[self._ordem_retorno]
+
+        self._gestores, self._ordem_gestor, self._gestor_ordenado = self._indexar("gestor")
+        self._unidades, self._ordem_unidade, self._unidade_ordenada = self._indexar("unidade")
+
+    def _indexar(self, coluna: str) -> Tuple[Dict[str, int], np.ndarray, np.ndarray]:
+        """Índice por coluna texto: código do valor, depois data de saída decrescente."""
+        codigos_por_nome: Dict[str, int] = {}
+        codigos = np.array(
+            [codigos_por_nome.setdefault(f.get(coluna) or "", len(codigos_por_nome)) for f in self._registros],
+            dtype=np.int32
+        )
+        ordem = np.lexsort((-self._saida.astype(np.int64), codigos))
+        return codigos_por_nome, ordem, codigos[ordem]
+
+    def __len__(self) -> int:
+        return len(self._registros)
+
+    # ==================== CONSULTAS ====================
+
+    def _linhas(self, posicoes, com_acessos: bool = True) -> List[Dict]:
+        """Cópias dos registros (o snapshot não é alterado pelos chamadores)."""
+        linhas = []
+        for posicao in posicoes:
+            linha = dict(self._registros[posicao])
+            if com_acessos:
+                linha["acessos"] = dict(linha.get("acessos") or {})
+            else:
+                linha.pop("acessos", None)
+            linhas.append(linha)
+        return linhas
+
+    @staticmethod
+    def _hoje(hoje: date = None) -> int:
+        return (hoje or datetime.now().date()).toordinal()
+
+    def buscar_saindo_hoje(self, hoje: date = None) -> List[Dict]:
+        """Funcionários saindo de férias hoje."""
+        dia = self._hoje(hoje)
+        inicio = np.searchsorted(self._saida_ordenada, dia, side="left")
+        fim = np.searchsorted(self._saida_ordenada, dia, side="right")
+        return self._linhas(self._ordem_saida[inicio:fim])
+
+    def buscar_em_ferias(self, hoje: date = None) -> List[Dict]:
+        """Funcionários atualmente em férias, por data de retorno."""
+        dia = self._hoje(hoje)
+        inicio = np.searchsorted(self._retorno_ordenado, dia, side="left")
+        candidatos = self._ordem_retorno[inicio:]
+        return self._linhas(candidatos[self._saida[candidatos] <= dia])
+
+    def buscar_proximos_a_sair(self, dias: int = 7, hoje: date = None) -> List[Dict]:
+        """Funcionários que vão sair nos próximos X dias, por data de saída."""
+        dia = self._hoje(hoje)
+        inicio = np.searchsorted(self._saida_ordenada, dia, side="right")
+        fim = np.searchsorted(self._saida_ordenada, dia + dias, side="right")
+        return self._linhas(self._ordem_saida[inicio:fim])
+
+    def _buscar_por(self, codigos: Dict[str, int], ordem: np.ndarray, ordenado: np.ndarray,
+                    valor: str, ano: int = None, mes: int = None) -> List[Dict]:
+        codigo = codigos.get(valor)
+        if codigo is None or not valor:
+            return []
+        inicio = np.searchsorted(ordenado, codigo, side="left")
+        fim = np.searchsorted(ordenado, codigo, side="right")
+        posicoes = ordem[inicio:fim]
+        if ano:
+            posicoes = posicoes[self._ano[posicoes] == ano]
+        if mes:
+            posicoes = posicoes[self._mes[posicoes] == mes]
+        return self._linhas(posicoes, com_acessos=False)
+
+    def buscar_funcionarios_por_gestor(self, gestor: str, ano: int = None, mes: int = None) -> List[Dict]:
+        """Funcionários de um gestor (saída mais recente primeiro), com filtros opcionais."""
+        return self._buscar_por(self._gestores, self._ordem_gestor, self._gestor_ordenado, gestor, ano, mes)
+
+    def buscar_funcionarios_por_unidade(self, unidade: str) -> List[Dict]:
+        """Funcionários de uma unidade (saída mais recente primeiro)."""
+        return self._buscar_por(self._unidades, self._ordem_unidade, self._unidade_ordenada, unidade)
+
+
+def obter_modelo_leitura(db: Database = None) -> ModeloLeitura:
+    """
+    Retorna o modelo de leitura do banco, reconstruindo-o apenas quando a
+    versão dos dados mudou desde a última carga.
+    """
+    db = db or Database()
+    chave = str(db.db_path)
+    versao = db.buscar_versao_dados()
+
+    modelo = _modelos.get(chave)
+    if modelo is not None and modelo.versao == versao:
+        return modelo
+
+    with _lock:
+        modelo = _modelos.get(chave)
+        if modelo is None or modelo.versao != versao:
+            modelo = ModeloLeitura(db.buscar_funcionarios(), versao)
+            _modelos[chave] = modelo
+    return modelo
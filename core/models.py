@@ -117,6 +117,36 @@ class SyncLog:
         }
 
 
+@dataclass
+class EstatisticasPeriodo:
+    """Estatísticas de férias de um período (ano/mês), calculadas em uma única leitura."""
+    
+    ano: Optional[int] = None
+    mes: Optional[int] = None
+    total_registros: int = 0
+    funcionarios_unicos: int = 0
+    total_unidades: int = 0
+    total_gestores: int = 0
+    ranking: List[Dict] = field(default_factory=list)       # [{"nome", "total"}]
+    por_gestor: List[Dict] = field(default_factory=list)    # [{"gestor", "total"}]
+    por_unidade: List[Dict] = field(default_factory=list)   # [{"unidade", "total"}]
+    por_mes: List[Dict] = field(default_factory=list)       # [{"mes", "total"}]
+    
+    def to_dict(self) -> dict:
+        return {
+            "ano": self.ano,
+            "mes": self.mes,
+            "total_registros": self.total_registros,
+            "funcionarios_unicos": self.funcionarios_unicos,
+            "total_unidades": self.total_unidades,
+            "total_gestores": self.total_gestores,
+            "ranking": self.ranking,
+            "por_gestor": self.por_gestor,
+            "por_unidade": self.por_unidade,
+            "por_mes": self.por_mes,
+        }
+
+
 @dataclass
 class PasswordLink:
     """Representa um link de senha gerado."""
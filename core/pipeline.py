@@ -0,0 +1,140 @@
+"""
+Pipeline de etapas encadeadas por geradores.
+
+Cada etapa recebe o iterador da etapa anterior e devolve um novo iterador.
+O pipeline mede, para cada etapa:
+- Tempo de parede exclusivo (descontando o tempo gasto nas etapas anteriores)
+- Linhas de entrada e de saída
+- Quanto a etapa elevou o pico de memória residente do processo, também
+  exclusivo (o pico é do processo inteiro: só a etapa que o eleva recebe o
+  aumento, as demais ficam com zero)
+
+O pico é lido uma vez a cada troca de etapa (no fim de cada avanço) e o
+aumento desde a leitura anterior, de qualquer etapa, fica com a etapa que
+acabou de rodar.
+"""
+
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterable, Iterator, List, Optional
+
+# Import opcional do resource (indisponível no Windows)
+try:
+    import resource
+    HAS_RESOURCE = True
+except ImportError:
+    HAS_RESOURCE = False
+
+
+def _memoria_pico_kb() -> Optional[int]:
+    """Retorna o pico de memória residente do processo em KB (Linux)."""
+    if not HAS_RESOURCE:
+        return None
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+@dataclass
+class MetricaEtapa:
+    """Métricas coletadas de uma etapa do pipeline."""
+
+    nome: str
+    ordem: int
+    linhas_entrada: int = 0
+    linhas_saida: int = 0
+    tempo_inclusivo: float = 0.0
+    tempo_anteriores: float = 0.0
+    memoria_aumento_kb: Optional[int] = None  # aumento exclusivo do pico do processo (KB)
+
+    @property
+    def duracao_ms(self) -> float:
+        """Tempo exclusivo da etapa em milissegundos."""
+        return max(0.0, self.tempo_inclusivo - self.tempo_anteriores) * 1000
+
+    def to_dict(self) -> dict:
+        return {
+            "etapa": self.nome,
+            "ordem": self.ordem,
+            "duracao_ms": round(self.duracao_ms, 2),
+            "linhas_entrada": self.linhas_entrada,
+            "linhas_saida": self.linhas_saida,
+            "memoria_aumento_kb": self.memoria_aumento_kb,
+        }
+
+
+class Pipeline:
+    """Encadeia etapas geradoras e coleta métricas de cada uma."""
+
+    def __init__(self):
+        self.etapas: List[MetricaEtapa] = []
+        self._iterador: Iterator = iter(())
+        self._ultimo_pico_kb: Optional[int] = None
+
+    def etapa(self, nome: str, funcao: Callable[[Iterable], Iterable]) -> "Pipeline":
+        """
+        Adiciona uma etapa ao pipeline.
+
+        Args:
+            nome: Nome da etapa (download, parse, write...)
+            funcao: Função que recebe o iterador anterior e devolve um iterável
+
+        Returns:
+            O próprio pipeline, para encadeamento
+        """
+        anterior = self.etapas[-1] if self.etapas else None
+        metrica = MetricaEtapa(nome=nome, ordem=len(self.etapas) + 1)
+        self.etapas.append(metrica)
+
+        entrada = self._contar_entrada(metrica, self._iterador)
+        self._iterador = self._medir(metrica, anterior, funcao(entrada))
+        return self
+
+    def executar(self) -> List:
+        """Consome o pipeline até o fim e retorna os itens da última etapa."""
+        self._ultimo_pico_kb = _memoria_pico_kb()
+        return list(self._iterador)
+
+    def metricas(self) -> List[Dict]:
+        """Retorna as métricas de todas as etapas como dicionários."""
+        return [m.to_dict() for m in self.etapas]
+
+    @staticmethod
+    def _contar_entrada(metrica: MetricaEtapa, iterador: Iterator) -> Iterator:
+        """Conta os itens que a etapa consome da anterior."""
+        for item in iterador:
+            metrica.linhas_entrada += 1
+            yield item
+
+    def _medir(self, metrica: MetricaEtapa, anterior: Optional[MetricaEtapa],
+               iteravel: Iterable) -> Iterator:
+        """Mede tempo, saída e aumento do pico de memória de cada avanço da etapa."""
+        iterador = iter(iteravel)
+        while True:
+            base_anteriores = anterior.tempo_inclusivo if anterior else 0.0
+            inicio = time.perf_counter()
+            try:
+                item = next(iterador)
+                fim = False
+            except StopIteration:
+                fim = True
+            metrica.tempo_inclusivo += time.perf_counter() - inicio
+            if anterior:
+                metrica.tempo_anteriores += anterior.tempo_inclusivo - base_anteriores
+            self._registrar_memoria(metrica)
+
+            if fim:
+                return
+            metrica.linhas_saida += 1
+            yield item
+
+    def _registrar_memoria(self, metrica: MetricaEtapa):
+        """
+        Lê o pico uma vez e atribui à etapa o aumento desde a leitura
+        anterior: as etapas anteriores já leram ao fim dos próprios avanços.
+        """
+        pico = _memoria_pico_kb()
+        if pico is None:
+            return
+        if self._ultimo_pico_kb is None:
+            self._ultimo_pico_kb = pico
+        metrica.memoria_aumento_kb = (metrica.memoria_aumento_kb or 0) + pico - self._ultimo_pico_kb
+        self._ultimo_pico_kb = pico
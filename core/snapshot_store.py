@@ -0,0 +1,191 @@
+"""
+Armazenamento endereçado por conteúdo das planilhas sincronizadas.
+
+Cada planilha baixada é guardada uma única vez sob o seu hash, junto com um
+snapshot compacto dos registros já processados. Assim, reprocessar uma versão
+(sync forçada, depuração, replay histórico) não precisa reler o XLSX.
+
+Layout de `SNAPSHOT_DIR`:
+    <hash>.xlsx      Planilha original
+    <hash>.parquet   Registros normalizados (ou <hash>.json.gz sem pyarrow)
+    <hash>.meta.json Abas processadas, data de criação e versão do parser
+"""
+
+import gzip
+import json
+import shutil
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+# Import opcional do pyarrow (Parquet)
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    HAS_PYARROW = True
+except ImportError:
+    HAS_PYARROW = False
+
+import sys
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from config.settings import settings
+
+# Incrementar quando a lógica de processamento mudar, invalidando snapshots antigos
+VERSAO_PARSER = 2
+
+
+class SnapshotStore:
+    """Guarda planilhas e registros processados indexados pelo hash do conteúdo."""
+
+    def __init__(self, diretorio: Path = None):
+        self.diretorio = Path(diretorio or settings.SNAPSHOT_DIR)
+
+    # ==================== CAMINHOS ====================
+
+    def _caminho_planilha(self, arquivo_hash: str) -> Path:
+        return self.diretorio / f"{arquivo_hash}.xlsx"
+
+    def _caminho_registros(self, arquivo_hash: str) -> Path:
+        extensao = "parquet" if HAS_PYARROW else "json.gz"
+        return self.diretorio / f"{arquivo_hash}.{extensao}"
+
+    def _caminho_meta(self, arquivo_hash: str) -> Path:
+        return self.diretorio / f"{arquivo_hash}.meta.json"
+
+    # ==================== ESCRITA ====================
+
+    def guardar_planilha(self, arquivo: Path, arquivo_hash: str) -> Path:
+        """Copia a planilha para o store se ainda não existir."""
+        destino = self._caminho_planilha(arquivo_hash)
+        if not destino.exists():
+            self.diretorio.mkdir(parents=True, exist_ok=True)
+            temporario = destino.with_suffix(".tmp")
+            shutil.copyfile(arquivo, temporario)
+            temporario.replace(destino)
+        return destino
+
+    def guardar_snapshot(self, arquivo_hash: str, registros: List[Dict], abas: List[Dict]):
+        """Grava os registros processados e as abas da versão."""
+        self.diretorio.mkdir(parents=True, exist_ok=True)
+        caminho = self._caminho_registros(arquivo_hash)
+        temporario = caminho.with_name(caminho.name + ".tmp")
+
+        if HAS_PYARROW:
+            pq.write_table(pa.Table.from_pylist(registros), temporario, compression="zstd")
+        else:
+            with gzip.open(temporario, "wt", encoding="utf-8") as f:
+                json.dump(registros, f, ensure_ascii=False)
+        temporario.replace(caminho)
+
+        meta = {
+            "hash": arquivo_hash,
+            "criado_em": datetime.now().isoformat(),
+            "versao_parser": VERSAO_PARSER,
+            "total_registros": len(registros),
+            "abas": abas,
+        }
+        self._caminho_meta(arquivo_hash).write_text(json.dumps(meta, ensure_ascii=False), encoding="utf-8")
+
+    # ==================== LEITURA ====================
+
+    def caminho_planilha(self, arquivo_hash: str) -> Optional[Path]:
+        """Retorna a planilha original de uma versão, se guardada."""
+        caminho = self._caminho_planilha(arquivo_hash)
+        return caminho if caminho.exists() else None
+
+    def carregar_snapshot(self, arquivo_hash: str) -> Optional[Tuple[List[Dict], List[Dict]]]:
+        """
+        Carrega os registros e abas processados de uma versão.
+
+        Returns:
+            Tupla (registros, abas) ou None se não houver snapshot válido
+        """
+        meta = self._ler_meta(arquivo_hash)
+        caminho = self._caminho_registros(arquivo_hash)
+        if not meta or meta.get("versao_parser") != VERSAO_PARSER or not caminho.exists():
+            return None
+
+        try:
+            if HAS_PYARROW:
+                registros = pq.read_table(caminho).to_pylist()
+            else:
+                with gzip.open(caminho, "rt", encoding="utf-8") as f:
+                    registros = json.load(f)
+        except Exception as e:
+            print(f"   ⚠️ Snapshot {arquivo_hash[:12]} ilegível: {e}")
+            return None
+
+        return registros, meta.get("abas", [])
+
+    def listar_versoes(self) -> List[Dict]:
+        """Lista as versões guardadas, da mais recente para a mais antiga."""
+        versoes = []
+        for caminho_meta in self.diretorio.glob("*.meta.json"):
+            arquivo_hash = caminho_meta.name[:-len(".meta.json")]
+            meta = self._ler_meta(arquivo_hash)
+            if not meta:
+                continue
+            meta["bytes"] = sum(c.stat().st_size for c in self._arquivos_versao(arquivo_hash))
+            versoes.append(meta)
+        return sorted(versoes, key=lambda v: v.get("criado_em", ""), reverse=True)
+
+    def _ler_meta(self, arquivo_hash: str) -> Optional[Dict]:
+        caminho = self._caminho_meta(arquivo_hash)
+        if not caminho.exists():
+            return None
+        try:
+            return json.loads(caminho.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+
+    def _arquivos_versao(self, arquivo_hash: str) -> List[Path]:
+        return [c for c in self.diretorio.glob(f"{arquivo_hash}.*") if c.is_file()]
+
+    # ==================== RETENÇÃO ====================
+
+    def aplicar_retencao(self, max_versoes: int, max_bytes: int) -> List[str]:
+        """
+        Remove as versões mais antigas além do limite de quantidade e de bytes.
+        A versão mais recente é sempre mantida.
+
+        Returns:
+            Hashes das versões removidas
+        """
+        versoes = self.listar_versoes()
+        total_bytes = sum(v["bytes"] for v in versoes)
+        removidas = []
+
+        for indice in range(len(versoes) - 1, 0, -1):
+            versao = versoes[indice]
+            if indice < max_versoes and total_bytes <= max_bytes:
+                break
+            for caminho in self._arquivos_versao(versao["hash"]):
+                try:
+                    caminho.unlink()
+                except OSError:
+                    pass
+            total_bytes -= versao["bytes"]
+            removidas.append(versao["hash"])
+
+        return removidas
+
+    def manter_apenas(self, hashes: List[str]) -> List[str]:
+        """
+        Remove todas as versões cujo hash não está na lista.
+
+        Returns:
+            Hashes das versões removidas
+        """
+        manter = set(hashes)
+        removidas = []
+        for versao in self.listar_versoes():
+            if versao["hash"] in manter:
+                continue
+            for caminho in self._arquivos_versao(versao["hash"]):
+                try:
+                    caminho.unlink()
+                except OSError:
+                    pass
+            removidas.append(versao["hash"])
+        return removidas
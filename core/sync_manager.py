@@ -8,12 +8,15 @@ Responsável por:
 - Salvar no banco de dados
 """
 
+import csv
 import hashlib
+import io
+import itertools
 import re
 import urllib.request
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
 
 import pandas as pd
 import openpyxl
@@ -22,9 +25,17 @@ import sys
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from config.settings import settings
+from core.coordenador_sync import CoordenadorSync
 from core.database import Database
+from core.pipeline import Pipeline
+from core.snapshot_store import SnapshotStore
+from core.validacao_dados import ValidadorDados
+from modules.leitor_google_sheets import LeitorGoogleSheets
 from utils.google_sheets import extrair_sheet_id, construir_url_exportacao
 
+# Data como a exportação CSV escreve uma célula de data (dd/mm/aaaa, hora opcional)
+PADRAO_DATA_CSV = re.compile(r"^(\d{1,2}/\d{1,2}/\d{4})(?: \d{1,2}:\d{2}(?::\d{2})?)?$")
+
 
 class SyncManager:
     """Gerenciador de sincronização."""
@@ -34,6 +45,15 @@ class SyncManager:
         self.arquivo_excel: Optional[Path] = None
         self.dados_processados: List[Dict] = []
         self.abas_processadas: List[Dict] = []
+        self.metricas_etapas: List[Dict] = []
+        self.arquivo_hash: str = ""
+        self.snapshots = SnapshotStore()
+        self.snapshots_abas = SnapshotStore(settings.SNAPSHOT_DIR / "abas")
+        self.hashes_abas: List[str] = []
+        self.abas_alteradas: List[str] = []
+        self.problemas: List[Dict] = []
+        self.total_eventos: int = 0
+        self.sync_id: Optional[int] = None
     
     # ==================== DOWNLOAD ====================
     
@@ -288,6 +308,15 @@ class SyncManager:
         # Qualquer outro valor = NB (Não Bloqueado - valor desconhecido tratado como liberado)
         return "NB"
     
+    def _status_reconhecido(self, valor: Any) -> bool:
+        """Indica se o valor da célula é um status de acesso conhecido (ou vazio)."""
+        if pd.isna(valor) or str(valor).strip() in ["", "nan"]:
+            return True
+        return str(valor).upper().strip() in [
+            "BLOQUEADO", "BLOQ", "LIBERADO", "LIB", "-", "NB",
+            "NP", "N/P", "N\\A", "NA", "N/A"
+        ]
+    
     def _extrair_mes_ano(self, nome_aba: str) -> Tuple[Optional[int], Optional[int]]:
         """Extrai mês e ano do nome da aba."""
         meses = {
@@ -331,9 +360,16 @@ class SyncManager:
     
     def processar_planilha(self) -> List[Dict]:
         """Processa a planilha e extrai dados."""
+        self.dados_processados = list(self._iterar_planilha())
+        if self.abas_processadas:
+            print(f"\n📈 Total: {len(self.dados_processados)} funcionários, {len(self.abas_processadas)} abas")
+        return self.dados_processados
+    
+    def _iterar_planilha(self) -> Iterator[Dict]:
+        """Percorre as abas da planilha gerando os registros de cada uma."""
         if not self.arquivo_excel or not self.arquivo_excel.exists():
             print("❌ Nenhum arquivo para processar")
-            return []
+            return
         
         print(f"\n📊 Processando: {self.arquivo_excel.name}")
         
@@ -341,50 +377,82 @@ class SyncManager:
             wb = openpyxl.load_workbook(self.arquivo_excel, data_only=True)
         except Exception as e:
             print(f"   ❌ Erro: {e}")
-            return []
+            return
         
-        self.dados_processados = []
         self.abas_processadas = []
         
         print(f"\n📋 Total de abas na planilha: {len(wb.sheetnames)}")
         
         for nome_aba in wb.sheetnames:
-            mes, ano = self._extrair_mes_ano(nome_aba)
-            
-            # Se não conseguir extrair mês/ano, usa valores padrão
-            if mes is None:
-                print(f"   ⚠️  {nome_aba}: sem mês/ano identificável, usando mês/ano atuais")
-                mes = datetime.now().month
-                ano = datetime.now().year
-            
-            ws = wb[nome_aba]
-            funcionarios = self._processar_aba(ws, nome_aba, mes, ano)
-            
-            if funcionarios:
-                self.dados_processados.extend(funcionarios)
-                self.abas_processadas.append({
-                    "nome": nome_aba,
-                    "mes": mes,
-                    "ano": ano,
-                    "total_funcionarios": len(funcionarios)
-                })
-                print(f"   ✅ {nome_aba}: {len(funcionarios)} funcionários")
-            else:
-                print(f"   ⚠️  {nome_aba}: 0 funcionários (aba vazia ou sem dados válidos)")
-                # Adiciona aba mesmo vazia para contar
-                self.abas_processadas.append({
-                    "nome": nome_aba,
-                    "mes": mes,
-                    "ano": ano,
-                    "total_funcionarios": 0
-                })
+            funcionarios, info = self._ler_aba(wb[nome_aba], nome_aba)
+            # Adiciona aba mesmo vazia para contar
+            self.abas_processadas.append(info)
+            yield from funcionarios
+    
+    def _ler_aba(self, ws, nome_aba: str) -> Tuple[List[Dict], Dict]:
+        """Identifica mês/ano da aba e extrai seus funcionários."""
+        mes, ano = self._extrair_mes_ano(nome_aba)
+        
+        # Se não conseguir extrair mês/ano, usa valores padrão
+        if mes is None:
+            print(f"   ⚠️  {nome_aba}: sem mês/ano identificável, usando mês/ano atuais")
+            mes = datetime.now().month
+            ano = datetime.now().year
+        
+        problemas = []
+        funcionarios = self._processar_aba(ws, nome_aba, mes, ano, problemas)
+        
+        if funcionarios:
+            print(f"   ✅ {nome_aba}: {len(funcionarios)} funcionários")
+        else:
+            print(f"   ⚠️  {nome_aba}: 0 funcionários (aba vazia ou sem dados válidos)")
+        
+        info = {
+            "nome": nome_aba,
+            "mes": mes,
+            "ano": ano,
+            "total_funcionarios": len(funcionarios),
+            "problemas": problemas
+        }
+        return funcionarios, info
+    
+    def _ler_aba_csv(self, aba: Dict) -> Tuple[List[Dict], Dict]:
+        """
+        Carrega o CSV de uma aba numa planilha em memória e extrai seus funcionários.
         
-        print(f"\n📈 Total: {len(self.dados_processados)} funcionários, {len(self.abas_processadas)} abas")
-        return self.dados_processados
+        As datas voltam a ser datetime, como as células de data do XLSX, para
+        que passem pelas mesmas correções (ex.: dia/mês invertido no retorno).
+        """
+        wb = openpyxl.Workbook()
+        ws = wb.active
+        texto = aba["conteudo"].decode("utf-8-sig", errors="replace")
+        for linha in csv.reader(io.StringIO(texto)):
+            ws.append([self._valor_csv(valor) for valor in linha])
+        return self._ler_aba(ws, aba["nome"])
     
-    def _processar_aba(self, ws, nome_aba: str, mes: int, ano: int) -> List[Dict]:
-        """Processa uma aba específica."""
+    def _valor_csv(self, valor: str) -> Any:
+        """Valor de uma célula do CSV com o tipo que ela teria no XLSX."""
+        if valor == "":
+            return None
+        data = PADRAO_DATA_CSV.match(valor.strip())
+        if data:
+            try:
+                return datetime.strptime(data.group(1), "%d/%m/%Y")
+            except ValueError:
+                pass
+        return valor
+    
+    def _processar_aba(self, ws, nome_aba: str, mes: int, ano: int,
+                       problemas: List[Dict] = None) -> List[Dict]:
+        """
+        Processa uma aba específica.
+        
+        Linhas descartadas (datas ilegíveis ou erro inesperado) são
+        registradas em `problemas`, se informado.
+        """
         funcionarios = []
+        if problemas is None:
+            problemas = []
         
         # Mapeia colunas pelo nome do header
         colunas = {}
@@ -471,6 +539,7 @@ class SyncManager:
         
         # Processa linhas
         for i, row in enumerate(ws.iter_rows(min_row=2), start=2):
+            nome_bruto = None
             try:
                 # Extração de dados brutos usando índices dinâmicos
                 unidade = row[idx_unidade].value if len(row) > idx_unidade else None
@@ -504,6 +573,14 @@ class SyncManager:
                     data_retorno = self._validar_data_retorno(data_retorno, data_saida, mes, ano)
 
                 if not data_saida or not data_retorno:
+                    problemas.append({
+                        "tipo": "data_invalida",
+                        "severidade": "erro",
+                        "nome": nome,
+                        "aba": nome_aba,
+                        "linha": i,
+                        "detalhe": f"Linha descartada: saída '{saida_raw}', retorno '{retorno_raw}'"
+                    })
                     continue
 
                 # Gestor
@@ -515,11 +592,14 @@ class SyncManager:
                 
                 # Acessos
                 acessos = {}
+                desconhecidos = []
                 for sistema in settings.SISTEMAS_ACESSO:
                     if sistema in idx_sistemas:
                         idx = idx_sistemas[sistema]
                         if len(row) > idx:
                             acessos[sistema] = self._mapear_status(row[idx].value)
+                            if not self._status_reconhecido(row[idx].value):
+                                desconhecidos.append(f"{sistema}={str(row[idx].value).strip()}")
                         else:
                             acessos[sistema] = "NB"  # Coluna existe mas célula vazia
                     else:
@@ -536,79 +616,358 @@ class SyncManager:
                     "aba_origem": nome_aba,
                     "mes": mes,
                     "ano": ano,
+                    "linha": i,
+                    "status_desconhecidos": "; ".join(desconhecidos),
                     "acessos": acessos
                 })
                 
-            except Exception:
-                continue
+            except Exception as e:
+                problemas.append({
+                    "tipo": "linha_invalida",
+                    "severidade": "erro",
+                    "nome": str(nome_bruto or "").strip(),
+                    "aba": nome_aba,
+                    "linha": i,
+                    "detalhe": f"Erro ao processar linha: {e}"
+                })
         
         return funcionarios
 
+    # ==================== SNAPSHOTS ====================
+    
+    def _registros_da_versao(self, arquivo_hash: str) -> Iterator[Dict]:
+        """Gera os registros da versão, lendo o snapshot ou processando o XLSX."""
+        snapshot = self.snapshots.carregar_snapshot(arquivo_hash) if arquivo_hash else None
+        if snapshot:
+            registros, self.abas_processadas = snapshot
+            print(f"\n⚡ Usando snapshot processado: {arquivo_hash[:12]} ({len(registros)} registros)")
+            yield from registros
+            return
+        
+        registros = []
+        for registro in self._iterar_planilha():
+            registros.append(registro)
+            yield registro
+        
+        if arquivo_hash and self.abas_processadas:
+            try:
+                self.snapshots.guardar_snapshot(arquivo_hash, registros, self.abas_processadas)
+            except Exception as e:
+                print(f"   ⚠️ Não foi possível gravar o snapshot: {e}")
+    
+    def carregar_versao(self, arquivo_hash: str = None) -> List[Dict]:
+        """
+        Carrega os registros processados de uma versão da planilha.
+        
+        Usa o snapshot guardado quando existe; senão processa o XLSX
+        (a planilha atual ou a guardada para o hash) e grava o snapshot.
+        
+        Args:
+            arquivo_hash: Hash da versão. Se None, usa a planilha atual.
+            
+        Returns:
+            Lista de registros processados
+        """
+        if arquivo_hash:
+            arquivo = self.snapshots.caminho_planilha(arquivo_hash)
+            if arquivo:
+                self.arquivo_excel = arquivo
+        else:
+            arquivo_hash = self.calcular_hash()
+            if arquivo_hash and self.arquivo_excel:
+                self.snapshots.guardar_planilha(self.arquivo_excel, arquivo_hash)
+        
+        self.arquivo_hash = arquivo_hash or ""
+        self.dados_processados = list(self._registros_da_versao(self.arquivo_hash))
+        return self.dados_processados
+    
+    # ==================== ETAPAS DO PIPELINE ====================
+    
+    def _etapa_download(self, _entrada: Iterable, forcar: bool, versao: str = None) -> Iterator[Path]:
+        """Etapa 1: baixa a planilha (ou usa o cache / uma versão guardada)."""
+        if versao:
+            arquivo = self.snapshots.caminho_planilha(versao)
+            if not arquivo:
+                self._falha = f"Versão {versao} não encontrada nos snapshots"
+                return
+            print(f"📦 Reprocessando versão guardada: {versao}")
+            self.arquivo_excel = arquivo
+            yield arquivo
+            return
+        
+        arquivo = self.baixar_planilha(forcar=forcar)
+        if not arquivo:
+            self._falha = "Falha no download"
+            return
+        yield arquivo
+    
+    def _etapa_fingerprint(self, arquivos: Iterable[Path], forcar: bool) -> Iterator[Path]:
+        """Etapa 2: calcula o hash, guarda a planilha e descarta arquivos não alterados."""
+        for arquivo in arquivos:
+            self.arquivo_hash = self.calcular_hash(arquivo)
+            try:
+                self.snapshots.guardar_planilha(arquivo, self.arquivo_hash)
+            except OSError as e:
+                print(f"   ⚠️ Não foi possível guardar a planilha no snapshot: {e}")
+            
+            if not forcar and not self.arquivo_mudou(self.arquivo_hash):
+                print("\n⏭️  Arquivo não foi alterado. Pulando processamento.")
+                self._pulado = True
+                continue
+            yield arquivo
+    
+    def _etapa_parse(self, arquivos: Iterable[Path]) -> Iterator[Dict]:
+        """Etapa 3: extrai os registros (do snapshot da versão, se existir)."""
+        for arquivo in arquivos:
+            self.arquivo_excel = arquivo
+            yield from self._registros_da_versao(self.arquivo_hash)
+    
+    def _etapa_download_csv(self, _entrada: Iterable) -> Iterator[Dict]:
+        """Etapa 1 (fonte CSV): descobre as abas e baixa o CSV de cada uma em paralelo."""
+        print("📥 Baixando abas da planilha em CSV...")
+        try:
+            leitor = LeitorGoogleSheets(settings.GOOGLE_SHEETS_URL)
+            abas = leitor.baixar_abas_csv(max_workers=settings.SYNC_CSV_WORKERS)
+        except Exception as e:
+            print(f"   ❌ Erro: {e}")
+            self._falha = "Falha no download"
+            return
+        print(f"   ✅ {len(abas)} abas baixadas")
+        yield from abas
+    
+    @staticmethod
+    def _chave_aba(aba: Dict) -> str:
+        """
+        Chave do snapshot da aba: conteúdo + gid + nome. Aba de origem, mês
+        e ano vêm do nome, então abas com o mesmo conteúdo (modelos em
+        branco, cópias) ou renomeadas não podem reaproveitar o snapshot.
+        """
+        return hashlib.md5(f"{aba['gid']}:{aba['nome']}:{aba['hash']}".encode()).hexdigest()
+    
+    def _etapa_fingerprint_csv(self, abas: Iterable[Dict], forcar: bool) -> Iterator[Dict]:
+        """Etapa 2 (fonte CSV): combina as chaves das abas e descarta se nada mudou."""
+        abas = list(abas)
+        if not abas:
+            return
+        
+        self.hashes_abas = [self._chave_aba(aba) for aba in abas]
+        self.arquivo_hash = hashlib.md5("\n".join(self.hashes_abas).encode()).hexdigest()
+        
+        if not forcar and not self.arquivo_mudou(self.arquivo_hash):
+            print("\n⏭️  Nenhuma aba foi alterada. Pulando processamento.")
+            self._pulado = True
+            return
+        yield from abas
+    
+    def _etapa_parse_csv(self, abas: Iterable[Dict]) -> Iterator[Dict]:
+        """Etapa 3 (fonte CSV): processa só as abas alteradas; as demais vêm do snapshot."""
+        self.abas_processadas = []
+        self.abas_alteradas = []
+        total_abas = 0
+        
+        for aba in abas:
+            total_abas += 1
+            chave = self._chave_aba(aba)
+            snapshot = self.snapshots_abas.carregar_snapshot(chave)
+            if snapshot:
+                registros, abas_info = snapshot
+            else:
+                self.abas_alteradas.append(aba["nome"])
+                registros, info = self._ler_aba_csv(aba)
+                abas_info = [info]
+                try:
+                    self.snapshots_abas.guardar_snapshot(chave, registros, abas_info)
+                except Exception as e:
+                    print(f"   ⚠️ Não foi possível gravar o snapshot da aba {aba['nome']}: {e}")
+            
+            self.abas_processadas.extend(abas_info)
+            yield from registros
+        
+        print(f"\n🔄 {len(self.abas_alteradas)} de {total_abas} abas alteradas")
+    
+    def _etapa_validar(self, funcionarios: Iterable[Dict]) -> Iterator[Dict]:
+        """
+        Etapa 4: descarta registros sem os campos obrigatórios, repassando os
+        demais à medida que chegam, e aplica as regras de qualidade sobre o
+        lote inteiro ao final.
+        """
+        validos = []
+        for f in funcionarios:
+            if f.get("nome") and f.get("data_saida") and f.get("data_retorno"):
+                validos.append(f)
+                yield f
+        
+        self.problemas = [p for aba in self.abas_processadas for p in aba.get("problemas", [])]
+        self.problemas += ValidadorDados().validar(validos)
+        if self.problemas:
+            print(f"\n🔎 {len(self.problemas)} problemas de qualidade encontrados")
+    
+    def _etapa_gravar(self, funcionarios: Iterable[Dict]) -> Iterator[Dict]:
+        """
+        Etapa 5: aplica os registros processados ao banco (só o que mudou,
+        removendo os que saíram da planilha). Os eventos de mudança são
+        gerados pela própria gravação, na mesma transação.
+        Na carga inicial (banco vazio) nenhum evento é gerado.
+        
+        Os registros vão direto do parse para `salvar_funcionarios`, sem cópia
+        intermediária: a etapa é o destino do fluxo e não repassa registros.
+        """
+        registros = iter(funcionarios)
+        primeiro = next(registros, None)
+        if primeiro is None:
+            if not self._pulado and not self._falha:
+                self._falha = "Falha no processamento"
+            return
+        
+        print("\n💾 Salvando no banco de dados...")
+        self.sync_id = self.db.iniciar_sync(self.arquivo_hash)
+        self.total_salvos = self.db.salvar_funcionarios(
+            itertools.chain([primeiro], registros), substituir=True, sync_id=self.sync_id
+        )
+        print(f"\n📈 Total: {self.total_salvos} funcionários, {len(self.abas_processadas)} abas")
+        self.total_eventos = self.db.contar_eventos_sync(self.sync_id)
+        if self.total_eventos:
+            print(f"\n📨 {self.total_eventos} eventos de mudança")
+        self.db.salvar_abas(self.abas_processadas, substituir=True)
+        yield from ()
+    
+    def _etapa_pos_processamento(self, funcionarios: Iterable[Dict]) -> Iterator[Dict]:
+        """Etapa 6: salva o hash e aplica a retenção dos snapshots."""
+        yield from funcionarios
+        if self.total_salvos:
+            self.salvar_hash(self.arquivo_hash)
+            removidas = self.snapshots.aplicar_retencao(
+                max_versoes=settings.SNAPSHOT_MAX_VERSOES,
+                max_bytes=settings.SNAPSHOT_MAX_MB * 1024 * 1024
+            )
+            for arquivo_hash in removidas:
+                print(f"   🗑️  Snapshot removido: {arquivo_hash[:12]}")
+            if self.hashes_abas:
+                self.snapshots_abas.manter_apenas(self.hashes_abas)
+    
     # ==================== SINCRONIZAÇÃO ====================
     
-    def sincronizar(self, forcar: bool = False) -> Dict:
+    def sincronizar(self, forcar: bool = False, versao: str = None) -> Dict:
         """
         Executa sincronização completa.
         
+        Apenas uma sincronização roda por vez entre todos os processos; se já
+        houver uma em andamento, aguarda e retorna o resultado dela (com
+        `forcar`, se a em andamento não era forçada, aguarda e executa outra).
+        
+        Args:
+            forcar: Se True, força download e processamento
+            versao: Hash de uma versão guardada para reprocessar (implica forcar)
+            
+        Returns:
+            Dicionário com resultado da sincronização
+        """
+        coordenador = CoordenadorSync(self.db)
+        return coordenador.executar(
+            "sincronizacao", lambda: self._executar_sincronizacao(forcar, versao), forcar=forcar or bool(versao)
+        )
+    
+    def _executar_sincronizacao(self, forcar: bool = False, versao: str = None) -> Dict:
+        """
+        Executa as etapas da sincronização.
+        
+        O fluxo é um pipeline de etapas encadeadas por geradores
+        (download → fingerprint → parse → validate → write → post-process);
+        o tempo, as linhas e o pico de memória de cada etapa são gravados
+        em `sync_etapas`.
+        
+        Com `SYNC_FONTE=csv`, as abas são baixadas como CSV em paralelo e
+        apenas as abas cujo conteúdo mudou são processadas.
+        
         Args:
             forcar: Se True, força download e processamento
+            versao: Hash de uma versão guardada para reprocessar
             
         Returns:
             Dicionário com resultado da sincronização
         """
+        forcar = forcar or bool(versao)
+        
         print("=" * 60)
         print("🔄 SINCRONIZAÇÃO DE DADOS")
         print(f"⏰ {datetime.now().strftime('%d/%m/%Y às %H:%M:%S')}")
         print("=" * 60)
         
-        # 1. Baixar planilha
-        if not self.baixar_planilha(forcar=forcar):
+        self._falha = None
+        self._pulado = False
+        self.arquivo_hash = ""
+        self.abas_processadas = []
+        self.hashes_abas = []
+        self.abas_alteradas = []
+        self.problemas = []
+        self.total_eventos = 0
+        self.total_salvos = 0
+        self.sync_id = None
+        
+        pipeline = Pipeline()
+        if settings.SYNC_FONTE.lower() == "csv" and not versao:
+            pipeline.etapa("download", self._etapa_download_csv)
+            pipeline.etapa("fingerprint", lambda abas: self._etapa_fingerprint_csv(abas, forcar))
+            pipeline.etapa("parse", self._etapa_parse_csv)
+        else:
+            pipeline.etapa("download", lambda entrada: self._etapa_download(entrada, forcar, versao))
+            pipeline.etapa("fingerprint", lambda arquivos: self._etapa_fingerprint(arquivos, forcar))
+            pipeline.etapa("parse", self._etapa_parse)
+        pipeline.etapa("validate", self._etapa_validar)
+        pipeline.etapa("write", self._etapa_gravar)
+        pipeline.etapa("post-process", self._etapa_pos_processamento)
+        try:
+            pipeline.executar()
+        except Exception as e:
+            if self.sync_id:
+                self.db.registrar_sync(
+                    total_registros=self.total_salvos,
+                    total_abas=len(self.abas_processadas),
+                    status="ERROR",
+                    mensagem=f"Erro na sincronização: {e}",
+                    arquivo_hash=self.arquivo_hash,
+                    sync_id=self.sync_id
+                )
+            raise
+        self.metricas_etapas = pipeline.metricas()
+        
+        if self._falha:
             return {
                 "status": "error",
-                "message": "Falha no download",
+                "message": self._falha,
                 "registros": 0
             }
         
-        # 2. Verificar hash
-        novo_hash = self.calcular_hash()
-        if not forcar and not self.arquivo_mudou(novo_hash):
-            print("\n⏭️  Arquivo não foi alterado. Pulando processamento.")
+        if self._pulado:
             return {
                 "status": "skipped",
                 "message": "Arquivo não foi alterado",
                 "registros": 0
             }
         
-        # 3. Processar dados
-        if not self.processar_planilha():
-            return {
-                "status": "error",
-                "message": "Falha no processamento",
-                "registros": 0
-            }
+        total = self.total_salvos
         
-        # 4. Salvar no banco
-        print("\n💾 Salvando no banco de dados...")
-        self.db.limpar_dados()
-        total = self.db.salvar_funcionarios(self.dados_processados)
-        self.db.salvar_abas(self.abas_processadas)
-        
-        # 5. Registrar sync
-        self.db.registrar_sync(
+        # Registra sync e o tempo de cada etapa
+        sync_id = self.db.registrar_sync(
             total_registros=total,
             total_abas=len(self.abas_processadas),
             status="SUCCESS",
             mensagem="Sincronização concluída com sucesso",
-            arquivo_hash=novo_hash
+            arquivo_hash=self.arquivo_hash,
+            sync_id=self.sync_id
         )
-        
-        # 6. Salvar hash
-        self.salvar_hash(novo_hash)
+        self.db.registrar_etapas_sync(sync_id, self.metricas_etapas)
+        self.db.registrar_problemas_sync(sync_id, self.problemas)
         
         print("\n" + "=" * 60)
         print("✅ SINCRONIZAÇÃO CONCLUÍDA!")
         print(f"   📊 {total} funcionários salvos")
         print(f"   📑 {len(self.abas_processadas)} abas processadas")
+        if self.problemas:
+            print(f"   🔎 {len(self.problemas)} problemas de qualidade")
+        for etapa in self.metricas_etapas:
+            print(f"   ⏱️  {etapa['etapa']}: {etapa['duracao_ms']:.0f} ms "
+                  f"({etapa['linhas_entrada']} → {etapa['linhas_saida']})")
         print("=" * 60)
         
         return {
@@ -616,6 +975,10 @@ class SyncManager:
             "message": f"Sincronizados {total} funcionários",
             "registros": total,
             "abas": len(self.abas_processadas),
+            "abas_alteradas": self.abas_alteradas,
+            "problemas": len(self.problemas),
+            "eventos": self.total_eventos,
+            "etapas": self.metricas_etapas,
             "timestamp": datetime.now().isoformat()
         }
 
@@ -629,23 +992,24 @@ def main():
     parser = argparse.ArgumentParser(description='Sincronizador de Férias')
     parser.add_argument('--forcar', '-f', action='store_true',
                        help='Força download mesmo com cache válido')
+    parser.add_argument('--versao', metavar='HASH',
+                       help='Reprocessa uma versão guardada nos snapshots')
+    parser.add_argument('--listar-versoes', action='store_true',
+                       help='Lista as versões guardadas nos snapshots')
     
     args = parser.parse_args()
     
     sync = SyncManager()
-    resultado = sync.sincronizar(forcar=args.forcar)
+    
+    if args.listar_versoes:
+        for v in sync.snapshots.listar_versoes():
+            print(f"{v['hash']}  {v['criado_em'][:19]}  {v['total_registros']:>6} registros  {v['bytes'] / 1024:.0f} KB")
+        return 0
+    
+    resultado = sync.sincronizar(forcar=args.forcar, versao=args.versao)
     
     return 0 if resultado["status"] == "success" else 1
 
 
 if __name__ == "__main__":
     exit(main())
-
-
-
-
-
-
-
-
-
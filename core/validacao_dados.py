@@ -0,0 +1,113 @@
+"""
+Validação de qualidade dos dados sincronizados.
+
+As regras rodam coluna a coluna sobre o lote inteiro de registros (pandas),
+com custo linear no número de linhas:
+- Retorno antes da saída
+- Ausência mais longa que o limite configurado
+- Mesmo funcionário e data de saída em mais de um registro/aba
+- Valores de status de acesso não reconhecidos
+"""
+
+from pathlib import Path
+from typing import Dict, Iterable, List
+
+import pandas as pd
+
+import sys
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from config.settings import settings
+
+ERRO = "erro"
+AVISO = "aviso"
+
+
+class ValidadorDados:
+    """Aplica as regras de qualidade a um lote de registros processados."""
+
+    def __init__(self, max_dias: int = None):
+        self.max_dias = max_dias or settings.VALIDACAO_MAX_DIAS
+
+    def validar(self, registros: List[Dict]) -> List[Dict]:
+        """
+        Valida o lote e retorna os problemas encontrados.
+
+        Args:
+            registros: Registros no formato produzido pelo parser
+
+        Returns:
+            Lista de dicts com tipo, severidade, nome, aba, linha e detalhe
+        """
+        if not registros:
+            return []
+
+        df = pd.DataFrame(registros, columns=[
+            "nome", "aba_origem", "linha", "data_saida", "data_retorno", "status_desconhecidos"
+        ])
+        df["saida"] = pd.to_datetime(df["data_saida"], errors="coerce")
+        df["retorno"] = pd.to_datetime(df["data_retorno"], errors="coerce")
+
+        problemas = []
+        problemas += self._retorno_antes_da_saida(df)
+        problemas += self._duracao_excessiva(df)
+        problemas += self._duplicados(df)
+        problemas += self._status_desconhecidos(df)
+        return problemas
+
+    # ==================== REGRAS ====================
+
+    def _retorno_antes_da_saida(self, df: pd.DataFrame) -> List[Dict]:
+        invalidos = df[df["retorno"] < df["saida"]]
+        return self._problemas(
+            invalidos, "retorno_antes_saida", ERRO,
+            "Retorno " + invalidos["data_retorno"] + " antes da saída " + invalidos["data_saida"]
+        )
+
+    def _duracao_excessiva(self, df: pd.DataFrame) -> List[Dict]:
+        dias = (df["retorno"] - df["saida"]).dt.days
+        longos = df[dias > self.max_dias]
+        return self._problemas(
+            longos, "duracao_excessiva", AVISO,
+            dias[longos.index].astype(int).astype(str) + f" dias (limite {self.max_dias})"
+        )
+
+    def _duplicados(self, df: pd.DataFrame) -> List[Dict]:
+        chave = df["nome"].str.strip().str.upper()
+        repetidos = df[pd.DataFrame({"nome": chave, "saida": df["data_saida"]}).duplicated(keep=False)]
+        if repetidos.empty:
+            return []
+
+        chaves = list(zip(chave[repetidos.index], repetidos["data_saida"]))
+        abas_por_chave: Dict[tuple, set] = {}
+        for k, aba in zip(chaves, repetidos["aba_origem"]):
+            abas_por_chave.setdefault(k, set()).add(aba)
+
+        return self._problemas(repetidos, "duplicado", AVISO, [
+            f"Saída {saida} repetida em: {', '.join(sorted(abas_por_chave[(nome, saida)]))}"
+            for nome, saida in chaves
+        ])
+
+    def _status_desconhecidos(self, df: pd.DataFrame) -> List[Dict]:
+        desconhecidos = df[df["status_desconhecidos"].fillna("") != ""]
+        return self._problemas(
+            desconhecidos, "status_desconhecido", AVISO,
+            "Status não reconhecido (tratado como NB): " + desconhecidos["status_desconhecidos"]
+        )
+
+    @staticmethod
+    def _problemas(linhas: pd.DataFrame, tipo: str, severidade: str, detalhes: Iterable[str]) -> List[Dict]:
+        """Converte as linhas marcadas por uma regra em registros de problema."""
+        return [
+            {
+                "tipo": tipo,
+                "severidade": severidade,
+                "nome": nome,
+                "aba": aba,
+                "linha": None if pd.isna(linha) else int(linha),
+                "detalhe": detalhe,
+            }
+            for nome, aba, linha, detalhe in zip(
+                linhas["nome"], linhas["aba_origem"], linhas["linha"], detalhes
+            )
+        ]
@@ -85,6 +85,7 @@ def testar_planilha_completa(url: str) -> Dict:
     Returns:
         Dicionário com resultado do teste
     """
+    from core.coordenador_sync import CoordenadorSync
     from core.sync_manager import SyncManager
     
     resultado = {
@@ -102,42 +103,38 @@ def testar_planilha_completa(url: str) -> Dict:
     resultado["detalhes"]["sheet_id"] = sheet_id
     resultado["detalhes"]["url_valida"] = True
     
-    # Tenta baixar e processar
+    # Tenta baixar e processar (aguarda sincronizações em andamento)
     try:
         sync = SyncManager()
-        
-        # Força download
-        arquivo = sync.baixar_planilha(forcar=True)
-        if not arquivo:
-            resultado["mensagem"] = "❌ Erro ao baixar planilha"
-            return resultado
-        
-        resultado["detalhes"]["arquivo_baixado"] = True
-        resultado["detalhes"]["nome_arquivo"] = arquivo.name
-        
-        # Tenta processar
-        dados = sync.processar_planilha()
-        if not dados:
-            resultado["mensagem"] = "⚠️ Planilha baixada, mas nenhum dado foi processado. Verifique o formato."
-            return resultado
-        
-        resultado["sucesso"] = True
-        resultado["mensagem"] = f"✅ Tudo OK! Planilha processada com sucesso: {len(dados)} funcionários em {len(sync.abas_processadas)} aba(s)"
-        resultado["detalhes"]["total_funcionarios"] = len(dados)
-        resultado["detalhes"]["total_abas"] = len(sync.abas_processadas)
-        resultado["detalhes"]["abas"] = [a["nome"] for a in sync.abas_processadas[:10]]  # Primeiras 10
-        
-        return resultado
+        coordenador = CoordenadorSync(sync.db)
+        return coordenador.executar("teste_planilha", lambda: _baixar_e_processar(sync, resultado))
         
     except Exception as e:
         resultado["mensagem"] = f"❌ Erro ao processar: {str(e)}"
         return resultado
 
 
-
-
-
-
-
-
-
+def _baixar_e_processar(sync, resultado: Dict) -> Dict:
+    """Baixa e processa a planilha preenchendo o resultado do teste."""
+    # Força download
+    arquivo = sync.baixar_planilha(forcar=True)
+    if not arquivo:
+        resultado["mensagem"] = "❌ Erro ao baixar planilha"
+        return resultado
+    
+    resultado["detalhes"]["arquivo_baixado"] = True
+    resultado["detalhes"]["nome_arquivo"] = arquivo.name
+    
+    # Tenta processar
+    dados = sync.processar_planilha()
+    if not dados:
+        resultado["mensagem"] = "⚠️ Planilha baixada, mas nenhum dado foi processado. Verifique o formato."
+        return resultado
+    
+    resultado["sucesso"] = True
+    resultado["mensagem"] = f"✅ Tudo OK! Planilha processada com sucesso: {len(dados)} funcionários em {len(sync.abas_processadas)} aba(s)"
+    resultado["detalhes"]["total_funcionarios"] = len(dados)
+    resultado["detalhes"]["total_abas"] = len(sync.abas_processadas)
+    resultado["detalhes"]["abas"] = [a["nome"] for a in sync.abas_processadas[:10]]  # Primeiras 10
+    
+    return resultado
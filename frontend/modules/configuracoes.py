@@ -4,6 +4,7 @@ Página de Configurações do Sistema.
 
 import sys
 from pathlib import Path
+from datetime import datetime
 
 # Adiciona raiz ao path
 ROOT_DIR = Path(__file__).parent.parent.parent
@@ -23,6 +24,7 @@ from core.sync_manager import SyncManager
 from integrations.evolution_api import MensagensAutomaticas, EvolutionAPI
 from integrations.onetimesecret import OneTimeSecretAPI
 from integrations.kanbanize import KanbanizeAPI
+from scheduler.saude import avaliar_heartbeat
 
 
 def render(database):
@@ -34,11 +36,7 @@ def render(database):
         if st.session_state['config_saved']:
             message = st.session_state.get('config_message', 'Configurações salvas com sucesso!')
             st.success(f"✅ **{message}**")
-            
-            # Só mostra aviso de reinício manual se não estiver em Docker
-            em_docker = Path("/.dockerenv").exists()
-            if not em_docker:
-                st.info("⚠️ **Importante:** Para aplicar as mudanças na sincronização automática, reinicie o scheduler (`./scripts/scheduler.sh` ou `python -m scheduler.jobs`)")
+            st.caption("🔄 Os horários são aplicados automaticamente ao scheduler em execução.")
         else:
             error_msg = st.session_state.get('config_error', 'Erro desconhecido ao salvar')
             st.error(f"❌ **Erro ao salvar configurações: {error_msg}**")
@@ -65,7 +63,7 @@ def render(database):
     kanbanize_base_url = config_atual.get("KANBANIZE_BASE_URL", "https://fmimpressosltda.kanbanize.com")
     kanbanize_api_key = config_atual.get("KANBANIZE_API_KEY", "")
     
-    st.info("💡 As configurações são salvas no arquivo `.env`. Após alterar, reinicie o scheduler se estiver rodando.")
+    st.info("💡 As configurações são salvas no arquivo `.env` e aplicadas automaticamente ao scheduler em execução.")
     
     st.divider()
     
@@ -1083,32 +1081,23 @@ def render(database):
                     # Recarrega settings
                     settings.carregar_env()
                     
-                    # Tenta reiniciar o scheduler automaticamente (apenas em Docker)
+                    # Sinaliza o scheduler pelo banco: ele aplica só os jobs alterados em até 1s
                     scheduler_reiniciado = False
-                    em_docker = Path("/.dockerenv").exists()
-                    
-                    if em_docker:
-                        try:
-                            # No Docker, envia sinal para o container do scheduler
-                            # O docker-compose deve ter configurado o volume compartilhado
-                            lock_file = Path("/app/data/.scheduler.lock")
-                            reload_flag = Path("/app/data/.scheduler.reload")
-                            
-                            # Cria flag para indicar que deve recarregar
-                            reload_flag.write_text(f"{datetime.now().isoformat()}\n")
-                            scheduler_reiniciado = True
-                            
-                            # Registra log
-                            database.registrar_log(
-                                tipo="sistema",
-                                categoria="Configurações",
-                                status="sucesso",
-                                mensagem="Configurações salvas e sinal de reload enviado ao scheduler",
-                                origem="configuracoes"
-                            )
-                        except Exception as e_docker:
-                            # Se falhar, não é crítico
-                            pass
+                    try:
+                        database.emitir_sinal("scheduler_reload")
+                        scheduler_reiniciado = True
+                        
+                        # Registra log
+                        database.registrar_log(
+                            tipo="sistema",
+                            categoria="Configurações",
+                            status="sucesso",
+                            mensagem="Configurações salvas e sinal de reload enviado ao scheduler",
+                            origem="configuracoes"
+                        )
+                    except Exception:
+                        # Se falhar, não é crítico
+                        pass
                     
                     # Salva mensagem de sucesso no session_state
                     st.session_state['config_saved'] = True
@@ -1131,6 +1120,46 @@ def render(database):
     
     st.divider()
     
+    # ==================== FERIADOS LOCAIS ====================
+    st.subheader("📅 Feriados Locais")
+
+    st.caption("ℹ️ Feriados nacionais já são considerados automaticamente. Cadastre aqui feriados municipais, "
+               "estaduais e pontos facultativos (ex: Carnaval). Em feriados os jobs agendados não rodam e o "
+               "\"próximo dia útil\" os pula.")
+
+    with st.expander("🗓️ Gerenciar feriados locais"):
+        feriados = database.buscar_feriados()
+        if feriados:
+            for feriado in feriados:
+                col_fer1, col_fer2 = st.columns([5, 1])
+                data_feriado = datetime.strptime(feriado["data"], "%Y-%m-%d")
+                with col_fer1:
+                    quando = data_feriado.strftime("%d/%m") + " (todo ano)" if feriado["recorrente"] else data_feriado.strftime("%d/%m/%Y")
+                    st.markdown(f"**{quando}** · {feriado['nome']}")
+                with col_fer2:
+                    if st.button("🗑️", key=f"btn_remover_feriado_{feriado['data']}"):
+                        database.remover_feriado(feriado["data"])
+                        st.rerun()
+        else:
+            st.info("📭 Nenhum feriado local cadastrado.")
+
+        col_fer1, col_fer2, col_fer3 = st.columns([1, 2, 1])
+        with col_fer1:
+            nova_data = st.date_input("Data:", key="novo_feriado_data", format="DD/MM/YYYY")
+        with col_fer2:
+            novo_nome = st.text_input("Descrição:", key="novo_feriado_nome", placeholder="Ex: Aniversário da cidade")
+        with col_fer3:
+            novo_recorrente = st.checkbox("Repete todo ano", key="novo_feriado_recorrente")
+
+        if st.button("➕ Adicionar feriado", key="btn_adicionar_feriado"):
+            if novo_nome.strip():
+                database.salvar_feriado(nova_data.strftime("%Y-%m-%d"), novo_nome.strip(), novo_recorrente)
+                st.rerun()
+            else:
+                st.warning("⚠️ Informe a descrição do feriado.")
+
+    st.divider()
+
     # ==================== INFORMAÇÕES ADICIONAIS ====================
     with st.expander("ℹ️ Informações sobre as configurações"):
         st.markdown("""
@@ -1190,84 +1219,18 @@ def _verificar_status_servicos(database, config_atual):
         "google_sheets": {"status": "unknown", "mensagem": "", "detalhes": ""}
     }
     
-    # 1. Verifica Scheduler
+    # 1. Verifica Scheduler (heartbeat gravado no banco pelo próprio scheduler)
     try:
-        # Detecta se está rodando em Docker
-        em_docker = Path("/.dockerenv").exists()
-        
-        if em_docker:
-            # No Docker, verifica o container scheduler
-            try:
-                result = subprocess.run(
-                    ["docker", "ps", "--filter", "name=controle-ferias-scheduler", "--format", "{{.Status}}"],
-                    capture_output=True,
-                    text=True,
-                    timeout=5
-                )
-                if result.returncode == 0 and result.stdout.strip() and "Up" in result.stdout:
-                    status_geral["scheduler"]["status"] = "sucesso"
-                    status_geral["scheduler"]["mensagem"] = "Scheduler rodando em container"
-                    status_geral["scheduler"]["detalhes"] = result.stdout.strip()
-                else:
-                    status_geral["scheduler"]["status"] = "erro"
-                    status_geral["scheduler"]["mensagem"] = "Container scheduler não está rodando"
-            except:
-                # Fallback: verifica se o arquivo de lock existe (compartilhado entre containers)
-                lock_file = Path("/app/data/.scheduler.lock")
-                if lock_file.exists():
-                    status_geral["scheduler"]["status"] = "sucesso"
-                    status_geral["scheduler"]["mensagem"] = "Scheduler rodando (container separado)"
-                    status_geral["scheduler"]["detalhes"] = "Detectado via lock file"
-                else:
-                    status_geral["scheduler"]["status"] = "warning"
-                    status_geral["scheduler"]["mensagem"] = "Não foi possível verificar (Docker)"
-        else:
-            # Não está em Docker, verifica localmente
-            result = subprocess.run(
-                ["pgrep", "-f", "scheduler.jobs"],
-                capture_output=True,
-                text=True,
-                timeout=5
-            )
-            if result.returncode == 0:
-                pids = result.stdout.strip().split('\n')
-                pids = [pid.strip() for pid in pids if pid.strip()]
-                if pids:
-                    status_geral["scheduler"]["status"] = "sucesso"
-                    status_geral["scheduler"]["mensagem"] = f"Scheduler rodando (PID: {', '.join(pids)})"
-                    status_geral["scheduler"]["detalhes"] = f"{len(pids)} processo(s) ativo(s)"
-                else:
-                    status_geral["scheduler"]["status"] = "erro"
-                    status_geral["scheduler"]["mensagem"] = "Scheduler não está rodando"
-            else:
-                # Tenta com ps aux (fallback)
-                try:
-                    result = subprocess.run(
-                        ["ps", "aux"],
-                        capture_output=True,
-                        text=True,
-                        timeout=5
-                    )
-                    if result.returncode == 0:
-                        encontrado = False
-                        for line in result.stdout.split('\n'):
-                            if 'scheduler.jobs' in line and 'grep' not in line:
-                                encontrado = True
-                                parts = line.split()
-                                if len(parts) > 1:
-                                    status_geral["scheduler"]["status"] = "sucesso"
-                                    status_geral["scheduler"]["mensagem"] = f"Scheduler rodando (PID: {parts[1]})"
-                                    status_geral["scheduler"]["detalhes"] = "Processo encontrado"
-                                break
-                        if not encontrado:
-                            status_geral["scheduler"]["status"] = "erro"
-                            status_geral["scheduler"]["mensagem"] = "Scheduler não está rodando"
-                    else:
-                        status_geral["scheduler"]["status"] = "warning"
-                        status_geral["scheduler"]["mensagem"] = "Não foi possível verificar (comando ps não disponível)"
-                except:
-                    status_geral["scheduler"]["status"] = "warning"
-                    status_geral["scheduler"]["mensagem"] = "Não foi possível verificar o scheduler"
+        heartbeat = database.buscar_heartbeat()
+        saudavel, mensagem = avaliar_heartbeat(heartbeat)
+        status_geral["scheduler"]["status"] = "sucesso" if saudavel else "erro"
+        status_geral["scheduler"]["mensagem"] = mensagem
+        if heartbeat:
+            detalhes = f"PID {heartbeat['pid']} em {heartbeat['host']} · iniciado em {heartbeat['iniciado_em']}"
+            if heartbeat["proximos"]:
+                proximo = heartbeat["proximos"][0]
+                detalhes += f" · próximo: {proximo['nome']} às {proximo['proxima'][11:16]}"
+            status_geral["scheduler"]["detalhes"] = detalhes
     except Exception as e:
         status_geral["scheduler"]["status"] = "erro"
         status_geral["scheduler"]["mensagem"] = f"Erro ao verificar: {str(e)}"
@@ -10,9 +10,11 @@ ROOT_DIR = Path(__file__).parent.parent.parent
 sys.path.insert(0, str(ROOT_DIR))
 
 import streamlit as st
-from datetime import datetime, timedelta
+from datetime import datetime
 from typing import Dict
 
+from core.modelo_leitura import obter_modelo_leitura
+from utils.calendario import rotulo_dia
 from frontend.components import exibir_tabela_funcionarios
 
 
@@ -58,29 +60,17 @@ def render(database):
     
     # Busca dados do banco
     abas = database.buscar_abas()
-    saindo_hoje = database.buscar_saindo_hoje()
+    modelo = obter_modelo_leitura(database)
+    saindo_hoje = modelo.buscar_saindo_hoje()
     voltando_proximo_dia = database.buscar_retornos_proximo_dia_util()
-    em_ferias = database.buscar_em_ferias()
-    proximos_sair = database.buscar_proximos_a_sair(dias=7)
+    em_ferias = modelo.buscar_em_ferias()
+    proximos_sair = modelo.buscar_proximos_a_sair(dias=7)
     
-    # Determina texto para "voltando" baseado no dia da semana
+    # Determina texto para "voltando" pelo próximo dia útil (considera feriados)
     hoje = datetime.now()
-    dia_semana = hoje.weekday()  # 0=segunda, 4=sexta, 5=sábado, 6=domingo
-    if dia_semana >= 4:  # Sexta (4), Sábado (5) ou Domingo (6)
-        texto_voltando = "Voltando Segunda"
-        # Calcula dias até segunda
-        if dia_semana == 4:  # Sexta
-            dias_ate_segunda = 3
-        elif dia_semana == 5:  # Sábado
-            dias_ate_segunda = 2
-        else:  # Domingo
-            dias_ate_segunda = 1
-        proxima_segunda = (hoje + timedelta(days=dias_ate_segunda)).strftime('%d/%m/%Y')
-        texto_voltando_completo = f"Voltando Segunda ({proxima_segunda})"
-    else:
-        texto_voltando = "Voltando Amanhã"
-        amanha = (hoje + timedelta(days=1)).strftime('%d/%m/%Y')
-        texto_voltando_completo = f"Voltando Amanhã ({amanha})"
+    proximo_dia_util = database.calendario().proximo_dia_util(hoje)
+    texto_voltando = f"Voltando {rotulo_dia(proximo_dia_util, hoje).split('-')[0]}"  # "Amanhã", "Segunda"...
+    texto_voltando_completo = f"{texto_voltando} ({proximo_dia_util.strftime('%d/%m/%Y')})"
     
     # Seletor de aba
     if abas:
@@ -17,6 +17,7 @@ import traceback
 from config.settings import settings
 from integrations.onetimesecret import OneTimeSecretAPI
 from frontend.components import formatar_data
+from utils.calendario import rotulo_dia
 
 
 def render(database):
@@ -36,10 +37,9 @@ def render(database):
         # Busca pessoas voltando para usar na lógica
         voltando_proximo_dia = database.buscar_retornos_proximo_dia_util()
         
-        # Determina texto "Amanhã" ou "Segunda"
+        # Determina texto "Amanhã" ou o dia da semana do próximo dia útil
         hoje = datetime.now()
-        dia_semana = hoje.weekday()
-        texto_voltando = "Segunda-feira" if dia_semana >= 4 else "Amanhã"
+        texto_voltando = rotulo_dia(database.calendario().proximo_dia_util(hoje), hoje)
         
         # --- SELETOR DE MODO (Fora do form para atualizar a UI) ---
         col_modo_1, col_modo_2 = st.columns([1, 2])
@@ -100,9 +100,10 @@ def render():
     db = get_database()
     
     # Tabs para diferentes tipos de logs
-    tab_atividades, tab_sync, tab_mensagens, tab_arquivo = st.tabs([
+    tab_atividades, tab_sync, tab_jobs, tab_mensagens, tab_arquivo = st.tabs([
         "📊 Atividades Gerais", 
         "🔄 Sincronizações", 
+        "⏱️ Jobs Agendados",
         "💬 Mensagens", 
         "📁 Arquivo de Log"
     ])
@@ -248,6 +249,79 @@ def render():
         else:
             st.info("📭 Nenhuma sincronização registrada ainda.")
     
+    # ==================== ABA: JOBS AGENDADOS ====================
+    with tab_jobs:
+        st.subheader("⏱️ Desempenho dos Jobs Agendados")
+        
+        janelas = {"Últimas 24 horas": 24, "Últimos 7 dias": 24 * 7, "Últimos 30 dias": 24 * 30}
+        col_janela1, col_janela2 = st.columns([3, 1])
+        with col_janela2:
+            janela = st.selectbox("Janela:", list(janelas), index=1, key="janela_metricas_jobs")
+        
+        metricas = db.buscar_metricas_jobs(horas=janelas[janela])
+        
+        if metricas:
+            col_job1, col_job2, col_job3 = st.columns(3)
+            col_job1.metric("Disparos", sum(m["disparos"] for m in metricas))
+            col_job2.metric("❌ Erros", sum(m["erros"] for m in metricas))
+            col_job3.metric("⏰ Misfires", sum(m["misfires"] for m in metricas))
+            
+            def _segundos(valor):
+                return "-" if valor is None else f"{valor:.1f}s"
+            
+            st.dataframe(
+                [
+                    {
+                        "Job": m["job_id"],
+                        "Disparos": m["disparos"],
+                        "✅ Sucesso": m["sucessos"],
+                        "⏭️ Pulados": m["pulados"],
+                        "❌ Erros": m["erros"],
+                        "⏰ Misfires": m["misfires"],
+                        "Duração p50": _segundos(m["p50_segundos"]),
+                        "Duração p95": _segundos(m["p95_segundos"]),
+                        "Atraso médio": _segundos(m["atraso_medio_segundos"]),
+                        "Último disparo": _formatar_timestamp(m["ultimo_disparo"]),
+                    }
+                    for m in metricas
+                ],
+                use_container_width=True,
+                hide_index=True
+            )
+            st.caption("Misfires: disparos perdidos (scheduler parado ou atrasado) ou ignorados porque a execução anterior ainda rodava.")
+        else:
+            st.info("📭 Nenhuma execução de job registrada nesta janela.")
+
+        # Dead-letter: horários que esgotaram as novas tentativas
+        st.markdown("---")
+        st.subheader("☠️ Execuções Esgotadas")
+
+        esgotadas = db.buscar_job_runs(limite=50, status="esgotado")
+        aguardando = db.buscar_job_runs(limite=50, status="reexecutar")
+
+        if aguardando:
+            st.info(f"🔁 {len(aguardando)} reexecução(ões) aguardando o scheduler: "
+                    + ", ".join(f"{r['job_id']} ({r['agendado_para'][5:16]})" for r in aguardando))
+
+        if esgotadas:
+            for execucao in esgotadas:
+                col_dl1, col_dl2 = st.columns([5, 1])
+                with col_dl1:
+                    st.markdown(
+                        f"**{execucao['job_id']}** · agendado para {_formatar_timestamp(execucao['agendado_para'])}"
+                        f" · {execucao['tentativas']} tentativa(s)"
+                    )
+                    if execucao.get("erro"):
+                        st.caption(f"❌ {execucao['erro'][:300]}")
+                with col_dl2:
+                    if st.button("🔁 Reexecutar", key=f"btn_reexecutar_{execucao['id']}"):
+                        if db.solicitar_reexecucao_job_run(execucao["id"]):
+                            db.emitir_sinal("scheduler_reexecucao")
+                        st.rerun()
+        else:
+            st.success("✅ Nenhuma execução esgotada.")
+        st.caption("Jobs que falham são tentados de novo com espera crescente até o limite de tentativas ou o prazo do tipo (ex: mensagem da manhã até 11:00).")
+
     # ==================== ABA: MENSAGENS ====================
     with tab_mensagens:
         st.subheader("💬 Log de Mensagens WhatsApp")
@@ -17,6 +17,10 @@ from datetime import datetime, timedelta
 from typing import Dict, List
 from collections import defaultdict
 
+from core.modelo_leitura import obter_modelo_leitura
+
+PERIODOS_POR_PAGINA = 20
+
 
 def render(database):
     """Renderiza a página de relatórios."""
@@ -61,60 +65,81 @@ def render(database):
         _render_calendario_anual(database)
 
 
+def _formatar_data(data_iso: str) -> str:
+    """Converte YYYY-MM-DD para DD/MM/YYYY (N/A se vazia)."""
+    try:
+        return datetime.strptime(data_iso, '%Y-%m-%d').strftime('%d/%m/%Y')
+    except (TypeError, ValueError):
+        return "N/A"
+
+
 def _render_relatorio_funcionario(database):
     """Relatório de histórico de férias por funcionário."""
     st.subheader("👤 Histórico de Férias por Funcionário")
     
-    # Busca todos os funcionários
-    historico = database.buscar_historico_ferias_por_funcionario()
-    
-    if not historico:
-        st.info("Nenhum registro de férias encontrado.")
-        return
-    
-    # Campo de busca
+    # Campo de busca (ignora acentos, maiúsculas e espaços extras)
     busca = st.text_input("🔍 Buscar funcionário:", placeholder="Digite o nome...")
     
-    # Filtra se houver busca
-    if busca:
-        historico = {k: v for k, v in historico.items() if busca.lower() in k.lower()}
+    pessoas = database.buscar_pessoas(busca=busca or None)
     
-    if not historico:
-        st.warning(f"Nenhum funcionário encontrado com '{busca}'")
+    if not pessoas:
+        if busca:
+            st.warning(f"Nenhum funcionário encontrado com '{busca}'")
+        else:
+            st.info("Nenhum registro de férias encontrado.")
         return
     
     # Seletor de funcionário
-    nomes = sorted(historico.keys())
-    funcionario_selecionado = st.selectbox(
+    nomes_por_id = {p["id"]: p["nome"] for p in pessoas}
+    pessoa_id = st.selectbox(
         "Selecione um funcionário:",
-        options=nomes,
+        options=list(nomes_por_id),
+        format_func=nomes_por_id.get,
         key="select_func_relatorio"
     )
     
-    if funcionario_selecionado:
-        dados = historico[funcionario_selecionado]
-        ferias_list = dados["ferias"]
+    if pessoa_id:
+        funcionario_selecionado = nomes_por_id[pessoa_id]
+        resumo = database.buscar_resumo_pessoa(pessoa_id) or {}
         
-        # Métricas do funcionário
-        col1, col2, col3 = st.columns(3)
+        # Métricas do funcionário (resumo pré-calculado na sincronização)
+        col1, col2, col3, col4 = st.columns(4)
         
         with col1:
-            st.metric("📊 Total de Períodos", len(ferias_list))
+            st.metric("📊 Total de Períodos", resumo.get("periodos", 0))
         
         with col2:
-            total_dias = sum(f.get("dias", 0) for f in ferias_list)
-            st.metric("📅 Total de Dias", total_dias)
+            st.metric("📅 Total de Dias", resumo.get("total_dias", 0))
         
         with col3:
-            if ferias_list:
-                ultima = ferias_list[0]  # Já vem ordenado por data desc
-                st.metric("🗓️ Última Férias", ultima.get("data_saida_fmt", "N/A"))
+            st.metric("🗓️ Última Férias", _formatar_data(resumo.get("ultima_saida")))
+        
+        with col4:
+            st.metric("🔜 Próximas Férias", _formatar_data(resumo.get("proxima_saida")))
+        
+        if resumo.get("por_ano"):
+            st.caption(" | ".join(
+                f"{ano}: {dados['periodos']} período(s), {dados['total_dias']} dias"
+                for ano, dados in resumo["por_ano"].items()
+            ))
         
         st.divider()
         
-        # Tabela de histórico
+        # Tabela de histórico (paginada: só a página exibida é lida do banco)
         st.markdown("**📋 Histórico Completo:**")
         
+        total_periodos = resumo.get("periodos", 0)
+        total_paginas = max(1, -(-total_periodos // PERIODOS_POR_PAGINA))
+        pagina = 1
+        if total_paginas > 1:
+            pagina = st.number_input(
+                f"Página (de {total_paginas}):", min_value=1, max_value=total_paginas, value=1,
+                key=f"pagina_historico_{pessoa_id}"
+            )
+        ferias_list = database.historico(
+            pessoa_id, offset=(pagina - 1) * PERIODOS_POR_PAGINA, limite=PERIODOS_POR_PAGINA
+        )
+        
         if ferias_list:
             df = pd.DataFrame(ferias_list)
             
@@ -131,6 +156,9 @@ def _render_relatorio_funcionario(database):
             if "dias" in df.columns:
                 colunas_exibir.append("dias")
                 mapeamento["dias"] = "⏱️ Dias"
+            if "dias_desde_anterior" in df.columns:
+                colunas_exibir.append("dias_desde_anterior")
+                mapeamento["dias_desde_anterior"] = "↔️ Dias desde o período anterior"
             if "motivo" in df.columns:
                 colunas_exibir.append("motivo")
                 mapeamento["motivo"] = "📝 Motivo"
@@ -145,9 +173,9 @@ def _render_relatorio_funcionario(database):
                 df_exibir = df[colunas_exibir].rename(columns=mapeamento)
                 st.dataframe(df_exibir, width="stretch", hide_index=True)
         
-        # Botão de exportar
+        # Botão de exportar (histórico inteiro da pessoa)
         if ferias_list:
-            csv = pd.DataFrame(ferias_list).to_csv(index=False)
+            csv = pd.DataFrame(database.buscar_historico_pessoa(pessoa_id)).to_csv(index=False)
             st.download_button(
                 label="📥 Exportar CSV",
                 data=csv,
@@ -291,7 +319,7 @@ def _render_relatorio_gestor(database):
     
     with col_filtro1:
         # Lista de gestores para seleção
-        lista_gestores = sorted([g["gestor"] for g in todos_gestores if g["gestor"]])
+        lista_gestores = database.buscar_gestores()
         gestor_selecionado = st.selectbox(
             "🧑‍💼 Selecione o Gestor:",
             options=lista_gestores,
@@ -321,7 +349,7 @@ def _render_relatorio_gestor(database):
         st.markdown(f"### 🧑‍💼 Detalhes: **{gestor_selecionado}**")
         
         # Busca funcionários do gestor com filtros
-        funcionarios_gestor = database.buscar_funcionarios_por_gestor(
+        funcionarios_gestor = obter_modelo_leitura(database).buscar_funcionarios_por_gestor(
             gestor=gestor_selecionado,
             ano=ano_filtro if ano_filtro != 0 else None,
             mes=mes_filtro if mes_filtro != 0 else None
@@ -470,13 +498,14 @@ def _render_estatisticas(database):
     
     st.divider()
     
-    # Busca estatísticas filtradas
-    stats = database.buscar_estatisticas_filtradas(
+    # Busca todas as estatísticas do período em uma única leitura
+    stats = database.buscar_estatisticas_periodo(
         ano=ano_selecionado if ano_selecionado != 0 else None,
-        mes=mes_selecionado if mes_selecionado != 0 else None
+        mes=mes_selecionado if mes_selecionado != 0 else None,
+        limite=10
     )
     
-    if not stats:
+    if not stats.total_registros:
         st.info("Nenhum dado disponível para os filtros selecionados.")
         return
     
@@ -497,23 +526,23 @@ def _render_estatisticas(database):
     col1, col2, col3, col4 = st.columns(4)
     
     with col1:
-        st.metric("📊 Total de Registros", stats.get("total_registros", 0))
+        st.metric("📊 Total de Registros", stats.total_registros)
     
     with col2:
-        st.metric("👥 Funcionários Únicos", stats.get("funcionarios_unicos", 0))
+        st.metric("👥 Funcionários Únicos", stats.funcionarios_unicos)
     
     with col3:
-        st.metric("👤 RH Solicitantes", stats.get("total_unidades", 0))
+        st.metric("👤 RH Solicitantes", stats.total_unidades)
     
     with col4:
-        st.metric("👤 Gestores", stats.get("total_gestores", 0))
+        st.metric("👤 Gestores", stats.total_gestores)
     
     st.divider()
     
     # Se filtrou por ano, mostra distribuição por mês
     if ano_selecionado != 0 and mes_selecionado == 0:
         st.markdown(f"**📆 Distribuição por Mês em {ano_selecionado}:**")
-        dados_mes = database.buscar_ferias_por_mes(ano_selecionado)
+        dados_mes = stats.por_mes
         
         if dados_mes:
             df_meses = pd.DataFrame([
@@ -527,11 +556,7 @@ def _render_estatisticas(database):
     
     # Ranking de funcionários com mais férias (filtrado)
     st.markdown("**🏆 Funcionários com Mais Períodos de Férias:**")
-    ranking = database.buscar_ranking_ferias_filtrado(
-        limite=10,
-        ano=ano_selecionado if ano_selecionado != 0 else None,
-        mes=mes_selecionado if mes_selecionado != 0 else None
-    )
+    ranking = stats.ranking
     
     if ranking:
         df_ranking = pd.DataFrame(ranking)
@@ -550,11 +575,7 @@ def _render_estatisticas(database):
     
     # Top gestores (filtrado)
     st.markdown("**👤 Gestores com Mais Subordinados em Férias:**")
-    top_gestores = database.buscar_estatisticas_por_gestor_filtrado(
-        limite=10,
-        ano=ano_selecionado if ano_selecionado != 0 else None,
-        mes=mes_selecionado if mes_selecionado != 0 else None
-    )
+    top_gestores = stats.por_gestor
     
     if top_gestores:
         df_gestores = pd.DataFrame(top_gestores)
@@ -571,11 +592,7 @@ def _render_estatisticas(database):
     
     # Top unidades (filtrado)
     st.markdown("**👤 RH Solicitantes com Mais Férias:**")
-    top_unidades = database.buscar_estatisticas_por_unidade_filtrado(
-        limite=10,
-        ano=ano_selecionado if ano_selecionado != 0 else None,
-        mes=mes_selecionado if mes_selecionado != 0 else None
-    )
+    top_unidades = stats.por_unidade
     
     if top_unidades:
         df_unidades = pd.DataFrame(top_unidades)
@@ -10,11 +10,13 @@ ROOT_DIR = Path(__file__).parent.parent.parent
 sys.path.insert(0, str(ROOT_DIR))
 
 import streamlit as st
-from datetime import datetime, timedelta
-import subprocess
+from datetime import datetime
+
+import pandas as pd
 
 from config.settings import settings
 from core.sync_manager import SyncManager
+from scheduler.saude import avaliar_heartbeat
 
 
 def _enviar_notificacao_sync(resultado: dict, database) -> None:
@@ -57,6 +59,79 @@ def _enviar_notificacao_sync(resultado: dict, database) -> None:
         )
 
 
+def _render_tempo_etapas(database) -> None:
+    """Exibe o gráfico de tempo por etapa das últimas sincronizações."""
+    st.subheader("⏱️ Tempo por Etapa")
+    
+    etapas = database.buscar_etapas_sync(limite_syncs=20)
+    if not etapas:
+        st.caption("As métricas por etapa aparecem após a próxima sincronização.")
+        return
+    
+    df = pd.DataFrame(etapas)
+    df["Sincronização"] = df["sync_at"].astype(str).str[:16]
+    ordem_etapas = df.sort_values("ordem")["etapa"].unique().tolist()
+    
+    grafico = df.pivot_table(
+        index="Sincronização", columns="etapa", values="duracao_ms", aggfunc="sum"
+    ).reindex(columns=ordem_etapas).fillna(0)
+    st.bar_chart(grafico, y_label="ms")
+    
+    ultimo_sync = df["sync_id"].max()
+    ultima = df[df["sync_id"] == ultimo_sync]
+    st.dataframe(
+        ultima[["etapa", "duracao_ms", "linhas_entrada", "linhas_saida", "memoria_aumento_kb"]].rename(columns={
+            "etapa": "Etapa",
+            "duracao_ms": "Tempo (ms)",
+            "linhas_entrada": "Linhas entrada",
+            "linhas_saida": "Linhas saída",
+            "memoria_aumento_kb": "Aumento do pico de memória (KB)",
+        }),
+        width='stretch',
+        hide_index=True
+    )
+
+
+def _render_problemas_qualidade(database) -> None:
+    """Exibe os problemas de qualidade encontrados na última sincronização."""
+    st.subheader("🔎 Qualidade dos Dados")
+    
+    problemas = database.buscar_problemas_sync()
+    if not problemas:
+        st.success("Nenhum problema encontrado na última sincronização.")
+        return
+    
+    df = pd.DataFrame(problemas)
+    erros = int((df["severidade"] == "erro").sum())
+    
+    col1, col2 = st.columns(2)
+    col1.metric("Erros", erros)
+    col2.metric("Avisos", len(df) - erros)
+    
+    tipos = {
+        "retorno_antes_saida": "Retorno antes da saída",
+        "duracao_excessiva": "Ausência muito longa",
+        "duplicado": "Registro duplicado",
+        "status_desconhecido": "Status de acesso desconhecido",
+        "data_invalida": "Data ilegível (linha descartada)",
+        "linha_invalida": "Erro na linha (descartada)",
+    }
+    df["tipo"] = df["tipo"].map(tipos).fillna(df["tipo"])
+    
+    st.dataframe(
+        df[["severidade", "tipo", "nome", "aba", "linha", "detalhe"]].rename(columns={
+            "severidade": "Severidade",
+            "tipo": "Problema",
+            "nome": "Nome",
+            "aba": "Aba",
+            "linha": "Linha",
+            "detalhe": "Detalhe",
+        }),
+        width='stretch',
+        hide_index=True
+    )
+
+
 def render(database):
     """Renderiza a página de sincronização."""
     st.header("🔄 Sincronização de Dados")
@@ -128,135 +203,31 @@ def render(database):
             st.session_state['mostrar_status_scheduler'] = not st.session_state['mostrar_status_scheduler']
             st.rerun()
     
-    # Mostra informações do scheduler se estiver ativo
+    # Mostra o estado do scheduler a partir do heartbeat gravado por ele no banco
     if st.session_state.get('mostrar_status_scheduler', False):
-            with st.spinner("Verificando..."):
-                from pathlib import Path
-                
-                # Detecta se está em Docker
-                em_docker = Path("/.dockerenv").exists()
-                
-                # Busca configurações de horários
-                sync_hour = settings.SYNC_HOUR
-                sync_minute = settings.SYNC_MINUTE
-                manha_hour = settings.MENSAGEM_MANHA_HOUR
-                manha_minute = settings.MENSAGEM_MANHA_MINUTE
-                tarde_hour = settings.MENSAGEM_TARDE_HOUR
-                tarde_minute = settings.MENSAGEM_TARDE_MINUTE
-                sync_notif_hour = settings.SYNC_NOTIF_HOUR
-                sync_notif_minute = settings.SYNC_NOTIF_MINUTE
-                
-                # Calcula próximo horário
-                agora = datetime.now()
-                proximos_horarios = []
-                
-                if settings.SYNC_ENABLED:
-                    sync_time = agora.replace(hour=sync_hour, minute=sync_minute, second=0, microsecond=0)
-                    if sync_time < agora:
-                        sync_time += timedelta(days=1)
-                    proximos_horarios.append(("Sincronização", sync_time))
-                
-                if settings.SYNC_NOTIF_ENABLED:
-                    sync_notif_time = agora.replace(hour=sync_notif_hour, minute=sync_notif_minute, second=0, microsecond=0)
-                    if sync_notif_time < agora:
-                        sync_notif_time += timedelta(days=1)
-                    proximos_horarios.append(("Sincronização + Notificação", sync_notif_time))
-                
-                if settings.KANBANIZE_SYNC_ENABLED and settings.KANBANIZE_SYNC_09H30_ENABLED:
-                    kanban_09h30_time = agora.replace(hour=9, minute=30, second=0, microsecond=0)
-                    if kanban_09h30_time < agora:
-                        kanban_09h30_time += timedelta(days=1)
-                    proximos_horarios.append(("Kanbanize Sync 09:30", kanban_09h30_time))
-                
-                if settings.KANBANIZE_SYNC_ENABLED and settings.KANBANIZE_SYNC_18H00_ENABLED:
-                    kanban_18h00_time = agora.replace(hour=18, minute=0, second=0, microsecond=0)
-                    if kanban_18h00_time < agora:
-                        kanban_18h00_time += timedelta(days=1)
-                    proximos_horarios.append(("Kanbanize Sync 18:00", kanban_18h00_time))
-                
-                if settings.MENSAGEM_MANHA_ENABLED:
-                    manha_time = agora.replace(hour=manha_hour, minute=manha_minute, second=0, microsecond=0)
-                    if manha_time < agora:
-                        manha_time += timedelta(days=1)
-                    proximos_horarios.append(("Mensagem Matutina", manha_time))
-                
-                if settings.MENSAGEM_TARDE_ENABLED:
-                    tarde_time = agora.replace(hour=tarde_hour, minute=tarde_minute, second=0, microsecond=0)
-                    if tarde_time < agora:
-                        tarde_time += timedelta(days=1)
-                    proximos_horarios.append(("Mensagem Vespertina", tarde_time))
-                
-                # Ordena e pega o próximo
-                proximos_horarios.sort(key=lambda x: x[1])
-                proximo = proximos_horarios[0] if proximos_horarios else None
-                
-                if em_docker:
-                    # Verifica arquivo de lock
-                    lock_file = Path("/app/data/.scheduler.lock")
-                    if lock_file.exists():
-                        try:
-                            lock_content = lock_file.read_text().strip()
-                            mensagem = f"✅ **Scheduler rodando** (container separado)\n\n"
-                            mensagem += f"**� Horário Atual:** {agora.strftime('%d/%m/%Y %H:%M:%S')}\n\n"
-                            mensagem += f"**�📅 Iniciado em:** {lock_content}\n\n"
-                            mensagem += f"**⏰ Horários Configurados:**\n"
-                            if settings.SYNC_ENABLED:
-                                mensagem += f"- 🔄 Sincronização: {sync_hour:02d}:{sync_minute:02d}\n"
-                            if settings.SYNC_NOTIF_ENABLED:
-                                mensagem += f"- 🔔 Sincronização + Notificação: {sync_notif_hour:02d}:{sync_notif_minute:02d}\n"
-                            if settings.KANBANIZE_SYNC_ENABLED and settings.KANBANIZE_SYNC_09H30_ENABLED:
-                                mensagem += f"- 📋 Kanbanize Sync: 09:30\n"
-                            if settings.KANBANIZE_SYNC_ENABLED and settings.KANBANIZE_SYNC_18H00_ENABLED:
-                                mensagem += f"- 📋 Kanbanize Sync: 18:00\n"
-                            if settings.MENSAGEM_MANHA_ENABLED:
-                                mensagem += f"- 🌅 Mensagem Matutina: {manha_hour:02d}:{manha_minute:02d}\n"
-                            if settings.MENSAGEM_TARDE_ENABLED:
-                                mensagem += f"- 🌆 Mensagem Vespertina: {tarde_hour:02d}:{tarde_minute:02d}\n"
-                            if proximo:
-                                mensagem += f"\n**⏭️ Próxima execução:**\n{proximo[0]} às {proximo[1].strftime('%H:%M:%S')}"
-                            st.success(mensagem)
-                        except:
-                            st.success("✅ Scheduler rodando (container separado)")
-                    else:
-                        st.error("❌ Scheduler não está rodando\n\nO arquivo de lock não foi encontrado")
-                else:
-                    # Verifica localmente
-                    try:
-                        result = subprocess.run(
-                            ["pgrep", "-f", "scheduler.jobs"],
-                            capture_output=True,
-                            text=True,
-                            timeout=5
-                        )
-                        if result.returncode == 0:
-                            pids = result.stdout.strip().split('\n')
-                            pids = [pid.strip() for pid in pids if pid.strip()]
-                            if pids:
-                                mensagem = f"✅ **Scheduler rodando**\n\n"
-                                mensagem += f"**🕐 Horário Atual:** {agora.strftime('%d/%m/%Y %H:%M:%S')}\n\n"
-                                mensagem += f"**PID(s):** {', '.join(pids)}\n\n"
-                                mensagem += f"**⏰ Horários Configurados:**\n"
-                                if settings.SYNC_ENABLED:
-                                    mensagem += f"- 🔄 Sincronização: {sync_hour:02d}:{sync_minute:02d}\n"
-                                if settings.SYNC_NOTIF_ENABLED:
-                                    mensagem += f"- 🔔 Sincronização + Notificação: {sync_notif_hour:02d}:{sync_notif_minute:02d}\n"
-                                if settings.KANBANIZE_SYNC_ENABLED and settings.KANBANIZE_SYNC_09H30_ENABLED:
-                                    mensagem += f"- 📋 Kanbanize Sync: 09:30\n"
-                                if settings.KANBANIZE_SYNC_ENABLED and settings.KANBANIZE_SYNC_18H00_ENABLED:
-                                    mensagem += f"- 📋 Kanbanize Sync: 18:00\n"
-                                if settings.MENSAGEM_MANHA_ENABLED:
-                                    mensagem += f"- 🌅 Mensagem Matutina: {manha_hour:02d}:{manha_minute:02d}\n"
-                                if settings.MENSAGEM_TARDE_ENABLED:
-                                    mensagem += f"- 🌆 Mensagem Vespertina: {tarde_hour:02d}:{tarde_minute:02d}\n"
-                                if proximo:
-                                    mensagem += f"\n**⏭️ Próxima execução:**\n{proximo[0]} às {proximo[1].strftime('%H:%M:%S')}"
-                                st.success(mensagem)
-                            else:
-                                st.error("❌ Scheduler não está rodando")
-                        else:
-                            st.error("❌ Scheduler não está rodando")
-                    except Exception as e:
-                        st.warning(f"⚠️ Não foi possível verificar: {e}")
+        heartbeat = database.buscar_heartbeat()
+        saudavel, status_msg = avaliar_heartbeat(heartbeat)
+        
+        if not heartbeat:
+            st.error(f"❌ {status_msg}")
+        else:
+            mensagem = f"{'✅' if saudavel else '❌'} **{status_msg}**\n\n"
+            mensagem += f"**🕐 Horário Atual:** {datetime.now().strftime('%d/%m/%Y %H:%M:%S')}\n\n"
+            mensagem += f"**📅 Iniciado em:** {heartbeat['iniciado_em']} (PID {heartbeat['pid']} em {heartbeat['host']})\n\n"
+            mensagem += f"**💓 Último heartbeat:** {heartbeat['atualizado_em']}\n\n"
+            mensagem += f"**⚙️ Jobs em execução:** {heartbeat['em_execucao']} · **Na fila:** {heartbeat['fila']}\n\n"
+            if heartbeat["proximos"]:
+                mensagem += "**⏰ Próximos disparos:**\n"
+                for proximo in heartbeat["proximos"]:
+                    quando = datetime.strptime(proximo["proxima"], "%Y-%m-%d %H:%M:%S")
+                    mensagem += f"- {proximo['nome']}: {quando.strftime('%d/%m %H:%M')}\n"
+            ultimo = heartbeat["ultimo_job"]
+            if ultimo:
+                mensagem += f"\n**🏁 Último job:** {ultimo['job_id']} ({ultimo['resultado']}) em {ultimo['finalizado_em']}"
+            if saudavel:
+                st.success(mensagem)
+            else:
+                st.error(mensagem)
     
     # Botão de sincronização
     if st.button("🔄 Sincronizar Agora", type="primary", width='stretch'):
@@ -265,6 +236,9 @@ def render(database):
                 sync = SyncManager()
                 resultado = sync.sincronizar(forcar=forcar)
                 
+                if resultado.get("compartilhado"):
+                    st.info("ℹ️ Já havia uma sincronização em andamento; o resultado dela foi reaproveitado.")
+                
                 if resultado["status"] == "success":
                     st.success(f"✅ Sincronização concluída com sucesso! {resultado.get('registros', 0)} registros processados.")
                     # Envia notificação WhatsApp se configurado
@@ -315,6 +289,14 @@ def render(database):
     
     st.divider()
     
+    _render_tempo_etapas(database)
+    
+    st.divider()
+    
+    _render_problemas_qualidade(database)
+    
+    st.divider()
+    
     # Informações
     st.info("""
     **ℹ️ Sobre a sincronização:**
@@ -4,14 +4,17 @@ Integração com Evolution API.
 Envia mensagens via WhatsApp usando Evolution API.
 """
 
+import asyncio
 import sys
 from pathlib import Path
-from typing import Dict, List, Optional
-from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+from datetime import datetime
 
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from config.settings import settings
+from integrations import http_assincrono
+from utils.calendario import rotulo_dia
 
 # Tenta importar requests
 try:
@@ -38,44 +41,31 @@ class EvolutionAPI:
         self.api_key = api_key or settings.EVOLUTION_API_KEY
         self.enabled = settings.EVOLUTION_ENABLED
     
-    def enviar_mensagem(self, texto: str, numero: str = None) -> Dict:
-        """
-        Envia mensagem de texto via WhatsApp.
-        
-        Args:
-            texto: Texto da mensagem
-            numero: Número/grupo (opcional, usa o configurado se não fornecido)
-            
-        Returns:
-            Dict com resultado: {"sucesso": bool, "mensagem": str}
-        """
+    def _validar_envio(self, numero: str = None) -> Optional[Dict]:
+        """Resultado de falha se a configuração não permite enviar, senão None."""
         if not self.enabled:
             return {
                 "sucesso": False,
                 "mensagem": "Evolution API desabilitada"
             }
         
-        if not HAS_REQUESTS:
-            return {
-                "sucesso": False,
-                "mensagem": "requests não instalado. Use: pip install requests"
-            }
-        
         if not self.url:
             return {
                 "sucesso": False,
                 "mensagem": "URL da Evolution API não configurada"
             }
         
-        numero_final = numero or self.numero
-        if not numero_final:
+        if not (numero or self.numero):
             return {
                 "sucesso": False,
                 "mensagem": "Número/grupo do WhatsApp não configurado"
             }
-        
+        return None
+    
+    def _montar_mensagem(self, texto: str, numero: str = None) -> Tuple[Dict, Dict]:
+        """Payload e headers do envio de texto."""
         # Formata o número: se não começar com código do país e não for grupo, adiciona 55 (Brasil)
-        numero_formatado = str(numero_final).strip()
+        numero_formatado = str(numero or self.numero).strip()
         
         # Se já termina com @g.us ou @s.whatsapp.net, é grupo/contato já formatado
         if "@" in numero_formatado:
@@ -90,41 +80,68 @@ class EvolutionAPI:
             
             numero_final = numero_limpo
         
-        try:
-            payload = {
-                "number": numero_final,
-                "text": texto
+        payload = {
+            "number": numero_final,
+            "text": texto
+        }
+        
+        # Headers (sempre inclui Content-Type)
+        headers = {
+            "Content-Type": "application/json"
+        }
+        
+        # Adiciona API Key no header se configurado (não vazio)
+        if self.api_key and self.api_key.strip():
+            headers["apikey"] = self.api_key.strip()
+        
+        return payload, headers
+    
+    @staticmethod
+    def _resultado_envio(response) -> Dict:
+        """Converte a resposta HTTP (requests ou httpx) no resultado do envio."""
+        # Aceita 200 (OK) e 201 (Created) como sucesso
+        if response.status_code in [200, 201]:
+            return {
+                "sucesso": True,
+                "mensagem": "Mensagem enviada com sucesso",
+                "status_code": response.status_code
             }
+        return {
+            "sucesso": False,
+            "mensagem": f"Erro HTTP {response.status_code}: {response.text}",
+            "status_code": response.status_code
+        }
+    
+    def enviar_mensagem(self, texto: str, numero: str = None) -> Dict:
+        """
+        Envia mensagem de texto via WhatsApp.
+        
+        Args:
+            texto: Texto da mensagem
+            numero: Número/grupo (opcional, usa o configurado se não fornecido)
             
-            # Headers (sempre inclui Content-Type)
-            headers = {
-                "Content-Type": "application/json"
+        Returns:
+            Dict com resultado: {"sucesso": bool, "mensagem": str}
+        """
+        erro = self._validar_envio(numero)
+        if erro:
+            return erro
+        
+        if not HAS_REQUESTS:
+            return {
+                "sucesso": False,
+                "mensagem": "requests não instalado. Use: pip install requests"
             }
-            
-            # Adiciona API Key no header se configurado (não vazio)
-            if self.api_key and self.api_key.strip():
-                headers["apikey"] = self.api_key.strip()
-            
+        
+        try:
+            payload, headers = self._montar_mensagem(texto, numero)
             response = requests.post(
                 self.url,
                 json=payload,
                 headers=headers,
                 timeout=30
             )
-            
-            # Aceita 200 (OK) e 201 (Created) como sucesso
-            if response.status_code in [200, 201]:
-                return {
-                    "sucesso": True,
-                    "mensagem": "Mensagem enviada com sucesso",
-                    "status_code": response.status_code
-                }
-            else:
-                return {
-                    "sucesso": False,
-                    "mensagem": f"Erro HTTP {response.status_code}: {response.text}",
-                    "status_code": response.status_code
-                }
+            return self._resultado_envio(response)
                 
         except requests.exceptions.ConnectionError:
             return {
@@ -142,6 +159,35 @@ class EvolutionAPI:
                 "mensagem": f"Erro inesperado: {str(e)}"
             }
     
+    async def enviar_mensagem_async(self, texto: str, numero: str = None) -> Dict:
+        """
+        Versão assíncrona de `enviar_mensagem`, no pool de conexões
+        compartilhado (`integrations.http_assincrono`).
+        """
+        erro = self._validar_envio(numero)
+        if erro:
+            return erro
+        
+        try:
+            payload, headers = self._montar_mensagem(texto, numero)
+            response = await http_assincrono.requisitar("POST", self.url, json=payload, headers=headers, timeout=30)
+            return self._resultado_envio(response)
+        except http_assincrono.ERROS_CONEXAO:
+            return {
+                "sucesso": False,
+                "mensagem": "Erro de conexão: não foi possível conectar ao servidor"
+            }
+        except http_assincrono.ERROS_TIMEOUT:
+            return {
+                "sucesso": False,
+                "mensagem": "Timeout: servidor não respondeu a tempo"
+            }
+        except Exception as e:
+            return {
+                "sucesso": False,
+                "mensagem": f"Erro inesperado: {str(e)}"
+            }
+    
     def enviar_media(self, media_bytes: bytes, mediatype: str = "image", 
                      caption: str = None, filename: str = None, numero: str = None) -> Dict:
         """
@@ -490,18 +536,17 @@ class MensagensAutomaticas:
         
         hoje = datetime.now()
         hoje_str = hoje.strftime('%d/%m/%Y')
-        dia_semana = hoje.weekday()  # 0=segunda, 4=sexta
         
-        # Funcionários voltando amanhã (ou segunda se for sexta)
+        # Funcionários voltando até o próximo dia útil (fim de semana e feriados no meio)
         voltando_proximo_dia_util = db.buscar_retornos_proximo_dia_util()
         
         # Determina texto da data de retorno
-        if dia_semana == 4:  # Sexta-feira
-            proxima_segunda = (hoje + timedelta(days=3)).strftime('%d/%m/%Y')
-            texto_data = f"no Fim de Semana e Segunda-feira ({proxima_segunda})"
+        proximo = db.calendario().proximo_dia_util(hoje)
+        rotulo = rotulo_dia(proximo, hoje)
+        if rotulo == "Amanhã":
+            texto_data = f"Amanhã ({proximo.strftime('%d/%m/%Y')})"
         else:
-            amanha = (hoje + timedelta(days=1)).strftime('%d/%m/%Y')
-            texto_data = f"Amanhã ({amanha})"
+            texto_data = f"até {rotulo} ({proximo.strftime('%d/%m/%Y')})"
         
         # Funcionários em férias com acessos pendentes (NB)
         em_ferias_com_pendentes = db.buscar_acessos_pendentes()
@@ -566,6 +611,29 @@ class MensagensAutomaticas:
         
         return mensagem
     
+    def gerar_mensagem_retornos_alterados(self, eventos: List[Dict]) -> str:
+        """
+        Gera mensagem com as datas de retorno alteradas na planilha.
+        
+        Args:
+            eventos: Eventos `retorno_alterado` do outbox da sincronização
+        """
+        def formatar(data: str) -> str:
+            try:
+                return datetime.strptime(data, '%Y-%m-%d').strftime('%d/%m/%Y')
+            except (TypeError, ValueError):
+                return data or "-"
+        
+        mensagem = f"📅 *Datas de Retorno Alteradas ({len(eventos)}):*\n\n"
+        for evento in eventos:
+            mensagem += (
+                f"• {evento.get('nome', 'N/A')}: "
+                f"{formatar(evento.get('valor_anterior'))} → {formatar(evento.get('valor_novo'))}\n"
+            )
+        mensagem += "\n_Sistema de Controle de Férias_"
+        
+        return mensagem
+    
     def enviar_mensagem_manha(self) -> Dict:
         """Envia mensagem matutina."""
         texto = self.gerar_mensagem_manha()
@@ -575,3 +643,13 @@ class MensagensAutomaticas:
         """Envia mensagem vespertina."""
         texto = self.gerar_mensagem_tarde()
         return self.evolution_api.enviar_mensagem(texto)
+    
+    async def enviar_mensagem_manha_async(self) -> Dict:
+        """Envia mensagem matutina sem bloquear o event loop (consultas ao banco em thread)."""
+        texto = await asyncio.to_thread(self.gerar_mensagem_manha)
+        return await self.evolution_api.enviar_mensagem_async(texto)
+    
+    async def enviar_mensagem_tarde_async(self) -> Dict:
+        """Envia mensagem vespertina sem bloquear o event loop (consultas ao banco em thread)."""
+        texto = await asyncio.to_thread(self.gerar_mensagem_tarde)
+        return await self.evolution_api.enviar_mensagem_async(texto)
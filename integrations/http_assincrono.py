@@ -0,0 +1,116 @@
+"""
+Cliente HTTP assíncrono compartilhado pelas integrações.
+
+Com `httpx` instalado, as requisições usam um `httpx.AsyncClient` por event
+loop: os jobs que rodam no loop compartilhado do scheduler
+(`scheduler.assincrono`) dividem o mesmo pool de conexões e mantêm muitas
+requisições em andamento sem uma thread por requisição. Sem `httpx`, as
+requisições vão para uma `requests.Session` compartilhada via
+`asyncio.to_thread` (mesma interface, concorrência limitada por threads).
+"""
+
+import asyncio
+import threading
+import weakref
+from typing import Any, Coroutine, Dict, Optional
+
+try:
+    import httpx
+    HAS_HTTPX = True
+except ImportError:
+    HAS_HTTPX = False
+
+try:
+    import requests
+    from requests.adapters import HTTPAdapter
+    HAS_REQUESTS = True
+except ImportError:
+    HAS_REQUESTS = False
+
+# Pool de conexões compartilhado por todos os jobs do loop
+MAX_CONEXOES = 100
+MAX_CONEXOES_OCIOSAS = 20
+
+# Exceções equivalentes de httpx e requests, para os clientes tratarem igual
+ERROS_CONEXAO = tuple(
+    ([httpx.ConnectError] if HAS_HTTPX else []) + ([requests.exceptions.ConnectionError] if HAS_REQUESTS else [])
+)
+ERROS_TIMEOUT = tuple(
+    ([httpx.TimeoutException] if HAS_HTTPX else []) + ([requests.exceptions.Timeout] if HAS_REQUESTS else [])
+)
+
+_clientes: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Any]" = weakref.WeakKeyDictionary()
+_sessao = None
+_lock = threading.Lock()
+
+
+def _cliente_do_loop():
+    """`httpx.AsyncClient` do event loop em execução (criado no primeiro uso)."""
+    loop = asyncio.get_running_loop()
+    cliente = _clientes.get(loop)
+    if cliente is None or cliente.is_closed:
+        cliente = httpx.AsyncClient(
+            limits=httpx.Limits(max_connections=MAX_CONEXOES, max_keepalive_connections=MAX_CONEXOES_OCIOSAS)
+        )
+        _clientes[loop] = cliente
+    return cliente
+
+
+def _sessao_compartilhada():
+    """`requests.Session` única do processo, com pool do tamanho do assíncrono."""
+    global _sessao
+    with _lock:
+        if _sessao is None:
+            _sessao = requests.Session()
+            adapter = HTTPAdapter(pool_connections=MAX_CONEXOES, pool_maxsize=MAX_CONEXOES)
+            _sessao.mount("https://", adapter)
+            _sessao.mount("http://", adapter)
+        return _sessao
+
+
+async def requisitar(metodo: str, url: str, *, params: Dict = None, json: Any = None, data: Dict = None,
+                     headers: Dict = None, auth: Optional[tuple] = None, timeout: float = 30):
+    """
+    Faz uma requisição HTTP sem bloquear o event loop.
+
+    Args:
+        auth: Autenticação básica como (usuário, senha)
+
+    Returns:
+        Resposta com `status_code`, `text` e `json()` (httpx ou requests)
+
+    Raises:
+        Exceções de `ERROS_CONEXAO` e `ERROS_TIMEOUT`, entre outras
+    """
+    if HAS_HTTPX:
+        return await _cliente_do_loop().request(
+            metodo, url, params=params, json=json, data=data, headers=headers, auth=auth, timeout=timeout
+        )
+    if not HAS_REQUESTS:
+        raise RuntimeError("Instale 'httpx' (ou 'requests') para as integrações HTTP")
+    return await asyncio.to_thread(
+        _sessao_compartilhada().request,
+        metodo, url, params=params, json=json, data=data, headers=headers, auth=auth, timeout=timeout
+    )
+
+
+async def fechar():
+    """Fecha o cliente HTTP do event loop em execução (antes de encerrar o loop)."""
+    cliente = _clientes.pop(asyncio.get_running_loop(), None)
+    if cliente is not None:
+        await cliente.aclose()
+
+
+def executar(corrotina: Coroutine) -> Any:
+    """
+    Executa a corrotina em um event loop próprio e fecha o cliente HTTP ao
+    final. Para chamadores síncronos fora do scheduler (interface, processo
+    filho de um job).
+    """
+    async def _executar():
+        try:
+            return await corrotina
+        finally:
+            await fechar()
+
+    return asyncio.run(_executar())
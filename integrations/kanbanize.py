@@ -1,15 +1,21 @@
 """
 Integração Profissional com Kanbanize/Businessmap API v2.
-Backend Seguro: Estrutura Sequencial + Busca de Cards Paralela.
+Backend Seguro: Estrutura Sequencial + Busca de Cards Concorrente.
+
+A busca de detalhes dos cards é assíncrona (`integrations.http_assincrono`):
+as requisições ficam em andamento ao mesmo tempo no event loop, limitadas
+por um semáforo, em vez de um pool de threads por busca.
 """
 
+import asyncio
 import sys
 from pathlib import Path
 from typing import Dict, List, Any
-import concurrent.futures
 
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
+from integrations import http_assincrono
+
 try:
     import requests
     from requests.adapters import HTTPAdapter
@@ -18,6 +24,11 @@ try:
 except ImportError:
     HAS_REQUESTS = False
 
+# Status que a API devolve em instabilidades passageiras (nova tentativa)
+STATUS_NOVA_TENTATIVA = (500, 502, 503, 504)
+TENTATIVAS_ASYNC = 3
+
+
 class KanbanizeAPI:
     """Cliente API Businessmap/Kanbanize V2."""
     
@@ -39,40 +50,58 @@ class KanbanizeAPI:
         self.session.mount('https://', adapter)
         self.session.mount('http://', adapter)
     
-    def _make_request(self, endpoint: str, method: str = "GET", params: Dict = None, timeout: int = 10) -> Dict:
-        if not HAS_REQUESTS:
-            return {"sucesso": False, "mensagem": "Instale 'requests'."}
-        
+    def _url(self, endpoint: str) -> str:
         endpoint_clean = endpoint.lstrip('/')
         if not endpoint_clean.startswith('api/v2'):
             endpoint_clean = f"api/v2/{endpoint_clean}"
-            
-        url = f"{self.base_url_original}/{endpoint_clean}"
+        return f"{self.base_url_original}/{endpoint_clean}"
+
+    @staticmethod
+    def _interpretar_resposta(response) -> Dict:
+        """Converte a resposta HTTP (requests ou httpx) no dicionário padrão do cliente."""
+        if response.status_code == 200:
+            try:
+                data = response.json()
+                final_data = data.get('data', data)
+                
+                # Extract pagination from nested structure (API v2 format)
+                pagination = None
+                if isinstance(final_data, dict):
+                    pagination = final_data.get('pagination')
+                    if 'data' in final_data:
+                        final_data = final_data['data']
+                
+                # Also check top-level pagination
+                if not pagination:
+                    pagination = data.get('pagination')
+
+                return {"sucesso": True, "dados": final_data, "paginacao": pagination}
+            except ValueError:
+                return {"sucesso": False, "mensagem": "Erro JSON", "dados": response.text}
+        
+        return {"sucesso": False, "mensagem": f"Erro {response.status_code}: {response.text}"}
+
+    def _make_request(self, endpoint: str, method: str = "GET", params: Dict = None, timeout: int = 10) -> Dict:
+        if not HAS_REQUESTS:
+            return {"sucesso": False, "mensagem": "Instale 'requests'."}
         
         try:
-            response = self.session.request(method, url, params=params, timeout=timeout)
-            
-            if response.status_code == 200:
-                try:
-                    data = response.json()
-                    final_data = data.get('data', data)
-                    
-                    # Extract pagination from nested structure (API v2 format)
-                    pagination = None
-                    if isinstance(final_data, dict):
-                        pagination = final_data.get('pagination')
-                        if 'data' in final_data:
-                            final_data = final_data['data']
-                    
-                    # Also check top-level pagination
-                    if not pagination:
-                        pagination = data.get('pagination')
+            response = self.session.request(method, self._url(endpoint), params=params, timeout=timeout)
+            return self._interpretar_resposta(response)
+        except Exception as e:
+            return {"sucesso": False, "mensagem": f"Erro Conexão: {e}"}
 
-                    return {"sucesso": True, "dados": final_data, "paginacao": pagination}
-                except ValueError:
-                    return {"sucesso": False, "mensagem": "Erro JSON", "dados": response.text}
-            
-            return {"sucesso": False, "mensagem": f"Erro {response.status_code}: {response.text}"}
+    async def _make_request_async(self, endpoint: str, method: str = "GET", params: Dict = None, timeout: int = 10) -> Dict:
+        """Versão assíncrona de `_make_request`, com o mesmo retry conservador em erros 5xx."""
+        try:
+            for tentativa in range(TENTATIVAS_ASYNC):
+                response = await http_assincrono.requisitar(
+                    method, self._url(endpoint), params=params, headers=dict(self.session.headers), timeout=timeout
+                )
+                if response.status_code not in STATUS_NOVA_TENTATIVA or tentativa == TENTATIVAS_ASYNC - 1:
+                    break
+                await asyncio.sleep(0.2 * 2 ** tentativa)
+            return self._interpretar_resposta(response)
         except Exception as e:
             return {"sucesso": False, "mensagem": f"Erro Conexão: {e}"}
 
@@ -92,26 +121,50 @@ class KanbanizeAPI:
         """Busca histórico de movimentação do card (quando entrou em cada coluna)."""
         return self._make_request(f"cards/{card_id}/history", timeout=20)
 
-    def buscar_cards_simples(self, board_ids=None, workflow_ids=None, column_ids=None, page=1, per_page=100, fields=None):
-        """Busca cards resumidos do board.
-        
-        Args:
-            fields: campo(s) adicionais a incluir na resposta (ex: 'in_current_position_since')
-        """
+    async def buscar_detalhe_unico_async(self, card_id: int) -> Dict:
+        return await self._make_request_async(f"cards/{card_id}", timeout=20)
+
+    @staticmethod
+    def _parametros_cards(board_ids=None, workflow_ids=None, column_ids=None, page=1, per_page=100, fields=None) -> Dict:
         params = {"page": page, "per_page": per_page}
         if board_ids: params["board_ids"] = ','.join(map(str, board_ids)) if isinstance(board_ids, list) else board_ids
         if workflow_ids: params["workflow_ids"] = ','.join(map(str, workflow_ids)) if isinstance(workflow_ids, list) else workflow_ids
         if column_ids: params["column_ids"] = ','.join(map(str, column_ids)) if isinstance(column_ids, list) else column_ids
         if fields: params["fields"] = fields
+        return params
 
+    def buscar_cards_simples(self, board_ids=None, workflow_ids=None, column_ids=None, page=1, per_page=100, fields=None):
+        """Busca cards resumidos do board.
+        
+        Args:
+            fields: campo(s) adicionais a incluir na resposta (ex: 'in_current_position_since')
+        """
+        params = self._parametros_cards(board_ids, workflow_ids, column_ids, page, per_page, fields)
         return self._make_request("cards", params=params, timeout=15)
 
+    async def buscar_cards_simples_async(self, board_ids=None, workflow_ids=None, column_ids=None, page=1, per_page=100, fields=None):
+        """Versão assíncrona de `buscar_cards_simples`."""
+        params = self._parametros_cards(board_ids, workflow_ids, column_ids, page, per_page, fields)
+        return await self._make_request_async("cards", params=params, timeout=15)
+
     def buscar_cards_completos_paralelo(self, board_ids: List[int], workflow_ids=None, column_ids=None, page=1, per_page=200, max_workers: int = 20, sem_detalhes: bool = False):
+        """Busca cards com ou sem detalhes completos (ver `buscar_cards_completos_async`).
+
+        Para chamadores síncronos (interface): roda a busca em um event loop próprio.
+
+        Args:
+            max_workers: número máximo de detalhes buscados ao mesmo tempo (padrão 20)
+        """
+        return http_assincrono.executar(self.buscar_cards_completos_async(
+            board_ids, workflow_ids, column_ids, page, per_page, max_concorrentes=max_workers, sem_detalhes=sem_detalhes
+        ))
+
+    async def buscar_cards_completos_async(self, board_ids: List[int], workflow_ids=None, column_ids=None, page=1, per_page=200, max_concorrentes: int = 20, sem_detalhes: bool = False):
         """Busca cards com ou sem detalhes completos.
 
         Args:
             per_page: itens por página (padrão 200)
-            max_workers: número máximo de threads para buscar detalhes (padrão 20)
+            max_concorrentes: número máximo de detalhes buscados ao mesmo tempo (padrão 20)
             sem_detalhes: se True, pula detail calls e retorna apenas resumo com in_current_position_since
         """
         # Fast mode: pede campos essenciais + in_current_position_since
@@ -121,7 +174,7 @@ class KanbanizeAPI:
         else:
             fields_param = None
             
-        res_lista = self.buscar_cards_simples(board_ids, workflow_ids, column_ids, page, per_page, fields=fields_param)
+        res_lista = await self.buscar_cards_simples_async(board_ids, workflow_ids, column_ids, page, per_page, fields=fields_param)
         
         if not res_lista.get("sucesso"):
             return res_lista
@@ -130,24 +183,20 @@ class KanbanizeAPI:
         if not cards_resumo or sem_detalhes:
             # Se sem_detalhes, retorna as summaries como estão
             return res_lista
-            
-        cards_detalhados = []
-        # Max workers configurável
-        with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
-            futures = {executor.submit(self.buscar_detalhe_unico, c['card_id']): c for c in cards_resumo}
-            
-            for future in concurrent.futures.as_completed(futures):
-                try:
-                    res = future.result()
-                    if res.get("sucesso"):
-                        cards_detalhados.append(res.get("dados"))
-                    else:
-                        cards_detalhados.append(futures[future])
-                except Exception:
-                    cards_detalhados.append(futures[future])
+        
+        # Semáforo no lugar do pool de threads: limita as requisições em andamento
+        semaforo = asyncio.Semaphore(max_concorrentes)
+
+        async def detalhar(card: Dict) -> Dict:
+            async with semaforo:
+                res = await self.buscar_detalhe_unico_async(card['card_id'])
+            # Sem o detalhe, mantém o resumo do card
+            return res.get("dados") if res.get("sucesso") else card
+
+        cards_detalhados = await asyncio.gather(*(detalhar(c) for c in cards_resumo))
                     
         return {
             "sucesso": True,
-            "dados": cards_detalhados,
+            "dados": list(cards_detalhados),
             "paginacao": res_lista.get("paginacao")
-        }
\ No newline at end of file
+        }
@@ -4,12 +4,15 @@ Integração com OneTimeSecret API.
 Gera links de senha únicos que expiram após serem visualizados uma vez.
 """
 
+import asyncio
 import sys
 from pathlib import Path
 from typing import Dict, List, Optional
 
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
+from integrations import http_assincrono
+
 # Tenta importar requests
 try:
     import requests
@@ -30,6 +33,9 @@ class OneTimeSecretAPI:
     BASE_URL = "https://eu.onetimesecret.com/api/v1"
     SECRET_URL_PREFIX = "https://eu.onetimesecret.com/secret/"
     
+    # Criações em andamento ao mesmo tempo (para não sobrecarregar a API)
+    MAX_CRIACOES_SIMULTANEAS = 3
+    
     def __init__(self, email: str, api_key: str):
         """
         Inicializa OneTimeSecret API.
@@ -75,27 +81,7 @@ class OneTimeSecretAPI:
                 timeout=30
             )
             
-            if response.status_code == 200:
-                data = response.json()
-                secret_key = data.get("secret_key", "")
-                metadata_key = data.get("metadata_key", "")
-                # Sempre usa nosso SECRET_URL_PREFIX (EU) ao invés do share_url da API
-                link_completo = f"{self.SECRET_URL_PREFIX}{secret_key}"
-                
-                return {
-                    "sucesso": True,
-                    "link": link_completo,
-                    "secret_key": secret_key,
-                    "metadata_key": metadata_key,
-                    "ttl": ttl,
-                    "mensagem": "Senha criada com sucesso"
-                }
-            else:
-                return {
-                    "sucesso": False,
-                    "mensagem": f"Erro HTTP {response.status_code}: {response.text}",
-                    "status_code": response.status_code
-                }
+            return self._resultado_criacao(response, ttl)
                 
         except requests.exceptions.ConnectionError:
             return {
@@ -113,6 +99,62 @@ class OneTimeSecretAPI:
                 "mensagem": f"Erro inesperado: {str(e)}"
             }
     
+    def _resultado_criacao(self, response, ttl: int) -> Dict:
+        """Converte a resposta HTTP (requests ou httpx) no resultado de `criar_senha`."""
+        if response.status_code == 200:
+            data = response.json()
+            secret_key = data.get("secret_key", "")
+            metadata_key = data.get("metadata_key", "")
+            # Sempre usa nosso SECRET_URL_PREFIX (EU) ao invés do share_url da API
+            link_completo = f"{self.SECRET_URL_PREFIX}{secret_key}"
+            
+            return {
+                "sucesso": True,
+                "link": link_completo,
+                "secret_key": secret_key,
+                "metadata_key": metadata_key,
+                "ttl": ttl,
+                "mensagem": "Senha criada com sucesso"
+            }
+        return {
+            "sucesso": False,
+            "mensagem": f"Erro HTTP {response.status_code}: {response.text}",
+            "status_code": response.status_code
+        }
+    
+    async def criar_senha_async(self, senha: str, ttl: int = 3600) -> Dict:
+        """
+        Versão assíncrona de `criar_senha`, no pool de conexões compartilhado
+        (`integrations.http_assincrono`).
+        """
+        try:
+            response = await http_assincrono.requisitar(
+                "POST",
+                f"{self.BASE_URL}/share",
+                auth=(self.email, self.api_key),
+                data={
+                    "secret": senha,
+                    "ttl": ttl
+                },
+                timeout=30
+            )
+            return self._resultado_criacao(response, ttl)
+        except http_assincrono.ERROS_CONEXAO:
+            return {
+                "sucesso": False,
+                "mensagem": "Erro de conexão: não foi possível conectar ao servidor"
+            }
+        except http_assincrono.ERROS_TIMEOUT:
+            return {
+                "sucesso": False,
+                "mensagem": "Timeout: servidor não respondeu a tempo"
+            }
+        except Exception as e:
+            return {
+                "sucesso": False,
+                "mensagem": f"Erro inesperado: {str(e)}"
+            }
+    
     def verificar_status(self, metadata_key: str, link_url: str = "") -> Dict:
         """
         Verifica o status do segredo sem queimá-lo (usa API v2).
@@ -258,3 +300,22 @@ class OneTimeSecretAPI:
             time.sleep(0.5)
         
         return resultados
+    
+    async def criar_multiplas_senhas_async(self, senha_base: str, quantidade: int,
+                                           incrementar: bool = False, ttl: int = 3600) -> List[Dict]:
+        """
+        Versão assíncrona de `criar_multiplas_senhas`: as senhas são criadas
+        ao mesmo tempo, até `MAX_CRIACOES_SIMULTANEAS` por vez (no lugar da
+        pausa entre chamadas). Resultados na ordem das senhas.
+        """
+        semaforo = asyncio.Semaphore(self.MAX_CRIACOES_SIMULTANEAS)
+        
+        async def criar(i: int) -> Dict:
+            senha = f"{senha_base}{i}" if incrementar and i > 0 else senha_base
+            async with semaforo:
+                resultado = await self.criar_senha_async(senha, ttl)
+            resultado["senha"] = senha
+            resultado["numero"] = i + 1
+            return resultado
+        
+        return list(await asyncio.gather(*(criar(i) for i in range(quantidade))))
@@ -4,8 +4,10 @@
 # ============================================
 
 import pandas as pd
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+import hashlib
 import tempfile
 from pathlib import Path
 import urllib.request
@@ -15,7 +17,9 @@ import sys
 # Adiciona o diretório raiz ao path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from utils.google_sheets import extrair_sheet_id, construir_url_exportacao
+from utils.google_sheets import (
+    extrair_sheet_id, construir_url_exportacao, construir_url_htmlview, extrair_abas_htmlview
+)
 
 
 class LeitorGoogleSheets:
@@ -30,6 +34,7 @@ class LeitorGoogleSheets:
         """
         self.url = url
         self._dados: Dict[str, pd.DataFrame] = {}
+        self._abas: Optional[List[Tuple[str, str]]] = None
     
     def _converter_url_para_csv(self, url: str, gid: Optional[str] = None) -> str:
         """
@@ -237,6 +242,56 @@ class LeitorGoogleSheets:
             csv_url_info = csv_url if 'csv_url' in locals() else 'N/A'
             raise Exception(f"Erro ao ler planilha CSV: {error_msg} (URL: {csv_url_info})")
     
+    def descobrir_abas(self) -> List[Tuple[str, str]]:
+        """
+        Descobre nome e gid de todas as abas pela página htmlview pública.
+        A descoberta é feita uma única vez por instância.
+        
+        Returns:
+            Lista de tuplas (nome, gid) na ordem da planilha
+        """
+        if self._abas is None:
+            sheet_id = extrair_sheet_id(self.url)
+            if not sheet_id:
+                raise ValueError(f"URL inválida do Google Sheets: {self.url}")
+            
+            with urllib.request.urlopen(construir_url_htmlview(sheet_id), timeout=60) as resposta:
+                html = resposta.read().decode("utf-8", errors="replace")
+            
+            abas = extrair_abas_htmlview(html)
+            if not abas:
+                raise Exception("Nenhuma aba encontrada na planilha (ela está pública?)")
+            self._abas = abas
+        
+        return self._abas
+    
+    def baixar_abas_csv(self, max_workers: int = 4) -> List[Dict]:
+        """
+        Baixa todas as abas como CSV em paralelo, com pool limitado.
+        
+        Args:
+            max_workers: Máximo de downloads simultâneos
+        
+        Returns:
+            Lista (na ordem das abas) de dicionários com nome, gid,
+            conteudo (bytes do CSV) e hash MD5 do conteúdo
+        """
+        abas = self.descobrir_abas()
+        
+        def baixar(aba: Tuple[str, str]) -> Dict:
+            nome, gid = aba
+            with urllib.request.urlopen(self._converter_url_para_csv(self.url, gid), timeout=60) as resposta:
+                conteudo = resposta.read()
+            return {
+                "nome": nome,
+                "gid": gid,
+                "conteudo": conteudo,
+                "hash": hashlib.md5(conteudo).hexdigest(),
+            }
+        
+        with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(abas)))) as pool:
+            return list(pool.map(baixar, abas))
+    
     def ler_via_api(self, credenciais_json: Optional[str] = None) -> Dict[str, pd.DataFrame]:
         """
         Lê todas as abas usando Google Sheets API.
@@ -0,0 +1,90 @@
+"""
+Event loop compartilhado pelos jobs assíncronos do scheduler.
+
+Os jobs de I/O (Kanbanize, mensagens do Evolution) são corrotinas. Em vez
+de uma thread (ou processo) por job, mais um pool de threads dentro do
+job, todos rodam em um único event loop, em uma thread dedicada, e dividem
+o pool de conexões HTTP (`integrations.http_assincrono`). O worker do
+APScheduler apenas aguarda o resultado; estourado o tempo limite, a
+corrotina é cancelada de fato, ao contrário de uma thread, que só pode
+ser abandonada.
+"""
+
+import asyncio
+import concurrent.futures
+import threading
+from pathlib import Path
+from typing import Any, Coroutine, Optional
+
+import sys
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from integrations import http_assincrono
+
+# Tempo para fechar conexões e encerrar o loop ao parar o scheduler (segundos)
+ESPERA_ENCERRAMENTO_SEGUNDOS = 5
+
+
+class CorrotinaCancelada(TimeoutError):
+    """A corrotina passou do tempo limite e foi cancelada no loop."""
+
+
+class LoopCompartilhado:
+    """Event loop em thread própria, iniciado no primeiro uso."""
+
+    def __init__(self):
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    @property
+    def rodando(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def iniciar(self) -> asyncio.AbstractEventLoop:
+        """Inicia o loop (se ainda não está rodando) e o devolve."""
+        with self._lock:
+            if not self.rodando:
+                self._loop = asyncio.new_event_loop()
+                self._thread = threading.Thread(
+                    target=self._loop.run_forever, name="jobs-asyncio", daemon=True
+                )
+                self._thread.start()
+            return self._loop
+
+    def executar(self, corrotina: Coroutine, timeout: float = None) -> Any:
+        """
+        Executa a corrotina no loop e aguarda o resultado.
+
+        Raises:
+            CorrotinaCancelada: Se passou de `timeout` segundos
+        """
+        futuro = asyncio.run_coroutine_threadsafe(corrotina, self.iniciar())
+        try:
+            return futuro.result(timeout)
+        except concurrent.futures.TimeoutError:
+            # Terminou (inclusive com TimeoutError da própria corrotina): vale o desfecho dela
+            if not futuro.cancel():
+                return futuro.result()
+            raise CorrotinaCancelada(f"Corrotina excedeu {timeout:.0f}s e foi cancelada") from None
+
+    def parar(self):
+        """Fecha o cliente HTTP do loop e encerra o loop e a thread."""
+        with self._lock:
+            if not self.rodando:
+                return
+            loop, thread = self._loop, self._thread
+            self._loop = self._thread = None
+
+        try:
+            asyncio.run_coroutine_threadsafe(http_assincrono.fechar(), loop).result(ESPERA_ENCERRAMENTO_SEGUNDOS)
+        except Exception:
+            pass
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join(ESPERA_ENCERRAMENTO_SEGUNDOS)
+        if not thread.is_alive():
+            loop.close()
+
+
+# Loop único do processo do scheduler
+loop_jobs = LoopCompartilhado()
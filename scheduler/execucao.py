@@ -0,0 +1,156 @@
+"""
+Execução isolada e com tempo limite dos jobs agendados.
+
+Cada job roda com um limite rígido de tempo:
+- Em processo filho (sincronizações: parsing pesado e downloads sem timeout).
+  Estourado o limite, o processo é encerrado (SIGTERM e depois SIGKILL).
+- Em thread (jobs leves de mensagem). Estourado o limite, a thread é
+  abandonada e o worker do scheduler é liberado.
+- No event loop compartilhado (jobs de I/O escritos como corrotinas, ver
+  `scheduler.assincrono`). Estourado o limite, a corrotina é cancelada.
+
+Em ambos os casos o estouro é registrado no log de atividades e vira
+`TimeoutError`, que o ledger grava como erro. Assim um job travado nunca
+segura o worker nem atrasa os demais jobs.
+"""
+
+import inspect
+import multiprocessing
+import threading
+from pathlib import Path
+from typing import Any, Callable
+
+import sys
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.database import Database
+from scheduler.assincrono import CorrotinaCancelada, loop_jobs
+
+# Tempo dado ao processo para encerrar após SIGTERM antes do SIGKILL (segundos)
+ESPERA_ENCERRAMENTO_SEGUNDOS = 5
+
+# "spawn" não herda locks de outras threads do scheduler (seguro com APScheduler)
+_contexto = multiprocessing.get_context("spawn")
+
+
+def _executar_no_filho(funcao: Callable[[], Any], conexao):
+    """Alvo do processo filho: devolve ('ok', retorno) ou ('erro', mensagem)."""
+    try:
+        retorno = funcao()
+        if inspect.iscoroutine(retorno):
+            # Job assíncrono configurado para rodar isolado: loop próprio no filho
+            from integrations import http_assincrono
+            retorno = http_assincrono.executar(retorno)
+        conexao.send(("ok", retorno))
+    except BaseException as e:
+        conexao.send(("erro", f"{type(e).__name__}: {e}"))
+    finally:
+        conexao.close()
+
+
+def _reportar_estouro(job_id: str, timeout: float, detalhe: str):
+    print(f"   ⏱️ Job {job_id} excedeu {timeout:.0f}s: {detalhe}")
+    try:
+        Database().registrar_log(
+            tipo="sistema",
+            categoria="Scheduler",
+            status="erro",
+            mensagem=f"Job {job_id} excedeu o tempo limite de {timeout:.0f}s",
+            detalhes=detalhe,
+            origem="scheduler"
+        )
+    except Exception:
+        pass
+
+
+def executar_em_processo(job_id: str, funcao: Callable[[], Any], timeout: float) -> Any:
+    """
+    Executa `funcao` (importável pelo nome, para ser enviada ao filho) em um
+    processo separado, encerrando-o se passar de `timeout` segundos.
+
+    Raises:
+        TimeoutError: Se o limite foi estourado (o processo é encerrado)
+        RuntimeError: Se a função lançou exceção no processo filho
+    """
+    leitura, escrita = _contexto.Pipe(duplex=False)
+    processo = _contexto.Process(
+        target=_executar_no_filho, args=(funcao, escrita), name=f"job-{job_id}", daemon=True
+    )
+    processo.start()
+    escrita.close()
+
+    try:
+        if not leitura.poll(timeout):
+            processo.terminate()
+            processo.join(ESPERA_ENCERRAMENTO_SEGUNDOS)
+            if processo.is_alive():
+                processo.kill()
+                processo.join()
+            _reportar_estouro(job_id, timeout, f"processo {processo.pid} encerrado")
+            raise TimeoutError(f"Job {job_id} excedeu {timeout:.0f}s e foi encerrado")
+
+        try:
+            status, valor = leitura.recv()
+        except EOFError:
+            processo.join()
+            raise RuntimeError(f"Processo do job {job_id} terminou sem resposta (código {processo.exitcode})")
+    finally:
+        leitura.close()
+
+    processo.join()
+    if status == "erro":
+        raise RuntimeError(valor)
+    return valor
+
+
+def executar_em_thread(job_id: str, funcao: Callable[[], Any], timeout: float) -> Any:
+    """
+    Executa `funcao` em uma thread daemon, aguardando no máximo `timeout`
+    segundos. Threads não podem ser mortas: estourado o limite, a thread é
+    abandonada (e reportada) e o chamador segue.
+
+    Raises:
+        TimeoutError: Se o limite foi estourado
+    """
+    resultado = {}
+
+    def alvo():
+        try:
+            resultado["valor"] = funcao()
+        except BaseException as e:
+            resultado["erro"] = e
+
+    thread = threading.Thread(target=alvo, name=f"job-{job_id}", daemon=True)
+    thread.start()
+    thread.join(timeout)
+
+    if thread.is_alive():
+        _reportar_estouro(job_id, timeout, f"thread {thread.name} abandonada")
+        raise TimeoutError(f"Job {job_id} excedeu {timeout:.0f}s")
+    if "erro" in resultado:
+        raise resultado["erro"]
+    return resultado.get("valor")
+
+
+def executar_no_loop(job_id: str, funcao: Callable[[], Any], timeout: float) -> Any:
+    """
+    Executa a corrotina de `funcao` no event loop compartilhado, aguardando
+    no máximo `timeout` segundos. Estourado o limite, a corrotina é cancelada.
+
+    Raises:
+        TimeoutError: Se o limite foi estourado
+    """
+    try:
+        return loop_jobs.executar(funcao(), timeout)
+    except CorrotinaCancelada:
+        _reportar_estouro(job_id, timeout, "corrotina cancelada")
+        raise TimeoutError(f"Job {job_id} excedeu {timeout:.0f}s e foi cancelado")
+
+
+def executar_com_limite(job_id: str, funcao: Callable[[], Any], timeout: float, processo: bool) -> Any:
+    """Executa o job com tempo limite: em processo, no event loop (corrotinas) ou em thread."""
+    if processo:
+        return executar_em_processo(job_id, funcao, timeout)
+    if inspect.iscoroutinefunction(funcao):
+        return executar_no_loop(job_id, funcao, timeout)
+    return executar_em_thread(job_id, funcao, timeout)
@@ -11,106 +11,218 @@ Uso:
     python -m scheduler.jobs --once   # Executa uma vez
 """
 
+import asyncio
 import sys
 from pathlib import Path
 from datetime import datetime
+from functools import partial
+from typing import Dict, List, Optional
 
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from config.settings import settings
+from core.database import Database
 from core.sync_manager import SyncManager
+from scheduler.assincrono import loop_jobs
+from scheduler.ledger import ERRO, FORMATO_LEDGER, REEXECUTAR, JobPulado, LedgerJobs
+from scheduler.execucao import executar_com_limite
+from scheduler.metricas import MonitorJobs
+from scheduler.recuperacao import recuperar
+from scheduler.saude import MonitorSaude
+from scheduler.registro import DefinicaoJob, carregar_registro, ultimo_disparo
 from utils.formatadores import FORMATO_ISO, FORMATO_HORA, agora_formatado
 
 
 def _eh_dia_util():
-    """Verifica se hoje é dia útil (segunda a sexta)."""
-    return datetime.now().weekday() < 5  # 0=segunda, 4=sexta, 5=sábado, 6=domingo
+    """Verifica se hoje é dia útil (segunda a sexta, exceto feriados)."""
+    return Database().calendario().eh_dia_util()
 
 
-def _get_controle_file():
-    """Retorna o caminho do arquivo de controle de jobs."""
-    return Path(settings.DATA_DIR) / ".jobs_executados.txt"
+def _motivo_dia_nao_util() -> str:
+    """Por que hoje não é dia útil (nome do feriado ou fim de semana), para os logs."""
+    return Database().calendario().motivo_nao_util() or "dia não útil"
 
 
-def _verificar_job_executado(job_nome: str) -> bool:
+def _tipo_executado_hoje(tipo: str) -> bool:
     """
-    Verifica se um job já foi executado hoje.
+    Verifica no ledger (`job_runs`) se algum job do tipo já foi executado com sucesso hoje.
+    
+    Os ids vêm do registro de jobs (padrões do .env e tabela `jobs_agendados`),
+    então jobs renomeados ou adicionados pela interface também contam.
     
     Args:
-        job_nome: Nome do job (ex: 'manha', 'tarde', 'sync', 'ferias')
+        tipo: Tipo de job do registro (ex: 'sincronizacao', 'mensagem_manha')
     
     Returns:
-        True se já foi executado hoje, False caso contrário
+        True se algum job do tipo já foi executado hoje, False caso contrário
+    """
+    ledger = LedgerJobs()
+    return any(
+        ledger.executado_hoje(definicao.id)
+        for definicao in carregar_registro(ledger.db) if definicao.tipo == tipo
+    )
+
+
+def _funcao_do_job(definicao: DefinicaoJob):
+    """
+    Função do tipo do job com os parâmetros da definição, envolvida pelo
+    tempo limite e isolamento efetivos (ver `scheduler.execucao`).
+    """
+    parametros = dict(definicao.parametros)
+    if definicao.notificar:
+        parametros["notificar"] = definicao.notificar
+    timeout, processo = definicao.limites
+    return partial(executar_com_limite, definicao.id, partial(TIPOS_FUNCAO[definicao.tipo], **parametros),
+                   timeout, processo)
+
+
+def _executar_agendado(definicao: DefinicaoJob, agendado_para: datetime = None,
+                       reexecucao: bool = False):
     """
-    controle_file = _get_controle_file()
-    hoje_str = agora_formatado(FORMATO_ISO)
+    Executa um job agendado através do ledger: o disparo é reservado de
+    forma atômica, então roda uma única vez entre processos e reinícios.
+    Novas tentativas e reexecuções informam o horário original em
+    `agendado_para`; no disparo do cron ele vem do trigger.
     
-    if not controle_file.exists():
-        return False
+    Returns:
+        Desfecho registrado no ledger ('sucesso' ou 'pulado', inclusive
+        quando o job retorna `JobPulado`); falhas são
+        relançadas para que o APScheduler emita EVENT_JOB_ERROR
+    """
+    if agendado_para is None:
+        agendado_para = ultimo_disparo(definicao.trigger()) or datetime.now().replace(second=0, microsecond=0)
+    ledger = _executar_tentativa(definicao, agendado_para, reexecucao)
+    if ledger.ultimo_status == ERRO:
+        raise RuntimeError(f"Job {definicao.id} falhou: {ledger.ultimo_erro or 'retorno de falha'}")
+    return ledger.ultimo_status
+
+
+def _executar_tentativa(definicao: DefinicaoJob, agendado_para: datetime,
+                        reexecucao: bool = False) -> LedgerJobs:
+    """
+    Executa uma tentativa do horário agendado através do ledger. Se falhar,
+    agenda a próxima tentativa conforme a política do tipo (backoff com
+    jitter, limite de tentativas e prazo) ou, esgotada a política, move o
+    horário para o dead-letter. Reexecuções pedidas pela interface têm uma
+    única tentativa.
+    
+    Returns:
+        O ledger usado, com `ultimo_status` e `ultimo_erro` da tentativa
+    """
+    ledger = LedgerJobs()
+    ledger.executar(definicao.id, _funcao_do_job(definicao), agendado_para)
+    if ledger.ultimo_status == ERRO:
+        proxima = None if reexecucao else _agendar_nova_tentativa(ledger, definicao, agendado_para)
+        if proxima is None:
+            _mover_para_dead_letter(ledger, definicao, agendado_para)
+    return ledger
+
+
+def _agendar_nova_tentativa(ledger: LedgerJobs, definicao: DefinicaoJob,
+                            agendado_para: datetime) -> Optional[datetime]:
+    """
+    Agenda no scheduler a próxima tentativa de um horário que falhou.
     
+    Returns:
+        Horário da nova tentativa, ou None se a política não permite outra
+    """
+    if _scheduler is None:
+        return None
+    
+    execucao = ledger.execucao(definicao.id, agendado_para)
+    tentativas = execucao["tentativas"] if execucao else 1
+    politica = definicao.politica
+    proxima = politica.proxima_tentativa(agendado_para, tentativas)
+    if proxima is None:
+        return None
+    
+    _scheduler.add_job(
+        _executar_agendado,
+        "date",
+        run_date=proxima,
+        args=[definicao, agendado_para],
+        # Um id por horário: a nova tentativa de um horário não substitui a de outro
+        id=f"{definicao.id}:tentativa:{agendado_para:%Y%m%d%H%M}",
+        name=f"{definicao.nome} (nova tentativa)",
+        replace_existing=True
+    )
+    print(f"   🔁 Nova tentativa de {definicao.nome} às {proxima:%H:%M:%S} "
+          f"({tentativas + 1}/{politica.tentativas})")
+    return proxima
+
+
+def _mover_para_dead_letter(ledger: LedgerJobs, definicao: DefinicaoJob, agendado_para: datetime):
+    """Registra que o horário esgotou as tentativas (lista de dead-letter na página de Logs)."""
+    ledger.esgotar(definicao.id, agendado_para)
+    print(f"   ☠️ {definicao.nome} ({agendado_para:%d/%m %H:%M}) esgotou as tentativas")
     try:
-        conteudo = controle_file.read_text().strip()
-        if conteudo.startswith(hoje_str):
-            partes = conteudo.split("|")
-            if len(partes) > 1:
-                jobs_executados = set(partes[1].split(","))
-                return job_nome in jobs_executados
-    except:
+        ledger.db.registrar_log(
+            tipo="sistema",
+            categoria="Scheduler",
+            status="erro",
+            mensagem=f"{definicao.nome} ({agendado_para:%d/%m %H:%M}) esgotou as tentativas",
+            detalhes=ledger.ultimo_erro,
+            origem="scheduler"
+        )
+    except Exception:
         pass
-    
-    return False
 
 
-def _marcar_job_executado(job_nome: str):
+def _despachar_reexecucoes(db: Database = None) -> List[str]:
     """
-    Marca um job como executado hoje.
+    Agenda para execução imediata os horários do dead-letter cuja
+    reexecução foi solicitada pela página de Logs.
     
-    Args:
-        job_nome: Nome do job (ex: 'manha', 'tarde', 'sync', 'ferias')
+    Returns:
+        IDs dos jobs despachados
     """
-    controle_file = _get_controle_file()
-    hoje_str = agora_formatado(FORMATO_ISO)
+    if _scheduler is None:
+        return []
     
-    # Lê jobs já executados hoje
-    jobs_executados = set()
-    if controle_file.exists():
-        try:
-            conteudo = controle_file.read_text().strip()
-            if conteudo.startswith(hoje_str):
-                partes = conteudo.split("|")
-                if len(partes) > 1:
-                    jobs_executados = set(partes[1].split(","))
-        except:
-            pass
-    
-    # Adiciona o novo job
-    jobs_executados.add(job_nome)
-    
-    # Salva
-    try:
-        controle_file.write_text(f"{hoje_str}|{','.join(jobs_executados)}")
-    except Exception as e:
-        print(f"   ⚠️ Erro ao salvar controle de jobs: {e}")
+    db = db or Database()
+    registro = {d.id: d for d in carregar_registro(db)}
+    despachados = []
+    
+    for execucao in db.buscar_job_runs(status=REEXECUTAR):
+        definicao = registro.get(execucao["job_id"])
+        if definicao is None:
+            print(f"   ⚠️ Reexecução de {execucao['job_id']} ignorada: job não está no registro")
+            continue
+        
+        _scheduler.add_job(
+            _executar_agendado,
+            args=[definicao, datetime.strptime(execucao["agendado_para"], FORMATO_LEDGER)],
+            kwargs={"reexecucao": True},
+            misfire_grace_time=None,
+            id=f"{definicao.id}:reexecucao:{execucao['id']}",
+            name=f"{definicao.nome} (reexecução)",
+            replace_existing=True
+        )
+        despachados.append(definicao.id)
+    
+    return despachados
 
 
-def _notificar_kanbanize(EvolutionAPI, mensagem: str):
+async def _notificar_kanbanize(EvolutionAPI, mensagem: str, notificar: str = None):
     """
     Envia notificação WhatsApp sobre sincronização Kanbanize.
     
     Args:
         EvolutionAPI: Classe da API Evolution (passada para evitar import circular)
         mensagem: Mensagem a ser enviada
+        notificar: Número/grupo de destino (padrão: EVOLUTION_NUMERO_SYNC)
     """
-    if not settings.EVOLUTION_ENABLED or not settings.EVOLUTION_NUMERO_SYNC:
+    numero = notificar or settings.EVOLUTION_NUMERO_SYNC
+    if not settings.EVOLUTION_ENABLED or not numero:
         return
     
     try:
         api_evolution = EvolutionAPI(
             url=settings.EVOLUTION_API_URL,
-            numero=settings.EVOLUTION_NUMERO_SYNC,
+            numero=numero,
             api_key=settings.EVOLUTION_API_KEY
         )
-        resultado = api_evolution.enviar_mensagem(mensagem)
+        resultado = await api_evolution.enviar_mensagem_async(mensagem)
         
         if resultado["sucesso"]:
             print(f"   📱 Notificação enviada para {api_evolution.numero}")
@@ -121,8 +233,8 @@ def _notificar_kanbanize(EvolutionAPI, mensagem: str):
 
 # Tenta importar APScheduler, senão usa fallback simples
 try:
+    from apscheduler.executors.pool import ThreadPoolExecutor
     from apscheduler.schedulers.background import BackgroundScheduler
-    from apscheduler.triggers.cron import CronTrigger
     HAS_APSCHEDULER = True
 except ImportError:
     HAS_APSCHEDULER = False
@@ -131,15 +243,36 @@ except ImportError:
 # Instância global do scheduler
 _scheduler = None
 
+# Heartbeat e endpoint de saúde do scheduler em execução
+_saude = None
+
+# Definição de cada job atualmente agendado
+_jobs_aplicados: Dict[str, DefinicaoJob] = {}
 
-def job_sincronizacao():
+# Intervalo entre consultas ao sinal de reload no banco (segundos)
+INTERVALO_SINAL_SEGUNDOS = 0.5
+
+SINAL_RELOAD = "scheduler_reload"
+
+# Emitido pela página de Logs ao pedir a reexecução de um item do dead-letter
+SINAL_REEXECUCAO = "scheduler_reexecucao"
+
+# Workers do scheduler: cada job ocupa um enquanto roda (ou aguarda seu processo)
+MAX_JOBS_SIMULTANEOS = 4
+
+
+def job_sincronizacao(notificar: str = None):
     """
     Job de sincronização diária (apenas dias úteis).
     Também envia notificação do resultado via WhatsApp.
+    
+    Args:
+        notificar: Número/grupo de destino (padrão: EVOLUTION_NUMERO_SYNC)
     """
     if not _eh_dia_util():
-        print(f"\n🔄 [{agora_formatado(FORMATO_HORA)}] Sincronização pulada (fim de semana)")
-        return
+        motivo = _motivo_dia_nao_util()
+        print(f"\n🔄 [{agora_formatado(FORMATO_HORA)}] Sincronização pulada ({motivo})")
+        return JobPulado(motivo)
     
     print(f"\n🔄 [{agora_formatado(FORMATO_HORA)}] Iniciando sincronização agendada...")
     
@@ -147,8 +280,12 @@ def job_sincronizacao():
         sync = SyncManager()
         resultado = sync.sincronizar()
         
+        if resultado.get("compartilhado"):
+            print("   ℹ️ Sincronização já estava em andamento, resultado reaproveitado")
+        
         if resultado["status"] == "success":
             print(f"   ✅ Sincronização concluída: {resultado['registros']} registros")
+            job_notificar_retornos_alterados()
         
         elif resultado["status"] == "skipped":
             print(f"   ⏭️ Pulado: {resultado['message']}")
@@ -157,13 +294,14 @@ def job_sincronizacao():
             print(f"   ❌ Erro: {resultado['message']}")
         
         # Envia notificação se Evolution API estiver habilitada
-        if settings.EVOLUTION_ENABLED and settings.EVOLUTION_NUMERO_SYNC:
+        numero = notificar or settings.EVOLUTION_NUMERO_SYNC
+        if settings.EVOLUTION_ENABLED and numero:
             try:
                 from integrations.evolution_api import EvolutionAPI
                 
                 api = EvolutionAPI(
                     url=settings.EVOLUTION_API_URL,
-                    numero=settings.EVOLUTION_NUMERO_SYNC,
+                    numero=numero,
                     api_key=settings.EVOLUTION_API_KEY
                 )
                 
@@ -176,32 +314,70 @@ def job_sincronizacao():
                     
             except Exception as e:
                 print(f"   ⚠️ Erro ao enviar notificação: {e}")
+        
+        return resultado["status"] != "error"
             
     except Exception as e:
         print(f"   ❌ Erro na sincronização: {e}")
+        return False
 
 
-def job_sincronizacao_com_notificacao():
+def job_notificar_retornos_alterados():
+    """
+    Avisa via WhatsApp as datas de retorno alteradas desde o último aviso.
+    Lê apenas os eventos novos do outbox da sincronização (cursor próprio).
+    """
+    if not settings.EVOLUTION_ENABLED or not settings.NOTIFY_RETORNO_ALTERADO:
+        return
+    
+    try:
+        from core.eventos_sync import ConsumidorEventos, RETORNO_ALTERADO
+        from integrations.evolution_api import MensagensAutomaticas, EvolutionAPI
+        
+        api = EvolutionAPI(
+            url=settings.EVOLUTION_API_URL,
+            numero=settings.EVOLUTION_NUMERO,
+            api_key=settings.EVOLUTION_API_KEY
+        )
+        mensagens = MensagensAutomaticas(api)
+        
+        def enviar(eventos):
+            resultado = api.enviar_mensagem(mensagens.gerar_mensagem_retornos_alterados(eventos))
+            if not resultado["sucesso"]:
+                raise Exception(resultado["mensagem"])
+        
+        total = ConsumidorEventos("notificacao_retorno").processar(enviar, tipos=[RETORNO_ALTERADO])
+        if total:
+            print(f"   📱 {total} data(s) de retorno alterada(s) notificada(s)")
+    except Exception as e:
+        print(f"   ⚠️ Erro ao notificar retornos alterados: {e}")
+
+
+def job_sincronizacao_com_notificacao(notificar: str = None):
     """
     Job de sincronização com notificação (13:00).
     Verifica se já foi executada hoje para evitar duplicação.
     Se a sincronização das 08:15 já rodou, apenas envia notificação.
     Caso contrário, executa sincronização completa.
+    
+    Args:
+        notificar: Número/grupo de destino (padrão: EVOLUTION_NUMERO_SYNC)
     """
     if not _eh_dia_util():
-        print(f"\n🔔 [{agora_formatado(FORMATO_HORA)}] Sincronização + Notificação pulada (fim de semana)")
-        return
+        motivo = _motivo_dia_nao_util()
+        print(f"\n🔔 [{agora_formatado(FORMATO_HORA)}] Sincronização + Notificação pulada ({motivo})")
+        return JobPulado(motivo)
     
     # Verifica se já foi executado hoje
-    if _verificar_job_executado("sync_notif"):
+    if _tipo_executado_hoje("sincronizacao_notificacao"):
         print(f"\n🔔 [{agora_formatado(FORMATO_HORA)}] Sincronização + Notificação já executada hoje, pulando...")
-        return
+        return JobPulado("já executado hoje")
     
     print(f"\n🔔 [{agora_formatado(FORMATO_HORA)}] Sincronização + Notificação (13:00)...")
     
     # Se a sincronização das 08:15 já rodou hoje, não precisa sincronizar de novo
     # Apenas verifica e envia notificação do status atual
-    if _verificar_job_executado("sync"):
+    if _tipo_executado_hoje("sincronizacao"):
         print("   ℹ️ Sincronização das 08:15 já executada, enviando apenas notificação...")
         try:
             from integrations.evolution_api import EvolutionAPI
@@ -211,10 +387,11 @@ def job_sincronizacao_com_notificacao():
             db = Database()
             last_sync = db.buscar_ultimo_sync()
             
-            if last_sync and settings.EVOLUTION_ENABLED and settings.EVOLUTION_NUMERO_SYNC:
+            numero = notificar or settings.EVOLUTION_NUMERO_SYNC
+            if last_sync and settings.EVOLUTION_ENABLED and numero:
                 api = EvolutionAPI(
                     url=settings.EVOLUTION_API_URL,
-                    numero=settings.EVOLUTION_NUMERO_SYNC,
+                    numero=numero,
                     api_key=settings.EVOLUTION_API_KEY
                 )
                 
@@ -231,15 +408,16 @@ def job_sincronizacao_com_notificacao():
                     print(f"   📱 Notificação enviada para: {api.numero}")
                 else:
                     print(f"   ⚠️ Falha ao enviar notificação: {resultado_notif['mensagem']}")
-            
-            _marcar_job_executado("sync_notif")
+                    return False
+            else:
+                return JobPulado("notificação desativada ou sem sincronização registrada")
         except Exception as e:
             print(f"   ❌ Erro ao enviar notificação: {e}")
+            return False
     else:
         # Se não executou às 08:15, executa sincronização completa agora
         print("   ℹ️ Sincronização das 08:15 não foi executada, executando agora...")
-        job_sincronizacao()
-        _marcar_job_executado("sync_notif")
+        return job_sincronizacao(notificar)
 
 
 def job_verificar_ferias_proximas():
@@ -248,8 +426,9 @@ def job_verificar_ferias_proximas():
     Apenas registra no log, NÃO envia mensagens (a mensagem matutina já cobre isso).
     """
     if not _eh_dia_util():
-        print(f"\n📅 [{agora_formatado(FORMATO_HORA)}] Verificação de férias pulada (fim de semana)")
-        return
+        motivo = _motivo_dia_nao_util()
+        print(f"\n📅 [{agora_formatado(FORMATO_HORA)}] Verificação de férias pulada ({motivo})")
+        return JobPulado(motivo)
     
     print(f"\n📅 [{agora_formatado(FORMATO_HORA)}] Verificando férias próximas...")
     
@@ -283,19 +462,26 @@ def job_verificar_ferias_proximas():
         print(f"   ❌ Erro ao verificar férias: {e}")
 
 
-def job_mensagem_manha():
-    """Job para enviar mensagem matutina (apenas dias úteis)."""
+async def job_mensagem_manha(notificar: str = None):
+    """
+    Job para enviar mensagem matutina (apenas dias úteis).
+    
+    Args:
+        notificar: Número/grupo de destino (padrão: EVOLUTION_NUMERO)
+    """
     if not settings.EVOLUTION_ENABLED or not settings.MENSAGEM_MANHA_ENABLED:
-        return
+        return JobPulado("mensagem matutina desativada")
     
-    if not _eh_dia_util():
-        print(f"\n🌅 [{agora_formatado(FORMATO_HORA)}] Mensagem matutina pulada (fim de semana)")
-        return
+    # Consultas ao banco fora do event loop compartilhado
+    if not await asyncio.to_thread(_eh_dia_util):
+        motivo = await asyncio.to_thread(_motivo_dia_nao_util)
+        print(f"\n🌅 [{agora_formatado(FORMATO_HORA)}] Mensagem matutina pulada ({motivo})")
+        return JobPulado(motivo)
     
     # Verifica se já foi executado hoje (evita duplicação)
-    if _verificar_job_executado("manha"):
+    if await asyncio.to_thread(_tipo_executado_hoje, "mensagem_manha"):
         print(f"\n🌅 [{agora_formatado(FORMATO_HORA)}] Mensagem matutina já enviada hoje, pulando...")
-        return
+        return JobPulado("já executado hoje")
     
     print(f"\n🌅 [{agora_formatado(FORMATO_HORA)}] Enviando mensagem matutina...")
     
@@ -303,34 +489,42 @@ def job_mensagem_manha():
         from integrations.evolution_api import MensagensAutomaticas, EvolutionAPI
         api = EvolutionAPI(
             url=settings.EVOLUTION_API_URL,
-            numero=settings.EVOLUTION_NUMERO,
+            numero=notificar or settings.EVOLUTION_NUMERO,
             api_key=settings.EVOLUTION_API_KEY
         )
         mensagens = MensagensAutomaticas(api)
-        resultado = mensagens.enviar_mensagem_manha()
+        resultado = await mensagens.enviar_mensagem_manha_async()
         
         if resultado["sucesso"]:
             print("   ✅ Mensagem matutina enviada com sucesso")
-            _marcar_job_executado("manha")
         else:
             print(f"   ❌ Erro ao enviar: {resultado['mensagem']}")
+            return False
     except Exception as e:
         print(f"   ❌ Erro: {e}")
+        return False
 
 
-def job_mensagem_tarde():
-    """Job para enviar mensagem vespertina (apenas dias úteis)."""
+async def job_mensagem_tarde(notificar: str = None):
+    """
+    Job para enviar mensagem vespertina (apenas dias úteis).
+    
+    Args:
+        notificar: Número/grupo de destino (padrão: EVOLUTION_NUMERO)
+    """
     if not settings.EVOLUTION_ENABLED or not settings.MENSAGEM_TARDE_ENABLED:
-        return
+        return JobPulado("mensagem vespertina desativada")
     
-    if not _eh_dia_util():
-        print(f"\n🌆 [{agora_formatado(FORMATO_HORA)}] Mensagem vespertina pulada (fim de semana)")
-        return
+    # Consultas ao banco fora do event loop compartilhado
+    if not await asyncio.to_thread(_eh_dia_util):
+        motivo = await asyncio.to_thread(_motivo_dia_nao_util)
+        print(f"\n🌆 [{agora_formatado(FORMATO_HORA)}] Mensagem vespertina pulada ({motivo})")
+        return JobPulado(motivo)
     
     # Verifica se já foi executado hoje (evita duplicação)
-    if _verificar_job_executado("tarde"):
+    if await asyncio.to_thread(_tipo_executado_hoje, "mensagem_tarde"):
         print(f"\n🌆 [{agora_formatado(FORMATO_HORA)}] Mensagem vespertina já enviada hoje, pulando...")
-        return
+        return JobPulado("já executado hoje")
     
     print(f"\n🌆 [{agora_formatado(FORMATO_HORA)}] Enviando mensagem vespertina...")
     
@@ -338,44 +532,55 @@ def job_mensagem_tarde():
         from integrations.evolution_api import MensagensAutomaticas, EvolutionAPI
         api = EvolutionAPI(
             url=settings.EVOLUTION_API_URL,
-            numero=settings.EVOLUTION_NUMERO,
+            numero=notificar or settings.EVOLUTION_NUMERO,
             api_key=settings.EVOLUTION_API_KEY
         )
         mensagens = MensagensAutomaticas(api)
-        resultado = mensagens.enviar_mensagem_tarde()
+        resultado = await mensagens.enviar_mensagem_tarde_async()
         
         if resultado["sucesso"]:
             print("   ✅ Mensagem vespertina enviada com sucesso")
-            _marcar_job_executado("tarde")
         else:
             print(f"   ❌ Erro ao enviar: {resultado['mensagem']}")
+            return False
     except Exception as e:
         print(f"   ❌ Erro: {e}")
+        return False
 
 
-def job_kanbanize_sync_09h30():
-    """Job para sincronizar cards do Kanbanize às 09:30 e enviar notificação."""
-    if not settings.KANBANIZE_SYNC_ENABLED or not settings.KANBANIZE_SYNC_09H30_ENABLED:
-        return
+async def job_kanbanize_sync(board_id=None, rotulo: str = "", notificar: str = None):
+    """
+    Job para sincronizar os cards de um board do Kanbanize e enviar notificação.
     
-    if not _eh_dia_util():
-        print(f"\n📋 [{agora_formatado(FORMATO_HORA)}] Sync Kanbanize 09:30 pulada (fim de semana)")
-        return
+    Corrotina: roda no event loop compartilhado do scheduler, com os
+    detalhes dos cards buscados de forma concorrente e o acesso ao banco em
+    thread (ver `scheduler.assincrono`).
     
-    print(f"\n📋 [{agora_formatado(FORMATO_HORA)}] Sincronizando Kanbanize (09:30)...")
+    Args:
+        board_id: Board a sincronizar (padrão: KANBANIZE_DEFAULT_BOARD_ID)
+        rotulo: Identificação da janela nas mensagens e logs (ex: '09:30')
+        notificar: Número/grupo de destino (padrão: EVOLUTION_NUMERO_SYNC)
+    """
+    # Consultas ao banco fora do event loop compartilhado
+    if not await asyncio.to_thread(_eh_dia_util):
+        motivo = await asyncio.to_thread(_motivo_dia_nao_util)
+        print(f"\n📋 [{agora_formatado(FORMATO_HORA)}] Sync Kanbanize {rotulo} pulada ({motivo})")
+        return JobPulado(motivo)
+    
+    print(f"\n📋 [{agora_formatado(FORMATO_HORA)}] Sincronizando Kanbanize ({rotulo})...")
     
     from integrations.kanbanize import KanbanizeAPI
     from integrations.evolution_api import EvolutionAPI
     from core.database import Database
     
-    db = Database()
+    db = await asyncio.to_thread(Database)
     
     try:
         # Conecta na API e busca cards
         api = KanbanizeAPI(settings.KANBANIZE_BASE_URL, settings.KANBANIZE_API_KEY)
-        board_id = int(settings.KANBANIZE_DEFAULT_BOARD_ID)
+        board_id = int(board_id or settings.KANBANIZE_DEFAULT_BOARD_ID)
         
-        resultado = api.buscar_cards_completos_paralelo(
+        resultado = await api.buscar_cards_completos_async(
             board_ids=[board_id],
             sem_detalhes=False  # Garante que os campos personalizados sejam buscados
         )
@@ -385,34 +590,38 @@ def job_kanbanize_sync_09h30():
             print(f"   ❌ Erro na API Kanbanize: {erro_msg}")
             
             # Notifica erro via WhatsApp
-            _notificar_kanbanize(EvolutionAPI, f"❌ Erro Kanbanize (09:30): {erro_msg}")
+            await _notificar_kanbanize(EvolutionAPI, f"❌ Erro Kanbanize ({rotulo}): {erro_msg}", notificar)
             
-            db.registrar_log(
+            await asyncio.to_thread(
+                db.registrar_log,
                 tipo="kanbanize",
                 categoria="Sincronização",
                 status="erro",
-                mensagem="Erro na API Kanbanize 09:30",
+                mensagem=f"Erro na API Kanbanize {rotulo}",
                 detalhes=erro_msg,
                 origem="scheduler"
             )
-            return
+            return False
         
         cards = resultado.get("dados", [])
         
         # Salva no banco
-        cards_salvos = db.salvar_cards_kanbanize(cards, board_id=board_id)
+        cards_salvos = await asyncio.to_thread(db.salvar_cards_kanbanize, cards, board_id=board_id)
         
         print(f"   ✅ {cards_salvos} cards sincronizados")
         
         # Envia mensagem de sucesso
-        _notificar_kanbanize(EvolutionAPI, f"✅ Kanbanize sincronizado (09:30): {cards_salvos} cards atualizados")
+        await _notificar_kanbanize(
+            EvolutionAPI, f"✅ Kanbanize sincronizado ({rotulo}): {cards_salvos} cards atualizados", notificar
+        )
         
         # Registra log
-        db.registrar_log(
+        await asyncio.to_thread(
+            db.registrar_log,
             tipo="kanbanize",
             categoria="Sincronização",
             status="sucesso",
-            mensagem=f"Sincronização Kanbanize 09:30: {cards_salvos} cards",
+            mensagem=f"Sincronização Kanbanize {rotulo}: {cards_salvos} cards",
             detalhes=f"Board ID: {board_id}",
             origem="scheduler"
         )
@@ -421,170 +630,97 @@ def job_kanbanize_sync_09h30():
         print(f"   ❌ Erro: {e}")
         
         # Notifica erro via WhatsApp
-        _notificar_kanbanize(EvolutionAPI, f"❌ Erro Kanbanize (09:30): {str(e)[:100]}")
+        await _notificar_kanbanize(EvolutionAPI, f"❌ Erro Kanbanize ({rotulo}): {str(e)[:100]}", notificar)
         
-        db.registrar_log(
+        await asyncio.to_thread(
+            db.registrar_log,
             tipo="kanbanize",
             categoria="Sincronização",
             status="erro",
-            mensagem="Erro na sincronização Kanbanize 09:30",
+            mensagem=f"Erro na sincronização Kanbanize {rotulo}",
             detalhes=str(e),
             origem="scheduler"
         )
+        return False
 
 
-def job_kanbanize_sync_18h00():
-    """Job para sincronizar cards do Kanbanize às 18:00 e enviar notificação."""
-    if not settings.KANBANIZE_SYNC_ENABLED or not settings.KANBANIZE_SYNC_18H00_ENABLED:
-        return
-    
-    if not _eh_dia_util():
-        print(f"\n📋 [{agora_formatado(FORMATO_HORA)}] Sync Kanbanize 18:00 pulada (fim de semana)")
-        return
-    
-    print(f"\n📋 [{agora_formatado(FORMATO_HORA)}] Sincronizando Kanbanize (18:00)...")
-    
-    from integrations.kanbanize import KanbanizeAPI
-    from integrations.evolution_api import EvolutionAPI
-    from core.database import Database
-    
-    db = Database()
-    
-    try:
-        # Conecta na API e busca cards
-        api = KanbanizeAPI(settings.KANBANIZE_BASE_URL, settings.KANBANIZE_API_KEY)
-        board_id = int(settings.KANBANIZE_DEFAULT_BOARD_ID)
-        
-        resultado = api.buscar_cards_completos_paralelo(
-            board_ids=[board_id],
-            sem_detalhes=False  # Garante que os campos personalizados sejam buscados
-        )
-        
-        if not resultado.get("sucesso"):
-            erro_msg = resultado.get('mensagem', 'Erro desconhecido')
-            print(f"   ❌ Erro na API Kanbanize: {erro_msg}")
-            
-            # Notifica erro via WhatsApp
-            _notificar_kanbanize(EvolutionAPI, f"❌ Erro Kanbanize (18:00): {erro_msg}")
-            
-            db.registrar_log(
-                tipo="kanbanize",
-                categoria="Sincronização",
-                status="erro",
-                mensagem="Erro na API Kanbanize 18:00",
-                detalhes=erro_msg,
-                origem="scheduler"
-            )
-            return
-        
-        cards = resultado.get("dados", [])
-        
-        # Salva no banco
-        cards_salvos = db.salvar_cards_kanbanize(cards, board_id=board_id)
-        
-        print(f"   ✅ {cards_salvos} cards sincronizados")
-        
-        # Envia mensagem de sucesso
-        _notificar_kanbanize(EvolutionAPI, f"✅ Kanbanize sincronizado (18:00): {cards_salvos} cards atualizados")
-        
-        # Registra log
-        db.registrar_log(
-            tipo="kanbanize",
-            categoria="Sincronização",
-            status="sucesso",
-            mensagem=f"Sincronização Kanbanize 18:00: {cards_salvos} cards",
-            detalhes=f"Board ID: {board_id}",
-            origem="scheduler"
-        )
-        
-    except Exception as e:
-        print(f"   ❌ Erro: {e}")
-        
-        # Notifica erro via WhatsApp
-        _notificar_kanbanize(EvolutionAPI, f"❌ Erro Kanbanize (18:00): {str(e)[:100]}")
-        
-        db.registrar_log(
-            tipo="kanbanize",
-            categoria="Sincronização",
-            status="erro",
-            mensagem="Erro na sincronização Kanbanize 18:00",
-            detalhes=str(e),
-            origem="scheduler"
-        )
+# Função executada por cada tipo de job do registro (ver `scheduler.registro`)
+TIPOS_FUNCAO = {
+    "sincronizacao": job_sincronizacao,
+    "sincronizacao_notificacao": job_sincronizacao_com_notificacao,
+    "mensagem_manha": job_mensagem_manha,
+    "mensagem_tarde": job_mensagem_tarde,
+    "verificar_ferias": job_verificar_ferias_proximas,
+    "kanbanize_sync": job_kanbanize_sync,
+}
 
 
 def _verificar_e_executar_jobs_perdidos():
     """
-    Verifica se há jobs que deveriam ter sido executados hoje mas foram perdidos
-    (por exemplo, se o scheduler iniciou depois do horário agendado).
-    
-    Usa arquivo de controle para evitar execução duplicada (funções _verificar_job_executado
-    e _marcar_job_executado nos próprios jobs já fazem esse controle).
+    Recupera os disparos perdidos de todos os jobs do registro (por exemplo,
+    se o scheduler iniciou depois do horário agendado). Ver
+    `scheduler.recuperacao`: os disparos saem do trigger de cada job, o
+    ledger diz quais não rodaram e o prazo da política descarta os que já
+    não têm utilidade. Grupos independentes rodam em paralelo.
     """
-    agora = datetime.now()
-    hora_atual = agora.hour
-    minuto_atual = agora.minute
-    
-    # Só executa em dias úteis
-    if not _eh_dia_util():
-        return
-    
     print("\n🔍 Verificando jobs perdidos...")
-    jobs_executados = []
-    
-    # Verifica sincronização (não tem controle de duplicação no job_sincronizacao, então verificamos aqui)
-    if settings.SYNC_ENABLED and not _verificar_job_executado("sync"):
-        hora_sync = settings.SYNC_HOUR
-        min_sync = settings.SYNC_MINUTE
-        if hora_atual > hora_sync or (hora_atual == hora_sync and minuto_atual > min_sync):
-            print(f"   ⏰ Sincronização das {hora_sync:02d}:{min_sync:02d} foi perdida, executando agora...")
-            job_sincronizacao()
-            _marcar_job_executado("sync")
-            jobs_executados.append("sync")
-    
-    # Verifica sincronização com notificação (13:00)
-    if settings.SYNC_NOTIF_ENABLED and not _verificar_job_executado("sync_notif"):
-        hora_sync_notif = settings.SYNC_NOTIF_HOUR
-        min_sync_notif = settings.SYNC_NOTIF_MINUTE
-        if hora_atual > hora_sync_notif or (hora_atual == hora_sync_notif and minuto_atual > min_sync_notif):
-            print(f"   ⏰ Sincronização + Notificação das {hora_sync_notif:02d}:{min_sync_notif:02d} foi perdida, executando agora...")
-            job_sincronizacao_com_notificacao()
-            _marcar_job_executado("sync_notif")
-            jobs_executados.append("sync_notif")
-    
-    # Verifica verificação de férias (09:00) - não envia mensagem, apenas verifica
-    # NOTA: Removido desta verificação pois é apenas informativo e não crítico
-    # if settings.EVOLUTION_ENABLED and not _verificar_job_executado("ferias"):
-    #     if hora_atual > 9 or (hora_atual == 9 and minuto_atual > 0):
-    #         print(f"   ⏰ Verificação de férias das 09:00 foi perdida, executando agora...")
-    #         job_verificar_ferias_proximas()
-    #         _marcar_job_executado("ferias")
-    #         jobs_executados.append("ferias")
-    
-    # Verifica mensagem matutina (o job já tem controle de duplicação interno)
-    if settings.EVOLUTION_ENABLED and settings.MENSAGEM_MANHA_ENABLED and not _verificar_job_executado("manha"):
-        hora_manha = settings.MENSAGEM_MANHA_HOUR
-        min_manha = settings.MENSAGEM_MANHA_MINUTE
-        if hora_atual > hora_manha or (hora_atual == hora_manha and minuto_atual > min_manha):
-            print(f"   ⏰ Mensagem matutina das {hora_manha:02d}:{min_manha:02d} foi perdida, executando agora...")
-            job_mensagem_manha()  # O job já marca como executado se for bem-sucedido
-            jobs_executados.append("manha")
-    
-    # Verifica mensagem vespertina (o job já tem controle de duplicação interno)
-    if settings.EVOLUTION_ENABLED and settings.MENSAGEM_TARDE_ENABLED and not _verificar_job_executado("tarde"):
-        hora_tarde = settings.MENSAGEM_TARDE_HOUR
-        min_tarde = settings.MENSAGEM_TARDE_MINUTE
-        if hora_atual > hora_tarde or (hora_atual == hora_tarde and minuto_atual > min_tarde):
-            print(f"   ⏰ Mensagem vespertina das {hora_tarde:02d}:{min_tarde:02d} foi perdida, executando agora...")
-            job_mensagem_tarde()  # O job já marca como executado se for bem-sucedido
-            jobs_executados.append("tarde")
-    
-    if jobs_executados:
-        print(f"   ✅ {len(jobs_executados)} job(s) perdido(s) processado(s): {', '.join(jobs_executados)}")
+    recuperados = recuperar(carregar_registro(), _executar_tentativa, max_paralelos=MAX_JOBS_SIMULTANEOS)
+    
+    if recuperados:
+        job_ids = [definicao.id for definicao, _ in recuperados]
+        print(f"   ✅ {len(job_ids)} job(s) perdido(s) processado(s): {', '.join(job_ids)}")
     else:
         print("   ✅ Nenhum job perdido")
 
 
+def _aplicar_jobs(scheduler, db=None) -> Dict[str, List[str]]:
+    """
+    Sincroniza os jobs do scheduler com o registro (`scheduler.registro`),
+    mexendo apenas nos que mudaram: novos são adicionados, desabilitados
+    removidos e os com definição alterada recriados. Execuções em andamento
+    não são interrompidas.
+    
+    Returns:
+        Dict com os IDs 'adicionados', 'alterados' e 'removidos'
+    """
+    desejados = {d.id: d for d in carregar_registro(db)}
+    mudancas = {"adicionados": [], "alterados": [], "removidos": []}
+    
+    for job_id in list(_jobs_aplicados):
+        if job_id not in desejados:
+            if scheduler.get_job(job_id):
+                scheduler.remove_job(job_id)
+            del _jobs_aplicados[job_id]
+            mudancas["removidos"].append(job_id)
+    
+    for job_id, definicao in desejados.items():
+        anterior = _jobs_aplicados.get(job_id)
+        if anterior == definicao:
+            continue
+        
+        scheduler.add_job(
+            _executar_agendado,
+            definicao.trigger(),
+            args=[definicao],
+            id=job_id,
+            name=definicao.nome,
+            max_instances=definicao.max_instancias,
+            replace_existing=True
+        )
+        _jobs_aplicados[job_id] = definicao
+        mudancas["adicionados" if anterior is None else "alterados"].append(job_id)
+    
+    return mudancas
+
+
+def recarregar_scheduler() -> Dict[str, List[str]]:
+    """Relê o .env e aplica ao scheduler em execução apenas as mudanças."""
+    settings.carregar_env()
+    if not _scheduler:
+        return {"adicionados": [], "alterados": [], "removidos": []}
+    return _aplicar_jobs(_scheduler)
+
+
 def iniciar_scheduler(executar_perdidos: bool = True):
     """
     Inicia o agendador de tarefas.
@@ -592,108 +728,42 @@ def iniciar_scheduler(executar_perdidos: bool = True):
     Args:
         executar_perdidos: Se True, executa jobs que foram perdidos (horário já passou hoje)
     
-    Agenda:
-        - Sincronização: diária no horário configurado (SYNC_HOUR:SYNC_MINUTE)
-        - Verificação de Férias Próximas: diária às 09:00
-        - Mensagem Matutina: no horário configurado (MENSAGEM_MANHA_HOUR:MINUTE)
-        - Mensagem Vespertina: no horário configurado (MENSAGEM_TARDE_HOUR:MINUTE)
+    Agenda os jobs do registro (`scheduler.registro`): os padrões do .env
+    (sincronizações, mensagens, Kanbanize) mais as linhas de `jobs_agendados`.
     """
-    global _scheduler
+    global _scheduler, _saude
     
     if not HAS_APSCHEDULER:
         print("❌ APScheduler não disponível. Instale com: pip install apscheduler")
         return False
     
-    # Cria arquivo de lock para indicar que o scheduler está rodando
-    try:
-        lock_file = Path(settings.DATA_DIR) / ".scheduler.lock"
-        lock_file.write_text(f"{datetime.now().isoformat()}\n")
-    except:
-        pass
-    
-    _scheduler = BackgroundScheduler()
-    
-    # Job 1: Sincronização diária (segunda a sexta)
-    if settings.SYNC_ENABLED:
-        _scheduler.add_job(
-            job_sincronizacao,
-            CronTrigger(hour=settings.SYNC_HOUR, minute=settings.SYNC_MINUTE, day_of_week='mon-fri'),
-            id='sync_diaria',
-            name='Sincronização Diária',
-            replace_existing=True
-        )
-    
-    # Job 1.5: Sincronização com notificação (segunda a sexta, 13:00)
-    if settings.SYNC_NOTIF_ENABLED:
-        _scheduler.add_job(
-            job_sincronizacao_com_notificacao,
-            CronTrigger(hour=settings.SYNC_NOTIF_HOUR, minute=settings.SYNC_NOTIF_MINUTE, day_of_week='mon-fri'),
-            id='sync_notif',
-            name='Sincronização + Notificação',
-            replace_existing=True
-        )
-    
-    # Job 2: Mensagem matutina (segunda a sexta)
-    if settings.EVOLUTION_ENABLED and settings.MENSAGEM_MANHA_ENABLED:
-        _scheduler.add_job(
-            job_mensagem_manha,
-            CronTrigger(hour=settings.MENSAGEM_MANHA_HOUR, minute=settings.MENSAGEM_MANHA_MINUTE, day_of_week='mon-fri'),
-            id='mensagem_manha',
-            name='Mensagem Matutina',
-            replace_existing=True
-        )
-    
-    # Job 3: Mensagem vespertina (segunda a sexta)
-    if settings.EVOLUTION_ENABLED and settings.MENSAGEM_TARDE_ENABLED:
-        _scheduler.add_job(
-            job_mensagem_tarde,
-            CronTrigger(hour=settings.MENSAGEM_TARDE_HOUR, minute=settings.MENSAGEM_TARDE_MINUTE, day_of_week='mon-fri'),
-            id='mensagem_tarde',
-            name='Mensagem Vespertina',
-            replace_existing=True
-        )
-    
-    # Job 4: Sincronização Kanbanize 09:30 (segunda a sexta)
-    if settings.KANBANIZE_SYNC_ENABLED and settings.KANBANIZE_SYNC_09H30_ENABLED:
-        _scheduler.add_job(
-            job_kanbanize_sync_09h30,
-            CronTrigger(hour=9, minute=30, day_of_week='mon-fri'),
-            id='kanbanize_sync_09h30',
-            name='Kanbanize Sync 09:30',
-            replace_existing=True
-        )
-    
-    # Job 5: Sincronização Kanbanize 18:00 (segunda a sexta)
-    if settings.KANBANIZE_SYNC_ENABLED and settings.KANBANIZE_SYNC_18H00_ENABLED:
-        _scheduler.add_job(
-            job_kanbanize_sync_18h00,
-            CronTrigger(hour=18, minute=0, day_of_week='mon-fri'),
-            id='kanbanize_sync_18h00',
-            name='Kanbanize Sync 18:00',
-            replace_existing=True
-        )
-    
+    # Disparos sobrepostos do mesmo job são fundidos em um (coalesce/max_instances)
+    _scheduler = BackgroundScheduler(
+        executors={"default": ThreadPoolExecutor(MAX_JOBS_SIMULTANEOS)},
+        job_defaults={"coalesce": True, "max_instances": 1, "misfire_grace_time": 5 * 60}
+    )
+    MonitorJobs().registrar(_scheduler)
+    _saude = MonitorSaude(max_workers=MAX_JOBS_SIMULTANEOS)
+    _saude.registrar(_scheduler)
+    
+    _aplicar_jobs(_scheduler)
+    # Event loop compartilhado pelos jobs assíncronos (Kanbanize, mensagens)
+    loop_jobs.iniciar()
     _scheduler.start()
     
+    # Heartbeat no banco (lido pela interface) e endpoint /health (healthcheck do Docker)
+    _saude.iniciar(porta=settings.SCHEDULER_HEALTH_PORT)
+    
     print("=" * 60)
     print("📆 SCHEDULER INICIADO")
     print("=" * 60)
-    if settings.SYNC_ENABLED:
-        print(f"   🔄 Sincronização: seg-sex às {settings.SYNC_HOUR:02d}:{settings.SYNC_MINUTE:02d}")
-    if settings.SYNC_NOTIF_ENABLED:
-        print(f"   🔔 Sincronização + Notificação: seg-sex às {settings.SYNC_NOTIF_HOUR:02d}:{settings.SYNC_NOTIF_MINUTE:02d}")
-    if settings.KANBANIZE_SYNC_ENABLED:
-        if settings.KANBANIZE_SYNC_09H30_ENABLED:
-            print(f"   📋 Kanbanize Sync 09:30: seg-sex às 09:30")
-        if settings.KANBANIZE_SYNC_18H00_ENABLED:
-            print(f"   📋 Kanbanize Sync 18:00: seg-sex às 18:00")
-    if settings.EVOLUTION_ENABLED:
-        if settings.MENSAGEM_MANHA_ENABLED:
-            print(f"   🌅 Mensagem Matutina: seg-sex às {settings.MENSAGEM_MANHA_HOUR:02d}:{settings.MENSAGEM_MANHA_MINUTE:02d}")
-        if settings.MENSAGEM_TARDE_ENABLED:
-            print(f"   🌆 Mensagem Vespertina: seg-sex às {settings.MENSAGEM_TARDE_HOUR:02d}:{settings.MENSAGEM_TARDE_MINUTE:02d}")
+    for definicao in _jobs_aplicados.values():
+        print(f"   🗓️ {definicao.nome}: cron '{definicao.cron}'")
     print("=" * 60)
     
+    # Reexecuções do dead-letter pedidas enquanto o scheduler estava parado
+    _despachar_reexecucoes()
+    
     # Executa jobs perdidos se o scheduler iniciou depois do horário
     if executar_perdidos:
         _verificar_e_executar_jobs_perdidos()
@@ -703,19 +773,18 @@ def iniciar_scheduler(executar_perdidos: bool = True):
 
 def parar_scheduler():
     """Para o agendador."""
-    global _scheduler
+    global _scheduler, _saude
     
     if _scheduler:
         _scheduler.shutdown()
         _scheduler = None
+        _jobs_aplicados.clear()
+        loop_jobs.parar()
         
-        # Remove arquivo de lock
-        try:
-            lock_file = Path(settings.DATA_DIR) / ".scheduler.lock"
-            if lock_file.exists():
-                lock_file.unlink()
-        except:
-            pass
+        # Registra o scheduler como parado no heartbeat
+        if _saude:
+            _saude.parar()
+            _saude = None
         
         print("⏹️ Scheduler parado")
 
@@ -728,9 +797,10 @@ def executar_agora():
     if settings.EVOLUTION_ENABLED:
         job_verificar_ferias_proximas()
     if settings.EVOLUTION_ENABLED and settings.MENSAGEM_MANHA_ENABLED:
-        job_mensagem_manha()
+        loop_jobs.executar(job_mensagem_manha())
     if settings.EVOLUTION_ENABLED and settings.MENSAGEM_TARDE_ENABLED:
-        job_mensagem_tarde()
+        loop_jobs.executar(job_mensagem_tarde())
+    loop_jobs.parar()
 
 
 # ==================== CLI ====================
@@ -762,38 +832,40 @@ def main():
     
     print("\n💡 Pressione Ctrl+C para parar\n")
     
-    # Verifica periodicamente se há arquivo de reload
-    reload_flag = Path(settings.DATA_DIR) / ".scheduler.reload"
+    # Acompanha os sinais gravados no banco pelas páginas de Configurações e Logs
+    db = Database()
+    versao_reload = db.buscar_versao_sinal(SINAL_RELOAD)
+    versao_reexecucao = db.buscar_versao_sinal(SINAL_REEXECUCAO)
     
     try:
         while True:
-            time.sleep(60)
+            time.sleep(INTERVALO_SINAL_SEGUNDOS)
             
-            # Verifica se foi criado arquivo de reload
-            if reload_flag.exists():
-                print("\n🔄 Detectado arquivo de reload, reiniciando scheduler...")
-                
+            versao = db.buscar_versao_sinal(SINAL_REEXECUCAO)
+            if versao != versao_reexecucao:
+                versao_reexecucao = versao
                 try:
-                    # Remove o arquivo de flag
-                    reload_flag.unlink()
-                    
-                    # Para o scheduler atual
-                    parar_scheduler()
-                    
-                    # Recarrega configurações
-                    settings.carregar_env()
-                    
-                    # Reinicia o scheduler
-                    time.sleep(1)
-                    if iniciar_scheduler(executar_perdidos=False):
-                        print("✅ Scheduler reiniciado com novas configurações!")
-                    else:
-                        print("❌ Falha ao reiniciar scheduler")
-                        break
+                    despachados = _despachar_reexecucoes(db)
+                    if despachados:
+                        print(f"\n🔁 Reexecução solicitada: {', '.join(despachados)}")
                 except Exception as e:
-                    print(f"❌ Erro ao reiniciar scheduler: {e}")
-                    break
-                    
+                    print(f"❌ Erro ao despachar reexecuções: {e}")
+            
+            versao = db.buscar_versao_sinal(SINAL_RELOAD)
+            if versao == versao_reload:
+                continue
+            versao_reload = versao
+            
+            print("\n🔄 Sinal de reload recebido, aplicando novas configurações...")
+            try:
+                mudancas = recarregar_scheduler()
+                for tipo, job_ids in mudancas.items():
+                    if job_ids:
+                        print(f"   • {tipo.capitalize()}: {', '.join(job_ids)}")
+                print("✅ Scheduler atualizado com novas configurações!")
+            except Exception as e:
+                print(f"❌ Erro ao recarregar scheduler: {e}")
+    
     except KeyboardInterrupt:
         parar_scheduler()
         print("\n👋 Scheduler encerrado")
@@ -0,0 +1,131 @@
+"""
+Ledger de execuções dos jobs agendados.
+
+Cada execução é uma linha de `job_runs` identificada por (job, horário
+agendado). A reserva é atômica no banco, então um mesmo horário roda uma
+única vez mesmo com vários processos do scheduler ou reinícios disputando:
+- Quem reserva executa e registra status, duração e erro
+- Horário com sucesso ou em andamento não é reservado de novo
+- Horário com erro pode ser reservado novamente (nova tentativa)
+- Horário que esgotou as tentativas vai para o dead-letter (`esgotado`) e
+  só roda de novo se a reexecução for solicitada (`reexecutar`)
+- Execução "em andamento" antiga demais (processo morto) pode ser retomada
+"""
+
+import os
+import socket
+import time
+import uuid
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional
+
+import sys
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.database import Database
+
+EXECUTANDO = "executando"
+SUCESSO = "sucesso"
+ERRO = "erro"
+PULADO = "pulado"
+ESGOTADO = "esgotado"
+REEXECUTAR = "reexecutar"
+
+# Status que permitem nova reserva do horário
+REPROCESSAVEIS = (ERRO, REEXECUTAR)
+
+# Execução em andamento há mais que isso é considerada abandonada (minutos)
+EXECUCAO_EXPIRADA_MINUTOS = 120
+
+FORMATO_LEDGER = "%Y-%m-%d %H:%M:%S"
+
+
+class JobPulado:
+    """
+    Retorno de um job que não executou de propósito (dia não útil, já
+    executado hoje, recurso desativado): registrado como `pulado`, não como
+    sucesso.
+    """
+
+    def __init__(self, motivo: str = ""):
+        self.motivo = motivo
+
+    def __repr__(self):
+        return f"JobPulado({self.motivo!r})"
+
+
+def status_do_retorno(retorno: Any) -> str:
+    """Status do ledger para o retorno de um job: False é erro, JobPulado é pulado."""
+    if retorno is False:
+        return ERRO
+    return PULADO if isinstance(retorno, JobPulado) else SUCESSO
+
+
+def horario_agendado(hora: int, minuto: int, dia: datetime = None) -> datetime:
+    """Horário agendado de um job diário no dia informado (hoje por padrão)."""
+    return (dia or datetime.now()).replace(hour=hora, minute=minuto, second=0, microsecond=0)
+
+
+class LedgerJobs:
+    """Reserva, executa e registra execuções de jobs em `job_runs`."""
+
+    def __init__(self, db: Database = None):
+        self.db = db or Database()
+        self.host = socket.gethostname()
+        self.pid = os.getpid()
+        self.ultimo_status: Optional[str] = None
+        self.ultimo_erro: Optional[str] = None
+
+    def executar(self, job_id: str, funcao: Callable[[], Any], agendado_para: datetime) -> Optional[Any]:
+        """
+        Executa `funcao` se este processo conseguir reservar o horário.
+
+        A função sinaliza falha retornando False ou lançando exceção, e que
+        não executou retornando `JobPulado`; qualquer outro retorno é
+        registrado como sucesso. O desfecho fica em
+        `ultimo_status` (sucesso, erro ou pulado) e `ultimo_erro`.
+
+        Returns:
+            Retorno da função, ou None se o horário já foi reservado por outro
+        """
+        token = uuid.uuid4().hex
+        self.ultimo_status, self.ultimo_erro = PULADO, None
+        expirado_antes = datetime.now() - timedelta(minutes=EXECUCAO_EXPIRADA_MINUTOS)
+
+        if not self.db.reservar_job_run(
+            job_id, agendado_para.strftime(FORMATO_LEDGER), token, self.pid, self.host,
+            expirado_antes.strftime(FORMATO_LEDGER)
+        ):
+            print(f"   ⏭️ {job_id} ({agendado_para:%H:%M}) já executado ou em execução, pulando...")
+            return None
+
+        inicio = time.monotonic()
+        try:
+            resultado = funcao()
+        except Exception as e:
+            self.ultimo_status, self.ultimo_erro = ERRO, str(e)
+            self.db.finalizar_job_run(token, ERRO, time.monotonic() - inicio, self.ultimo_erro)
+            print(f"   ❌ Erro no job {job_id}: {e}")
+            return None
+
+        self.ultimo_status = status_do_retorno(resultado)
+        self.db.finalizar_job_run(token, self.ultimo_status, time.monotonic() - inicio)
+        return resultado
+
+    def pendente(self, job_id: str, agendado_para: datetime) -> bool:
+        """Verifica se o horário ainda precisa rodar (sem execução, com erro ou reexecução pedida)."""
+        execucao = self.execucao(job_id, agendado_para)
+        return execucao is None or execucao["status"] in REPROCESSAVEIS
+
+    def execucao(self, job_id: str, agendado_para: datetime) -> Optional[Dict]:
+        """Linha do ledger do horário, se houver."""
+        return self.db.buscar_job_run(job_id, agendado_para.strftime(FORMATO_LEDGER))
+
+    def esgotar(self, job_id: str, agendado_para: datetime):
+        """Move um horário com erro para o dead-letter."""
+        self.db.atualizar_status_job_run(job_id, agendado_para.strftime(FORMATO_LEDGER), ESGOTADO, de=ERRO)
+
+    def executado_hoje(self, job_id: str) -> bool:
+        """Verifica se o job já rodou com sucesso em algum horário de hoje."""
+        return self.db.job_executado_no_dia(job_id, datetime.now().strftime("%Y-%m-%d"))
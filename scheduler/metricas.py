@@ -0,0 +1,126 @@
+"""
+Métricas de execução dos jobs agendados.
+
+Listener do APScheduler que grava em `job_metricas`, para cada disparo:
+- Atraso de início (horário agendado x submissão ao executor)
+- Duração da execução
+- Desfecho: sucesso, pulado, erro, perdido (misfire) ou ignorado
+  (instância anterior ainda rodando)
+- Mensagem da exceção, quando houver
+
+A página de Logs agrega essas linhas em p50/p95 e contagem de misfires.
+"""
+
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Tuple
+
+import sys
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.database import Database
+from scheduler.ledger import PULADO, JobPulado
+
+try:
+    from apscheduler.events import (
+        EVENT_JOB_ERROR, EVENT_JOB_EXECUTED, EVENT_JOB_MAX_INSTANCES,
+        EVENT_JOB_MISSED, EVENT_JOB_SUBMITTED,
+    )
+    HAS_APSCHEDULER = True
+except ImportError:
+    HAS_APSCHEDULER = False
+
+SUCESSO = "sucesso"
+ERRO = "erro"
+PERDIDO = "perdido"
+IGNORADO = "ignorado"
+
+FORMATO_METRICA = "%Y-%m-%d %H:%M:%S"
+
+
+def _local(momento: datetime) -> datetime:
+    """Converte horários com fuso do APScheduler para o horário local sem fuso."""
+    return momento.astimezone().replace(tzinfo=None) if momento.tzinfo else momento
+
+
+def resultado_do_retorno(retorno) -> str:
+    """Desfecho de uma execução sem exceção: o status devolvido pelo ledger, pulado ou sucesso."""
+    if isinstance(retorno, str):
+        return retorno
+    return PULADO if isinstance(retorno, JobPulado) else SUCESSO
+
+
+class MonitorJobs:
+    """Registra as métricas dos eventos de jobs de um scheduler."""
+
+    def __init__(self, db: Database = None):
+        self.db = db or Database()
+        self._lock = threading.Lock()
+        # (job_id, horário agendado) -> submissão ao executor / término sem submissão vista
+        self._inicios: Dict[Tuple[str, datetime], datetime] = {}
+        self._pendentes: Dict[Tuple[str, datetime], Tuple[object, datetime]] = {}
+
+    def registrar(self, scheduler):
+        """Adiciona o listener ao scheduler."""
+        if not HAS_APSCHEDULER:
+            return
+        scheduler.add_listener(
+            self._tratar_evento,
+            EVENT_JOB_SUBMITTED | EVENT_JOB_EXECUTED | EVENT_JOB_ERROR | EVENT_JOB_MISSED | EVENT_JOB_MAX_INSTANCES
+        )
+
+    def _tratar_evento(self, evento):
+        try:
+            if evento.code == EVENT_JOB_SUBMITTED:
+                self._submetido(evento)
+            elif evento.code in (EVENT_JOB_EXECUTED, EVENT_JOB_ERROR):
+                self._finalizado(evento, datetime.now())
+            elif evento.code == EVENT_JOB_MISSED:
+                self._gravar(evento.job_id, evento.scheduled_run_time, PERDIDO)
+            elif evento.code == EVENT_JOB_MAX_INSTANCES:
+                for agendado in evento.scheduled_run_times:
+                    self._gravar(evento.job_id, agendado, IGNORADO)
+        except Exception as e:
+            print(f"   ⚠️ Erro ao registrar métrica do job {evento.job_id}: {e}")
+
+    def _submetido(self, evento):
+        agora = datetime.now()
+        for agendado in evento.scheduled_run_times:
+            chave = (evento.job_id, _local(agendado))
+            with self._lock:
+                # Jobs muito rápidos podem terminar antes do evento de submissão ser despachado
+                pendente = self._pendentes.pop(chave, None)
+                if pendente is None:
+                    self._inicios[chave] = agora
+            if pendente is not None:
+                self._registrar_execucao(pendente[0], agora, pendente[1])
+
+    def _finalizado(self, evento, fim: datetime):
+        chave = (evento.job_id, _local(evento.scheduled_run_time))
+        with self._lock:
+            inicio = self._inicios.pop(chave, None)
+            if inicio is None:
+                self._pendentes[chave] = (evento, fim)
+        if inicio is not None:
+            self._registrar_execucao(evento, inicio, fim)
+
+    def _registrar_execucao(self, evento, inicio: datetime, fim: datetime):
+        if evento.exception is not None:
+            resultado, erro = ERRO, str(evento.exception)
+        else:
+            resultado, erro = resultado_do_retorno(evento.retval), None
+        self._gravar(evento.job_id, evento.scheduled_run_time, resultado, inicio, fim, erro)
+
+    def _gravar(self, job_id: str, agendado: datetime, resultado: str,
+                inicio: datetime = None, fim: datetime = None, erro: str = None):
+        agendado = _local(agendado)
+        self.db.registrar_metrica_job({
+            "job_id": job_id,
+            "resultado": resultado,
+            "agendado_para": agendado.strftime(FORMATO_METRICA),
+            "iniciado_em": inicio.strftime(FORMATO_METRICA) if inicio else None,
+            "atraso_segundos": (inicio - agendado).total_seconds() if inicio else None,
+            "duracao_segundos": (fim - inicio).total_seconds() if inicio and fim else None,
+            "erro": erro,
+        })
@@ -0,0 +1,109 @@
+"""
+Recuperação de disparos perdidos (catch-up).
+
+Quando o scheduler volta depois de parado, cada job do registro é
+verificado pelo seu próprio trigger: os disparos dentro da janela de
+tolerância são conferidos no ledger (`job_runs`) e os que não rodaram são
+executados. Regras:
+- De cada job só é recuperado o disparo pendente mais recente (coalesce)
+- Disparo cujo horário útil já passou (prazo da política do tipo) é
+  descartado: mensagem da manhã às 15h não serve para nada
+- Tipos marcados como não recuperáveis ficam de fora
+- Grupos diferentes rodam em paralelo; dentro de um grupo a execução é em
+  série na ordem dos horários (as mensagens dependem dos dados da
+  sincronização, então ficam no mesmo grupo dela)
+
+A execução passa pela mesma reserva atômica do ledger dos disparos normais,
+então recuperar nunca duplica um horário.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Tuple
+
+import sys
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from scheduler.ledger import LedgerJobs
+from scheduler.registro import DefinicaoJob, disparos
+
+# Disparos mais antigos que isso não são recuperados
+JANELA_RECUPERACAO = timedelta(hours=12)
+
+# Tipos que precisam rodar em série entre si; os demais formam grupo próprio
+GRUPOS_SERIAIS = {
+    "sincronizacao": "planilha",
+    "sincronizacao_notificacao": "planilha",
+    "mensagem_manha": "planilha",
+    "mensagem_tarde": "planilha",
+}
+
+Recuperacao = Tuple[DefinicaoJob, datetime]
+
+
+def disparos_perdidos(definicao: DefinicaoJob, ledger: LedgerJobs, agora: datetime = None,
+                      janela: timedelta = JANELA_RECUPERACAO) -> List[datetime]:
+    """
+    Disparos do job na janela que não rodaram (ou falharam) e ainda estão
+    dentro do horário útil, em ordem.
+    """
+    politica = definicao.politica
+    if not politica.recuperar:
+        return []
+
+    agora = agora or datetime.now()
+    return [
+        horario for horario in disparos(definicao.trigger(), agora - janela, agora)
+        if politica.limite(horario) >= agora and ledger.pendente(definicao.id, horario)
+    ]
+
+
+def planejar_recuperacao(definicoes: Iterable[DefinicaoJob], ledger: LedgerJobs = None,
+                         agora: datetime = None,
+                         janela: timedelta = JANELA_RECUPERACAO) -> Dict[str, List[Recuperacao]]:
+    """
+    Disparos a recuperar agrupados por grupo serial, cada grupo em ordem
+    de horário.
+    """
+    ledger = ledger or LedgerJobs()
+    grupos: Dict[str, List[Recuperacao]] = {}
+
+    for definicao in definicoes:
+        perdidos = disparos_perdidos(definicao, ledger, agora, janela)
+        if perdidos:
+            grupo = GRUPOS_SERIAIS.get(definicao.tipo, definicao.tipo)
+            grupos.setdefault(grupo, []).append((definicao, perdidos[-1]))
+
+    for itens in grupos.values():
+        itens.sort(key=lambda item: item[1])
+    return grupos
+
+
+def recuperar(definicoes: Iterable[DefinicaoJob], executar: Callable[[DefinicaoJob, datetime], Any],
+              ledger: LedgerJobs = None, agora: datetime = None,
+              janela: timedelta = JANELA_RECUPERACAO, max_paralelos: int = 4) -> List[Recuperacao]:
+    """
+    Executa os disparos perdidos com `executar(definicao, agendado_para)`,
+    grupos em paralelo e cada grupo em série. Erro em um job não interrompe
+    os demais.
+
+    Returns:
+        Disparos recuperados, na ordem de cada grupo
+    """
+    plano = planejar_recuperacao(definicoes, ledger, agora, janela)
+    if not plano:
+        return []
+
+    def executar_grupo(itens: List[Recuperacao]):
+        for definicao, agendado_para in itens:
+            print(f"   ⏰ {definicao.nome} das {agendado_para:%H:%M} foi perdida, executando agora...")
+            try:
+                executar(definicao, agendado_para)
+            except Exception as e:
+                print(f"   ❌ Erro ao recuperar {definicao.id}: {e}")
+
+    with ThreadPoolExecutor(max_workers=min(max_paralelos, len(plano)), thread_name_prefix="recuperacao") as pool:
+        list(pool.map(executar_grupo, plano.values()))
+
+    return [item for itens in plano.values() for item in itens]
@@ -0,0 +1,219 @@
+"""
+Registro declarativo dos jobs agendados.
+
+Cada job é uma `DefinicaoJob`: tipo (qual função roda), expressão cron,
+parâmetros, limites de execução e destino da notificação. O registro vem
+de duas fontes:
+- Jobs padrão, derivados das configurações do .env (página Configurações)
+- Linhas da tabela `jobs_agendados`, que acrescentam jobs (ex: outro board
+  do Kanbanize, outra janela de sincronização) ou sobrescrevem um padrão
+  pelo mesmo id
+
+O scheduler instancia os jobs a partir do registro e, no reload, só
+recria as definições que mudaram.
+"""
+
+import json
+import random
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import sys
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from config.settings import settings
+from core.database import Database
+
+try:
+    from apscheduler.triggers.cron import CronTrigger
+except ImportError:
+    CronTrigger = None
+
+# Tipos de job: tempo limite (segundos) e isolamento em processo padrão.
+# Jobs assíncronos fora de processo rodam no event loop compartilhado
+# (`scheduler.assincrono`), canceláveis ao estourar o limite.
+TIPOS_JOB: Dict[str, Tuple[int, bool]] = {
+    "sincronizacao": (30 * 60, True),
+    "sincronizacao_notificacao": (30 * 60, True),
+    "mensagem_manha": (5 * 60, False),
+    "mensagem_tarde": (5 * 60, False),
+    "verificar_ferias": (5 * 60, False),
+    "kanbanize_sync": (20 * 60, False),
+}
+
+
+@dataclass(frozen=True)
+class PoliticaRetry:
+    """
+    Novas tentativas após falha: backoff exponencial com jitter, limitado
+    em número de tentativas e por um prazo no dia agendado. O prazo também
+    limita a recuperação de disparos perdidos (`scheduler.recuperacao`).
+    """
+    tentativas: int = 3
+    espera_segundos: int = 60
+    espera_maxima_segundos: int = 30 * 60
+    prazo: Optional[str] = None  # "HH:MM": depois disso a execução não tem mais utilidade
+    recuperar: bool = True  # disparo perdido é executado quando o scheduler volta
+
+    def espera(self, tentativa: int, aleatorio=random.random) -> float:
+        """Espera antes da próxima tentativa: metade fixa, metade aleatória."""
+        base = min(self.espera_maxima_segundos, self.espera_segundos * 2 ** (tentativa - 1))
+        return base / 2 + aleatorio() * base / 2
+
+    def limite(self, agendado_para: datetime) -> datetime:
+        """Último momento útil da execução agendada (fim do dia se não há prazo)."""
+        if self.prazo:
+            hora, minuto = map(int, self.prazo.split(":"))
+            return agendado_para.replace(hour=hora, minute=minuto, second=0, microsecond=0)
+        return agendado_para.replace(hour=23, minute=59, second=59, microsecond=0)
+
+    def proxima_tentativa(self, agendado_para: datetime, tentativas_feitas: int,
+                          agora: datetime = None) -> Optional[datetime]:
+        """Quando tentar de novo, ou None se as tentativas ou o prazo se esgotaram."""
+        if tentativas_feitas >= self.tentativas:
+            return None
+        momento = (agora or datetime.now()) + timedelta(seconds=self.espera(tentativas_feitas))
+        return momento if momento <= self.limite(agendado_para) else None
+
+
+# Política de novas tentativas por tipo de job
+POLITICAS_RETRY: Dict[str, PoliticaRetry] = {
+    "sincronizacao": PoliticaRetry(tentativas=3, espera_segundos=120),
+    "sincronizacao_notificacao": PoliticaRetry(tentativas=3, espera_segundos=120),
+    "mensagem_manha": PoliticaRetry(tentativas=5, espera_segundos=60, prazo="11:00"),
+    "mensagem_tarde": PoliticaRetry(tentativas=5, espera_segundos=60, prazo="20:00"),
+    # Apenas informativo: não vale a pena recuperar
+    "verificar_ferias": PoliticaRetry(tentativas=1, recuperar=False),
+    "kanbanize_sync": PoliticaRetry(tentativas=3, espera_segundos=300),
+}
+
+
+@dataclass(frozen=True)
+class DefinicaoJob:
+    """Definição de um job agendado."""
+    id: str
+    tipo: str
+    nome: str
+    cron: str
+    parametros: Dict = field(default_factory=dict)
+    habilitado: bool = True
+    timeout_segundos: Optional[int] = None
+    processo: Optional[bool] = None
+    max_instancias: int = 1
+    notificar: Optional[str] = None
+
+    @property
+    def limites(self) -> Tuple[int, bool]:
+        """Tempo limite e isolamento efetivos (do job ou do tipo)."""
+        timeout, processo = TIPOS_JOB[self.tipo]
+        return (
+            self.timeout_segundos or timeout,
+            processo if self.processo is None else self.processo,
+        )
+
+    @property
+    def politica(self) -> PoliticaRetry:
+        """Política de novas tentativas do tipo do job."""
+        return POLITICAS_RETRY.get(self.tipo, PoliticaRetry(tentativas=1))
+
+    def trigger(self):
+        """CronTrigger da expressão cron (minuto hora dia mês dia_da_semana)."""
+        return CronTrigger.from_crontab(self.cron)
+
+
+def _cron_dias_uteis(hora: int, minuto: int) -> str:
+    return f"{minuto} {hora} * * mon-fri"
+
+
+def definicoes_padrao() -> List[DefinicaoJob]:
+    """Jobs padrão segundo as configurações atuais do .env."""
+    kanbanize = settings.KANBANIZE_SYNC_ENABLED
+    board_id = settings.KANBANIZE_DEFAULT_BOARD_ID
+    return [
+        DefinicaoJob(
+            "sync_diaria", "sincronizacao", "Sincronização Diária",
+            _cron_dias_uteis(settings.SYNC_HOUR, settings.SYNC_MINUTE),
+            habilitado=settings.SYNC_ENABLED
+        ),
+        DefinicaoJob(
+            "sync_notif", "sincronizacao_notificacao", "Sincronização + Notificação",
+            _cron_dias_uteis(settings.SYNC_NOTIF_HOUR, settings.SYNC_NOTIF_MINUTE),
+            habilitado=settings.SYNC_NOTIF_ENABLED
+        ),
+        DefinicaoJob(
+            "mensagem_manha", "mensagem_manha", "Mensagem Matutina",
+            _cron_dias_uteis(settings.MENSAGEM_MANHA_HOUR, settings.MENSAGEM_MANHA_MINUTE),
+            habilitado=settings.EVOLUTION_ENABLED and settings.MENSAGEM_MANHA_ENABLED
+        ),
+        DefinicaoJob(
+            "mensagem_tarde", "mensagem_tarde", "Mensagem Vespertina",
+            _cron_dias_uteis(settings.MENSAGEM_TARDE_HOUR, settings.MENSAGEM_TARDE_MINUTE),
+            habilitado=settings.EVOLUTION_ENABLED and settings.MENSAGEM_TARDE_ENABLED
+        ),
+        DefinicaoJob(
+            "kanbanize_sync_09h30", "kanbanize_sync", "Kanbanize Sync 09:30", _cron_dias_uteis(9, 30),
+            parametros={"board_id": board_id, "rotulo": "09:30"},
+            habilitado=kanbanize and settings.KANBANIZE_SYNC_09H30_ENABLED
+        ),
+        DefinicaoJob(
+            "kanbanize_sync_18h00", "kanbanize_sync", "Kanbanize Sync 18:00", _cron_dias_uteis(18, 0),
+            parametros={"board_id": board_id, "rotulo": "18:00"},
+            habilitado=kanbanize and settings.KANBANIZE_SYNC_18H00_ENABLED
+        ),
+    ]
+
+
+def _definicao_da_linha(linha: Dict) -> DefinicaoJob:
+    return DefinicaoJob(
+        id=linha["id"],
+        tipo=linha["tipo"],
+        nome=linha["nome"] or linha["id"],
+        cron=linha["cron"],
+        parametros=json.loads(linha["parametros"] or "{}"),
+        habilitado=bool(linha["habilitado"]),
+        timeout_segundos=linha["timeout_segundos"],
+        processo=None if linha["processo"] is None else bool(linha["processo"]),
+        max_instancias=linha["max_instancias"] or 1,
+        notificar=linha["notificar"] or None,
+    )
+
+
+def carregar_registro(db: Database = None) -> List[DefinicaoJob]:
+    """
+    Jobs habilitados: padrões do .env sobrescritos/complementados pela
+    tabela `jobs_agendados`. Linhas com tipo desconhecido são ignoradas.
+    """
+    definicoes = {d.id: d for d in definicoes_padrao()}
+    for linha in (db or Database()).buscar_jobs_agendados():
+        if linha["tipo"] not in TIPOS_JOB:
+            print(f"   ⚠️ Job '{linha['id']}' com tipo desconhecido: {linha['tipo']}")
+            continue
+        definicoes[linha["id"]] = _definicao_da_linha(linha)
+    return [d for d in definicoes.values() if d.habilitado]
+
+
+def disparos(trigger, inicio: datetime, fim: datetime) -> List[datetime]:
+    """
+    Horários de disparo do trigger em [inicio, fim], em ordem, como
+    datetime local sem fuso (o formato usado no ledger).
+    """
+    fim = fim.astimezone(trigger.timezone)
+    disparo = trigger.get_next_fire_time(None, inicio.astimezone(trigger.timezone))
+    horarios = []
+    while disparo is not None and disparo <= fim:
+        horarios.append(disparo.astimezone().replace(tzinfo=None))
+        disparo = trigger.get_next_fire_time(disparo, disparo + timedelta(seconds=1))
+    return horarios
+
+
+def ultimo_disparo(trigger, agora: datetime = None,
+                   janela: timedelta = timedelta(hours=1)) -> Optional[datetime]:
+    """
+    Último horário de disparo do trigger em (agora - janela, agora], como
+    datetime local sem fuso. Usado para identificar a ocorrência no ledger.
+    """
+    agora = agora or datetime.now()
+    horarios = disparos(trigger, agora - janela, agora)
+    return horarios[-1] if horarios else None
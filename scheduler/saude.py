@@ -0,0 +1,249 @@
+"""
+Saúde do scheduler: heartbeat no banco e endpoint HTTP local.
+
+A cada `INTERVALO_HEARTBEAT_SEGUNDOS` o scheduler grava em
+`scheduler_heartbeat` (linha única) o instante, os próximos disparos, os
+jobs em execução e na fila e o último desfecho. A interface lê essa linha
+(o scheduler roda em outro container) e o healthcheck do Docker consulta o
+endpoint local:
+- GET /health  → 200 se saudável, 503 caso contrário (JSON com o estado)
+- GET /metrics → métricas no formato texto do Prometheus
+
+Saudável = scheduler rodando, heartbeat recente e nenhum job com disparo
+atrasado além da tolerância (loop do scheduler travado). Um processo vivo
+porém travado deixa de ser considerado saudável, ao contrário do `pgrep`.
+"""
+
+import json
+import os
+import socket
+import threading
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+import sys
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.database import Database
+from scheduler.metricas import resultado_do_retorno
+
+try:
+    from apscheduler.events import EVENT_JOB_ERROR, EVENT_JOB_EXECUTED, EVENT_JOB_SUBMITTED
+    HAS_APSCHEDULER = True
+except ImportError:
+    HAS_APSCHEDULER = False
+
+INTERVALO_HEARTBEAT_SEGUNDOS = 5
+
+# Heartbeat mais antigo que isso indica scheduler parado ou travado
+HEARTBEAT_EXPIRADO_SEGUNDOS = 30
+
+# Disparo atrasado além disso (tolerância de misfire) indica loop travado
+ATRASO_MAXIMO_SEGUNDOS = 5 * 60
+
+FORMATO_HEARTBEAT = "%Y-%m-%d %H:%M:%S"
+
+RODANDO = "rodando"
+ATRASADO = "atrasado"
+PARADO = "parado"
+
+
+def avaliar_heartbeat(heartbeat: Optional[Dict], agora: datetime = None) -> Tuple[bool, str]:
+    """
+    Interpreta um heartbeat (do banco ou do próprio processo).
+
+    Returns:
+        (saudável, mensagem para exibição)
+    """
+    if not heartbeat:
+        return False, "Scheduler nunca registrou heartbeat"
+
+    agora = agora or datetime.now()
+    idade = (agora - datetime.strptime(heartbeat["atualizado_em"], FORMATO_HEARTBEAT)).total_seconds()
+
+    if heartbeat["status"] == PARADO:
+        return False, f"Scheduler parado desde {heartbeat['atualizado_em']}"
+    if idade > HEARTBEAT_EXPIRADO_SEGUNDOS:
+        return False, f"Sem heartbeat há {idade:.0f}s (scheduler parado ou travado)"
+    if heartbeat["status"] == ATRASADO:
+        return False, "Scheduler rodando, mas com disparos atrasados (loop travado?)"
+    return True, f"Scheduler rodando (heartbeat há {max(idade, 0):.0f}s)"
+
+
+class MonitorSaude:
+    """Mantém o estado de saúde do scheduler, grava o heartbeat e serve o endpoint."""
+
+    def __init__(self, db: Database = None, max_workers: int = 4):
+        self.db = db or Database()
+        self.max_workers = max_workers
+        self.scheduler = None
+        self.iniciado_em = datetime.now().strftime(FORMATO_HEARTBEAT)
+        self.estado: Optional[Dict] = None
+        self._lock = threading.Lock()
+        self._em_execucao = 0
+        self._ultimo_job: Optional[Dict] = None
+        self._parar = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._servidor: Optional[ThreadingHTTPServer] = None
+
+    def registrar(self, scheduler):
+        """Acompanha os eventos de jobs do scheduler (execução e último desfecho)."""
+        self.scheduler = scheduler
+        if HAS_APSCHEDULER:
+            scheduler.add_listener(self._ao_submeter, EVENT_JOB_SUBMITTED)
+            scheduler.add_listener(self._ao_finalizar, EVENT_JOB_EXECUTED | EVENT_JOB_ERROR)
+
+    def _ao_submeter(self, evento):
+        with self._lock:
+            self._em_execucao += 1
+
+    def _ao_finalizar(self, evento):
+        # O término pode chegar antes da submissão: o contador fica negativo por um instante
+        with self._lock:
+            self._em_execucao -= 1
+            self._ultimo_job = {
+                "job_id": evento.job_id,
+                "resultado": "erro" if evento.exception is not None else resultado_do_retorno(evento.retval),
+                "finalizado_em": datetime.now().strftime(FORMATO_HEARTBEAT),
+                "erro": str(evento.exception) if evento.exception is not None else None,
+            }
+
+    def coletar(self, agora: datetime = None) -> Dict:
+        """Fotografa o estado atual do scheduler."""
+        agora = agora or datetime.now()
+        proximos, atrasado = [], False
+
+        if self.scheduler is not None and self.scheduler.running:
+            for job in self.scheduler.get_jobs():
+                if job.next_run_time is None:
+                    continue
+                proxima = job.next_run_time.astimezone().replace(tzinfo=None)
+                atrasado = atrasado or (agora - proxima).total_seconds() > ATRASO_MAXIMO_SEGUNDOS
+                proximos.append({"id": job.id, "nome": job.name, "proxima": proxima.strftime(FORMATO_HEARTBEAT)})
+            status = ATRASADO if atrasado else RODANDO
+        else:
+            status = PARADO
+        proximos.sort(key=lambda p: p["proxima"])
+
+        with self._lock:
+            em_execucao, ultimo_job = max(0, self._em_execucao), self._ultimo_job
+
+        return {
+            "status": status,
+            "atualizado_em": agora.strftime(FORMATO_HEARTBEAT),
+            "iniciado_em": self.iniciado_em,
+            "pid": os.getpid(),
+            "host": socket.gethostname(),
+            "em_execucao": min(em_execucao, self.max_workers),
+            "fila": max(0, em_execucao - self.max_workers),
+            "proximos": proximos,
+            "ultimo_job": ultimo_job,
+        }
+
+    def pulsar(self) -> Dict:
+        """Coleta o estado e grava o heartbeat no banco."""
+        self.estado = self.coletar()
+        self.db.registrar_heartbeat(self.estado)
+        return self.estado
+
+    def _loop(self):
+        while not self._parar.wait(INTERVALO_HEARTBEAT_SEGUNDOS):
+            try:
+                self.pulsar()
+            except Exception as e:
+                print(f"   ⚠️ Erro ao gravar heartbeat: {e}")
+
+    def iniciar(self, porta: int = None, host: str = "127.0.0.1"):
+        """Grava o primeiro heartbeat e inicia o envio periódico e o endpoint HTTP."""
+        self.pulsar()
+        self._parar.clear()
+        self._thread = threading.Thread(target=self._loop, name="heartbeat", daemon=True)
+        self._thread.start()
+
+        if porta:
+            try:
+                self._servidor = ThreadingHTTPServer((host, porta), _HandlerSaude)
+                self._servidor.monitor = self
+                threading.Thread(target=self._servidor.serve_forever, name="saude-http", daemon=True).start()
+                print(f"   💓 Endpoint de saúde em http://{host}:{self._servidor.server_port}/health")
+            except OSError as e:
+                self._servidor = None
+                print(f"   ⚠️ Endpoint de saúde indisponível na porta {porta}: {e}")
+
+    def parar(self):
+        """Para o heartbeat e o endpoint, registrando o scheduler como parado."""
+        self._parar.set()
+        if self._thread:
+            self._thread.join(INTERVALO_HEARTBEAT_SEGUNDOS)
+            self._thread = None
+        if self._servidor:
+            self._servidor.shutdown()
+            self._servidor.server_close()
+            self._servidor = None
+        self.scheduler = None
+        try:
+            self.pulsar()
+        except Exception:
+            pass
+
+    def metricas(self) -> str:
+        """Estado atual no formato texto do Prometheus."""
+        estado = self.estado or self.coletar()
+        saudavel, _ = avaliar_heartbeat(estado)
+        linhas = [
+            "# HELP scheduler_up 1 se o scheduler está saudável",
+            "# TYPE scheduler_up gauge",
+            f"scheduler_up {int(saudavel)}",
+            "# TYPE scheduler_heartbeat_timestamp_seconds gauge",
+            f"scheduler_heartbeat_timestamp_seconds {_epoch(estado['atualizado_em'])}",
+            "# TYPE scheduler_jobs_em_execucao gauge",
+            f"scheduler_jobs_em_execucao {estado['em_execucao']}",
+            "# TYPE scheduler_jobs_na_fila gauge",
+            f"scheduler_jobs_na_fila {estado['fila']}",
+            "# TYPE scheduler_proximo_disparo_timestamp_seconds gauge",
+        ]
+        linhas += [
+            f'scheduler_proximo_disparo_timestamp_seconds{{job="{p["id"]}"}} {_epoch(p["proxima"])}'
+            for p in estado["proximos"]
+        ]
+        ultimo = estado["ultimo_job"]
+        if ultimo:
+            linhas += [
+                "# TYPE scheduler_ultimo_job_sucesso gauge",
+                f'scheduler_ultimo_job_sucesso{{job="{ultimo["job_id"]}"}} {int(ultimo["resultado"] != "erro")}',
+            ]
+        return "\n".join(linhas) + "\n"
+
+
+def _epoch(momento: str) -> int:
+    return int(datetime.strptime(momento, FORMATO_HEARTBEAT).timestamp())
+
+
+class _HandlerSaude(BaseHTTPRequestHandler):
+    """GET /health e /metrics a partir do estado em memória do monitor."""
+
+    def do_GET(self):
+        monitor: MonitorSaude = self.server.monitor
+        if self.path == "/health":
+            estado = monitor.estado
+            saudavel, mensagem = avaliar_heartbeat(estado)
+            corpo = json.dumps({"saudavel": saudavel, "mensagem": mensagem, "estado": estado}, ensure_ascii=False)
+            self._responder(200 if saudavel else 503, "application/json; charset=utf-8", corpo)
+        elif self.path == "/metrics":
+            self._responder(200, "text/plain; version=0.0.4; charset=utf-8", monitor.metricas())
+        else:
+            self._responder(404, "text/plain; charset=utf-8", "não encontrado\n")
+
+    def _responder(self, codigo: int, tipo: str, corpo: str):
+        dados = corpo.encode("utf-8")
+        self.send_response(codigo)
+        self.send_header("Content-Type", tipo)
+        self.send_header("Content-Length", str(len(dados)))
+        self.end_headers()
+        self.wfile.write(dados)
+
+    def log_message(self, formato, *args):
+        # Healthcheck a cada 30s poluiria o log do scheduler
+        pass
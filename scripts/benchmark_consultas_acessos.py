@@ -0,0 +1,87 @@
+"""
+Benchmark das consultas de acessos (bloqueados após o retorno e pendentes).
+
+Cria bancos temporários com volumes crescentes de registros e mede, para
+cada chamada, o tempo e o número de comandos SQL executados. O número de
+comandos deve ser o mesmo em todos os volumes.
+
+Uso: python3 scripts/benchmark_consultas_acessos.py [--volumes 1000 10000 50000]
+"""
+
+import argparse
+import sqlite3
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(ROOT))
+
+from core.database import Database
+
+
+class DatabaseInstrumentado(Database):
+    """Database que conta os comandos SQL executados."""
+
+    def __init__(self, db_path: Path):
+        self.comandos = 0
+        super().__init__(db_path)
+
+    def _get_connection(self) -> sqlite3.Connection:
+        conn = super()._get_connection()
+        conn.set_trace_callback(self._contar)
+        return conn
+
+    def _contar(self, _sql: str):
+        self.comandos += 1
+
+
+def popular(db: Database, total: int):
+    """Gera registros com metade já retornada e alguns acessos bloqueados/pendentes."""
+    hoje = datetime.now()
+    registros = []
+    for i in range(total):
+        saida = hoje - timedelta(days=(i % 60) + 1)
+        registros.append({
+            "nome": f"FUNCIONARIO {i:06d}",
+            "data_saida": saida.strftime('%Y-%m-%d'),
+            "data_retorno": (saida + timedelta(days=(i % 40))).strftime('%Y-%m-%d'),
+            "mes": saida.month,
+            "ano": saida.year,
+            "acessos": {
+                "AD PRIN": "BLOQUEADO" if i % 3 else "LIBERADO",
+                "VPN": "PENDENTE" if i % 7 == 0 else "NB",
+            },
+        })
+    db.salvar_funcionarios(registros)
+
+
+def medir(db: DatabaseInstrumentado, funcao):
+    db.comandos = 0
+    inicio = time.perf_counter()
+    resultado = funcao()
+    return len(resultado), db.comandos, (time.perf_counter() - inicio) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark das consultas de acessos")
+    parser.add_argument("--volumes", type=int, nargs="+", default=[1000, 10000, 50000])
+    args = parser.parse_args()
+
+    print(f"{'registros':>10} | {'consulta':<26} | {'linhas':>7} | {'comandos':>8} | {'tempo (ms)':>10}")
+    for volume in args.volumes:
+        with tempfile.TemporaryDirectory() as tmp:
+            db = DatabaseInstrumentado(Path(tmp) / "benchmark.sqlite")
+            popular(db, volume)
+            for nome, funcao in (
+                ("retornados_bloqueados", db.buscar_retornados_com_acessos_bloqueados),
+                ("acessos_pendentes", db.buscar_acessos_pendentes),
+            ):
+                linhas, comandos, ms = medir(db, funcao)
+                print(f"{volume:>10} | {nome:<26} | {linhas:>7} | {comandos:>8} | {ms:>10.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -14,10 +14,13 @@ sys.path.insert(0, str(ROOT_DIR))
 
 from core.sync_manager import SyncManager
 
-def debug_user(user_name: str):
+def debug_user(user_name: str, versao: str = None):
     """
     Carrega a planilha, processa os dados e imprime as informações
     de um usuário específico para depuração.
+    
+    Se `versao` for informada, usa o snapshot guardado daquela versão
+    em vez de baixar a planilha novamente.
     """
     print("=" * 60)
     print(f"🕵️  Iniciando depuração para o usuário: {user_name}")
@@ -25,17 +28,20 @@ def debug_user(user_name: str):
 
     sync = SyncManager()
 
-    # 1. Baixar a planilha (usando o cache se disponível, mas podemos forçar)
-    print("\n[PASSO 1] Baixando a planilha...")
-    if not sync.baixar_planilha(forcar=True):
-        print("❌ Falha no download. Abortando.")
-        return
-    print(f"✅ Planilha baixada: {sync.arquivo_excel.name}")
+    # 1. Baixar a planilha (ou usar a versão guardada)
+    if versao:
+        print(f"\n[PASSO 1] Usando versão guardada: {versao}")
+    else:
+        print("\n[PASSO 1] Baixando a planilha...")
+        if not sync.baixar_planilha(forcar=True):
+            print("❌ Falha no download. Abortando.")
+            return
+        print(f"✅ Planilha baixada: {sync.arquivo_excel.name}")
 
-    # 2. Processar a planilha para extrair todos os dados
+    # 2. Processar a planilha (reaproveita o snapshot da versão, se existir)
     print("\n[PASSO 2] Processando a planilha...")
     try:
-        dados_processados = sync.processar_planilha()
+        dados_processados = sync.carregar_versao(versao)
         if not dados_processados:
             print("❌ Nenhum dado foi processado da planilha.")
             return
@@ -86,6 +92,11 @@ if __name__ == "__main__":
         type=str,
         help="Nome do usuário a ser verificado (pode ser parcial, entre aspas)."
     )
+    parser.add_argument(
+        "--versao",
+        metavar="HASH",
+        help="Hash de uma versão guardada nos snapshots (ver sync_manager.py --listar-versoes)."
+    )
     args = parser.parse_args()
     
-    debug_user(args.nome)
+    debug_user(args.nome, args.versao)
@@ -0,0 +1,174 @@
+import io
+import sqlite3
+import sys
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from pathlib import Path
+
+# Adiciona a raiz do projeto ao sys.path
+ROOT_DIR = Path(__file__).parent.parent
+sys.path.insert(0, str(ROOT_DIR))
+
+from core.database import Database
+
+
+def funcionario(nome, **acessos):
+    return {
+        "nome": nome, "data_saida": "2025-01-06", "data_retorno": "2025-01-20",
+        "mes": 1, "ano": 2025, "acessos": acessos,
+    }
+
+
+class TestAcessosMatriz(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.db_path = Path(self.tmp.name) / "teste.sqlite"
+        self.db = Database(self.db_path)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def _consultar(self, sql):
+        conn = sqlite3.connect(self.db_path)
+        linhas = conn.execute(sql).fetchall()
+        conn.close()
+        return linhas
+
+    def test_uma_linha_por_funcionario(self):
+        self.db.salvar_funcionarios([
+            funcionario("ANA", **{"AD PRIN": "BLOQUEADO", "VPN": "LIBERADO", "TOTVS": "NP"}),
+            funcionario("BRUNO", **{"AD PRIN": "BLOQUEADO", "VPN": "NB"}),
+        ])
+
+        self.assertEqual(self._consultar("SELECT COUNT(*) FROM acessos_matriz"), [(2,)])
+        self.assertEqual(
+            self._consultar("SELECT sistema, status FROM acessos a JOIN funcionarios f "
+                            "ON f.id = a.funcionario_id WHERE f.nome = 'BRUNO' ORDER BY sistema"),
+            [("AD PRIN", "BLOQUEADO"), ("VPN", "NB")]
+        )
+
+        ana = next(f for f in self.db.buscar_funcionarios() if f["nome"] == "ANA")
+        self.assertEqual(ana["acessos"], {"AD PRIN": "BLOQUEADO", "VPN": "LIBERADO", "TOTVS": "NP"})
+
+        resumo = self.db.buscar_resumo_acessos()
+        self.assertEqual(resumo["AD PRIN"], {"BLOQUEADO": 2})
+        self.assertEqual(resumo["VPN"], {"LIBERADO": 1, "NB": 1})
+        self.assertEqual(resumo["Gmail"], {})
+
+    def test_atualizacao_no_lugar(self):
+        self.db.salvar_funcionarios([funcionario("ANA", VPN="BLOQUEADO")])
+        self.db.salvar_funcionarios([funcionario("ANA", VPN="LIBERADO", SAP="BLOQUEADO")])
+
+        self.assertEqual(self._consultar("SELECT COUNT(*) FROM acessos_matriz"), [(1,)])
+        self.assertEqual(self.db.buscar_funcionarios()[0]["acessos"], {"VPN": "LIBERADO", "SAP": "BLOQUEADO"})
+
+    def test_migra_tabela_antiga(self):
+        conn = sqlite3.connect(self.db_path)
+        conn.executescript("""
+            DROP VIEW acessos;
+            CREATE TABLE acessos (id INTEGER PRIMARY KEY, funcionario_id INTEGER, sistema TEXT, status TEXT);
+            INSERT INTO funcionarios (id, nome, data_saida) VALUES (7, 'ANA', '2025-01-06');
+            INSERT INTO acessos (funcionario_id, sistema, status)
+            VALUES (7, 'VPN', 'BLOQUEADO'), (7, 'Gmail', 'LIBERADO');
+        """)
+        conn.commit()
+        conn.close()
+
+        db = Database(self.db_path)
+
+        self.assertEqual(db.buscar_funcionarios()[0]["acessos"], {"VPN": "BLOQUEADO", "Gmail": "LIBERADO"})
+        self.assertEqual(self._consultar("SELECT type FROM sqlite_master WHERE name = 'acessos'"), [("view",)])
+
+
+class TestHistoricoAcessos(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.db_path = Path(self.tmp.name) / "teste.sqlite"
+        self.db = Database(self.db_path)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_grava_apenas_mudancas(self):
+        self.db.salvar_funcionarios([
+            funcionario("ANA", VPN="BLOQUEADO", Gmail="BLOQUEADO"),
+            funcionario("BRUNO", VPN="BLOQUEADO"),
+        ], substituir=True)
+
+        saida = io.StringIO()
+        with redirect_stdout(saida):
+            self.db.salvar_funcionarios([
+                funcionario("ANA", VPN="LIBERADO", Gmail="BLOQUEADO"),
+                funcionario("BRUNO", VPN="BLOQUEADO"),
+            ], substituir=True, sync_id=42)
+
+        historico = self.db.buscar_historico_acessos()
+        self.assertEqual(
+            [(h["nome"], h["sistema"], h["de"], h["para"], h["sync_id"]) for h in historico],
+            [("ANA", "VPN", "BLOQUEADO", "LIBERADO", 42)]
+        )
+        self.assertIn("Atualizados: 1, Inalterados: 1", saida.getvalue())
+
+    def test_duplicatas_entre_abas_nao_geram_mudancas(self):
+        duplicado = [
+            dict(funcionario("ANA", VPN="BLOQUEADO"), aba_origem="JANEIRO"),
+            dict(funcionario("ANA", VPN="LIBERADO"), aba_origem="JANEIRO (2)"),
+        ]
+        with redirect_stdout(io.StringIO()):
+            self.db.salvar_funcionarios(duplicado, substituir=True)
+        versao = self.db.buscar_versao_dados()
+
+        saida = io.StringIO()
+        with redirect_stdout(saida):
+            total = self.db.salvar_funcionarios(duplicado, substituir=True)
+
+        self.assertEqual(total, 1)
+        self.assertIn("Inseridos: 0, Atualizados: 0, Inalterados: 1", saida.getvalue())
+        self.assertEqual(self.db.buscar_versao_dados(), versao)
+        self.assertEqual(self.db.buscar_historico_acessos(), [])
+        self.assertEqual(self.db.buscar_funcionarios()[0]["acessos"], {"VPN": "LIBERADO"})
+
+    def test_sync_seguinte_nao_herda_mudancas(self):
+        with redirect_stdout(io.StringIO()):
+            self.db.salvar_funcionarios([funcionario("ANA", VPN="BLOQUEADO")])
+            self.db.salvar_funcionarios([funcionario("ANA", VPN="LIBERADO")], sync_id=1)
+            self.db.salvar_funcionarios([funcionario("ANA", VPN="NB")], sync_id=2)
+
+        historico = self.db.buscar_historico_acessos()
+        self.assertEqual([(h["para"], h["sync_id"]) for h in historico], [("NB", 2), ("LIBERADO", 1)])
+
+    def test_remarcacao_mantem_historico(self):
+        with redirect_stdout(io.StringIO()):
+            self.db.salvar_funcionarios([funcionario("ANA", VPN="BLOQUEADO"), funcionario("BRUNO", VPN="NB")])
+            remarcada = dict(funcionario("ANA", VPN="LIBERADO"), data_saida="2025-02-03")
+            self.db.salvar_funcionarios([remarcada], substituir=True, sync_id=7)
+        pessoa_id = self.db.buscar_funcionarios()[0]["pessoa_id"]
+
+        historico = self.db.buscar_historico_acessos(pessoa_id=pessoa_id)
+        self.assertEqual(
+            sorted((h["nome"], h["data_saida"], h["de"], h["para"], h["sync_id"]) for h in historico),
+            [("ANA", "2025-01-06", "BLOQUEADO", None, 7), ("ANA", "2025-02-03", None, "LIBERADO", 7)]
+        )
+        bruno = self.db.buscar_historico_acessos(sistema="VPN")
+        self.assertIn(("BRUNO", "2025-01-06", "NB", None), [
+            (h["nome"], h["data_saida"], h["de"], h["para"]) for h in bruno
+        ])
+
+    def test_substituir_remove_ausentes(self):
+        self.db.salvar_funcionarios([funcionario("ANA", VPN="NB"), funcionario("BRUNO", VPN="NB")])
+        ana_id = next(f["id"] for f in self.db.buscar_funcionarios() if f["nome"] == "ANA")
+
+        total = self.db.salvar_funcionarios([funcionario("ANA", VPN="NB")], substituir=True)
+
+        self.assertEqual(total, 1)
+        self.assertEqual([(f["id"], f["nome"]) for f in self.db.buscar_funcionarios()], [(ana_id, "ANA")])
+        conn = sqlite3.connect(self.db_path)
+        self.assertEqual(conn.execute("SELECT COUNT(*) FROM acessos_matriz").fetchone()[0], 1)
+        conn.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,92 @@
+import sys
+import tempfile
+import unittest
+from datetime import date, datetime
+from pathlib import Path
+
+# Adiciona a raiz do projeto ao sys.path
+ROOT_DIR = Path(__file__).parent.parent
+sys.path.insert(0, str(ROOT_DIR))
+
+from core.database import Database
+from utils.calendario import Calendario, feriados_nacionais, pascoa, rotulo_dia
+
+
+class TestCalendario(unittest.TestCase):
+
+    def setUp(self):
+        self.calendario = Calendario(ano_inicio=2024, ano_fim=2026)
+
+    def test_feriados_nacionais(self):
+        self.assertEqual(pascoa(2025), date(2025, 4, 20))
+        self.assertEqual(pascoa(2026), date(2026, 4, 5))
+        feriados = feriados_nacionais(2025)
+        self.assertEqual(feriados[date(2025, 4, 18)], "Sexta-feira Santa")
+        self.assertIn(date(2025, 11, 20), feriados)
+        self.assertNotIn(date(2023, 11, 20), feriados_nacionais(2023))
+
+    def test_proximo_dia_util_e_dias_uteis_entre(self):
+        # Quinta antes da Sexta-feira Santa; segunda é Tiradentes
+        self.assertEqual(self.calendario.proximo_dia_util(date(2025, 4, 17)), date(2025, 4, 22))
+        self.assertEqual(self.calendario.proximo_dia_util(datetime(2025, 1, 3, 18, 0)), date(2025, 1, 6))
+        self.assertFalse(self.calendario.eh_dia_util(date(2025, 12, 25)))
+        self.assertTrue(self.calendario.eh_dia_util(date(2025, 12, 26)))
+
+        self.assertEqual(self.calendario.dias_uteis_entre(date(2025, 1, 3), date(2025, 1, 6)), 1)
+        self.assertEqual(self.calendario.dias_uteis_entre(date(2025, 4, 17), date(2025, 4, 22)), 1)
+        self.assertEqual(self.calendario.dias_uteis_entre(date(2025, 4, 22), date(2025, 4, 17)), -1)
+        self.assertEqual(self.calendario.dias_uteis_entre(date(2024, 12, 31), date(2025, 12, 31)), 255)
+
+        # Fora do intervalo pré-calculado: mesmo resultado, calculado dia a dia
+        self.assertEqual(self.calendario.proximo_dia_util(date(2027, 3, 25)), date(2027, 3, 29))
+        self.assertEqual(self.calendario.dias_uteis_entre(date(2026, 12, 30), date(2027, 1, 4)), 2)
+
+    def test_motivo_nao_util(self):
+        self.assertEqual(self.calendario.motivo_nao_util(date(2025, 12, 25)), "feriado: Natal")
+        self.assertEqual(self.calendario.motivo_nao_util(date(2025, 1, 4)), "fim de semana")
+        self.assertIsNone(self.calendario.motivo_nao_util(date(2025, 1, 6)))
+
+    def test_rotulo_dia(self):
+        self.assertEqual(rotulo_dia(date(2025, 1, 7), date(2025, 1, 6)), "Amanhã")
+        self.assertEqual(rotulo_dia(date(2025, 1, 6), date(2025, 1, 3)), "Segunda-feira")
+
+
+class TestCalendarioBanco(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.db = Database(Path(self.tmp.name) / "teste.sqlite")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_feriados_locais_invalidam_o_cache(self):
+        ano = date.today().year
+        aniversario = date(ano, 1, 25)
+        calendario = self.db.calendario()
+        self.assertIs(self.db.calendario(), calendario)
+
+        self.db.salvar_feriado(aniversario.strftime("%Y-%m-%d"), "Aniversário da cidade", recorrente=True)
+        calendario = self.db.calendario()
+        self.assertFalse(calendario.eh_dia_util(date(ano + 1, 1, 25)))
+        self.assertFalse(calendario.eh_dia_util(date(ano + 3, 1, 25)))
+
+        self.assertTrue(self.db.remover_feriado(aniversario.strftime("%Y-%m-%d")))
+        self.assertEqual(self.db.calendario().eh_dia_util(date(ano + 3, 1, 25)), date(ano + 3, 1, 25).weekday() < 5)
+
+    def test_retornos_ate_o_proximo_dia_util(self):
+        # Quinta 17/04/2025: sexta (Santa), fim de semana e segunda (Tiradentes) até terça
+        retornos = ["2025-04-17", "2025-04-19", "2025-04-21", "2025-04-22", "2025-04-23"]
+        self.db.salvar_funcionarios([
+            {"nome": f"FUNC {i}", "data_saida": "2025-04-01", "data_retorno": retorno, "mes": 4, "ano": 2025}
+            for i, retorno in enumerate(retornos)
+        ])
+
+        voltando = self.db.buscar_retornos_proximo_dia_util(datetime(2025, 4, 17, 18, 0))
+        self.assertEqual([f["nome"] for f in voltando], ["FUNC 1", "FUNC 2", "FUNC 3"])
+        voltando = self.db.buscar_retornos_proximo_dia_util(datetime(2025, 4, 22, 18, 0))
+        self.assertEqual([f["nome"] for f in voltando], ["FUNC 4"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,76 @@
+import sys
+import tempfile
+import unittest
+from datetime import datetime, timedelta
+from pathlib import Path
+
+# Adiciona a raiz do projeto ao sys.path
+ROOT_DIR = Path(__file__).parent.parent
+sys.path.insert(0, str(ROOT_DIR))
+
+from core.database import Database
+
+
+class DatabaseContado(Database):
+    """Conta os comandos SQL executados."""
+
+    def __init__(self, db_path):
+        self.comandos = 0
+        super().__init__(db_path)
+
+    def _get_connection(self):
+        conn = super()._get_connection()
+        conn.set_trace_callback(lambda _sql: setattr(self, "comandos", self.comandos + 1))
+        return conn
+
+
+def dia(delta):
+    return (datetime.now() + timedelta(days=delta)).strftime('%Y-%m-%d')
+
+
+def registros(total):
+    return [
+        {
+            "nome": f"FUNC {i}", "data_saida": dia(-10 - i % 5), "data_retorno": dia(-1 if i % 2 else 3),
+            "mes": 1, "ano": 2025,
+            "acessos": {"VPN": "BLOQUEADO", "Gmail": "PENDENTE" if i % 3 == 0 else "NB"},
+        }
+        for i in range(total)
+    ]
+
+
+class TestConsultasAcessos(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def _comandos(self, total):
+        db = DatabaseContado(Path(self.tmp.name) / f"teste_{total}.sqlite")
+        db.salvar_funcionarios(registros(total))
+
+        contagens = []
+        for consulta in (db.buscar_retornados_com_acessos_bloqueados, db.buscar_acessos_pendentes):
+            db.comandos = 0
+            resultado = consulta()
+            self.assertTrue(resultado)
+            contagens.append(db.comandos)
+        return contagens
+
+    def test_numero_de_consultas_constante(self):
+        self.assertEqual(self._comandos(10), self._comandos(2000))
+
+    def test_resultados(self):
+        db = Database(Path(self.tmp.name) / "teste.sqlite")
+        db.salvar_funcionarios(registros(6))
+
+        retornados = db.buscar_retornados_com_acessos_bloqueados()
+        self.assertEqual(sorted(f["nome"] for f in retornados), ["FUNC 1", "FUNC 3", "FUNC 5"])
+        self.assertEqual(retornados[0]["acessos"]["VPN"], "BLOQUEADO")
+        self.assertEqual(sorted(f["nome"] for f in db.buscar_acessos_pendentes()), ["FUNC 0"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,133 @@
+import sys
+import tempfile
+import threading
+import time
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+# Adiciona a raiz do projeto ao sys.path
+ROOT_DIR = Path(__file__).parent.parent
+sys.path.insert(0, str(ROOT_DIR))
+
+from core import coordenador_sync
+from core.coordenador_sync import CoordenadorSync
+from core.database import Database
+
+
+class TestCoordenadorSync(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.db_path = Path(self.tmp.name) / "teste.sqlite"
+        Database(self.db_path)
+
+        patcher = patch.object(coordenador_sync, "INTERVALO_ESPERA_SEGUNDOS", 0.05)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_chamadas_simultaneas_compartilham_uma_execucao(self):
+        chamadas = []
+        iniciou = threading.Event()
+
+        def sincronizar():
+            chamadas.append(1)
+            iniciou.set()
+            time.sleep(0.3)
+            return {"status": "success", "registros": 42}
+
+        resultados = {}
+
+        def primeiro():
+            resultados["primeiro"] = CoordenadorSync(Database(self.db_path)).executar("sincronizacao", sincronizar)
+
+        t = threading.Thread(target=primeiro)
+        t.start()
+        iniciou.wait(2)
+        resultados["segundo"] = CoordenadorSync(Database(self.db_path)).executar("sincronizacao", sincronizar)
+        t.join()
+
+        self.assertEqual(len(chamadas), 1)
+        self.assertEqual(resultados["primeiro"]["registros"], 42)
+        self.assertEqual(resultados["segundo"]["registros"], 42)
+        self.assertTrue(resultados["segundo"]["compartilhado"])
+        self.assertIsNone(Database(self.db_path).buscar_execucao_sync_ativa())
+
+    def test_chamada_forcada_executa_depois_da_comum(self):
+        chamadas = []
+        iniciou = threading.Event()
+
+        def sincronizar(forcada):
+            chamadas.append(forcada)
+            iniciou.set()
+            time.sleep(0.3)
+            return {"status": "success", "forcada": forcada}
+
+        resultados = {}
+
+        def comum():
+            resultados["comum"] = CoordenadorSync(Database(self.db_path)).executar(
+                "sincronizacao", lambda: sincronizar(False)
+            )
+
+        t = threading.Thread(target=comum)
+        t.start()
+        iniciou.wait(2)
+        resultados["forcada"] = CoordenadorSync(Database(self.db_path)).executar(
+            "sincronizacao", lambda: sincronizar(True), forcar=True
+        )
+        t.join()
+
+        self.assertEqual(chamadas, [False, True])
+        self.assertTrue(resultados["forcada"]["forcada"])
+        self.assertNotIn("compartilhado", resultados["forcada"])
+
+    def test_chamada_comum_aproveita_a_forcada(self):
+        iniciou = threading.Event()
+
+        def sincronizar():
+            iniciou.set()
+            time.sleep(0.3)
+            return {"status": "success", "registros": 7}
+
+        t = threading.Thread(target=lambda: CoordenadorSync(Database(self.db_path)).executar(
+            "sincronizacao", sincronizar, forcar=True
+        ))
+        t.start()
+        iniciou.wait(2)
+        resultado = CoordenadorSync(Database(self.db_path)).executar("sincronizacao", sincronizar)
+        t.join()
+
+        self.assertTrue(resultado["compartilhado"])
+        self.assertEqual(resultado["registros"], 7)
+
+    def test_recupera_execucao_de_processo_morto(self):
+        db = Database(self.db_path)
+        coordenador = CoordenadorSync(db)
+        # Simula uma execução deixada por um processo que morreu no meio da sync
+        self.assertTrue(db.tentar_iniciar_execucao_sync("morto", "sincronizacao", 2 ** 22 + 7, coordenador.host))
+
+        with patch.object(coordenador_sync, "_processo_vivo", return_value=False):
+            resultado = coordenador.executar("sincronizacao", lambda: {"status": "success", "registros": 1})
+
+        self.assertEqual(resultado["registros"], 1)
+        self.assertNotIn("compartilhado", resultado)
+        self.assertEqual(db.buscar_execucao_sync("morto")["status"], "abandonado")
+
+    def test_erro_libera_execucao(self):
+        db = Database(self.db_path)
+
+        def falhar():
+            raise RuntimeError("falha no download")
+
+        with self.assertRaises(RuntimeError):
+            CoordenadorSync(db).executar("sincronizacao", falhar)
+
+        self.assertIsNone(db.buscar_execucao_sync_ativa())
+
+
+if __name__ == '__main__':
+    unittest.main()
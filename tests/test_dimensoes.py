@@ -0,0 +1,86 @@
+import sqlite3
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+# Adiciona a raiz do projeto ao sys.path
+ROOT_DIR = Path(__file__).parent.parent
+sys.path.insert(0, str(ROOT_DIR))
+
+from core.database import Database
+
+
+def funcionario(nome, unidade, gestor, aba="JANEIRO 2025", saida="2025-01-06"):
+    return {
+        "nome": nome, "unidade": unidade, "motivo": "FÉRIAS", "data_saida": saida,
+        "data_retorno": "2025-01-20", "gestor": gestor, "aba_origem": aba,
+        "mes": 1, "ano": 2025, "acessos": {},
+    }
+
+
+class TestDimensoes(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.db_path = Path(self.tmp.name) / "teste.sqlite"
+        self.db = Database(self.db_path)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_funcionarios_referenciam_dimensoes(self):
+        self.db.salvar_funcionarios([
+            funcionario("ANA", "RH", "CARLOS"),
+            funcionario("BRUNO", "RH", "CARLOS"),
+            funcionario("CAIO", "TI", "", aba="FEVEREIRO 2025"),
+        ])
+        self.db.salvar_abas([{"nome": "JANEIRO 2025", "mes": 1, "ano": 2025, "total_funcionarios": 2}])
+
+        conn = sqlite3.connect(self.db_path)
+        colunas = {row[1] for row in conn.execute("PRAGMA table_info(funcionarios)")}
+        self.assertTrue({"unidade_id", "gestor_id", "aba_id"} <= colunas)
+        self.assertFalse({"unidade", "gestor", "aba_origem"} & colunas)
+        self.assertEqual(conn.execute("SELECT COUNT(*) FROM abas").fetchone()[0], 2)
+        conn.close()
+
+        ana = self.db.buscar_funcionarios(aba="JANEIRO 2025")[-1]
+        self.assertEqual((ana["unidade"], ana["gestor"], ana["aba_origem"]), ("RH", "CARLOS", "JANEIRO 2025"))
+        self.assertEqual(self.db.buscar_estatisticas_por_unidade(), [
+            {"unidade": "RH", "total": 2}, {"unidade": "TI", "total": 1}
+        ])
+        self.assertEqual(self.db.buscar_estatisticas_por_gestor_filtrado(ano=2025),
+                         [{"gestor": "CARLOS", "total": 2}])
+        self.assertEqual(self.db.buscar_estatisticas_filtradas(ano=2025)["total_gestores"], 1)
+        self.assertEqual(self.db.buscar_gestores(), ["CARLOS"])
+        self.assertEqual(self.db.buscar_unidades(), ["RH", "TI"])
+        self.assertEqual(len(self.db.buscar_funcionarios_por_gestor("CARLOS")), 2)
+
+    def test_migra_colunas_texto(self):
+        conn = sqlite3.connect(self.db_path)
+        conn.executescript("""
+            DROP VIEW vw_funcionarios;
+            DROP TABLE funcionarios;
+            CREATE TABLE funcionarios (
+                id INTEGER PRIMARY KEY AUTOINCREMENT, nome TEXT NOT NULL, unidade TEXT,
+                motivo TEXT, data_saida DATE, data_retorno DATE, gestor TEXT,
+                aba_origem TEXT, mes INTEGER, ano INTEGER, created_at DATETIME
+            );
+            CREATE INDEX idx_func_aba ON funcionarios(aba_origem);
+            INSERT INTO funcionarios (nome, unidade, data_saida, data_retorno, gestor, aba_origem)
+            VALUES ('ANA', 'RH', '2025-01-06', '2025-01-20', 'CARLOS', 'JANEIRO 2025'),
+                   ('BRUNO', '', '2025-01-13', '2025-01-27', 'CARLOS', 'JANEIRO 2025');
+        """)
+        conn.commit()
+        conn.close()
+
+        db = Database(self.db_path)
+
+        self.assertEqual(db.buscar_estatisticas_por_gestor(), [{"gestor": "CARLOS", "total": 2}])
+        self.assertEqual(db.buscar_estatisticas_gerais()["total_unidades"], 1)
+        bruno = db.buscar_funcionarios_por_gestor("CARLOS")[0]
+        self.assertEqual((bruno["nome"], bruno["unidade"], bruno["aba_origem"]), ("BRUNO", "", "JANEIRO 2025"))
+
+
+if __name__ == '__main__':
+    unittest.main()
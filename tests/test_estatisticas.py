@@ -0,0 +1,69 @@
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+# Adiciona a raiz do projeto ao sys.path
+ROOT_DIR = Path(__file__).parent.parent
+sys.path.insert(0, str(ROOT_DIR))
+
+from core.database import Database
+from core.models import EstatisticasPeriodo
+
+
+def periodo(nome, mes, gestor, unidade, ano=2025):
+    return {
+        "nome": nome, "data_saida": f"{ano}-{mes:02d}-06", "data_retorno": f"{ano}-{mes:02d}-20",
+        "gestor": gestor, "unidade": unidade, "mes": mes, "ano": ano, "acessos": {},
+    }
+
+
+class TestEstatisticasPeriodo(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.db = Database(Path(self.tmp.name) / "teste.sqlite")
+        self.db.salvar_funcionarios([
+            periodo("ANA", 1, "CARLOS", "RH"),
+            periodo("ANA", 7, "CARLOS", "RH"),
+            periodo("BRUNO", 1, "CARLOS", "TI"),
+            periodo("CAIO", 3, "DANI", ""),
+            periodo("DORA", 2, "", "TI"),
+            periodo("ANA", 1, "CARLOS", "RH", ano=2024),
+        ])
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_uma_leitura_para_todas_as_secoes(self):
+        stats = self.db.buscar_estatisticas_periodo(ano=2025)
+
+        self.assertIsInstance(stats, EstatisticasPeriodo)
+        self.assertEqual(
+            (stats.total_registros, stats.funcionarios_unicos, stats.total_unidades, stats.total_gestores),
+            (5, 4, 2, 2)
+        )
+        self.assertEqual(stats.ranking[0], {"nome": "ANA", "total": 2})
+        self.assertEqual(stats.por_gestor, [{"gestor": "CARLOS", "total": 3}, {"gestor": "DANI", "total": 1}])
+        self.assertEqual(stats.por_unidade, [{"unidade": "RH", "total": 2}, {"unidade": "TI", "total": 2}])
+        self.assertEqual(stats.por_mes, self.db.buscar_ferias_por_mes(2025))
+
+    def test_equivale_as_consultas_separadas(self):
+        for ano, mes in ((None, None), (2025, None), (2025, 1), (None, 1)):
+            stats = self.db.buscar_estatisticas_periodo(ano=ano, mes=mes)
+            antigas = self.db.buscar_estatisticas_filtradas(ano=ano, mes=mes)
+            self.assertEqual(
+                {chave: getattr(stats, chave) for chave in antigas}, antigas
+            )
+            self.assertEqual(
+                sorted(stats.por_gestor, key=lambda g: g["gestor"]),
+                sorted(self.db.buscar_estatisticas_por_gestor_filtrado(ano=ano, mes=mes), key=lambda g: g["gestor"])
+            )
+
+    def test_periodo_sem_dados(self):
+        stats = self.db.buscar_estatisticas_periodo(ano=2030)
+        self.assertEqual((stats.total_registros, stats.ranking, stats.por_mes), (0, [], []))
+
+
+if __name__ == '__main__':
+    unittest.main()
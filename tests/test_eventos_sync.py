@@ -0,0 +1,127 @@
+import io
+import sys
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from pathlib import Path
+
+# Adiciona a raiz do projeto ao sys.path
+ROOT_DIR = Path(__file__).parent.parent
+sys.path.insert(0, str(ROOT_DIR))
+
+from core.database import Database
+from core.eventos_sync import ConsumidorEventos, calcular_eventos
+
+
+def funcionario(nome, saida, retorno, gestor="CARLOS", **acessos):
+    return {
+        "nome": nome, "data_saida": saida, "data_retorno": retorno, "unidade": "RH",
+        "motivo": "FÉRIAS", "gestor": gestor, "aba_origem": "JANEIRO 2025", "mes": 1, "ano": 2025,
+        "acessos": acessos or {"VPN": "BLOQUEADO"},
+    }
+
+
+class TestCalcularEventos(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.db = Database(Path(self.tmp.name) / "teste.sqlite")
+        self.db.salvar_funcionarios([
+            funcionario("ANA", "2025-01-06", "2025-01-20"),
+            funcionario("BRUNO", "2025-01-13", "2025-01-27"),
+            funcionario("CAIO", "2025-01-13", "2025-01-27"),
+        ])
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_tipos_de_evento(self):
+        eventos = calcular_eventos(self.db.buscar_estado_funcionarios(), [
+            funcionario("ANA", "2025-01-06", "2025-01-24"),
+            funcionario("BRUNO", "2025-01-13", "2025-01-27", gestor="DANI", VPN="LIBERADO"),
+            funcionario("DORA", "2025-02-03", "2025-02-17"),
+        ])
+
+        resumo = sorted((e["tipo"], e["nome"], e["campo"], e["valor_anterior"], e["valor_novo"]) for e in eventos)
+        self.assertEqual(resumo, [
+            ("acesso_alterado", "BRUNO", "VPN", "BLOQUEADO", "LIBERADO"),
+            ("dados_alterados", "BRUNO", "gestor", "CARLOS", "DANI"),
+            ("ferias_criada", "DORA", "data_retorno", None, "2025-02-17"),
+            ("ferias_removida", "CAIO", "data_retorno", "2025-01-27", None),
+            ("retorno_alterado", "ANA", "data_retorno", "2025-01-20", "2025-01-24"),
+        ])
+
+    def test_gravacao_gera_os_mesmos_eventos(self):
+        registros = [
+            funcionario("ANA", "2025-01-06", "2025-01-24"),
+            funcionario("BRUNO", "2025-01-13", "2025-01-27", gestor="DANI", VPN="LIBERADO"),
+            funcionario("DORA", "2025-02-03", "2025-02-17"),
+        ]
+        esperados = calcular_eventos(self.db.buscar_estado_funcionarios(), registros)
+
+        with redirect_stdout(io.StringIO()):
+            self.db.salvar_funcionarios(registros, substituir=True, sync_id=5)
+
+        chave = lambda e: (e["tipo"], e["nome"], e["campo"], e["valor_anterior"], e["valor_novo"])
+        gravados = self.db.buscar_eventos_sync()
+        self.assertEqual(sorted(map(chave, gravados)), sorted(map(chave, esperados)))
+        self.assertEqual({e["sync_id"] for e in gravados}, {5})
+        self.assertEqual(self.db.contar_eventos_sync(5), len(esperados))
+
+    def test_sem_mudancas_nao_gera_eventos(self):
+        eventos = calcular_eventos(self.db.buscar_estado_funcionarios(), [
+            funcionario("ANA", "2025-01-06", "2025-01-20"),
+            funcionario("BRUNO", "2025-01-13", "2025-01-27"),
+            funcionario("CAIO", "2025-01-13", "2025-01-27"),
+        ])
+        self.assertEqual(eventos, [])
+
+
+class TestConsumidorEventos(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.db = Database(Path(self.tmp.name) / "teste.sqlite")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def _evento(self, tipo, nome):
+        return {"tipo": tipo, "nome": nome, "data_saida": "2025-01-06", "campo": "data_retorno"}
+
+    def test_consumidor_le_apenas_eventos_novos(self):
+        self.db.registrar_eventos_sync(1, [self._evento("retorno_alterado", "ANTIGO")])
+        consumidor = ConsumidorEventos("teste", self.db)
+        self.assertEqual(consumidor.processar(lambda eventos: None), 0)
+
+        self.db.registrar_eventos_sync(2, [
+            self._evento("retorno_alterado", "ANA"),
+            self._evento("acesso_alterado", "BRUNO"),
+            self._evento("retorno_alterado", "CAIO"),
+        ])
+
+        recebidos = []
+        total = consumidor.processar(lambda eventos: recebidos.extend(eventos),
+                                     tipos=["retorno_alterado"], lote=1)
+        self.assertEqual(total, 2)
+        self.assertEqual([e["nome"] for e in recebidos], ["ANA", "CAIO"])
+        self.assertEqual(consumidor.processar(lambda eventos: recebidos.extend(eventos)), 0)
+
+    def test_falha_nao_avanca_cursor(self):
+        consumidor = ConsumidorEventos("teste", self.db)
+        consumidor.processar(lambda eventos: None)
+        self.db.registrar_eventos_sync(1, [self._evento("retorno_alterado", "ANA")])
+
+        def falhar(eventos):
+            raise RuntimeError("WhatsApp fora do ar")
+
+        with self.assertRaises(RuntimeError):
+            consumidor.processar(falhar)
+
+        recebidos = []
+        consumidor.processar(lambda eventos: recebidos.extend(eventos))
+        self.assertEqual([e["nome"] for e in recebidos], ["ANA"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,99 @@
+import asyncio
+import sys
+import threading
+import time
+import unittest
+from functools import partial
+from pathlib import Path
+from unittest.mock import patch
+
+# Adiciona a raiz do projeto ao sys.path
+ROOT_DIR = Path(__file__).parent.parent
+sys.path.insert(0, str(ROOT_DIR))
+
+from scheduler import execucao, jobs
+from scheduler.assincrono import loop_jobs
+from scheduler.execucao import executar_com_limite
+
+
+@patch.object(execucao, "_reportar_estouro", lambda *args: None)
+class TestExecucaoJobs(unittest.TestCase):
+
+    def test_processo_devolve_retorno_e_erros(self):
+        self.assertEqual(executar_com_limite("potencia", partial(pow, 2, 10), 30, processo=True), 1024)
+        with self.assertRaisesRegex(RuntimeError, "ValueError"):
+            executar_com_limite("invalido", partial(int, "x"), 30, processo=True)
+
+    def test_processo_travado_e_encerrado(self):
+        inicio = time.monotonic()
+        with self.assertRaises(TimeoutError):
+            executar_com_limite("travado", partial(time.sleep, 60), 1, processo=True)
+        self.assertLess(time.monotonic() - inicio, 10)
+        self.assertEqual([p for p in execucao._contexto.active_children() if p.name == "job-travado"], [])
+
+    def test_thread_travada_libera_o_chamador(self):
+        self.assertEqual(executar_com_limite("rapido", lambda: "ok", 5, processo=False), "ok")
+        inicio = time.monotonic()
+        with self.assertRaises(TimeoutError):
+            executar_com_limite("lento", partial(time.sleep, 5), 0.2, processo=False)
+        self.assertLess(time.monotonic() - inicio, 1)
+
+
+    def test_corrotinas_dividem_o_loop_e_sao_canceladas(self):
+        threads, cancelada = [], threading.Event()
+
+        async def job(nome):
+            threads.append(threading.current_thread().name)
+            try:
+                await asyncio.sleep(0.3)
+            except asyncio.CancelledError:
+                cancelada.set()
+                raise
+            return nome
+
+        resultados = []
+        inicio = time.monotonic()
+        trabalhadores = [
+            threading.Thread(target=lambda n=n: resultados.append(executar_com_limite(n, partial(job, n), 5, processo=False)))
+            for n in ("a", "b", "c")
+        ]
+        for t in trabalhadores:
+            t.start()
+        for t in trabalhadores:
+            t.join()
+        self.assertEqual(sorted(resultados), ["a", "b", "c"])
+        self.assertLess(time.monotonic() - inicio, 0.8)
+        self.assertEqual(set(threads), {"jobs-asyncio"})
+
+        with self.assertRaises(TimeoutError):
+            executar_com_limite("lento", partial(job, "lento"), 0.1, processo=False)
+        self.assertTrue(cancelada.wait(1))
+
+        # Em processo, a corrotina roda em um loop próprio no filho
+        self.assertEqual(executar_com_limite("isolado", partial(asyncio.sleep, 0, "ok"), 30, processo=True), "ok")
+        loop_jobs.parar()
+        self.assertFalse(loop_jobs.rodando)
+
+
+    def test_jobs_assincronos_consultam_o_banco_fora_do_loop(self):
+        threads = []
+
+        def registrar(retorno):
+            def consulta(*args):
+                threads.append(threading.current_thread().name)
+                return retorno
+            return consulta
+
+        with patch.object(jobs, "_eh_dia_util", registrar(True)), \
+                patch.object(jobs, "_tipo_executado_hoje", registrar(True)), \
+                patch.dict(jobs.settings._data, {"EVOLUTION_ENABLED": "true", "MENSAGEM_MANHA_ENABLED": "true"}), \
+                patch("builtins.print"):
+            loop_jobs.executar(jobs.job_mensagem_manha(), 5)
+        loop_jobs.parar()
+
+        self.assertEqual(len(threads), 2)
+        self.assertNotIn("jobs-asyncio", threads)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,99 @@
+import json
+import sys
+import threading
+import time
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+# Adiciona a raiz do projeto ao sys.path
+ROOT_DIR = Path(__file__).parent.parent
+sys.path.insert(0, str(ROOT_DIR))
+
+from integrations import http_assincrono
+from integrations.evolution_api import EvolutionAPI
+from integrations.kanbanize import KanbanizeAPI
+
+CARDS = [{"card_id": n, "title": f"Card {n}"} for n in range(1, 7)]
+
+
+class _ServidorFalso(BaseHTTPRequestHandler):
+    """Kanbanize (lista e detalhes lentos) e Evolution, contando requisições simultâneas."""
+
+    def do_GET(self):
+        servidor = self.server
+        if self.path.startswith("/api/v2/cards?"):
+            return self._responder(200, {"data": {"pagination": {"all_pages": 1}, "data": CARDS}})
+
+        card_id = int(self.path.rsplit("/", 1)[1])
+        with servidor.lock:
+            servidor.em_andamento += 1
+            servidor.pico = max(servidor.pico, servidor.em_andamento)
+        time.sleep(0.2)
+        with servidor.lock:
+            servidor.em_andamento -= 1
+        if card_id == 4:
+            return self._responder(404, {"error": "não encontrado"})
+        self._responder(200, {"data": {"card_id": card_id, "title": f"Card {card_id}", "detalhado": True}})
+
+    def do_POST(self):
+        corpo = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        self.server.mensagens.append((self.headers.get("apikey"), corpo))
+        self._responder(201, {"key": {"id": "1"}})
+
+    def _responder(self, codigo, dados):
+        corpo = json.dumps(dados).encode()
+        self.send_response(codigo)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(corpo)))
+        self.end_headers()
+        self.wfile.write(corpo)
+
+    def log_message(self, formato, *args):
+        pass
+
+
+class TestIntegracoesAssincronas(unittest.TestCase):
+
+    def setUp(self):
+        self.servidor = ThreadingHTTPServer(("127.0.0.1", 0), _ServidorFalso)
+        self.servidor.lock = threading.Lock()
+        self.servidor.em_andamento = self.servidor.pico = 0
+        self.servidor.mensagens = []
+        threading.Thread(target=self.servidor.serve_forever, daemon=True).start()
+        self.addCleanup(self.servidor.server_close)
+        self.addCleanup(self.servidor.shutdown)
+        self.url = f"http://127.0.0.1:{self.servidor.server_port}"
+
+    def test_kanbanize_detalhes_concorrentes_limitados(self):
+        api = KanbanizeAPI(self.url, "chave")
+
+        inicio = time.monotonic()
+        resultado = api.buscar_cards_completos_paralelo([1], max_workers=3)
+        duracao = time.monotonic() - inicio
+
+        self.assertTrue(resultado["sucesso"])
+        self.assertEqual([c["card_id"] for c in resultado["dados"]], [1, 2, 3, 4, 5, 6])
+        # Card sem detalhe (404) mantém o resumo
+        self.assertNotIn("detalhado", resultado["dados"][3])
+        self.assertTrue(all(c.get("detalhado") for i, c in enumerate(resultado["dados"]) if i != 3))
+        self.assertLessEqual(self.servidor.pico, 3)
+        self.assertLess(duracao, 6 * 0.2)
+
+    def test_evolution_envio_assincrono(self):
+        api = EvolutionAPI(url=f"{self.url}/message/sendText/teste", numero="11987654321", api_key="segredo")
+        api.enabled = True
+
+        resultado = http_assincrono.executar(api.enviar_mensagem_async("Olá"))
+        self.assertTrue(resultado["sucesso"])
+        self.assertEqual(self.servidor.mensagens, [("segredo", {"number": "5511987654321", "text": "Olá"})])
+
+        # Servidor fora do ar
+        api.url = "http://127.0.0.1:9/message/sendText/teste"
+        resultado = http_assincrono.executar(api.enviar_mensagem_async("Olá"))
+        self.assertFalse(resultado["sucesso"])
+        self.assertIn("conexão", resultado["mensagem"])
+
+
+if __name__ == '__main__':
+    unittest.main()
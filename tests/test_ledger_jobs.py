@@ -0,0 +1,97 @@
+import sqlite3
+import sys
+import tempfile
+import threading
+import time
+import unittest
+from datetime import datetime
+from pathlib import Path
+
+# Adiciona a raiz do projeto ao sys.path
+ROOT_DIR = Path(__file__).parent.parent
+sys.path.insert(0, str(ROOT_DIR))
+
+from core.database import Database
+from scheduler.ledger import JobPulado, LedgerJobs, horario_agendado
+
+AGENDADO = horario_agendado(8, 15)
+
+
+class TestLedgerJobs(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.db_path = Path(self.tmp.name) / "teste.sqlite"
+        self.db = Database(self.db_path)
+        self.ledger = LedgerJobs(self.db)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_horario_executa_uma_unica_vez_entre_concorrentes(self):
+        chamadas = []
+
+        def job():
+            chamadas.append(1)
+            time.sleep(0.2)
+
+        threads = [
+            threading.Thread(target=LedgerJobs(Database(self.db_path)).executar, args=("sync_diaria", job, AGENDADO))
+            for _ in range(4)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(len(chamadas), 1)
+        self.assertFalse(self.ledger.pendente("sync_diaria", AGENDADO))
+        self.assertTrue(self.ledger.executado_hoje("sync_diaria"))
+
+        execucao = self.db.buscar_job_runs(job_id="sync_diaria")[0]
+        self.assertEqual(execucao["status"], "sucesso")
+        self.assertGreaterEqual(execucao["duracao_segundos"], 0.2)
+
+    def test_falha_libera_nova_tentativa(self):
+        def falhar():
+            raise RuntimeError("WhatsApp fora do ar")
+
+        self.ledger.executar("mensagem_manha", falhar, AGENDADO)
+        self.ledger.executar("mensagem_tarde", lambda: False, AGENDADO)
+        self.assertTrue(self.ledger.pendente("mensagem_manha", AGENDADO))
+        self.assertFalse(self.ledger.executado_hoje("mensagem_manha"))
+
+        self.assertEqual(self.ledger.executar("mensagem_manha", lambda: "ok", AGENDADO), "ok")
+        execucao = self.db.buscar_job_runs(job_id="mensagem_manha")[0]
+        self.assertEqual((execucao["status"], execucao["tentativas"], execucao["erro"]), ("sucesso", 2, None))
+        self.assertEqual(self.db.buscar_job_runs(job_id="mensagem_tarde")[0]["status"], "erro")
+
+    def test_job_pulado_nao_conta_como_sucesso(self):
+        self.ledger.executar("mensagem_manha", lambda: JobPulado("Feriado"), AGENDADO)
+
+        self.assertEqual(self.ledger.ultimo_status, "pulado")
+        self.assertEqual(self.db.buscar_job_runs(job_id="mensagem_manha")[0]["status"], "pulado")
+        self.assertFalse(self.ledger.executado_hoje("mensagem_manha"))
+        self.assertFalse(self.ledger.pendente("mensagem_manha", AGENDADO))
+
+    def test_execucao_travada_expira(self):
+        conn = sqlite3.connect(self.db_path)
+        conn.execute("""
+            INSERT INTO job_runs (job_id, agendado_para, token, status, iniciado_em)
+            VALUES ('sync_diaria', ?, 'antigo', 'executando', ?)
+        """, (AGENDADO.strftime("%Y-%m-%d %H:%M:%S"), "2000-01-01 08:15:00"))
+        conn.commit()
+        conn.close()
+
+        self.assertFalse(self.ledger.pendente("sync_diaria", AGENDADO))
+        self.assertEqual(self.ledger.executar("sync_diaria", lambda: 42, AGENDADO), 42)
+        self.assertEqual(self.db.buscar_job_runs()[0]["tentativas"], 2)
+
+    def test_horarios_diferentes_sao_execucoes_distintas(self):
+        self.ledger.executar("kanbanize_sync_09h30", lambda: None, horario_agendado(9, 30, datetime(2025, 1, 6)))
+        self.ledger.executar("kanbanize_sync_09h30", lambda: None, horario_agendado(9, 30, datetime(2025, 1, 7)))
+        self.assertEqual(len(self.db.buscar_job_runs(job_id="kanbanize_sync_09h30")), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,85 @@
+import sys
+import tempfile
+import threading
+import time
+import unittest
+from datetime import datetime, timedelta
+from pathlib import Path
+
+# Adiciona a raiz do projeto ao sys.path
+ROOT_DIR = Path(__file__).parent.parent
+sys.path.insert(0, str(ROOT_DIR))
+
+from apscheduler.schedulers.background import BackgroundScheduler
+
+from core.database import Database
+from scheduler.ledger import JobPulado
+from scheduler.metricas import MonitorJobs
+
+
+class TestMetricasJobs(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.db = Database(Path(self.tmp.name) / "teste.sqlite")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def _metrica(self, job_id, resultado, duracao=None, agendado=None):
+        agendado = agendado or datetime.now().replace(microsecond=0)
+        self.db.registrar_metrica_job({
+            "job_id": job_id, "resultado": resultado,
+            "agendado_para": agendado.strftime("%Y-%m-%d %H:%M:%S"),
+            "iniciado_em": None, "atraso_segundos": 0.5 if duracao else None,
+            "duracao_segundos": duracao, "erro": None,
+        })
+
+    def test_percentis_e_misfires_por_janela(self):
+        for duracao in range(1, 21):
+            self._metrica("sync_diaria", "sucesso", float(duracao))
+        self._metrica("sync_diaria", "perdido")
+        self._metrica("mensagem_manha", "erro", 2.0)
+        self._metrica("mensagem_manha", "ignorado")
+        self._metrica("mensagem_manha", "sucesso", 9.0, datetime.now() - timedelta(days=3))
+
+        metricas = {m["job_id"]: m for m in self.db.buscar_metricas_jobs(horas=24)}
+
+        sync = metricas["sync_diaria"]
+        self.assertEqual((sync["disparos"], sync["sucessos"], sync["misfires"]), (21, 20, 1))
+        self.assertEqual((sync["p50_segundos"], sync["p95_segundos"]), (10.0, 19.0))
+        self.assertEqual((metricas["mensagem_manha"]["erros"], metricas["mensagem_manha"]["misfires"]), (1, 1))
+        self.assertEqual(metricas["mensagem_manha"]["p95_segundos"], 2.0)
+        self.assertEqual({m["job_id"]: m["disparos"] for m in self.db.buscar_metricas_jobs(horas=24 * 7)},
+                         {"mensagem_manha": 3, "sync_diaria": 21})
+
+    def test_listener_registra_eventos_do_scheduler(self):
+        terminou = threading.Event()
+
+        def falhar():
+            raise RuntimeError("API fora do ar")
+
+        scheduler = BackgroundScheduler()
+        MonitorJobs(self.db).registrar(scheduler)
+        scheduler.start()
+        self.addCleanup(scheduler.shutdown)
+
+        agora = datetime.now()
+        scheduler.add_job(lambda: time.sleep(0.2), "date", run_date=agora, id="lento")
+        scheduler.add_job(falhar, "date", run_date=agora, id="falha")
+        scheduler.add_job(lambda: JobPulado("Feriado"), "date", run_date=agora, id="feriado")
+        scheduler.add_job(terminou.set, "date", run_date=agora - timedelta(minutes=5),
+                          id="atrasado", misfire_grace_time=1)
+        time.sleep(0.6)
+
+        metricas = {m["job_id"]: m for m in self.db.buscar_metricas_jobs(horas=1)}
+        self.assertEqual(metricas["lento"]["sucessos"], 1)
+        self.assertGreaterEqual(metricas["lento"]["p50_segundos"], 0.15)
+        self.assertEqual(metricas["falha"]["erros"], 1)
+        self.assertEqual((metricas["feriado"]["sucessos"], metricas["feriado"]["pulados"]), (0, 1))
+        self.assertEqual(metricas["atrasado"]["misfires"], 1)
+        self.assertFalse(terminou.is_set())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,83 @@
+import sys
+import tempfile
+import unittest
+from datetime import date
+from pathlib import Path
+
+# Adiciona a raiz do projeto ao sys.path
+ROOT_DIR = Path(__file__).parent.parent
+sys.path.insert(0, str(ROOT_DIR))
+
+from core.database import Database
+from core.modelo_leitura import obter_modelo_leitura
+
+HOJE = date(2025, 3, 10)
+
+
+def funcionario(nome, saida, retorno, gestor="CARLOS", unidade="RH"):
+    return {
+        "nome": nome, "unidade": unidade, "motivo": "FÉRIAS", "data_saida": saida, "data_retorno": retorno,
+        "gestor": gestor, "aba_origem": "MARÇO 2025", "mes": int(saida[5:7]), "ano": int(saida[:4]),
+        "acessos": {"VPN": "BLOQUEADO"},
+    }
+
+
+class TestModeloLeitura(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.db = Database(Path(self.tmp.name) / "teste.sqlite")
+        self.db.salvar_funcionarios([
+            funcionario("ANA", "2025-03-10", "2025-03-24"),
+            funcionario("BRUNO", "2025-03-01", "2025-03-12", gestor="DANI"),
+            funcionario("CAIO", "2025-03-05", "2025-03-10", unidade="TI"),
+            funcionario("DORA", "2025-03-15", "2025-03-29"),
+            funcionario("EVA", "2025-03-18", "2025-04-01"),
+            funcionario("FABIO", "2025-02-01", "2025-02-15"),
+        ])
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def _nomes(self, funcionarios):
+        return [f["nome"] for f in funcionarios]
+
+    def test_consultas(self):
+        modelo = obter_modelo_leitura(self.db)
+
+        self.assertEqual(self._nomes(modelo.buscar_saindo_hoje(hoje=HOJE)), ["ANA"])
+        self.assertEqual(self._nomes(modelo.buscar_em_ferias(hoje=HOJE)), ["CAIO", "BRUNO", "ANA"])
+        self.assertEqual(self._nomes(modelo.buscar_proximos_a_sair(dias=7, hoje=HOJE)), ["DORA"])
+        self.assertEqual(self._nomes(modelo.buscar_funcionarios_por_gestor("CARLOS")),
+                         ["EVA", "DORA", "ANA", "CAIO", "FABIO"])
+        self.assertEqual(self._nomes(modelo.buscar_funcionarios_por_gestor("CARLOS", ano=2025, mes=2)), ["FABIO"])
+        self.assertEqual(modelo.buscar_funcionarios_por_gestor("NINGUEM"), [])
+        self.assertEqual(self._nomes(modelo.buscar_funcionarios_por_unidade("TI")), ["CAIO"])
+
+        ana = modelo.buscar_saindo_hoje(hoje=HOJE)[0]
+        self.assertEqual((ana["gestor"], ana["acessos"]), ("CARLOS", {"VPN": "BLOQUEADO"}))
+        self.assertEqual(
+            modelo.buscar_funcionarios_por_gestor("DANI"),
+            self.db.buscar_funcionarios_por_gestor("DANI")
+        )
+
+    def test_resultados_sao_copias(self):
+        modelo = obter_modelo_leitura(self.db)
+        modelo.buscar_saindo_hoje(hoje=HOJE)[0]["acessos"]["VPN"] = "LIBERADO"
+        self.assertEqual(modelo.buscar_saindo_hoje(hoje=HOJE)[0]["acessos"]["VPN"], "BLOQUEADO")
+
+    def test_reconstroi_so_quando_a_versao_muda(self):
+        modelo = obter_modelo_leitura(self.db)
+        self.assertIs(obter_modelo_leitura(self.db), modelo)
+
+        self.db.salvar_funcionarios([funcionario("ANA", "2025-03-10", "2025-03-24")])
+        self.assertIs(obter_modelo_leitura(self.db), modelo)
+
+        self.db.salvar_funcionarios([funcionario("GIL", "2025-03-10", "2025-03-20")])
+        novo = obter_modelo_leitura(self.db)
+        self.assertIsNot(novo, modelo)
+        self.assertEqual(sorted(self._nomes(novo.buscar_saindo_hoje(hoje=HOJE))), ["ANA", "GIL"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,100 @@
+import sqlite3
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+# Adiciona a raiz do projeto ao sys.path
+ROOT_DIR = Path(__file__).parent.parent
+sys.path.insert(0, str(ROOT_DIR))
+
+from core.database import Database
+from utils.formatadores import normalizar_nome
+
+
+def periodo(nome, saida, retorno):
+    return {"nome": nome, "data_saida": saida, "data_retorno": retorno, "mes": 1, "ano": 2025, "acessos": {}}
+
+
+class TestPessoas(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.db_path = Path(self.tmp.name) / "teste.sqlite"
+        self.db = Database(self.db_path)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_normalizar_nome(self):
+        self.assertEqual(normalizar_nome("  José   da SILVA "), "jose da silva")
+        self.assertEqual(normalizar_nome("JOSÉ DA SILVA"), normalizar_nome("jose da  silva"))
+        self.assertEqual(normalizar_nome(None), "")
+
+    def test_variacoes_do_nome_sao_a_mesma_pessoa(self):
+        self.db.salvar_funcionarios([
+            periodo("JOSÉ DA SILVA", "2025-01-06", "2025-01-20"),
+            periodo("Jose  da Silva", "2025-07-01", "2025-07-15"),
+            periodo("ANA SOUZA", "2025-02-03", "2025-02-17"),
+        ])
+
+        pessoas = self.db.buscar_pessoas()
+        self.assertEqual([(p["nome"], p["total"]) for p in pessoas], [("ANA SOUZA", 1), ("JOSÉ DA SILVA", 2)])
+        self.assertEqual(self.db.buscar_ranking_ferias(limite=1), [{"nome": "JOSÉ DA SILVA", "total": 2}])
+        self.assertEqual(self.db.buscar_estatisticas_gerais()["funcionarios_unicos"], 2)
+
+        jose = self.db.buscar_pessoa_por_nome("jose da silva")
+        historico = self.db.buscar_historico_pessoa(jose["id"])
+        self.assertEqual([h["data_saida"] for h in historico], ["2025-07-01", "2025-01-06"])
+        self.assertEqual(historico[0]["dias"], 15)
+        self.assertEqual([p["nome"] for p in self.db.buscar_pessoas(busca="jóse")], ["JOSÉ DA SILVA"])
+
+    def test_historico_paginado(self):
+        self.db.salvar_funcionarios([
+            periodo("ANA SOUZA", "2024-01-08", "2024-01-19"),
+            periodo("ANA SOUZA", "2024-07-01", "2024-07-10"),
+            periodo("ANA SOUZA", "2025-01-06", "2025-01-20"),
+            periodo("BRUNO LIMA", "2025-02-03", "2025-02-07"),
+            periodo("CAIO ROCHA", "2025-03-03", "2025-03-07"),
+        ])
+        ana = self.db.buscar_pessoa_por_nome("ana souza")["id"]
+
+        pagina = self.db.historico(ana, offset=1, limite=1)
+        self.assertEqual(len(pagina), 1)
+        self.assertEqual(pagina[0]["data_saida_fmt"], "01/07/2024")
+        self.assertEqual(pagina[0]["dias"], 10)
+        self.assertEqual(pagina[0]["dias_desde_anterior"], 164)
+        self.assertIsNone(self.db.historico(ana, offset=2)[0]["dias_desde_anterior"])
+
+        pessoas, cursor = self.db.buscar_historico_pagina(pessoas_por_pagina=2)
+        self.assertEqual([p["nome"] for p in pessoas], ["ANA SOUZA", "BRUNO LIMA"])
+        self.assertEqual(len(pessoas[0]["ferias"]), 3)
+        pessoas, cursor = self.db.buscar_historico_pagina(cursor, pessoas_por_pagina=2)
+        self.assertEqual(([p["nome"] for p in pessoas], cursor), (["CAIO ROCHA"], None))
+        self.assertEqual([p["nome"] for p in self.db.iterar_historico(pessoas_por_pagina=1)],
+                         ["ANA SOUZA", "BRUNO LIMA", "CAIO ROCHA"])
+
+    def test_id_da_pessoa_estavel_entre_syncs(self):
+        self.db.salvar_funcionarios([periodo("ANA SOUZA", "2025-01-06", "2025-01-20")])
+        pessoa_id = self.db.buscar_pessoa_por_nome("ANA SOUZA")["id"]
+
+        self.db.limpar_dados()
+        self.db.salvar_funcionarios([periodo("Ana Souza", "2025-01-06", "2025-01-20")])
+
+        self.assertEqual(self.db.buscar_pessoas()[0]["id"], pessoa_id)
+
+    def test_registros_antigos_sao_vinculados(self):
+        conn = sqlite3.connect(self.db_path)
+        conn.execute("INSERT INTO funcionarios (nome, data_saida, data_retorno) VALUES ('CAIO ROCHA', '2025-01-06', '2025-01-20')")
+        conn.commit()
+        conn.close()
+
+        Database(self.db_path)
+
+        conn = sqlite3.connect(self.db_path)
+        self.assertEqual(conn.execute("SELECT COUNT(*) FROM funcionarios WHERE pessoa_id IS NULL").fetchone()[0], 0)
+        conn.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,72 @@
+import io
+import sys
+import tempfile
+import threading
+import unittest
+from contextlib import redirect_stdout
+from datetime import datetime
+from pathlib import Path
+
+# Adiciona a raiz do projeto ao sys.path
+ROOT_DIR = Path(__file__).parent.parent
+sys.path.insert(0, str(ROOT_DIR))
+
+from core.database import Database
+from scheduler.ledger import LedgerJobs
+from scheduler.recuperacao import planejar_recuperacao, recuperar
+from scheduler.registro import DefinicaoJob
+
+AGORA = datetime(2025, 1, 6, 12, 0)  # segunda-feira
+
+SYNC = DefinicaoJob("sync_diaria", "sincronizacao", "Sincronização", "15 8 * * mon-fri")
+SYNC_NOTIF = DefinicaoJob("sync_notif", "sincronizacao_notificacao", "Sync + Notif", "0 11 * * mon-fri")
+MANHA = DefinicaoJob("mensagem_manha", "mensagem_manha", "Manhã", "0 8 * * mon-fri")
+TARDE = DefinicaoJob("mensagem_tarde", "mensagem_tarde", "Tarde", "0 18 * * mon-fri")
+FERIAS = DefinicaoJob("ferias", "verificar_ferias", "Férias", "0 9 * * *")
+KANBANIZE = DefinicaoJob("kanbanize", "kanbanize_sync", "Kanbanize", "0 7,10 * * *")
+
+
+class TestRecuperacaoJobs(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.ledger = LedgerJobs(Database(Path(self.tmp.name) / "teste.sqlite"))
+
+    def test_plano_respeita_prazo_ledger_e_coalesce(self):
+        self.ledger.executar("sync_notif", lambda: True, datetime(2025, 1, 6, 11, 0))
+
+        plano = planejar_recuperacao([SYNC, SYNC_NOTIF, MANHA, TARDE, FERIAS, KANBANIZE], self.ledger, AGORA)
+
+        self.assertEqual({grupo: [(d.id, h) for d, h in itens] for grupo, itens in plano.items()}, {
+            "planilha": [("sync_diaria", datetime(2025, 1, 6, 8, 15))],
+            "kanbanize_sync": [("kanbanize", datetime(2025, 1, 6, 10, 0))],
+        })
+        self.assertEqual(planejar_recuperacao([MANHA], self.ledger, datetime(2025, 1, 6, 10, 0)),
+                         {"planilha": [(MANHA, datetime(2025, 1, 6, 8, 0))]})
+
+    def test_grupos_em_paralelo_e_em_serie_dentro_do_grupo(self):
+        kanbanize_iniciou = threading.Event()
+        execucoes, em_paralelo = [], []
+
+        def executar(definicao, agendado_para):
+            if definicao.tipo == "kanbanize_sync":
+                kanbanize_iniciou.set()
+            else:
+                # Só termina se o grupo do Kanbanize rodar ao mesmo tempo
+                em_paralelo.append(kanbanize_iniciou.wait(5))
+            execucoes.append(definicao.id)
+            if definicao.id == "sync_diaria":
+                raise RuntimeError("planilha indisponível")
+
+        with redirect_stdout(io.StringIO()):
+            recuperados = recuperar([MANHA, SYNC, KANBANIZE], executar, self.ledger, datetime(2025, 1, 6, 10, 30))
+
+        self.assertEqual([d.id for d, _ in recuperados], ["mensagem_manha", "sync_diaria", "kanbanize"])
+        self.assertEqual(em_paralelo, [True, True])
+        self.assertLess(execucoes.index("mensagem_manha"), execucoes.index("sync_diaria"))
+        self.assertEqual(sorted(execucoes), ["kanbanize", "mensagem_manha", "sync_diaria"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,99 @@
+import io
+import sys
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from datetime import datetime, timedelta
+from pathlib import Path
+from unittest.mock import patch
+
+# Adiciona a raiz do projeto ao sys.path
+ROOT_DIR = Path(__file__).parent.parent
+sys.path.insert(0, str(ROOT_DIR))
+
+from apscheduler.schedulers.background import BackgroundScheduler
+from apscheduler.triggers.cron import CronTrigger
+
+from config.settings import settings
+from core.database import Database
+from scheduler import jobs
+from scheduler.registro import ultimo_disparo
+
+CONFIG = {
+    "SYNC_ENABLED": "true", "SYNC_HOUR": "8", "SYNC_MINUTE": "15",
+    "SYNC_NOTIF_ENABLED": "true", "SYNC_NOTIF_HOUR": "13", "SYNC_NOTIF_MINUTE": "0",
+    "EVOLUTION_ENABLED": "true", "MENSAGEM_MANHA_ENABLED": "true", "MENSAGEM_TARDE_ENABLED": "false",
+    "KANBANIZE_SYNC_ENABLED": "false",
+}
+
+
+class TestReloadScheduler(unittest.TestCase):
+
+    def setUp(self):
+        patcher = patch.dict(settings._data, CONFIG)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.db = Database(Path(self.tmp.name) / "teste.sqlite")
+
+        self.scheduler = BackgroundScheduler()
+        self.scheduler.start(paused=True)
+        self.addCleanup(self.scheduler.shutdown, wait=False)
+        self.addCleanup(jobs._jobs_aplicados.clear)
+
+    def test_aplica_apenas_jobs_alterados(self):
+        mudancas = jobs._aplicar_jobs(self.scheduler, self.db)
+        self.assertEqual(sorted(mudancas["adicionados"]), ["mensagem_manha", "sync_diaria", "sync_notif"])
+        sync_notif = self.scheduler.get_job("sync_notif")
+
+        settings._data.update({"SYNC_HOUR": "9", "MENSAGEM_MANHA_ENABLED": "false", "MENSAGEM_TARDE_ENABLED": "true"})
+        mudancas = jobs._aplicar_jobs(self.scheduler, self.db)
+
+        self.assertEqual(mudancas, {
+            "adicionados": ["mensagem_tarde"], "alterados": ["sync_diaria"], "removidos": ["mensagem_manha"]
+        })
+        self.assertIsNone(self.scheduler.get_job("mensagem_manha"))
+        self.assertEqual(self.scheduler.get_job("sync_diaria").args[0].cron, "15 9 * * mon-fri")
+        self.assertIs(self.scheduler.get_job("sync_notif"), sync_notif)
+        self.assertEqual(jobs._aplicar_jobs(self.scheduler, self.db), {"adicionados": [], "alterados": [], "removidos": []})
+
+    def test_jobs_do_registro_no_banco(self):
+        self.db.salvar_job_agendado({
+            "id": "kanbanize_board_7", "tipo": "kanbanize_sync", "cron": "0 12 * * mon-fri",
+            "parametros": {"board_id": 7, "rotulo": "12:00"}, "notificar": "5511999999999",
+        })
+        self.db.salvar_job_agendado({"id": "desconhecido", "tipo": "nao_existe", "cron": "0 12 * * *"})
+        with redirect_stdout(io.StringIO()):
+            mudancas = jobs._aplicar_jobs(self.scheduler, self.db)
+        self.assertIn("kanbanize_board_7", mudancas["adicionados"])
+        self.assertNotIn("desconhecido", mudancas["adicionados"])
+
+        funcao = jobs._funcao_do_job(self.scheduler.get_job("kanbanize_board_7").args[0])
+        self.assertEqual(funcao.args[1].keywords, {"board_id": 7, "rotulo": "12:00", "notificar": "5511999999999"})
+        self.assertEqual(funcao.args[2:], (20 * 60, False))
+
+        self.db.salvar_job_agendado({"id": "sync_diaria", "tipo": "sincronizacao", "cron": "30 7 * * *",
+                                     "timeout_segundos": 600})
+        with redirect_stdout(io.StringIO()):
+            mudancas = jobs._aplicar_jobs(self.scheduler, self.db)
+        self.assertEqual(mudancas["alterados"], ["sync_diaria"])
+        self.assertEqual(jobs._funcao_do_job(self.scheduler.get_job("sync_diaria").args[0]).args[2], 600)
+
+    def test_sinal_de_reload(self):
+        self.assertEqual(self.db.buscar_versao_sinal(jobs.SINAL_RELOAD), 0)
+        self.db.emitir_sinal(jobs.SINAL_RELOAD)
+        self.db.emitir_sinal(jobs.SINAL_RELOAD)
+        self.assertEqual(self.db.buscar_versao_sinal(jobs.SINAL_RELOAD), 2)
+
+    def test_ultimo_disparo(self):
+        trigger = CronTrigger.from_crontab("30 9 * * mon-fri")
+        self.assertEqual(ultimo_disparo(trigger, datetime(2025, 1, 6, 9, 45)), datetime(2025, 1, 6, 9, 30))
+        self.assertIsNone(ultimo_disparo(trigger, datetime(2025, 1, 6, 10, 45)))
+        self.assertEqual(ultimo_disparo(trigger, datetime(2025, 1, 6, 10, 45), janela=timedelta(days=4)),
+                         datetime(2025, 1, 6, 9, 30))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,82 @@
+import sqlite3
+import sys
+import tempfile
+import unittest
+from datetime import datetime, timedelta
+from pathlib import Path
+
+# Adiciona a raiz do projeto ao sys.path
+ROOT_DIR = Path(__file__).parent.parent
+sys.path.insert(0, str(ROOT_DIR))
+
+from core.database import Database
+
+
+def periodo(nome, saida, retorno):
+    return {"nome": nome, "data_saida": saida, "data_retorno": retorno,
+            "mes": int(saida[5:7]), "ano": int(saida[:4]), "acessos": {}}
+
+
+class TestResumoFuncionario(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.db_path = Path(self.tmp.name) / "teste.sqlite"
+        self.db = Database(self.db_path)
+        self.futuro = (datetime.now() + timedelta(days=30)).strftime('%Y-%m-%d')
+        self.db.salvar_funcionarios([
+            periodo("ANA", "2024-07-01", "2024-07-10"),
+            periodo("ANA", "2025-01-06", "2025-01-20"),
+            periodo("Ana", self.futuro, self.futuro),
+            periodo("BRUNO", "2025-02-03", "2025-02-07"),
+        ], substituir=True)
+        self.ana = self.db.buscar_pessoa_por_nome("ANA")["id"]
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_resumo_da_pessoa(self):
+        resumo = self.db.buscar_resumo_pessoa(self.ana)
+
+        self.assertEqual((resumo["nome"], resumo["periodos"], resumo["total_dias"]), ("ANA", 3, 26))
+        self.assertEqual(resumo["ultima_saida"], "2025-01-06")
+        self.assertEqual(resumo["proxima_saida"], self.futuro)
+        self.assertEqual(resumo["por_ano"][2024], {"periodos": 1, "total_dias": 10})
+        self.assertIsNone(self.db.buscar_resumo_pessoa(9999))
+
+    def test_proxima_saida_relativa_ao_dia_da_consulta(self):
+        # Sem nova sync: passada a data de saída, ela vira a última e não há próxima
+        depois = datetime.strptime(self.futuro, '%Y-%m-%d').date() + timedelta(days=1)
+        resumo = self.db.buscar_resumo_pessoa(self.ana, hoje=depois)
+
+        self.assertEqual(resumo["ultima_saida"], self.futuro)
+        self.assertIsNone(resumo["proxima_saida"])
+
+    def test_rankings_pelo_resumo(self):
+        self.assertEqual(self.db.buscar_ranking_ferias(limite=1), [{"nome": "ANA", "total": 3}])
+        self.assertEqual(sorted(r["nome"] for r in self.db.buscar_ranking_ferias_filtrado(ano=2025)),
+                         ["ANA", "BRUNO"])
+        self.assertEqual(self.db.buscar_ranking_ferias_filtrado(ano=2024), [{"nome": "ANA", "total": 1}])
+
+    def test_atualizacao_incremental(self):
+        self.db.salvar_funcionarios([
+            periodo("ANA", "2024-07-01", "2024-07-10"),
+            periodo("BRUNO", "2025-02-03", "2025-02-07"),
+            periodo("BRUNO", "2025-08-04", "2025-08-08"),
+        ], substituir=True)
+
+        self.assertEqual(self.db.buscar_resumo_pessoa(self.ana)["periodos"], 1)
+        self.assertEqual(self.db.buscar_ranking_ferias(limite=1), [{"nome": "BRUNO", "total": 2}])
+
+    def test_resumo_criado_para_banco_existente(self):
+        conn = sqlite3.connect(self.db_path)
+        conn.execute("DELETE FROM resumo_funcionario")
+        conn.commit()
+        conn.close()
+
+        db = Database(self.db_path)
+        self.assertEqual(db.buscar_resumo_pessoa(self.ana)["periodos"], 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,146 @@
+import io
+import sys
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from datetime import datetime, timedelta
+from functools import partial
+from pathlib import Path
+from unittest.mock import patch
+
+# Adiciona a raiz do projeto ao sys.path
+ROOT_DIR = Path(__file__).parent.parent
+sys.path.insert(0, str(ROOT_DIR))
+
+from apscheduler.schedulers.background import BackgroundScheduler
+
+from core.database import Database
+from scheduler import jobs, registro
+from scheduler.ledger import FORMATO_LEDGER, LedgerJobs
+from scheduler.registro import DefinicaoJob, PoliticaRetry
+
+DEFINICAO = DefinicaoJob("sync_extra", "sincronizacao", "Sync Extra", "0 12 * * *")
+
+
+class TestPoliticaRetry(unittest.TestCase):
+
+    def test_backoff_exponencial_com_jitter(self):
+        politica = PoliticaRetry(tentativas=5, espera_segundos=60, espera_maxima_segundos=300)
+        self.assertEqual([politica.espera(n, aleatorio=lambda: 0) for n in (1, 2, 3, 4)], [30, 60, 120, 150])
+        self.assertEqual([politica.espera(n, aleatorio=lambda: 1) for n in (1, 2, 3, 4)], [60, 120, 240, 300])
+
+    def test_limite_de_tentativas_e_prazo(self):
+        manha = registro.POLITICAS_RETRY["mensagem_manha"]
+        agendado = datetime(2025, 1, 6, 8, 0)
+        self.assertIsNotNone(manha.proxima_tentativa(agendado, 1, agora=datetime(2025, 1, 6, 8, 1)))
+        self.assertIsNone(manha.proxima_tentativa(agendado, manha.tentativas, agora=datetime(2025, 1, 6, 8, 1)))
+        self.assertIsNone(manha.proxima_tentativa(agendado, 1, agora=datetime(2025, 1, 6, 10, 59, 50)))
+
+
+class TestNotificacaoDas13h(unittest.TestCase):
+
+    def test_falha_no_envio_e_falha_do_job(self):
+        """Sync das 08:15 já feita: falha ao notificar precisa chegar ao ledger para nova tentativa."""
+        class EvolutionFalha:
+            def __init__(self, **kwargs):
+                self.numero = kwargs["numero"]
+
+            def enviar_mensagem_sync(self, resultado, origem):
+                return {"sucesso": False, "mensagem": "Erro HTTP 500"}
+
+        executados = {"sincronizacao_notificacao": False, "sincronizacao": True}
+        saida = io.StringIO()
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        with patch("core.database.Database", partial(Database, Path(tmp.name) / "teste.sqlite")), \
+                patch.object(jobs, "_eh_dia_util", lambda: True), \
+                patch.object(jobs, "_tipo_executado_hoje", executados.get), \
+                patch.object(Database, "buscar_ultimo_sync", lambda _: {"total_registros": 3}), \
+                patch("integrations.evolution_api.EvolutionAPI", EvolutionFalha), \
+                patch.dict(jobs.settings._data, {"EVOLUTION_ENABLED": "true", "EVOLUTION_NUMERO_SYNC": "5511999999999"}), \
+                redirect_stdout(saida):
+            self.assertIs(jobs.job_sincronizacao_com_notificacao(), False)
+        self.assertIn("Falha ao enviar notificação: Erro HTTP 500", saida.getvalue())
+
+
+    def test_jobs_relacionados_vem_do_registro(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        db = Database(Path(tmp.name) / "teste.sqlite")
+        db.salvar_job_agendado({"id": DEFINICAO.id, "tipo": DEFINICAO.tipo, "cron": DEFINICAO.cron})
+        ledger = LedgerJobs(db)
+
+        with patch.object(jobs, "LedgerJobs", lambda: ledger):
+            self.assertFalse(jobs._tipo_executado_hoje("sincronizacao"))
+            ledger.executar(DEFINICAO.id, lambda: True, datetime.now().replace(second=0, microsecond=0))
+            self.assertTrue(jobs._tipo_executado_hoje("sincronizacao"))
+            self.assertFalse(jobs._tipo_executado_hoje("sincronizacao_notificacao"))
+
+
+class TestDeadLetter(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.db = Database(Path(self.tmp.name) / "teste.sqlite")
+        self.db.salvar_job_agendado({"id": DEFINICAO.id, "tipo": DEFINICAO.tipo, "cron": DEFINICAO.cron})
+
+        scheduler = BackgroundScheduler()
+        scheduler.start(paused=True)
+        self.addCleanup(scheduler.shutdown, wait=False)
+
+        self.resultado = False
+        for alvo, valor in [
+            ("_scheduler", scheduler),
+            ("LedgerJobs", partial(LedgerJobs, self.db)),
+            ("_funcao_do_job", lambda definicao: lambda: self.resultado),
+        ]:
+            patcher = patch.object(jobs, alvo, valor)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        patcher = patch.dict(registro.POLITICAS_RETRY, {"sincronizacao": PoliticaRetry(tentativas=2, espera_segundos=1)})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.scheduler = scheduler
+        self.agendado = datetime.now().replace(microsecond=0)
+
+    def _execucao(self):
+        return self.db.buscar_job_run(DEFINICAO.id, self.agendado.strftime(FORMATO_LEDGER))
+
+    def test_falhas_reagendam_ate_esgotar_e_reexecucao(self):
+        with redirect_stdout(io.StringIO()):
+            with self.assertRaises(RuntimeError):
+                jobs._executar_agendado(DEFINICAO, self.agendado)
+            nova_tentativa = self.scheduler.get_job(f"sync_extra:tentativa:{self.agendado:%Y%m%d%H%M}")
+            self.assertEqual(nova_tentativa.args, (DEFINICAO, self.agendado))
+
+            # A falha de outro horário agenda a própria tentativa, sem substituir esta
+            outro_horario = self.agendado + timedelta(days=1)
+            with self.assertRaises(RuntimeError):
+                jobs._executar_agendado(DEFINICAO, outro_horario)
+            self.assertEqual(
+                self.scheduler.get_job(f"sync_extra:tentativa:{outro_horario:%Y%m%d%H%M}").args,
+                (DEFINICAO, outro_horario)
+            )
+            self.assertEqual(self.scheduler.get_job(nova_tentativa.id).args, (DEFINICAO, self.agendado))
+            self.assertEqual(self._execucao()["status"], "erro")
+
+            with self.assertRaises(RuntimeError):
+                jobs._executar_agendado(*nova_tentativa.args)
+            self.assertEqual((self._execucao()["status"], self._execucao()["tentativas"]), ("esgotado", 2))
+            self.assertFalse(LedgerJobs(self.db).pendente(DEFINICAO.id, self.agendado))
+
+            run_id = self.db.buscar_job_runs(status="esgotado")[0]["id"]
+            self.assertTrue(self.db.solicitar_reexecucao_job_run(run_id))
+            self.assertFalse(self.db.solicitar_reexecucao_job_run(run_id))
+            self.assertEqual(jobs._despachar_reexecucoes(self.db), [DEFINICAO.id])
+
+            reexecucao = self.scheduler.get_job(f"sync_extra:reexecucao:{run_id}")
+            self.resultado = True
+            self.assertEqual(jobs._executar_agendado(*reexecucao.args, **reexecucao.kwargs), "sucesso")
+        self.assertEqual((self._execucao()["status"], self._execucao()["tentativas"]), ("sucesso", 3))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,87 @@
+import io
+import json
+import socket
+import sys
+import tempfile
+import time
+import unittest
+import urllib.error
+import urllib.request
+from contextlib import redirect_stdout
+from datetime import datetime, timedelta
+from pathlib import Path
+
+# Adiciona a raiz do projeto ao sys.path
+ROOT_DIR = Path(__file__).parent.parent
+sys.path.insert(0, str(ROOT_DIR))
+
+from apscheduler.schedulers.background import BackgroundScheduler
+
+from core.database import Database
+from scheduler.saude import FORMATO_HEARTBEAT, MonitorSaude, avaliar_heartbeat
+
+
+def porta_livre():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+class TestSaudeScheduler(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.db = Database(Path(self.tmp.name) / "teste.sqlite")
+
+    def test_avaliar_heartbeat(self):
+        agora = datetime(2025, 1, 6, 10, 0, 0)
+
+        def heartbeat(status, segundos_atras):
+            return {"status": status, "atualizado_em": (agora - timedelta(seconds=segundos_atras)).strftime(FORMATO_HEARTBEAT)}
+
+        self.assertFalse(avaliar_heartbeat(None, agora)[0])
+        self.assertTrue(avaliar_heartbeat(heartbeat("rodando", 4), agora)[0])
+        self.assertIn("Sem heartbeat", avaliar_heartbeat(heartbeat("rodando", 120), agora)[1])
+        self.assertIn("atrasados", avaliar_heartbeat(heartbeat("atrasado", 4), agora)[1])
+        self.assertIn("parado", avaliar_heartbeat(heartbeat("parado", 4), agora)[1])
+
+    def test_heartbeat_e_endpoint(self):
+        scheduler = BackgroundScheduler()
+        monitor = MonitorSaude(self.db)
+        monitor.registrar(scheduler)
+        scheduler.start()
+
+        scheduler.add_job(lambda: "pulado", "date", run_date=datetime.now(), id="rapido")
+        scheduler.add_job(print, "cron", hour=23, minute=59, id="noturno", name="Job Noturno")
+        time.sleep(0.3)
+
+        porta = porta_livre()
+        with redirect_stdout(io.StringIO()):
+            monitor.iniciar(porta=porta)
+        self.addCleanup(monitor.parar)
+
+        heartbeat = self.db.buscar_heartbeat()
+        self.assertEqual(heartbeat["status"], "rodando")
+        self.assertEqual([p["id"] for p in heartbeat["proximos"]], ["noturno"])
+        self.assertEqual(heartbeat["ultimo_job"]["job_id"], "rapido")
+        self.assertEqual(heartbeat["ultimo_job"]["resultado"], "pulado")
+        self.assertEqual((heartbeat["em_execucao"], heartbeat["fila"]), (0, 0))
+
+        with urllib.request.urlopen(f"http://127.0.0.1:{porta}/health", timeout=5) as resposta:
+            self.assertEqual(resposta.status, 200)
+            self.assertTrue(json.load(resposta)["saudavel"])
+        with urllib.request.urlopen(f"http://127.0.0.1:{porta}/metrics", timeout=5) as resposta:
+            metricas = resposta.read().decode()
+        self.assertIn("scheduler_up 1", metricas)
+        self.assertIn('scheduler_proximo_disparo_timestamp_seconds{job="noturno"}', metricas)
+
+        scheduler.shutdown()
+        monitor.parar()
+        self.assertEqual(self.db.buscar_heartbeat()["status"], "parado")
+        with self.assertRaises(urllib.error.URLError):
+            urllib.request.urlopen(f"http://127.0.0.1:{porta}/health", timeout=1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,185 @@
+import io
+import sys
+import tempfile
+import threading
+import unittest
+from contextlib import redirect_stdout
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from unittest.mock import patch
+from urllib.parse import parse_qs, urlparse
+
+import openpyxl
+
+# Adiciona a raiz do projeto ao sys.path
+ROOT_DIR = Path(__file__).parent.parent
+sys.path.insert(0, str(ROOT_DIR))
+
+from config.settings import settings
+from core.database import Database
+from core.snapshot_store import SnapshotStore
+from core.sync_manager import SyncManager
+from utils import google_sheets
+
+CABECALHO = "RESP.,NOME,MOTIVO,SAÍDA,RETORNO,GESTOR,AD PRIN,VPN\n"
+
+HTMLVIEW = """<html><script>
+items.push({name: "JANEIRO 2025", pageUrl: "x", gid: "0",initialSheet: true});
+items.push({name: "FEVEREIRO 2025", pageUrl: "y", gid: "111",initialSheet: false});
+</script></html>"""
+
+
+class PlanilhaFalsa(BaseHTTPRequestHandler):
+    """Servidor local que imita o htmlview e a exportação CSV do Google Sheets."""
+
+    abas = {}
+    requisicoes = []
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        self.requisicoes.append(self.path)
+        if url.path.endswith("/htmlview"):
+            corpo = HTMLVIEW.encode()
+        elif url.path.endswith("/export"):
+            gid = parse_qs(url.query)["gid"][0]
+            corpo = self.abas[gid].encode()
+        else:
+            self.send_error(404)
+            return
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(corpo)))
+        self.end_headers()
+        self.wfile.write(corpo)
+
+    def log_message(self, *args):
+        pass
+
+
+class TestSincronizacaoCSV(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        tmp_dir = Path(self.tmp.name)
+        self.db_path = tmp_dir / "teste.sqlite"
+
+        PlanilhaFalsa.abas = {
+            "0": CABECALHO
+                 + "RH,ANA SOUZA,FÉRIAS,06/01/2025,20/01/2025,CARLOS,BLOQUEADO,LIBERADO\n"
+                 + "RH,BRUNO LIMA,FÉRIAS,13/01/2025,27/01/2025,CARLOS,,-\n",
+            "111": CABECALHO
+                   + "TI,CAIO ROCHA,FÉRIAS,03/02/2025,17/02/2025,DANI,BLOQ,BLOQ\n",
+        }
+        PlanilhaFalsa.requisicoes = []
+
+        self.servidor = ThreadingHTTPServer(("127.0.0.1", 0), PlanilhaFalsa)
+        threading.Thread(target=self.servidor.serve_forever, daemon=True).start()
+        base_url = f"http://127.0.0.1:{self.servidor.server_address[1]}"
+
+        self.hash_salvo = {}
+        patchers = [
+            patch.object(google_sheets, "GOOGLE_SHEETS_BASE_URL", base_url),
+            patch.dict(settings._data, {
+                "SYNC_FONTE": "csv",
+                "GOOGLE_SHEETS_URL": f"{base_url}/spreadsheets/d/planilha123/edit",
+            }),
+            patch("core.sync_manager.Database", lambda: Database(self.db_path)),
+            patch("core.sync_manager.SnapshotStore",
+                  lambda diretorio=None: SnapshotStore(tmp_dir / Path(diretorio or "snapshots").name)),
+            patch.object(SyncManager, "salvar_hash", lambda _, h: self.hash_salvo.update(ultimo=h)),
+            patch.object(SyncManager, "arquivo_mudou", lambda _, h: h != self.hash_salvo.get("ultimo")),
+        ]
+        for p in patchers:
+            p.start()
+            self.addCleanup(p.stop)
+
+    def tearDown(self):
+        self.servidor.shutdown()
+        self.servidor.server_close()
+        self.tmp.cleanup()
+
+    def test_primeira_sync_processa_todas_as_abas(self):
+        resultado = SyncManager().sincronizar()
+
+        self.assertEqual(resultado["status"], "success")
+        self.assertEqual(resultado["registros"], 3)
+        self.assertEqual(resultado["abas"], 2)
+        self.assertEqual(resultado["abas_alteradas"], ["JANEIRO 2025", "FEVEREIRO 2025"])
+        self.assertEqual(sum(r.endswith("/htmlview") for r in PlanilhaFalsa.requisicoes), 1)
+
+        funcionarios = Database(self.db_path).buscar_funcionarios()
+        ana = next(f for f in funcionarios if f["nome"] == "ANA SOUZA")
+        self.assertEqual(ana["data_saida"], "2025-01-06")
+
+    def test_so_abas_alteradas_sao_processadas(self):
+        SyncManager().sincronizar()
+        PlanilhaFalsa.abas["111"] += "TI,DORA MELO,FÉRIAS,10/02/2025,24/02/2025,DANI,,\n"
+
+        lidas = []
+        original = SyncManager._ler_aba_csv
+
+        def ler_aba_csv(sync, aba):
+            lidas.append(aba["nome"])
+            return original(sync, aba)
+
+        with patch.object(SyncManager, "_ler_aba_csv", ler_aba_csv):
+            resultado = SyncManager().sincronizar()
+
+        self.assertEqual(lidas, ["FEVEREIRO 2025"])
+        self.assertEqual(resultado["registros"], 4)
+        self.assertEqual(resultado["abas_alteradas"], ["FEVEREIRO 2025"])
+
+    def test_abas_com_mesmo_conteudo_mantem_a_propria_origem(self):
+        # Modelos de mês copiados: mesmo conteúdo, abas diferentes
+        PlanilhaFalsa.abas["111"] = PlanilhaFalsa.abas["0"] = CABECALHO
+        SyncManager().sincronizar()
+        PlanilhaFalsa.abas["0"] = CABECALHO + "RH,ANA SOUZA,FÉRIAS,06/01/2025,20/01/2025,CARLOS,BLOQUEADO,\n"
+
+        sync = SyncManager()
+        resultado = sync.sincronizar()
+
+        self.assertEqual(resultado["abas_alteradas"], ["JANEIRO 2025"])
+        self.assertEqual([(a["nome"], a["mes"]) for a in sync.abas_processadas],
+                         [("JANEIRO 2025", 1), ("FEVEREIRO 2025", 2)])
+
+    def test_aba_renomeada_e_reprocessada(self):
+        SyncManager().sincronizar()
+
+        with patch(f"{__name__}.HTMLVIEW", HTMLVIEW.replace("FEVEREIRO 2025", "FEV 2025")):
+            resultado = SyncManager().sincronizar()
+
+        self.assertEqual(resultado["status"], "success")
+        self.assertEqual(resultado["abas_alteradas"], ["FEV 2025"])
+
+    def test_csv_e_xlsx_geram_os_mesmos_registros(self):
+        # Retorno com dia/mês invertido (02/05 em vez de 05/02): corrigido nos dois modos
+        linhas = [
+            ["RH", "ANA SOUZA", "FÉRIAS", datetime(2025, 1, 6), datetime(2025, 5, 2), "CARLOS", "BLOQUEADO", "LIBERADO"],
+            ["RH", "BRUNO LIMA", "FÉRIAS", datetime(2025, 1, 13), datetime(2025, 1, 27), "CARLOS", None, "-"],
+        ]
+        wb = openpyxl.Workbook()
+        wb.active.append(CABECALHO.strip().split(","))
+        csv_texto = CABECALHO
+        for linha in linhas:
+            wb.active.append(linha)
+            csv_texto += ",".join(
+                v.strftime("%d/%m/%Y") if isinstance(v, datetime) else (v or "") for v in linha
+            ) + "\n"
+
+        sync = SyncManager()
+        with redirect_stdout(io.StringIO()):
+            por_xlsx, _ = sync._ler_aba(wb.active, "JANEIRO 2025")
+            por_csv, _ = sync._ler_aba_csv({"nome": "JANEIRO 2025", "conteudo": csv_texto.encode()})
+
+        self.assertEqual(por_csv, por_xlsx)
+        self.assertEqual(por_csv[0]["data_retorno"], "2025-02-05")
+
+    def test_nada_alterado_e_pulado(self):
+        SyncManager().sincronizar()
+        resultado = SyncManager().sincronizar()
+
+        self.assertEqual(resultado["status"], "skipped")
+
+
+if __name__ == '__main__':
+    unittest.main()
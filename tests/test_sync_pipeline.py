@@ -0,0 +1,202 @@
+import sqlite3
+import ast
+import subprocess
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+import openpyxl
+
+# Adiciona a raiz do projeto ao sys.path
+ROOT_DIR = Path(__file__).parent.parent
+sys.path.insert(0, str(ROOT_DIR))
+
+from core.database import Database
+from core.pipeline import Pipeline
+from core.snapshot_store import SnapshotStore
+from core.sync_manager import SyncManager
+
+
+def criar_planilha(caminho: Path):
+    """Cria uma planilha mínima com duas abas no formato da planilha real."""
+    wb = openpyxl.Workbook()
+    ws = wb.active
+    ws.title = "JANEIRO 2025"
+    ws.append(["RESP.", "NOME", "MOTIVO", "SAÍDA", "RETORNO", "GESTOR", "AD PRIN", "VPN"])
+    ws.append(["RH", "ANA SOUZA", "FÉRIAS", "06/01/2025", "20/01/2025", "CARLOS", "BLOQUEADO", "LIBERADO"])
+    ws.append(["RH", "BRUNO LIMA", "FÉRIAS", "13/01/2025", "27/01/2025", "CARLOS", "", "-"])
+    ws.append(["RH", "", "FÉRIAS", "13/01/2025", "27/01/2025", "CARLOS", "", ""])
+
+    ws2 = wb.create_sheet("FEVEREIRO 2025")
+    ws2.append(["RESP.", "NOME", "MOTIVO", "SAÍDA", "RETORNO", "GESTOR", "AD PRIN", "VPN"])
+    ws2.append(["TI", "CAIO ROCHA", "FÉRIAS", "03/02/2025", "17/02/2025", "DANI", "BLOQ", "BLOQ"])
+    wb.save(caminho)
+
+
+class TestPipeline(unittest.TestCase):
+
+    def test_conta_linhas_por_etapa(self):
+        pipeline = (
+            Pipeline()
+            .etapa("gerar", lambda _: iter(range(10)))
+            .etapa("filtrar", lambda itens: (i for i in itens if i % 2 == 0))
+            .etapa("dobrar", lambda itens: (i * 2 for i in itens))
+        )
+
+        self.assertEqual(pipeline.executar(), [0, 4, 8, 12, 16])
+
+        metricas = {m["etapa"]: m for m in pipeline.metricas()}
+        self.assertEqual(metricas["gerar"]["linhas_saida"], 10)
+        self.assertEqual(metricas["filtrar"]["linhas_entrada"], 10)
+        self.assertEqual(metricas["filtrar"]["linhas_saida"], 5)
+        self.assertEqual(metricas["dobrar"]["linhas_entrada"], 5)
+        self.assertEqual([m["ordem"] for m in pipeline.metricas()], [1, 2, 3])
+        self.assertTrue(all(m["duracao_ms"] >= 0 for m in pipeline.metricas()))
+
+    @unittest.skipUnless(sys.platform.startswith("linux"), "ru_maxrss em KB só no Linux")
+    def test_aumento_de_memoria_fica_com_a_etapa_que_aloca(self):
+        # Processo novo: o pico do processo do pytest mascararia a alocação (128 MB,
+        # acima da folga deixada pelo pico dos imports)
+        script = (
+            "from core.pipeline import Pipeline\n"
+            "blocos = []\n"
+            "p = (Pipeline().etapa('gerar', lambda _: iter(range(8)))\n"
+            "     .etapa('alocar', lambda itens: (blocos.append(b'x' * (16 << 20)) or i for i in itens))\n"
+            "     .etapa('contar', lambda itens: (i + 1 for i in itens)))\n"
+            "p.executar()\n"
+            "print({m['etapa']: m['memoria_aumento_kb'] for m in p.metricas()})\n"
+        )
+        saida = subprocess.run([sys.executable, "-c", script], cwd=ROOT_DIR, capture_output=True,
+                               text=True, check=True).stdout
+        memoria = ast.literal_eval(saida.strip().splitlines()[-1])
+
+        self.assertGreater(memoria["alocar"], 32 * 1024)
+        self.assertLess(memoria["contar"], 4 * 1024)
+
+
+class TestSincronizacaoPorEtapas(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        tmp_dir = Path(self.tmp.name)
+        self.db_path = tmp_dir / "teste.sqlite"
+        self.planilha = tmp_dir / "planilha_teste.xlsx"
+        criar_planilha(self.planilha)
+
+        self.snapshot_dir = tmp_dir / "snapshots"
+        patcher_db = patch("core.sync_manager.Database", lambda: Database(self.db_path))
+        patcher_snap = patch("core.sync_manager.SnapshotStore",
+                             lambda diretorio=None: SnapshotStore(self.snapshot_dir / Path(diretorio or "").name))
+        patcher_hash = patch.object(SyncManager, "salvar_hash")
+        patcher_mudou = patch.object(SyncManager, "arquivo_mudou", return_value=True)
+        for p in (patcher_db, patcher_snap, patcher_hash, patcher_mudou):
+            p.start()
+            self.addCleanup(p.stop)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def _sync(self) -> SyncManager:
+        sync = SyncManager()
+        sync.baixar_planilha = lambda forcar=False: self.planilha
+        return sync
+
+    def test_registra_metricas_de_cada_etapa(self):
+        resultado = self._sync().sincronizar()
+
+        self.assertEqual(resultado["status"], "success")
+        self.assertEqual(resultado["registros"], 3)
+
+        etapas = Database(self.db_path).buscar_etapas_sync()
+        self.assertEqual(
+            [e["etapa"] for e in etapas],
+            ["download", "fingerprint", "parse", "validate", "write", "post-process"]
+        )
+        por_nome = {e["etapa"]: e for e in etapas}
+        self.assertEqual(por_nome["parse"]["linhas_saida"], 3)
+        self.assertEqual(por_nome["write"]["linhas_entrada"], 3)
+
+    def test_arquivo_nao_alterado_e_pulado(self):
+        with patch.object(SyncManager, "arquivo_mudou", return_value=False):
+            resultado = self._sync().sincronizar()
+
+        self.assertEqual(resultado["status"], "skipped")
+        conn = sqlite3.connect(self.db_path)
+        self.assertEqual(conn.execute("SELECT COUNT(*) FROM funcionarios").fetchone()[0], 0)
+        conn.close()
+
+    def test_segunda_sync_usa_snapshot(self):
+        self._sync().sincronizar()
+
+        with patch.object(SyncManager, "_iterar_planilha", side_effect=AssertionError("releu o XLSX")):
+            resultado = self._sync().sincronizar(forcar=True)
+
+        self.assertEqual(resultado["status"], "success")
+        self.assertEqual(resultado["registros"], 3)
+        self.assertEqual(resultado["abas"], 2)
+
+    def test_sync_registra_eventos_de_mudanca(self):
+        self.assertEqual(self._sync().sincronizar()["eventos"], 0)
+
+        wb = openpyxl.load_workbook(self.planilha)
+        wb["JANEIRO 2025"]["E2"] = "24/01/2025"
+        wb.save(self.planilha)
+        resultado = self._sync().sincronizar()
+
+        eventos = Database(self.db_path).buscar_eventos_sync()
+        self.assertEqual(resultado["eventos"], 1)
+        self.assertEqual(
+            (eventos[0]["tipo"], eventos[0]["nome"], eventos[0]["valor_novo"]),
+            ("retorno_alterado", "ANA SOUZA", "2025-01-24")
+        )
+
+    def test_replay_de_versao_guardada(self):
+        sync = self._sync()
+        sync.sincronizar()
+        versao = sync.arquivo_hash
+
+        replay = self._sync()
+        replay.baixar_planilha = lambda forcar=False: None
+        resultado = replay.sincronizar(versao=versao)
+
+        self.assertEqual(resultado["status"], "success")
+        self.assertEqual(resultado["registros"], 3)
+        self.assertEqual(replay.sincronizar(versao="inexistente")["status"], "error")
+
+
+class TestSnapshotStore(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.store = SnapshotStore(Path(self.tmp.name))
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_roundtrip(self):
+        registros = [{"nome": "ANA", "mes": 1, "acessos": {"AD PRIN": "BLOQUEADO"}}]
+        self.store.guardar_snapshot("abc", registros, [{"aba": "JANEIRO 2025"}])
+
+        carregados, abas = self.store.carregar_snapshot("abc")
+        self.assertEqual(carregados[0]["nome"], "ANA")
+        self.assertEqual(carregados[0]["acessos"]["AD PRIN"], "BLOQUEADO")
+        self.assertEqual(abas, [{"aba": "JANEIRO 2025"}])
+        self.assertIsNone(self.store.carregar_snapshot("outro"))
+
+    def test_retencao_mantem_as_mais_recentes(self):
+        for i in range(4):
+            self.store.guardar_snapshot(f"v{i}", [{"nome": "ANA"}], [])
+            meta = self.store._caminho_meta(f"v{i}")
+            meta.write_text(meta.read_text().replace('"criado_em": "', f'"criado_em": "0{i}'))
+
+        removidas = self.store.aplicar_retencao(max_versoes=2, max_bytes=10 ** 9)
+
+        self.assertEqual(removidas, ["v0", "v1"])
+        self.assertEqual([v["hash"] for v in self.store.listar_versoes()], ["v3", "v2"])
+        self.assertEqual(self.store.aplicar_retencao(max_versoes=10, max_bytes=0), ["v2"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,107 @@
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+import openpyxl
+
+# Adiciona a raiz do projeto ao sys.path
+ROOT_DIR = Path(__file__).parent.parent
+sys.path.insert(0, str(ROOT_DIR))
+
+from core.database import Database
+from core.snapshot_store import SnapshotStore
+from core.sync_manager import SyncManager
+from core.validacao_dados import ValidadorDados
+
+
+def registro(nome, saida, retorno, aba="JANEIRO 2025", linha=2, desconhecidos=""):
+    return {
+        "nome": nome, "data_saida": saida, "data_retorno": retorno,
+        "aba_origem": aba, "linha": linha, "status_desconhecidos": desconhecidos,
+    }
+
+
+class TestValidadorDados(unittest.TestCase):
+
+    def _tipos(self, registros):
+        return sorted((p["tipo"], p["nome"]) for p in ValidadorDados(max_dias=60).validar(registros))
+
+    def test_lote_valido_nao_gera_problemas(self):
+        self.assertEqual(self._tipos([registro("ANA", "2025-01-06", "2025-01-20")]), [])
+        self.assertEqual(ValidadorDados(max_dias=60).validar([]), [])
+
+    def test_regras(self):
+        problemas = self._tipos([
+            registro("ANA", "2025-01-20", "2025-01-06"),
+            registro("BRUNO", "2025-01-06", "2025-05-20"),
+            registro("CAIO", "2025-01-06", "2025-01-20", aba="JANEIRO 2025"),
+            registro("caio ", "2025-01-06", "2025-01-21", aba="FEVEREIRO 2025", linha=5),
+            registro("DORA", "2025-01-06", "2025-01-20", desconhecidos="VPN=TALVEZ"),
+        ])
+
+        self.assertEqual(problemas, [
+            ("duplicado", "CAIO"),
+            ("duplicado", "caio "),
+            ("duracao_excessiva", "BRUNO"),
+            ("retorno_antes_saida", "ANA"),
+            ("status_desconhecido", "DORA"),
+        ])
+
+    def test_duplicado_informa_abas(self):
+        problemas = ValidadorDados(max_dias=60).validar([
+            registro("CAIO", "2025-01-06", "2025-01-20", aba="JANEIRO 2025"),
+            registro("CAIO", "2025-01-06", "2025-01-20", aba="FEVEREIRO 2025", linha=7),
+        ])
+
+        self.assertEqual(problemas[1]["linha"], 7)
+        self.assertIn("FEVEREIRO 2025, JANEIRO 2025", problemas[1]["detalhe"])
+
+
+class TestProblemasNaSincronizacao(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        tmp_dir = Path(self.tmp.name)
+        self.db_path = tmp_dir / "teste.sqlite"
+        self.planilha = tmp_dir / "planilha.xlsx"
+
+        wb = openpyxl.Workbook()
+        ws = wb.active
+        ws.title = "JANEIRO 2025"
+        ws.append(["RESP.", "NOME", "MOTIVO", "SAÍDA", "RETORNO", "GESTOR", "AD PRIN", "VPN"])
+        ws.append(["RH", "ANA SOUZA", "FÉRIAS", "06/01/2025", "20/01/2025", "CARLOS", "BLOQUEADO", "TALVEZ"])
+        ws.append(["RH", "BRUNO LIMA", "FÉRIAS", "13/01/2025", "ontem", "CARLOS", "", ""])
+        wb.save(self.planilha)
+
+        patchers = [
+            patch("core.sync_manager.Database", lambda: Database(self.db_path)),
+            patch("core.sync_manager.SnapshotStore",
+                  lambda diretorio=None: SnapshotStore(tmp_dir / Path(diretorio or "snapshots").name)),
+            patch.object(SyncManager, "salvar_hash"),
+            patch.object(SyncManager, "arquivo_mudou", return_value=True),
+        ]
+        for p in patchers:
+            p.start()
+            self.addCleanup(p.stop)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_problemas_sao_gravados(self):
+        sync = SyncManager()
+        sync.baixar_planilha = lambda forcar=False: self.planilha
+        resultado = sync.sincronizar()
+
+        self.assertEqual(resultado["registros"], 1)
+        self.assertEqual(resultado["problemas"], 2)
+
+        problemas = {p["tipo"]: p for p in Database(self.db_path).buscar_problemas_sync()}
+        self.assertEqual(problemas["data_invalida"]["nome"], "BRUNO LIMA")
+        self.assertEqual(problemas["data_invalida"]["linha"], 3)
+        self.assertIn("VPN=TALVEZ", problemas["status_desconhecido"]["detalhe"])
+
+
+if __name__ == '__main__':
+    unittest.main()
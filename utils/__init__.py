@@ -4,6 +4,7 @@ from .formatadores import (
     formatar_data_iso,
     parse_data, 
     formatar_nome,
+    normalizar_nome,
     dias_entre_datas,
     agora_formatado,
     FORMATO_DATA_BR,
@@ -0,0 +1,176 @@
+# ============================================
+# UTILITÁRIOS: CALENDÁRIO DE DIAS ÚTEIS
+# Responsabilidade: Feriados e consultas de dia útil
+# ============================================
+
+from array import array
+from datetime import date, datetime, timedelta
+from typing import Dict, Iterable, Optional, Tuple, Union
+
+# Quantos anos antes/depois do atual o calendário pré-calcula
+ANOS_ANTES = 1
+ANOS_DEPOIS = 5
+
+DIAS_SEMANA = [
+    "Segunda-feira", "Terça-feira", "Quarta-feira", "Quinta-feira",
+    "Sexta-feira", "Sábado", "Domingo",
+]
+
+# Feriados nacionais de data fixa (mês, dia)
+FERIADOS_FIXOS = {
+    (1, 1): "Confraternização Universal",
+    (4, 21): "Tiradentes",
+    (5, 1): "Dia do Trabalho",
+    (9, 7): "Independência do Brasil",
+    (10, 12): "Nossa Senhora Aparecida",
+    (11, 2): "Finados",
+    (11, 15): "Proclamação da República",
+    (12, 25): "Natal",
+}
+
+
+def pascoa(ano: int) -> date:
+    """Domingo de Páscoa (algoritmo de Meeus/Jones/Butcher)."""
+    a = ano % 19
+    b, c = divmod(ano, 100)
+    d, e = divmod(b, 4)
+    f = (b + 8) // 25
+    g = (b - f + 1) // 3
+    h = (19 * a + b - d - g + 15) % 30
+    i, k = divmod(c, 4)
+    l = (32 + 2 * e + 2 * i - h - k) % 7
+    m = (a + 11 * h + 22 * l) // 451
+    mes, dia = divmod(h + l - 7 * m + 114, 31)
+    return date(ano, mes, dia + 1)
+
+
+def feriados_nacionais(ano: int) -> Dict[date, str]:
+    """
+    Feriados nacionais do ano. Carnaval e Corpus Christi são pontos
+    facultativos e entram como feriados locais, se for o caso.
+    """
+    feriados = {date(ano, mes, dia): nome for (mes, dia), nome in FERIADOS_FIXOS.items()}
+    feriados[pascoa(ano) - timedelta(days=2)] = "Sexta-feira Santa"
+    if ano >= 2024:
+        feriados[date(ano, 11, 20)] = "Dia Nacional de Zumbi e da Consciência Negra"
+    return feriados
+
+
+def _como_data(valor: Union[date, datetime]) -> date:
+    return valor.date() if isinstance(valor, datetime) else valor
+
+
+class Calendario:
+    """
+    Dias úteis pré-calculados para um intervalo de anos.
+
+    Guarda, para cada dia do intervalo, se é útil, quantos dias úteis há
+    até ele (soma acumulada) e qual o próximo dia útil. Assim
+    `eh_dia_util`, `proximo_dia_util` e `dias_uteis_entre` são consultas
+    O(1) por índice. Datas fora do intervalo são calculadas dia a dia.
+    """
+
+    def __init__(self, feriados_locais: Iterable[date] = (), recorrentes: Iterable[Tuple[int, int]] = (),
+                 ano_inicio: int = None, ano_fim: int = None):
+        """
+        Args:
+            feriados_locais: Feriados locais em datas específicas
+            recorrentes: Feriados locais anuais, como (mês, dia)
+            ano_inicio/ano_fim: Intervalo pré-calculado (padrão: ano atual -1 a +5)
+        """
+        ano_atual = date.today().year
+        self.inicio = date(ano_inicio or ano_atual - ANOS_ANTES, 1, 1)
+        self.fim = date(ano_fim or ano_atual + ANOS_DEPOIS, 12, 31)
+
+        self.recorrentes = set(recorrentes)
+        self.feriados: Dict[date, str] = {}
+        for ano in range(self.inicio.year, self.fim.year + 1):
+            self.feriados.update(feriados_nacionais(ano))
+            for mes, dia in self.recorrentes:
+                try:
+                    self.feriados.setdefault(date(ano, mes, dia), "Feriado local")
+                except ValueError:  # 29/02 em ano não bissexto
+                    pass
+        for feriado in feriados_locais:
+            self.feriados.setdefault(feriado, "Feriado local")
+
+        total = (self.fim - self.inicio).days + 1
+        self._util = bytearray(total)
+        self._acumulado = array("i", [0]) * total
+        self._proximo = array("i", [0]) * total
+
+        acumulado = 0
+        for indice in range(total):
+            dia = self.inicio + timedelta(days=indice)
+            util = dia.weekday() < 5 and dia not in self.feriados
+            self._util[indice] = util
+            acumulado += util
+            self._acumulado[indice] = acumulado
+
+        # Próximo dia útil estritamente depois de cada dia (-1: fora do intervalo)
+        proximo = -1
+        for indice in range(total - 1, -1, -1):
+            self._proximo[indice] = proximo
+            if self._util[indice]:
+                proximo = indice
+
+    def _indice(self, dia: date) -> Optional[int]:
+        if self.inicio <= dia <= self.fim:
+            return (dia - self.inicio).days
+        return None
+
+    def eh_dia_util(self, dia: Union[date, datetime] = None) -> bool:
+        """Verifica se o dia (hoje por padrão) é útil: seg-sex e não feriado."""
+        dia = _como_data(dia or date.today())
+        indice = self._indice(dia)
+        if indice is None:
+            return (dia.weekday() < 5 and dia not in self.feriados
+                    and (dia.month, dia.day) not in self.recorrentes
+                    and dia not in feriados_nacionais(dia.year))
+        return bool(self._util[indice])
+
+    def motivo_nao_util(self, dia: Union[date, datetime] = None) -> Optional[str]:
+        """Nome do feriado ou 'fim de semana' se o dia (hoje por padrão) não é útil, senão None."""
+        dia = _como_data(dia or date.today())
+        if self.eh_dia_util(dia):
+            return None
+        feriado = self.feriados.get(dia) or feriados_nacionais(dia.year).get(dia)
+        if feriado is None and (dia.month, dia.day) in self.recorrentes:
+            feriado = "Feriado local"
+        return f"feriado: {feriado}" if feriado else "fim de semana"
+
+    def proximo_dia_util(self, dia: Union[date, datetime] = None) -> date:
+        """Primeiro dia útil depois do dia informado (hoje por padrão)."""
+        dia = _como_data(dia or date.today())
+        indice = self._indice(dia)
+        if indice is not None and self._proximo[indice] >= 0:
+            return self.inicio + timedelta(days=self._proximo[indice])
+
+        proximo = dia + timedelta(days=1)
+        while not self.eh_dia_util(proximo):
+            proximo += timedelta(days=1)
+        return proximo
+
+    def dias_uteis_entre(self, inicio: Union[date, datetime], fim: Union[date, datetime]) -> int:
+        """
+        Quantidade de dias úteis em (inicio, fim]: de sexta para segunda é 1.
+        Negativo se `fim` vem antes de `inicio`.
+        """
+        inicio, fim = _como_data(inicio), _como_data(fim)
+        if fim < inicio:
+            return -self.dias_uteis_entre(fim, inicio)
+
+        indice_inicio, indice_fim = self._indice(inicio), self._indice(fim)
+        if indice_inicio is not None and indice_fim is not None:
+            return self._acumulado[indice_fim] - self._acumulado[indice_inicio]
+
+        return sum(
+            self.eh_dia_util(inicio + timedelta(days=n))
+            for n in range(1, (fim - inicio).days + 1)
+        )
+
+
+def rotulo_dia(dia: date, hoje: date = None) -> str:
+    """'Amanhã' se o dia é o seguinte a hoje, senão o nome do dia da semana."""
+    hoje = _como_data(hoje or date.today())
+    return "Amanhã" if dia == hoje + timedelta(days=1) else DIAS_SEMANA[dia.weekday()]
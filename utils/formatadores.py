@@ -6,6 +6,7 @@
 from datetime import datetime
 from typing import Optional, Union
 import re
+import unicodedata
 
 # ============================================
 # CONSTANTES DE FORMATOS DE DATA
@@ -169,6 +170,23 @@ def formatar_nome(nome: str) -> str:
     return nome.strip().title()
 
 
+def normalizar_nome(nome: str) -> str:
+    """
+    Gera a chave de identidade de um nome: sem acentos, casefold e
+    com espaços colapsados.
+    
+    Example:
+        >>> normalizar_nome("  José   da SILVA ")
+        'jose da silva'
+    """
+    if not nome:
+        return ""
+    sem_acentos = "".join(
+        c for c in unicodedata.normalize("NFKD", nome) if not unicodedata.combining(c)
+    )
+    return " ".join(sem_acentos.casefold().split())
+
+
 def dias_entre_datas(data_inicio: datetime, data_fim: datetime) -> int:
     """Calcula dias entre duas datas."""
     if data_inicio is None or data_fim is None:
@@ -3,8 +3,12 @@
 # Responsabilidade: Funções utilitárias para Google Sheets
 # ============================================
 
+import json
 import re
-from typing import Optional
+from typing import List, Optional, Tuple
+
+# Endereço base do Google Sheets (substituível em testes por um servidor local)
+GOOGLE_SHEETS_BASE_URL = "https://docs.google.com"
 
 
 def extrair_sheet_id(url: str) -> Optional[str]:
@@ -54,9 +58,51 @@ def construir_url_exportacao(sheet_id: str, formato: str = "xlsx", gid: Optional
     Returns:
         URL de exportação
     """
-    url = f"https://docs.google.com/spreadsheets/d/{sheet_id}/export?format={formato}"
+    url = f"{GOOGLE_SHEETS_BASE_URL}/spreadsheets/d/{sheet_id}/export?format={formato}"
     
     if gid:
         url += f"&gid={gid}"
     
     return url
+
+
+def construir_url_htmlview(sheet_id: str) -> str:
+    """
+    Constrói URL da visualização HTML pública, que lista todas as abas.
+    
+    Args:
+        sheet_id: ID da planilha
+        
+    Returns:
+        URL da página htmlview
+    """
+    return f"{GOOGLE_SHEETS_BASE_URL}/spreadsheets/d/{sheet_id}/htmlview"
+
+
+def extrair_abas_htmlview(html: str) -> List[Tuple[str, str]]:
+    """
+    Extrai nome e gid das abas a partir da página htmlview.
+    
+    A página declara as abas em chamadas JavaScript no formato
+    `items.push({name: "JANEIRO 2025", ..., gid: "123", ...})`; como
+    alternativa, usa os botões `<li id="sheet-button-GID"><a>NOME</a></li>`.
+    
+    Args:
+        html: Conteúdo da página htmlview
+        
+    Returns:
+        Lista de tuplas (nome, gid) na ordem das abas
+        
+    Example:
+        >>> extrair_abas_htmlview('items.push({name: "JAN", pageUrl: "x", gid: "7"});')
+        [('JAN', '7')]
+    """
+    abas = []
+    for nome, gid in re.findall(r'name:\s*"((?:[^"\\]|\\.)*)"[^}]*?gid:\s*"(\d+)"', html):
+        abas.append((json.loads(f'"{nome}"'), gid))
+    
+    if not abas:
+        for gid, nome in re.findall(r'id="sheet-button-(\d+)"[^>]*>\s*<a[^>]*>([^<]+)</a>', html):
+            abas.append((nome.strip(), gid))
+    
+    return abas